@@ -3,27 +3,110 @@
 Process for generating the leaderboards:
  - Call the lichess `get online bots` API (https://lichess.org/api/bot/online).
  - Parse the response into a collection of bots with ratings.
+ - Include the bots which were seen online by polling since the leaderboards were last generated.
+ - Look up the previously seen bots which are offline (https://lichess.org/api/users) to refresh their information.
  - Convert collection of bots into leaderboard rows for each time control and variant.
  - Compare that data with data generated previously to create updated leaderboard rows.
  - Save the new data for comparison next time.
  - Generate html leaderboards from the data which are fun to look at.
+
+The online bots response is cached in `leaderboard_cache`. If lichess reports that it has not been modified, the cached
+response is used.
+
+When run with `--poll`, the online bots are instead polled every few minutes and buffered for the next generation.
+When run with `--base-url`, a different server such as `python -m src.leaderboard.bench.stand_in_server` is used.
+When run with `--record`, each fetched online bots response is also archived in `leaderboard_cache/recordings`.
+When run with `--store sqlite`, the leaderboard state is kept in `leaderboard_cache/leaderboard.sqlite3`.
+When run with `--store delta`, a record of what changed is written to `leaderboard_data/generations` instead of json files.
+When run with `--workers`, the leaderboards of the perf types are generated in parallel processes.
+When run with `--skip-unchanged-pages`, the pages of the leaderboards which did not change are not rendered again.
+When run with `--perf`, only the leaderboards of the given perf types and the index are generated or rendered.
+When run with `--archive-after`, the bots which have been ineligible for that many days are moved to an archive.
+When run with `--render-only`, the html is rendered from the saved data and the cached online bots without any requests.
 """
 
+import contextlib
+
+from src.leaderboard.chrono.durations import ONE_DAY, ONE_MINUTE
 from src.leaderboard.chrono.fixed_time_provider import FixedTimeProvider
 from src.leaderboard.chrono.real_time_provider import RealTimeProvider
+from src.leaderboard.data import vectorized_ranking
+from src.leaderboard.data.data_generator import GenerationOptions, create_ranked_rows
+from src.leaderboard.data.delta_leaderboard_store import DeltaLeaderboardStore
+from src.leaderboard.data.json_leaderboard_store import JsonLeaderboardStore
+from src.leaderboard.data.leaderboard_store import LeaderboardStore, copy_leaderboard_state
+from src.leaderboard.data.sqlite_leaderboard_store import SqliteLeaderboardStore
+from src.leaderboard.fs import file_paths
 from src.leaderboard.fs.real_file_system import RealFileSystem
+from src.leaderboard.li.async_lichess_client import AsyncLichessClient
+from src.leaderboard.li.caching_lichess_client import CachingLichessClient
 from src.leaderboard.li.real_lichess_client import RealLichessClient
+from src.leaderboard.li.recording_lichess_client import RecordingLichessClient
+from src.leaderboard.li.response_cache import ResponseCache
 from src.leaderboard.log.real_log_writer import RealLogWriter
+from src.leaderboard.main import command_line
 from src.leaderboard.main.leaderboard_generator import LeaderboardGenerator
+from src.leaderboard.main.sightings_poller import SightingsPoller
+
+
+def create_store(file_system: RealFileSystem, store_name: str) -> LeaderboardStore | None:
+  """Return the store given by `--store`, or None for json, where the leaderboard state is kept in the json files."""
+  if store_name == "sqlite":
+    return SqliteLeaderboardStore(file_system.resolve(file_paths.leaderboard_database_path()))
+  if store_name == "delta":
+    return DeltaLeaderboardStore(file_system)
+  return None
 
 
 if __name__ == "__main__":
+  arguments = command_line.parse_arguments()
   # Instantiate dependencies
   file_system = RealFileSystem()
-  lichess_client = RealLichessClient()
-  time_provider = FixedTimeProvider(RealTimeProvider().get_current_time())
   log_writer = RealLogWriter(__name__)
-  # Create generator
-  leaderboard_generator = LeaderboardGenerator(file_system, lichess_client, time_provider, log_writer)
-  # Generate leaderboards
-  leaderboard_generator.generate_leaderboards()
+  with RealLichessClient(base_url=arguments.base_url) as lichess_client:
+    if arguments.poll:
+      polling_client = (
+        RecordingLichessClient(lichess_client, file_system, RealTimeProvider()) if arguments.record else lichess_client
+      )
+      # Poll until interrupted
+      SightingsPoller(file_system, polling_client, log_writer).run(arguments.poll_interval * ONE_MINUTE)
+    elif arguments.render_only:
+      # Replay the cached online bots
+      caching_client = CachingLichessClient(lichess_client, ResponseCache(file_system), RealTimeProvider(), offline=True)
+      # Show when the online bots were fetched
+      time_provider = FixedTimeProvider(caching_client.get_response_header().fetched_at)
+      # The json files are not written with the delta store
+      render_options = GenerationOptions(
+        store=DeltaLeaderboardStore(file_system) if arguments.store == "delta" else None, perf_types=arguments.perf
+      )
+      # Render leaderboards
+      LeaderboardGenerator(file_system, caching_client, time_provider, log_writer, render_options).render_leaderboards()
+    else:
+      time_provider = FixedTimeProvider(RealTimeProvider().get_current_time())
+      caching_client = CachingLichessClient(lichess_client, ResponseCache(file_system), time_provider)
+      generation_client = (
+        RecordingLichessClient(caching_client, file_system, time_provider) if arguments.record else caching_client
+      )
+      # Share the pooled session for refreshing the offline bots
+      users_client = AsyncLichessClient(lichess_client.session, arguments.base_url, log_writer=log_writer)
+      rank_rows = vectorized_ranking.create_ranked_rows if arguments.ranking == "numpy" else create_ranked_rows
+      store = create_store(file_system, arguments.store)
+      # The store is closed even if the generation fails
+      with store or contextlib.nullcontext():
+        if store and store.is_empty():
+          # Start from the state in the json files
+          copy_leaderboard_state(JsonLeaderboardStore(file_system), store)
+        options = GenerationOptions(
+          users_client,
+          rank_rows,
+          skip_unchanged_pages=arguments.skip_unchanged_pages,
+          store=store,
+          export_json=arguments.store != "delta",
+          workers=arguments.workers,
+          perf_types=arguments.perf,
+          archive_after=None if arguments.archive_after is None else arguments.archive_after * ONE_DAY,
+        )
+        # Create generator
+        leaderboard_generator = LeaderboardGenerator(file_system, generation_client, time_provider, log_writer, options)
+        # Generate leaderboards
+        leaderboard_generator.generate_leaderboards()
@@ -0,0 +1 @@
+"""Modules for benchmarking leaderboard generation on synthetic data."""
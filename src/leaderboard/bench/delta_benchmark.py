@@ -0,0 +1,128 @@
+"""Benchmark for the bytes of leaderboard data committed per generation, with the json files and with the delta store.
+
+Runs the same generations of a changing synthetic population in two temporary directories, one writing the json files and
+one writing the generation records of DeltaLeaderboardStore, and compares the bytes of the files in leaderboard_data which
+each generation changed (which is what a commit of the generation adds to the repository). Then compares the time it takes to
+load the latest state from the json files with the time it takes to rebuild it from its keyframe and the records since.
+
+Usage: python -m src.leaderboard.bench.delta_benchmark
+"""
+
+import tempfile
+import time
+from pathlib import Path
+
+from src.leaderboard.bench import synthetic_bots
+from src.leaderboard.bench.replay_benchmark import GENERATION_INTERVAL
+from src.leaderboard.bench.synthetic_bots import PopulationConfig, SyntheticPopulation
+from src.leaderboard.chrono.fixed_time_provider import FixedTimeProvider
+from src.leaderboard.data.data_generator import GenerationOptions
+from src.leaderboard.data.delta_leaderboard_store import DeltaLeaderboardStore
+from src.leaderboard.data.json_leaderboard_store import JsonLeaderboardStore
+from src.leaderboard.fs import compression, file_paths
+from src.leaderboard.fs.file_system import FileSystem
+from src.leaderboard.fs.real_file_system import RealFileSystem
+from src.leaderboard.li.replay_lichess_client import ReplayLichessClient
+from src.leaderboard.log.log_writer import LogWriter
+from src.leaderboard.log.real_log_writer import RealLogWriter
+from src.leaderboard.main.leaderboard_generator import LeaderboardGenerator
+
+
+# The number of bots in each run
+BOT_COUNTS = (10_000,)
+# The number of generations in each run
+GENERATION_COUNT = 30
+# The number of records from one keyframe to the next, so that the latest record holds the most changes since its keyframe
+KEYFRAME_INTERVAL = 10
+# The fraction of online bots which are replaced by new bots, and which play games, between generations
+CHURN = 0.01
+
+
+def write_recordings(file_system: FileSystem, bot_count: int, generation_count: int) -> ReplayLichessClient:
+  """Record generation_count snapshots of a synthetic population and return a client which replays them."""
+  time_provider = FixedTimeProvider(synthetic_bots.SEEN_AT // 1000)
+  population = SyntheticPopulation(PopulationConfig(bot_count=bot_count, churn=CHURN), time_provider)
+  extension = compression.get_preferred_extension()
+  file_names: list[str] = []
+  for _ in range(generation_count):
+    file_name = file_paths.recording_path(time_provider.get_current_time(), 0, extension)
+    ndjson = "\n".join(population.take_snapshot())
+    file_system.write_bytes(file_name, compression.compress_for_extension(ndjson.encode(), extension))
+    file_names.append(file_name)
+    time_provider.fixed_current_time += GENERATION_INTERVAL
+  return ReplayLichessClient(file_system, file_names)
+
+
+def read_data_files(file_system: FileSystem) -> dict[str, bytes]:
+  """Return the contents of the files of the leaderboard data, except for the rating history."""
+  file_names = file_system.list_files(file_paths.LEADERBOARD_DATA_DIR) + file_system.list_files(file_paths.generations_dir())
+  return {file_name: file_system.read_bytes(file_name) or b"" for file_name in file_names}
+
+
+def run_generations(
+  file_system: FileSystem, lichess_client: ReplayLichessClient, log_writer: LogWriter, options: GenerationOptions
+) -> list[int]:
+  """Generate the leaderboards once for each recording and return the bytes of the data files each generation changed."""
+  time_provider = FixedTimeProvider(synthetic_bots.SEEN_AT // 1000)
+  changed_bytes: list[int] = []
+  data_files = read_data_files(file_system)
+  for _ in lichess_client.file_names:
+    LeaderboardGenerator(file_system, lichess_client, time_provider, log_writer, options).generate_leaderboards()
+    previous_data_files, data_files = data_files, read_data_files(file_system)
+    changed_bytes.append(
+      sum(len(contents) for file_name, contents in data_files.items() if previous_data_files.get(file_name) != contents)
+    )
+    time_provider.fixed_current_time += GENERATION_INTERVAL
+  return changed_bytes
+
+
+def run_benchmark(
+  log_writer: LogWriter,
+  bot_counts: tuple[int, ...] = BOT_COUNTS,
+  generation_count: int = GENERATION_COUNT,
+  keyframe_interval: int = KEYFRAME_INTERVAL,
+) -> None:
+  """Run the generations of each size with the json files and with the delta store, and log the bytes and load times."""
+  for bot_count in bot_counts:
+    with tempfile.TemporaryDirectory() as json_dir, tempfile.TemporaryDirectory() as delta_dir:
+      json_file_system = RealFileSystem(Path(json_dir))
+      delta_file_system = RealFileSystem(Path(delta_dir))
+      lichess_client = write_recordings(json_file_system, bot_count, generation_count)
+      json_bytes = run_generations(json_file_system, lichess_client, log_writer, GenerationOptions())
+      delta_options = GenerationOptions(store=DeltaLeaderboardStore(delta_file_system, keyframe_interval), export_json=False)
+      delta_bytes = run_generations(delta_file_system, lichess_client, log_writer, delta_options)
+
+      start_time = time.perf_counter()
+      json_store = JsonLeaderboardStore(json_file_system)
+      json_state = json_store.load_bot_profiles(), json_store.load_leaderboard_rows()
+      json_seconds = time.perf_counter() - start_time
+      start_time = time.perf_counter()
+      delta_store = DeltaLeaderboardStore(delta_file_system, keyframe_interval)
+      delta_state = delta_store.load_bot_profiles(), delta_store.load_leaderboard_rows()
+      delta_seconds = time.perf_counter() - start_time
+      if delta_state != json_state:
+        error_msg = f"The state rebuilt from the generation records of {bot_count} bots does not match the json files"
+        raise ValueError(error_msg)
+
+      # The records which are not keyframes
+      deltas_bytes = [record_bytes for record, record_bytes in enumerate(delta_bytes) if record % keyframe_interval]
+      log_writer.info(
+        "%7d bots, %d generations: json %d bytes per generation, delta %d bytes per generation (%d per delta), %.1fx smaller",
+        bot_count,
+        generation_count,
+        sum(json_bytes) // generation_count,
+        sum(delta_bytes) // generation_count,
+        sum(deltas_bytes) // max(len(deltas_bytes), 1),
+        sum(json_bytes) / sum(delta_bytes),
+      )
+      log_writer.info(
+        "%7d bots: load json %.3fs, rebuild from a keyframe and the changes of %d generations since %.3fs",
+        bot_count,
+        json_seconds,
+        (generation_count - 1) % keyframe_interval,
+        delta_seconds,
+      )
+
+
+if __name__ == "__main__":
+  run_benchmark(RealLogWriter(__name__))
@@ -0,0 +1,79 @@
+"""Benchmark for ingesting the online bots into perf type buckets.
+
+Compares bucketing from a list of Perf objects per bot to bucketing from the bot's PerfTable, reporting the time, the number
+of allocations still alive after parsing, and the peak memory.
+
+Usage: python -m src.leaderboard.bench.ingest_benchmark
+"""
+
+import time
+import tracemalloc
+from collections.abc import Callable
+from typing import Any
+
+from src.leaderboard.bench import synthetic_bots
+from src.leaderboard.bench.parse_benchmark import parse_perf
+from src.leaderboard.data import data_generator
+from src.leaderboard.data.leaderboard_objects import BotPerf, LeaderboardPerf
+from src.leaderboard.li import json_backend
+from src.leaderboard.li.bot_user import BotUser, Perf
+from src.leaderboard.log.log_writer import LogWriter
+from src.leaderboard.log.real_log_writer import RealLogWriter
+
+
+BOT_COUNTS = (10_000, 100_000)
+
+
+def ingest_with_perf_lists(lines: list[str]) -> object:
+  """Parse each bot into a list of Perf objects and bucket them, as was done before PerfTable."""
+  parsed: list[tuple[str, list[Perf]]] = []
+  for line in lines:
+    json_dict: dict[str, Any] = json_backend.loads(line)
+    perfs = [parse_perf(key, perf_json) for key, perf_json in json_dict.get("perfs", {}).items()]
+    parsed.append((json_dict["username"], perfs))
+  bot_perfs_by_perf_type: dict[Any, list[BotPerf]] = {}
+  for username, perfs in parsed:
+    for perf in perfs:
+      if perf.games:
+        leaderboard_perf = LeaderboardPerf(perf.rating, perf.rd, perf.prog, perf.games, perf.prov)
+        bot_perfs_by_perf_type.setdefault(perf.perf_type, []).append(BotPerf(username, leaderboard_perf))
+  return parsed, bot_perfs_by_perf_type
+
+
+def ingest_with_perf_tables(lines: list[str]) -> object:
+  """Parse each bot into a BotUser with a PerfTable and bucket them with create_bot_info."""
+  bot_users = [BotUser.from_json(line) for line in lines]
+  return bot_users, data_generator.create_bot_info(bot_users)
+
+
+def measure(ingest: Callable[[list[str]], object], lines: list[str]) -> tuple[float, int, int]:
+  """Return the seconds, the number of live allocations and the peak bytes of ingesting the lines."""
+  tracemalloc.start()
+  start_time = time.perf_counter()
+  result = ingest(lines)
+  seconds = time.perf_counter() - start_time
+  allocation_count = sum(stat.count for stat in tracemalloc.take_snapshot().statistics("filename"))
+  _, peak_bytes = tracemalloc.get_traced_memory()
+  tracemalloc.stop()
+  del result
+  return seconds, allocation_count, peak_bytes
+
+
+def run_benchmark(log_writer: LogWriter, bot_counts: tuple[int, ...] = BOT_COUNTS) -> None:
+  """Ingest synthetic online bots of each size with both representations and log the results."""
+  for bot_count in bot_counts:
+    lines = synthetic_bots.create_online_bots_lines(bot_count)
+    for name, ingest in (("perf lists", ingest_with_perf_lists), ("perf tables", ingest_with_perf_tables)):
+      seconds, allocation_count, peak_bytes = measure(ingest, lines)
+      log_writer.info(
+        "%7d bots, %-11s: %.3fs, %.1f live allocations/bot, peak %.0f bytes/bot",
+        bot_count,
+        name,
+        seconds,
+        allocation_count / bot_count,
+        peak_bytes / bot_count,
+      )
+
+
+if __name__ == "__main__":
+  run_benchmark(RealLogWriter(__name__))
@@ -0,0 +1,89 @@
+"""Load test of the full generation pipeline against a local stand-in server.
+
+For each population size, a stand-in server with a synthetic population is started in process, and the leaderboards are
+generated several times in a temporary directory. Each generation fetches the online bots over HTTP and looks up the bots
+which went offline, so the population churns between generations like it does on lichess.
+
+Usage: python -m src.leaderboard.bench.load_benchmark [--bots N [N ...]] [--generations N] [--churn FRACTION] ...
+"""
+
+import argparse
+import tempfile
+import time
+from collections.abc import Sequence
+from pathlib import Path
+
+from src.leaderboard.bench import stand_in_server
+from src.leaderboard.bench.stand_in_server import StandInServer
+from src.leaderboard.bench.synthetic_bots import PopulationConfig, SyntheticPopulation
+from src.leaderboard.chrono.fixed_time_provider import FixedTimeProvider
+from src.leaderboard.chrono.real_time_provider import RealTimeProvider
+from src.leaderboard.data.data_generator import GenerationOptions
+from src.leaderboard.fs.real_file_system import RealFileSystem
+from src.leaderboard.li.async_lichess_client import AsyncLichessClient
+from src.leaderboard.li.real_lichess_client import RealLichessClient
+from src.leaderboard.log.log_writer import LogWriter
+from src.leaderboard.log.real_log_writer import RealLogWriter
+from src.leaderboard.main.leaderboard_generator import LeaderboardGenerator
+
+
+DEFAULT_BOT_COUNTS = (10_000, 100_000)
+DEFAULT_GENERATION_COUNT = 3
+# The stand-in server does not rate limit, so the users are looked up as fast as possible
+MAX_CONCURRENT_REQUESTS = 8
+REQUESTS_PER_SECOND = 1000.0
+
+
+def run_load_test(
+  population_config: PopulationConfig,
+  log_writer: LogWriter,
+  generation_count: int,
+  latency: float = 0.0,
+  lines_per_second: float | None = None,
+) -> list[float]:
+  """Generate the leaderboards generation_count times against a stand-in server and return the seconds each took."""
+  population = SyntheticPopulation(population_config, RealTimeProvider())
+  generation_seconds: list[float] = []
+  with (
+    StandInServer(population, latency, lines_per_second) as server,
+    RealLichessClient(base_url=server.base_url) as lichess_client,
+    tempfile.TemporaryDirectory() as temp_dir,
+  ):
+    file_system = RealFileSystem(Path(temp_dir))
+    users_client = AsyncLichessClient(
+      lichess_client.session,
+      server.base_url,
+      MAX_CONCURRENT_REQUESTS,
+      REQUESTS_PER_SECOND,
+      MAX_CONCURRENT_REQUESTS,
+      log_writer,
+    )
+    for _ in range(generation_count):
+      time_provider = FixedTimeProvider(RealTimeProvider().get_current_time())
+      generator = LeaderboardGenerator(file_system, lichess_client, time_provider, log_writer, GenerationOptions(users_client))
+      start_time = time.perf_counter()
+      generator.generate_leaderboards()
+      generation_seconds.append(time.perf_counter() - start_time)
+  return generation_seconds
+
+
+def parse_arguments(args: Sequence[str] | None = None) -> argparse.Namespace:
+  """Parse the command line arguments. If args is None, sys.argv is used."""
+  parser = argparse.ArgumentParser(prog="python -m src.leaderboard.bench.load_benchmark", description=__doc__)
+  parser.add_argument("--bots", type=int, nargs="+", default=DEFAULT_BOT_COUNTS, help="the population sizes to test")
+  parser.add_argument("--generations", type=int, default=DEFAULT_GENERATION_COUNT, help="the number of generations to run")
+  stand_in_server.add_population_arguments(parser)
+  return parser.parse_args(args)
+
+
+if __name__ == "__main__":
+  arguments = parse_arguments()
+  log_writer = RealLogWriter(__name__)
+  for bot_count in arguments.bots:
+    population_config = stand_in_server.create_population_config(arguments, bot_count)
+    seconds = run_load_test(
+      population_config, log_writer, arguments.generations, arguments.latency, arguments.lines_per_second
+    )
+    log_writer.info(
+      "%d bots: %s", bot_count, ", ".join(f"generation {index + 1} {value:.2f}s" for index, value in enumerate(seconds))
+    )
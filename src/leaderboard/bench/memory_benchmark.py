@@ -0,0 +1,96 @@
+"""Benchmark for the memory used by the leaderboard data.
+
+Reports the bytes per bot retained by a LeaderboardDataResult, both when it is generated from the online bots and when it is
+loaded back from the saved json (where the interned names are shared by a bot's profile and its rows).
+
+Usage: python -m src.leaderboard.bench.memory_benchmark
+"""
+
+import functools
+import json
+import tracemalloc
+from collections.abc import Callable
+
+from src.leaderboard.bench import synthetic_bots
+from src.leaderboard.data import data_generator
+from src.leaderboard.data.data_generator import LeaderboardDataResult
+from src.leaderboard.data.leaderboard_objects import BotProfile, LeaderboardRow
+from src.leaderboard.li.bot_user import BotUser
+from src.leaderboard.li.pert_type import PerfType
+from src.leaderboard.log.log_writer import LogWriter
+from src.leaderboard.log.real_log_writer import RealLogWriter
+
+
+# The number of bots in each run
+BOT_COUNTS = (10_000, 100_000)
+# The time of the generation, when the synthetic bots were seen
+CURRENT_TIME = synthetic_bots.SEEN_AT // 1000
+
+
+def generate_leaderboard_data(lines: list[str]) -> LeaderboardDataResult:
+  """Generate the leaderboard data of bots which are all being seen for the first time."""
+  bot_info = data_generator.create_bot_info(BotUser.from_json(line) for line in lines)
+  bot_columns = data_generator.BotColumns.create(bot_info.bot_profiles_by_name, CURRENT_TIME)
+  ranked_rows_by_perf_type = {
+    perf_type: data_generator.create_ranked_rows(
+      data_generator.merge_updates([], sorted(bot_perfs, key=lambda bot_perf: data_generator.name_sort_key(bot_perf.name))),
+      bot_columns,
+      CURRENT_TIME,
+    )
+    for perf_type, bot_perfs in bot_info.bot_perfs_by_perf_type.items()
+  }
+  return LeaderboardDataResult.create_result(bot_info.bot_profiles_by_name, ranked_rows_by_perf_type)
+
+
+def save_leaderboard_data(leaderboard_data: LeaderboardDataResult) -> tuple[str, dict[PerfType, str]]:
+  """Return the json of the bot profiles and of the rows of each perf type."""
+  bot_profiles_json = json.dumps([bot_profile.as_dict() for bot_profile in leaderboard_data.get_bot_profiles_sorted()])
+  rows_json_by_perf_type = {
+    perf_type: json.dumps([row.as_dict() for row in rows])
+    for perf_type, rows in leaderboard_data.get_ranked_rows_sorted().items()
+  }
+  return bot_profiles_json, rows_json_by_perf_type
+
+
+def load_leaderboard_data(bot_profiles_json: str, rows_json_by_perf_type: dict[PerfType, str]) -> LeaderboardDataResult:
+  """Load leaderboard data from the json of the bot profiles and of the rows of each perf type."""
+  bot_profiles = [BotProfile.from_dict(bot_profile_dict) for bot_profile_dict in json.loads(bot_profiles_json)]
+  ranked_rows_by_perf_type = {
+    perf_type: [LeaderboardRow.from_dict(row_dict) for row_dict in json.loads(rows_json)]
+    for perf_type, rows_json in rows_json_by_perf_type.items()
+  }
+  return LeaderboardDataResult.create_result(
+    {bot_profile.name: bot_profile for bot_profile in bot_profiles}, ranked_rows_by_perf_type
+  )
+
+
+def measure_retained_bytes(create: Callable[[], LeaderboardDataResult]) -> tuple[LeaderboardDataResult, int]:
+  """Return the created leaderboard data and the number of bytes it retains."""
+  tracemalloc.start()
+  leaderboard_data = create()
+  retained_bytes, _ = tracemalloc.get_traced_memory()
+  tracemalloc.stop()
+  return leaderboard_data, retained_bytes
+
+
+def run_benchmark(log_writer: LogWriter, bot_counts: tuple[int, ...] = BOT_COUNTS) -> None:
+  """Generate and load the leaderboard data of synthetic bots of each size and log the bytes retained per bot."""
+  for bot_count in bot_counts:
+    lines = synthetic_bots.create_online_bots_lines(bot_count)
+    generated_data, generated_bytes = measure_retained_bytes(functools.partial(generate_leaderboard_data, lines))
+    bot_profiles_json, rows_json_by_perf_type = save_leaderboard_data(generated_data)
+    loaded_data, loaded_bytes = measure_retained_bytes(
+      functools.partial(load_leaderboard_data, bot_profiles_json, rows_json_by_perf_type)
+    )
+    row_count = sum(len(rows) for rows in loaded_data.ranked_rows_by_perf_type.values())
+    log_writer.info(
+      "%7d bots (%.1f rows/bot): generated %.0f bytes/bot, loaded %.0f bytes/bot",
+      bot_count,
+      row_count / bot_count,
+      generated_bytes / bot_count,
+      loaded_bytes / bot_count,
+    )
+
+
+if __name__ == "__main__":
+  run_benchmark(RealLogWriter(__name__))
@@ -0,0 +1,81 @@
+"""Benchmark for parsing the ndjson returned by the lichess get online bots API.
+
+Compares the previous approach of decoding with the standard library and creating a Perf for every perf, to BotUser.from_json.
+
+Usage: python -m src.leaderboard.bench.parse_benchmark
+"""
+
+import json
+import time
+from collections.abc import Callable
+from typing import Any
+
+from src.leaderboard.bench import synthetic_bots
+from src.leaderboard.li import json_backend
+from src.leaderboard.li.bot_user import BotUser, Perf, create_perf_table_from_perfs
+from src.leaderboard.li.pert_type import PerfType
+from src.leaderboard.log.log_writer import LogWriter
+from src.leaderboard.log.real_log_writer import RealLogWriter
+
+
+# The number of lines of ndjson to parse in each run
+BOT_COUNTS = (10_000, 30_000, 100_000)
+
+
+def parse_perf(perf_type_key: str, perf_json: dict[str, Any]) -> Perf:
+  """Create a Perf from a json key and value, as was done for every perf before PerfTable."""
+  return Perf(
+    PerfType.from_json(perf_type_key),
+    perf_json.get("games", 0),
+    perf_json.get("rating", 0),
+    perf_json.get("rd", 0),
+    perf_json.get("prog", 0),
+    perf_json.get("prov", False),
+  )
+
+
+def parse_with_stdlib(json_str: str) -> BotUser:
+  """Parse a bot by decoding every field with the standard library and creating a Perf for every perf."""
+  json_dict: dict[str, Any] = json.loads(json_str)
+  perfs = [parse_perf(perf_type_key, perf_json) for perf_type_key, perf_json in json_dict.get("perfs", {}).items()]
+  profile_dict = json_dict.get("profile", {})
+  return BotUser(
+    json_dict.get("username", ""),
+    json_dict.get("flair", ""),
+    profile_dict.get("flag", ""),
+    json_dict.get("createdAt", 0) // 1000,
+    json_dict.get("seenAt", 0) // 1000,
+    json_dict.get("patron", False),
+    json_dict.get("tosViolation", False),
+    create_perf_table_from_perfs(perfs),
+  )
+
+
+def time_parse(parse: Callable[[str], BotUser], lines: list[str]) -> float:
+  """Return the number of seconds it takes to parse all of the lines."""
+  start_time = time.perf_counter()
+  for line in lines:
+    parse(line)
+  return time.perf_counter() - start_time
+
+
+def run_benchmark(log_writer: LogWriter, bot_counts: tuple[int, ...] = BOT_COUNTS) -> None:
+  """Parse synthetic online bots of each size and log the throughput of both parsers."""
+  log_writer.info("Parsing with BotUser.from_json using %s", json_backend.get_backend_name())
+  for bot_count in bot_counts:
+    lines = synthetic_bots.create_online_bots_lines(bot_count)
+    stdlib_seconds = time_parse(parse_with_stdlib, lines)
+    fast_seconds = time_parse(BotUser.from_json, lines)
+    log_writer.info(
+      "%7d bots: stdlib %.3fs (%.0f bots/s), from_json %.3fs (%.0f bots/s), speedup %.2fx",
+      bot_count,
+      stdlib_seconds,
+      bot_count / stdlib_seconds,
+      fast_seconds,
+      bot_count / fast_seconds,
+      stdlib_seconds / fast_seconds,
+    )
+
+
+if __name__ == "__main__":
+  run_benchmark(RealLogWriter(__name__))
@@ -0,0 +1,55 @@
+"""Benchmark for ranking the rows of a leaderboard.
+
+Compares data_generator.create_ranked_rows to the NumPy implementation in vectorized_ranking, and checks that they agree.
+
+Usage: python -m src.leaderboard.bench.ranking_benchmark
+"""
+
+import time
+
+from src.leaderboard.bench import synthetic_rows
+from src.leaderboard.data import data_generator, vectorized_ranking
+from src.leaderboard.data.data_generator import BotColumns, RankRows
+from src.leaderboard.data.leaderboard_objects import LeaderboardRow
+from src.leaderboard.data.leaderboard_update import LeaderboardUpdate
+from src.leaderboard.log.log_writer import LogWriter
+from src.leaderboard.log.real_log_writer import RealLogWriter
+
+
+# The number of rows to rank in each run
+ROW_COUNTS = (1_000, 10_000, 100_000)
+
+
+def time_ranking(
+  rank_rows: RankRows, updates: list[LeaderboardUpdate], bot_columns: BotColumns
+) -> tuple[list[LeaderboardRow], float]:
+  """Return the ranked rows and the number of seconds it took to rank them."""
+  start_time = time.perf_counter()
+  leaderboard_rows = rank_rows(updates, bot_columns, synthetic_rows.CURRENT_TIME)
+  return leaderboard_rows, time.perf_counter() - start_time
+
+
+def run_benchmark(log_writer: LogWriter, row_counts: tuple[int, ...] = ROW_COUNTS) -> None:
+  """Rank synthetic rows of each size with both engines and log the speedup."""
+  if not vectorized_ranking.is_available():
+    log_writer.info("numpy is not installed")
+    return
+  for row_count in row_counts:
+    updates, bot_profiles_by_name = synthetic_rows.create_ranking_inputs(row_count)
+    bot_columns = BotColumns.create(bot_profiles_by_name, synthetic_rows.CURRENT_TIME)
+    python_rows, python_seconds = time_ranking(data_generator.create_ranked_rows, updates, bot_columns)
+    numpy_rows, numpy_seconds = time_ranking(vectorized_ranking.create_ranked_rows, updates, bot_columns)
+    if numpy_rows != python_rows:
+      error_msg = f"The ranking engines disagree on {row_count} rows"
+      raise ValueError(error_msg)
+    log_writer.info(
+      "%7d rows: python %.3fs, numpy %.3fs, speedup %.2fx",
+      row_count,
+      python_seconds,
+      numpy_seconds,
+      python_seconds / numpy_seconds,
+    )
+
+
+if __name__ == "__main__":
+  run_benchmark(RealLogWriter(__name__))
@@ -0,0 +1,88 @@
+"""Benchmark for generating the leaderboards from recorded online bots.
+
+Record responses by running the generator (or poller) with `--record`, then replay them here to run many generations offline
+at full speed. The generated files are written to a temporary directory, so the working tree is left untouched.
+
+Usage: python -m src.leaderboard.bench.replay_benchmark [--generations N] [--recordings N] [--profile FILE]
+"""
+
+import argparse
+import cProfile
+import tempfile
+import time
+from collections.abc import Sequence
+from pathlib import Path
+
+from src.leaderboard.chrono.durations import ONE_HOUR
+from src.leaderboard.chrono.fixed_time_provider import FixedTimeProvider
+from src.leaderboard.chrono.real_time_provider import RealTimeProvider
+from src.leaderboard.fs.file_system import FileSystem
+from src.leaderboard.fs.real_file_system import RealFileSystem
+from src.leaderboard.li.replay_lichess_client import ReplayLichessClient
+from src.leaderboard.log.log_writer import LogWriter
+from src.leaderboard.log.real_log_writer import RealLogWriter
+from src.leaderboard.main.leaderboard_generator import LeaderboardGenerator
+
+
+# The default number of generations to run
+DEFAULT_GENERATION_COUNT = 10
+# The time between generations in production
+GENERATION_INTERVAL = 2 * ONE_HOUR
+
+
+def run_generations(
+  file_system: FileSystem, lichess_client: ReplayLichessClient, log_writer: LogWriter, generation_count: int, start_time: int
+) -> list[float]:
+  """Generate the leaderboards generation_count times and return the seconds each generation took."""
+  generation_seconds: list[float] = []
+  for generation in range(generation_count):
+    time_provider = FixedTimeProvider(start_time + generation * GENERATION_INTERVAL)
+    generation_start_time = time.perf_counter()
+    LeaderboardGenerator(file_system, lichess_client, time_provider, log_writer).generate_leaderboards()
+    generation_seconds.append(time.perf_counter() - generation_start_time)
+  return generation_seconds
+
+
+def run_benchmark(
+  lichess_client: ReplayLichessClient, log_writer: LogWriter, generation_count: int, profile_path: Path | None = None
+) -> None:
+  """Replay the recordings for generation_count generations in a temporary directory and log the timings."""
+  # Decompress every recording up front so that only generation is measured
+  for file_name in lichess_client.file_names:
+    lichess_client.load(file_name)
+  profiler = cProfile.Profile() if profile_path else None
+  with tempfile.TemporaryDirectory() as temp_dir:
+    file_system = RealFileSystem(Path(temp_dir))
+    if profiler:
+      profiler.enable()
+    generation_seconds = run_generations(
+      file_system, lichess_client, log_writer, generation_count, RealTimeProvider().get_current_time()
+    )
+    if profiler:
+      profiler.disable()
+  if profiler and profile_path:
+    profiler.dump_stats(profile_path)
+    log_writer.info("Wrote profile to %s", profile_path)
+  log_writer.info(
+    "%d generations of %d recordings: first %.3fs, mean %.3fs, min %.3fs",
+    generation_count,
+    len(lichess_client.file_names),
+    generation_seconds[0],
+    sum(generation_seconds) / len(generation_seconds),
+    min(generation_seconds),
+  )
+
+
+def parse_arguments(args: Sequence[str] | None = None) -> argparse.Namespace:
+  """Parse the command line arguments. If args is None, sys.argv is used."""
+  parser = argparse.ArgumentParser(prog="python -m src.leaderboard.bench.replay_benchmark", description=__doc__)
+  parser.add_argument("--generations", type=int, default=DEFAULT_GENERATION_COUNT, help="the number of generations to run")
+  parser.add_argument("--recordings", type=int, help="replay only the latest N recordings (default: all)")
+  parser.add_argument("--profile", type=Path, metavar="FILE", help="write cProfile stats to FILE")
+  return parser.parse_args(args)
+
+
+if __name__ == "__main__":
+  arguments = parse_arguments()
+  replay_client = ReplayLichessClient.from_recordings(RealFileSystem(), arguments.recordings)
+  run_benchmark(replay_client, RealLogWriter(__name__), arguments.generations, arguments.profile)
@@ -0,0 +1,88 @@
+"""Benchmark for converting leaderboard rows to and from json dicts.
+
+Compares dataclasses.asdict with default_remover and the hand written from_dict, which were used before, to the serializers
+generated from the fields of the dataclasses.
+
+Usage: python -m src.leaderboard.bench.serializer_benchmark
+"""
+
+import dataclasses
+import sys
+import time
+from collections.abc import Callable
+from typing import Any
+
+from src.leaderboard.bench import synthetic_rows
+from src.leaderboard.data import data_generator, default_remover
+from src.leaderboard.data.leaderboard_objects import LeaderboardPerf, LeaderboardRow, RankInfo
+from src.leaderboard.log.log_writer import LogWriter
+from src.leaderboard.log.real_log_writer import RealLogWriter
+
+
+# The number of rows to convert in each run
+ROW_COUNTS = (10_000, 50_000)
+
+
+def row_to_dict_with_asdict(row: LeaderboardRow) -> dict[str, Any]:
+  """Convert a row by copying it with dataclasses.asdict and then removing the defaults."""
+  return default_remover.to_dict_without_defaults(dataclasses.asdict(row))
+
+
+def row_from_dict_by_hand(json_dict: dict[str, Any]) -> LeaderboardRow:
+  """Create a row by reading every field of every nested json dict by hand."""
+  perf_dict: dict[str, Any] = json_dict.get("perf", {})
+  rank_info_dict: dict[str, Any] = json_dict.get("rank_info", {})
+  return LeaderboardRow(
+    sys.intern(json_dict.get("name", "")),
+    LeaderboardPerf(
+      perf_dict.get("rating", 0),
+      perf_dict.get("rd", 0),
+      perf_dict.get("prog", 0),
+      perf_dict.get("games", 0),
+      perf_dict.get("prov", False),
+    ),
+    RankInfo(
+      rank_info_dict.get("rank", 0),
+      rank_info_dict.get("delta_rank", 0),
+      rank_info_dict.get("delta_rating", 0),
+      rank_info_dict.get("delta_games", 0),
+      rank_info_dict.get("peak_rank", 0),
+      rank_info_dict.get("peak_rating", 0),
+      rank_info_dict.get("last_played", 0),
+    ),
+  )
+
+
+def time_conversion(convert: Callable[[Any], object], values: list[Any]) -> float:
+  """Return the number of seconds it takes to convert all of the values."""
+  start_time = time.perf_counter()
+  for value in values:
+    convert(value)
+  return time.perf_counter() - start_time
+
+
+def run_benchmark(log_writer: LogWriter, row_counts: tuple[int, ...] = ROW_COUNTS) -> None:
+  """Convert synthetic rows of each size to and from json dicts and log the throughput of both approaches."""
+  for row_count in row_counts:
+    updates, bot_profiles_by_name = synthetic_rows.create_ranking_inputs(row_count)
+    bot_columns = data_generator.BotColumns.create(bot_profiles_by_name, synthetic_rows.CURRENT_TIME)
+    rows = data_generator.create_ranked_rows(updates, bot_columns, synthetic_rows.CURRENT_TIME)
+    row_dicts = [row.as_dict() for row in rows]
+    for direction, previous_convert, generated_convert, values in (
+      ("to_dict", row_to_dict_with_asdict, LeaderboardRow.as_dict, rows),
+      ("from_dict", row_from_dict_by_hand, LeaderboardRow.from_dict, row_dicts),
+    ):
+      previous_seconds = time_conversion(previous_convert, values)
+      generated_seconds = time_conversion(generated_convert, values)
+      log_writer.info(
+        "%7d rows %-9s: previous %.0f rows/s, generated %.0f rows/s, speedup %.2fx",
+        row_count,
+        direction,
+        row_count / previous_seconds,
+        row_count / generated_seconds,
+        previous_seconds / generated_seconds,
+      )
+
+
+if __name__ == "__main__":
+  run_benchmark(RealLogWriter(__name__))
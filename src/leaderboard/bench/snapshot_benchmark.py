@@ -0,0 +1,85 @@
+"""Benchmark for loading the leaderboard state at the start of a generation.
+
+Saves the leaderboard data of synthetic bots both as the json files and as the binary snapshot in a temporary directory, and
+compares the time it takes to load the bot profiles and the rows of every perf type from each.
+
+Usage: python -m src.leaderboard.bench.snapshot_benchmark
+"""
+
+import tempfile
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+from src.leaderboard.bench import memory_benchmark, synthetic_bots
+from src.leaderboard.data import binary_snapshot, data_generator
+from src.leaderboard.data.json_leaderboard_store import JsonLeaderboardStore
+from src.leaderboard.data.leaderboard_objects import BotProfile, LeaderboardRow
+from src.leaderboard.fs.file_system import FileSystem
+from src.leaderboard.fs.real_file_system import RealFileSystem
+from src.leaderboard.li.pert_type import PerfType
+from src.leaderboard.log.log_writer import LogWriter
+from src.leaderboard.log.real_log_writer import RealLogWriter
+
+
+# The number of bots in each run
+BOT_COUNTS = (10_000, 100_000)
+
+LoadedData = tuple[dict[str, BotProfile], dict[PerfType, list[LeaderboardRow]]]
+
+
+def save_leaderboard_data(file_system: FileSystem, bot_count: int) -> None:
+  """Save the json files and the snapshot of the leaderboard data of bot_count synthetic bots."""
+  leaderboard_data = memory_benchmark.generate_leaderboard_data(synthetic_bots.create_online_bots_lines(bot_count))
+  bot_profiles = leaderboard_data.get_bot_profiles_sorted()
+  name_sorted_rows_by_perf_type = leaderboard_data.get_ranked_rows_sorted()
+  JsonLeaderboardStore(file_system).save(bot_profiles, name_sorted_rows_by_perf_type)
+  snapshot = binary_snapshot.serialize_snapshot(
+    binary_snapshot.digest_json_files(file_system), bot_profiles, name_sorted_rows_by_perf_type
+  )
+  binary_snapshot.save_snapshot(file_system, snapshot)
+
+
+def load_json(file_system: FileSystem) -> LoadedData:
+  """Load the leaderboard data from the json files."""
+  return data_generator.load_bot_profiles(file_system), data_generator.load_leaderboard_rows(file_system)
+
+
+def load_snapshot(file_system: FileSystem) -> LoadedData:
+  """Load the leaderboard data from the snapshot, including the time to check that it matches the json files."""
+  snapshot = binary_snapshot.load_snapshot(file_system)
+  if snapshot is None:
+    error_msg = "The snapshot is missing or stale"
+    raise ValueError(error_msg)
+  return snapshot.load_bot_profiles(), snapshot.load_leaderboard_rows()
+
+
+def time_load(load: Callable[[FileSystem], LoadedData], file_system: FileSystem) -> tuple[LoadedData, float]:
+  """Return the loaded leaderboard data and the number of seconds it took to load."""
+  start_time = time.perf_counter()
+  loaded_data = load(file_system)
+  return loaded_data, time.perf_counter() - start_time
+
+
+def run_benchmark(log_writer: LogWriter, bot_counts: tuple[int, ...] = BOT_COUNTS) -> None:
+  """Save the leaderboard data of synthetic bots of each size and log how long it takes to load from json and the snapshot."""
+  for bot_count in bot_counts:
+    with tempfile.TemporaryDirectory() as temp_dir:
+      file_system = RealFileSystem(Path(temp_dir))
+      save_leaderboard_data(file_system, bot_count)
+      json_data, json_seconds = time_load(load_json, file_system)
+      snapshot_data, snapshot_seconds = time_load(load_snapshot, file_system)
+      if snapshot_data != json_data:
+        error_msg = f"The snapshot of {bot_count} bots does not match the json files"
+        raise ValueError(error_msg)
+      log_writer.info(
+        "%7d bots: json %.3fs, snapshot %.3fs, speedup %.2fx",
+        bot_count,
+        json_seconds,
+        snapshot_seconds,
+        json_seconds / snapshot_seconds,
+      )
+
+
+if __name__ == "__main__":
+  run_benchmark(RealLogWriter(__name__))
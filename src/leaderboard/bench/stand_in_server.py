@@ -0,0 +1,156 @@
+"""A local stand-in for the lichess API which serves a synthetic bot population, for load testing.
+
+Serves `GET /api/bot/online` (streamed ndjson) and `POST /api/users`. Point the generator at it with `--base-url`.
+
+Usage: python -m src.leaderboard.bench.stand_in_server [--port PORT] [--bots N] [--churn FRACTION] ...
+"""
+
+import argparse
+import http.server
+import threading
+import time
+from collections.abc import Sequence
+from types import TracebackType
+
+from src.leaderboard.bench.synthetic_bots import PopulationConfig, SyntheticPopulation
+from src.leaderboard.chrono.real_time_provider import RealTimeProvider
+from src.leaderboard.li.async_lichess_client import USERS_PATH
+from src.leaderboard.li.real_lichess_client import ONLINE_BOTS_PATH
+from src.leaderboard.log.real_log_writer import RealLogWriter
+
+
+# The number of lines written to the stream at once
+LINES_PER_CHUNK = 100
+DEFAULT_PORT = 8000
+
+
+class StandInServer:
+  """Serves the online bots and users of a synthetic population.
+
+  Every request for the online bots returns the next snapshot of the population, so bots churn between calls. The online
+  bots are streamed after an initial latency, optionally limited to a number of lines per second. The number of bots
+  returned is not limited by the `nb` parameter, so populations far larger than lichess's can be served.
+  """
+
+  def __init__(
+    self,
+    population: SyntheticPopulation,
+    latency: float = 0.0,
+    lines_per_second: float | None = None,
+    host: str = "127.0.0.1",
+    port: int = 0,
+  ) -> None:
+    """Create the server. If port is 0, a free port is chosen."""
+    self.population = population
+    self.latency = latency
+    self.lines_per_second = lines_per_second
+    self.server = http.server.ThreadingHTTPServer((host, port), self.create_handler())
+    self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+  def __enter__(self) -> "StandInServer":
+    """Start serving requests in a background thread."""
+    self.thread.start()
+    return self
+
+  def __exit__(
+    self, exc_type: type[BaseException] | None, exc_value: BaseException | None, traceback: TracebackType | None
+  ) -> None:
+    """Stop serving requests."""
+    self.server.shutdown()
+    self.server.server_close()
+
+  @property
+  def base_url(self) -> str:
+    """Return the url to use instead of https://lichess.org."""
+    host, port = self.server.server_address[:2]
+    return f"http://{host!s}:{port}"
+
+  def create_handler(self) -> type[http.server.BaseHTTPRequestHandler]:
+    """Create a request handler class bound to this server."""
+    stand_in = self
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+      def do_GET(self) -> None:
+        """Stream the next snapshot of online bots for `GET /api/bot/online`."""
+        if self.path.partition("?")[0] != ONLINE_BOTS_PATH:
+          self.send_error(404)
+          return
+        lines = stand_in.population.take_snapshot()
+        time.sleep(stand_in.latency)
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        # Without a content length the body is read until the connection closes, like a stream
+        self.end_headers()
+        for start in range(0, len(lines), LINES_PER_CHUNK):
+          chunk = lines[start : start + LINES_PER_CHUNK]
+          self.wfile.write("".join(f"{line}\n" for line in chunk).encode())
+          self.wfile.flush()
+          if stand_in.lines_per_second:
+            time.sleep(len(chunk) / stand_in.lines_per_second)
+
+      def do_POST(self) -> None:
+        """Respond to `POST /api/users`."""
+        if self.path != USERS_PATH:
+          self.send_error(404)
+          return
+        content_length = int(self.headers.get("Content-Length", 0))
+        usernames = self.rfile.read(content_length).decode().split(",")
+        body = f"[{','.join(stand_in.population.lookup_users(usernames))}]".encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+      def log_message(self, format: str, *args: object) -> None:  # noqa: A002 - name required by BaseHTTPRequestHandler
+        """Do not log requests."""
+
+    return Handler
+
+
+def add_population_arguments(parser: argparse.ArgumentParser) -> None:
+  """Add the arguments which configure a synthetic population."""
+  defaults = PopulationConfig()
+  parser.add_argument("--perf-coverage", type=float, default=defaults.perf_coverage, help="chance a bot has played a perf")
+  parser.add_argument("--rating-mean", type=float, default=defaults.rating_mean, help="the mean rating")
+  parser.add_argument("--rating-stdev", type=float, default=defaults.rating_stdev, help="the rating standard deviation")
+  parser.add_argument("--provisional", type=float, default=defaults.provisional_fraction, help="fraction of provisional perfs")
+  parser.add_argument(
+    "--tos-violations", type=float, default=defaults.tos_violation_fraction, help="fraction of TOS violators"
+  )
+  parser.add_argument("--churn", type=float, default=defaults.churn, help="fraction of bots which change between calls")
+  parser.add_argument("--seed", type=int, default=defaults.seed, help="the random seed")
+  parser.add_argument("--latency", type=float, default=0.0, help="seconds to wait before responding")
+  parser.add_argument("--lines-per-second", type=float, help="limit the rate the online bots are streamed")
+
+
+def create_population_config(arguments: argparse.Namespace, bot_count: int) -> PopulationConfig:
+  """Create the population configuration from parsed arguments."""
+  return PopulationConfig(
+    bot_count,
+    arguments.perf_coverage,
+    arguments.rating_mean,
+    arguments.rating_stdev,
+    arguments.provisional,
+    arguments.tos_violations,
+    arguments.churn,
+    arguments.seed,
+  )
+
+
+def parse_arguments(args: Sequence[str] | None = None) -> argparse.Namespace:
+  """Parse the command line arguments. If args is None, sys.argv is used."""
+  parser = argparse.ArgumentParser(prog="python -m src.leaderboard.bench.stand_in_server", description=__doc__)
+  parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"the port to listen on (default: {DEFAULT_PORT})")
+  parser.add_argument("--bots", type=int, default=PopulationConfig().bot_count, help="the number of online bots")
+  add_population_arguments(parser)
+  return parser.parse_args(args)
+
+
+if __name__ == "__main__":
+  arguments = parse_arguments()
+  log_writer = RealLogWriter(__name__)
+  population = SyntheticPopulation(create_population_config(arguments, arguments.bots), RealTimeProvider())
+  stand_in_server = StandInServer(population, arguments.latency, arguments.lines_per_second, port=arguments.port)
+  log_writer.info("Serving %d synthetic bots at %s", arguments.bots, stand_in_server.base_url)
+  stand_in_server.server.serve_forever()
@@ -0,0 +1,157 @@
+"""Module containing functions for creating synthetic lichess bots.
+
+The bots resemble the responses of the lichess get online bots API, including perfs which are not on the leaderboards.
+"""
+
+import dataclasses
+import json
+import random
+import threading
+from typing import Any
+
+from src.leaderboard.chrono.time_provider import TimeProvider
+from src.leaderboard.li.pert_type import PerfType
+
+
+# The epoch millis of the earliest and latest creation times of the synthetic bots
+EARLIEST_CREATED_AT = 1_400_000_000_000
+LATEST_CREATED_AT = 1_700_000_000_000
+# The epoch millis that the synthetic bots were last seen
+SEEN_AT = 1_750_000_000_000
+# Lichess considers ratings with a deviation above 110 to be provisional
+PROVISIONAL_RD = 150
+
+
+@dataclasses.dataclass(frozen=True)
+class PopulationConfig:
+  """The shape of a synthetic bot population."""
+
+  # The number of bots online at once
+  bot_count: int = 1000
+  # The probability that a bot has played each perf type
+  perf_coverage: float = 0.5
+  # The mean and standard deviation of the normally distributed ratings
+  rating_mean: float = 1800.0
+  rating_stdev: float = 300.0
+  # The fraction of perfs which are provisional
+  provisional_fraction: float = 0.1
+  # The fraction of bots which have violated the terms of service
+  tos_violation_fraction: float = 0.01
+  # The fraction of online bots which go offline (replaced by new bots) and which play games between snapshots
+  churn: float = 0.1
+  # The random seed
+  seed: int = 0
+
+
+def create_perf_json_dict(rng: random.Random, config: PopulationConfig) -> dict[str, Any]:
+  """Create the lichess json of a random perf."""
+  provisional = rng.random() < config.provisional_fraction
+  perf_json: dict[str, Any] = {
+    "games": rng.randint(1, 10_000),
+    "rating": round(rng.gauss(config.rating_mean, config.rating_stdev)),
+    "rd": PROVISIONAL_RD if provisional else rng.randint(45, 110),
+    "prog": rng.randint(-50, 50),
+  }
+  if provisional:
+    perf_json["prov"] = True
+  return perf_json
+
+
+def create_bot_user_json_dict(
+  rng: random.Random, index: int, config: PopulationConfig | None = None, seen_at: int = SEEN_AT
+) -> dict[str, Any]:
+  """Create the lichess json of a bot with a random selection of perfs."""
+  config = config or PopulationConfig()
+  perfs: dict[str, Any] = {
+    perf_type.to_string(): create_perf_json_dict(rng, config)
+    for perf_type in PerfType.all_except_unknown()
+    if rng.random() < config.perf_coverage
+  }
+  # Perfs which are not on the leaderboards
+  perfs["puzzle"] = {"games": 0, "rating": 1500, "rd": 500, "prog": 0, "prov": True}
+  perfs["storm"] = {"runs": 0, "score": 0}
+  bot_json: dict[str, Any] = {
+    "id": f"synthetic-bot-{index}",
+    "username": f"Synthetic-Bot-{index}",
+    "perfs": perfs,
+    "flair": "activity.lichess-berserk",
+    "createdAt": rng.randint(EARLIEST_CREATED_AT, LATEST_CREATED_AT),
+    "seenAt": seen_at,
+    "profile": {"flag": "_earth", "bio": "A synthetic bot", "links": "https://github.com"},
+    "playTime": {"total": rng.randint(0, 10_000_000), "tv": 0},
+    "title": "BOT",
+  }
+  if rng.random() < config.tos_violation_fraction:
+    bot_json["tosViolation"] = True
+  return bot_json
+
+
+def create_online_bots_lines(bot_count: int, seed: int = 0) -> list[str]:
+  """Create bot_count lines of ndjson representing online bots."""
+  rng = random.Random(seed)  # noqa: S311 - reproducible, not cryptographic
+  return [json.dumps(create_bot_user_json_dict(rng, index)) for index in range(bot_count)]
+
+
+class SyntheticPopulation:
+  """A population of synthetic bots which changes between snapshots.
+
+  Every bot which has ever been online is remembered, so that offline bots can still be looked up. The ndjson of each bot is
+  cached until the bot changes, so snapshots of large populations are cheap.
+  """
+
+  def __init__(self, config: PopulationConfig, time_provider: TimeProvider) -> None:
+    """Create the initial online bots."""
+    self.config = config
+    self.time_provider = time_provider
+    self.rng = random.Random(config.seed)  # noqa: S311 - reproducible, not cryptographic
+    self.bots_by_id: dict[str, dict[str, Any]] = {}
+    self.lines_by_id: dict[str, str] = {}
+    self.next_index = 0
+    self.lock = threading.Lock()
+    self.online_ids = [self.create_bot() for _ in range(config.bot_count)]
+
+  def create_bot(self) -> str:
+    """Create a new bot and return its id."""
+    bot_json = create_bot_user_json_dict(self.rng, self.next_index, self.config, self.get_seen_at())
+    self.next_index += 1
+    self.bots_by_id[bot_json["id"]] = bot_json
+    return bot_json["id"]
+
+  def get_seen_at(self) -> int:
+    """Return the current time in epoch millis."""
+    return self.time_provider.get_current_time() * 1000
+
+  def play_games(self, bot_id: str) -> None:
+    """Update the rating of one of the bot's perfs as if it played some games."""
+    bot_json = self.bots_by_id[bot_id]
+    perf_json = next((perf_json for perf_json in bot_json["perfs"].values() if perf_json.get("games")), None)
+    if perf_json:
+      games_played = self.rng.randint(1, 10)
+      perf_json["games"] += games_played
+      perf_json["rating"] += self.rng.randint(-10, 10) * games_played
+    bot_json["seenAt"] = self.get_seen_at()
+    self.lines_by_id.pop(bot_id, None)
+
+  def get_line(self, bot_id: str) -> str:
+    """Return the ndjson of a bot."""
+    line = self.lines_by_id.get(bot_id)
+    if line is None:
+      line = json.dumps(self.bots_by_id[bot_id])
+      self.lines_by_id[bot_id] = line
+    return line
+
+  def take_snapshot(self) -> list[str]:
+    """Return the ndjson lines of the online bots, then apply churn for the next snapshot."""
+    with self.lock:
+      lines = [self.get_line(bot_id) for bot_id in self.online_ids]
+      churn_count = round(len(self.online_ids) * self.config.churn)
+      for position in self.rng.sample(range(len(self.online_ids)), churn_count):
+        self.online_ids[position] = self.create_bot()
+      for bot_id in self.rng.sample(self.online_ids, churn_count):
+        self.play_games(bot_id)
+      return lines
+
+  def lookup_users(self, usernames: list[str]) -> list[str]:
+    """Return the json of the bots with the given usernames which exist."""
+    with self.lock:
+      return [self.get_line(name.lower()) for name in usernames if name.lower() in self.bots_by_id]
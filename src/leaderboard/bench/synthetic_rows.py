@@ -0,0 +1,47 @@
+"""Module containing functions for creating synthetic leaderboard updates.
+
+The updates are chosen to exercise every tie break and eligibility rule of ranking: tied ratings, rds and creation times,
+names which differ only by case, ratings of 0, provisional ratings, TOS violations, and bots which have not been seen or
+have not played recently.
+"""
+
+import random
+
+from src.leaderboard.chrono.durations import ONE_DAY, TWO_WEEKS
+from src.leaderboard.data.leaderboard_objects import BotPerf, BotProfile, LeaderboardPerf, LeaderboardRow, RankInfo
+from src.leaderboard.data.leaderboard_update import LeaderboardUpdate
+
+
+# The time the synthetic leaderboards are generated (seconds since epoch)
+CURRENT_TIME = 1_750_000_000
+
+
+def create_ranking_inputs(
+  count: int, seed: int = 0, current_time: int = CURRENT_TIME
+) -> tuple[list[LeaderboardUpdate], dict[str, BotProfile]]:
+  """Create count updates for one perf type and the profiles of their bots."""
+  rng = random.Random(seed)  # noqa: S311 - reproducible, not cryptographic
+  updates: list[LeaderboardUpdate] = []
+  bot_profiles_by_name: dict[str, BotProfile] = {}
+  for index in range(count):
+    # Some names only differ from the previous bot's name by case
+    name = f"BOT-{index - 1}" if index and index % 37 == 0 else f"Bot-{index}"
+    last_seen = current_time - rng.randint(0, TWO_WEEKS + 7 * ONE_DAY)
+    created = rng.choice(range(0, 50 * ONE_DAY, ONE_DAY))
+    tos_violation = rng.random() < 0.02  # noqa: PLR2004 - a few bots
+    bot_profiles_by_name[name] = BotProfile(name, "", "", created, last_seen, False, tos_violation, False, True)
+
+    rating = 0 if rng.random() < 0.02 else rng.randint(1500, 1600)  # noqa: PLR2004 - a few bots
+    prov = rng.random() < 0.1  # noqa: PLR2004 - some bots
+    perf = LeaderboardPerf(rating, rng.randint(45, 60), 0, rng.randint(1, 5000), prov)
+    previous_rank = rng.randint(0, count)
+    last_played = current_time - rng.randint(0, TWO_WEEKS + 7 * ONE_DAY)
+    previous_rank_info = RankInfo(previous_rank, 0, 0, 0, previous_rank, rating, last_played)
+    previous_row = LeaderboardRow(
+      name, LeaderboardPerf(rating - rng.randint(-20, 20), perf.rd, 0, perf.games, prov), previous_rank_info
+    )
+    kind = rng.randrange(3)
+    updates.append(
+      LeaderboardUpdate.create_update(previous_row if kind != 1 else None, BotPerf(name, perf) if kind != 0 else None)
+    )
+  return updates, bot_profiles_by_name
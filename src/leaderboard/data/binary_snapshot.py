@@ -0,0 +1,222 @@
+"""A compact binary snapshot of the leaderboard state, which is faster to load than the json files.
+
+The snapshot is saved next to the leaderboard data after every generation, stamped with a digest of the generation number and
+the sizes of the json files it was built from, and is only loaded while that digest is unchanged, so the json files remain the
+source of truth when they are edited, restored or pulled without a new generation. The digest only needs the size of each
+file, not its contents. The modification times are left out, because a checkout of the leaderboard data resets them.
+The snapshot is made of:
+- a header with the magic bytes, the version, the digest of the json files and the counts of what follows
+- a string table with the end offset of each string and then the utf-8 bytes of the strings
+- a fixed-width record for each bot profile, with its name, flair and flag as indexes into the string table
+- a directory with the string index of each perf type and its number of rows
+- a fixed-width record for each row, grouped by perf type in the order of the directory
+
+The snapshot is mapped into memory rather than read, and the strings, the bot profiles and the rows of each perf type are
+only decoded when they are first needed.
+"""
+
+import hashlib
+import itertools
+import struct
+import sys
+from collections.abc import Callable
+
+from src.leaderboard.data.leaderboard_objects import BotProfile, LeaderboardPerf, LeaderboardRow, RankInfo
+from src.leaderboard.fs import file_paths
+from src.leaderboard.fs.file_system import FileSystem
+from src.leaderboard.li.pert_type import PerfType
+
+
+MAGIC = b"LBSNAPSH"
+# The version of the format, which is increased whenever the format changes
+VERSION = 3
+# The number of bytes in the digest of the json files
+DIGEST_SIZE = 16
+# The magic bytes, version, digest of the json files, string count, bot profile count and perf type count
+HEADER = struct.Struct(f"<8sI{DIGEST_SIZE}sIII")
+# The end offset of one string in the string table
+STRING_OFFSET = struct.Struct("<I")
+# The string indexes of the name, flair and flag, then created, last_seen, patron and tos_violation
+BOT_PROFILE_RECORD = struct.Struct("<IIIqqBB")
+# The string index of the perf type and its row count
+PERF_TYPE_RECORD = struct.Struct("<II")
+# The string index of the name, then the perf fields and the rank info fields
+ROW_RECORD = struct.Struct("<IiiiiBiiiiiiq")
+
+
+def load_generation_number(file_system: FileSystem) -> int:
+  """Return the number of times the leaderboards have been generated."""
+  value_str = file_system.read_file(file_paths.generation_number_path())
+  return int(value_str) if value_str else 0
+
+
+def digest_json_files(file_system: FileSystem) -> bytes:
+  """Return a digest of the generation number and the sizes of the bot profiles file and the data file of every perf type."""
+  digest = hashlib.blake2b(digest_size=DIGEST_SIZE)
+  digest.update(load_generation_number(file_system).to_bytes(8, "little"))
+  for file_name in (file_paths.bot_profiles_path(), *map(file_paths.data_path, PerfType.all_except_unknown())):
+    # A missing file has size -1, so that it differs from an empty file
+    size = file_system.get_size(file_name)
+    digest.update((-1 if size is None else size).to_bytes(8, "little", signed=True))
+  return digest.digest()
+
+
+def serialize_snapshot(
+  json_digest: bytes,
+  name_sorted_bot_profiles: list[BotProfile],
+  name_sorted_rows_by_perf_type: dict[PerfType, list[LeaderboardRow]],
+) -> bytes:
+  """Return the snapshot of the bot profiles and rows, which are already sorted by name, stamped with the json digest."""
+  index_by_string: dict[str, int] = {}
+
+  def get_index(string: str) -> int:
+    return index_by_string.setdefault(string, len(index_by_string))
+
+  bot_profile_records = b"".join(
+    BOT_PROFILE_RECORD.pack(
+      get_index(bot_profile.name),
+      get_index(bot_profile.flair),
+      get_index(bot_profile.flag),
+      bot_profile.created,
+      bot_profile.last_seen,
+      bot_profile.patron,
+      bot_profile.tos_violation,
+    )
+    for bot_profile in name_sorted_bot_profiles
+  )
+  perf_type_records = b"".join(
+    PERF_TYPE_RECORD.pack(get_index(perf_type.to_string()), len(rows))
+    for perf_type, rows in name_sorted_rows_by_perf_type.items()
+  )
+  row_records = b"".join(
+    ROW_RECORD.pack(
+      get_index(row.name),
+      row.perf.rating,
+      row.perf.rd,
+      row.perf.prog,
+      row.perf.games,
+      row.perf.prov,
+      row.rank_info.rank,
+      row.rank_info.delta_rank,
+      row.rank_info.delta_rating,
+      row.rank_info.delta_games,
+      row.rank_info.peak_rank,
+      row.rank_info.peak_rating,
+      row.rank_info.last_played,
+    )
+    for rows in name_sorted_rows_by_perf_type.values()
+    for row in rows
+  )
+  encoded_strings = [string.encode() for string in index_by_string]
+  header = HEADER.pack(
+    MAGIC, VERSION, json_digest, len(encoded_strings), len(name_sorted_bot_profiles), len(name_sorted_rows_by_perf_type)
+  )
+  string_offsets = b"".join(
+    STRING_OFFSET.pack(offset) for offset in itertools.accumulate(len(encoded_string) for encoded_string in encoded_strings)
+  )
+  return b"".join((header, string_offsets, *encoded_strings, bot_profile_records, perf_type_records, row_records))
+
+
+class LeaderboardSnapshot:
+  """A snapshot of the leaderboard state which is decoded from a buffer as it is needed."""
+
+  def __init__(self, buffer: memoryview) -> None:
+    """Read the header, string offsets and directory of a snapshot. Raise a ValueError if the snapshot is not valid."""
+    if len(buffer) < HEADER.size:
+      error_msg = f"Snapshot of {len(buffer)} bytes is too short"
+      raise ValueError(error_msg)
+    magic, version, json_digest, string_count, bot_profile_count, perf_type_count = HEADER.unpack_from(buffer)
+    if magic != MAGIC or version != VERSION:
+      error_msg = f"Snapshot has magic {magic!r} and version {version}, expected {MAGIC!r} and version {VERSION}"
+      raise ValueError(error_msg)
+    self.buffer = buffer
+    self.json_digest: bytes = json_digest
+    # The offsets of the strings in the buffer, the start of string i is at index i and its end at index i + 1
+    strings_offset = HEADER.size + string_count * STRING_OFFSET.size
+    self.string_offsets = [strings_offset] + [
+      strings_offset + end for (end,) in STRING_OFFSET.iter_unpack(buffer[HEADER.size : strings_offset])
+    ]
+    self.strings: list[str | None] = [None] * string_count
+    # The bot profile records follow the strings
+    self.bot_profiles_offset = self.string_offsets[-1]
+    self.bot_profile_count: int = bot_profile_count
+    # The start offset and row count of each perf type's rows, which follow the directory
+    directory_offset = self.bot_profiles_offset + bot_profile_count * BOT_PROFILE_RECORD.size
+    rows_offset = directory_offset + perf_type_count * PERF_TYPE_RECORD.size
+    self.rows_offset_and_count_by_perf_type: dict[PerfType, tuple[int, int]] = {}
+    for perf_type_index, row_count in PERF_TYPE_RECORD.iter_unpack(buffer[directory_offset:rows_offset]):
+      self.rows_offset_and_count_by_perf_type[PerfType.from_json(self.get_string(perf_type_index))] = (rows_offset, row_count)
+      rows_offset += row_count * ROW_RECORD.size
+    if rows_offset != len(buffer):
+      error_msg = f"Snapshot of {len(buffer)} bytes should have {rows_offset} bytes"
+      raise ValueError(error_msg)
+
+  def get_string(self, index: int) -> str:
+    """Return the string at an index of the string table, decoding and interning it the first time."""
+    string = self.strings[index]
+    if string is None:
+      string = sys.intern(str(self.buffer[self.string_offsets[index] : self.string_offsets[index + 1]], "utf-8"))
+      self.strings[index] = string
+    return string
+
+  def load_bot_profiles(self) -> dict[str, BotProfile]:
+    """Decode the bot profiles. As with BotProfile.from_dict, the bots are not new and are offline."""
+    get_string: Callable[[int], str] = self.get_string
+    end_offset = self.bot_profiles_offset + self.bot_profile_count * BOT_PROFILE_RECORD.size
+    bot_profiles = [
+      BotProfile(
+        get_string(name), get_string(flair), get_string(flag), created, last_seen, bool(patron), bool(tos), False, False
+      )
+      for name, flair, flag, created, last_seen, patron, tos in BOT_PROFILE_RECORD.iter_unpack(
+        self.buffer[self.bot_profiles_offset : end_offset]
+      )
+    ]
+    return {bot_profile.name: bot_profile for bot_profile in bot_profiles}
+
+  def load_rows(self, perf_type: PerfType) -> list[LeaderboardRow]:
+    """Decode the rows of a perf type, sorted by name."""
+    rows_offset, row_count = self.rows_offset_and_count_by_perf_type.get(perf_type, (0, 0))
+    get_string: Callable[[int], str] = self.get_string
+    return [
+      LeaderboardRow(
+        get_string(name),
+        LeaderboardPerf(rating, rd, prog, games, bool(prov)),
+        RankInfo(rank, delta_rank, delta_rating, delta_games, peak_rank, peak_rating, last_played),
+      )
+      for (
+        name,
+        rating,
+        rd,
+        prog,
+        games,
+        prov,
+        rank,
+        delta_rank,
+        delta_rating,
+        delta_games,
+        peak_rank,
+        peak_rating,
+        last_played,
+      ) in ROW_RECORD.iter_unpack(self.buffer[rows_offset : rows_offset + row_count * ROW_RECORD.size])
+    ]
+
+  def load_leaderboard_rows(self) -> dict[PerfType, list[LeaderboardRow]]:
+    """Decode the rows of every perf type, sorted by name."""
+    return {perf_type: self.load_rows(perf_type) for perf_type in PerfType.all_except_unknown()}
+
+
+def save_snapshot(file_system: FileSystem, snapshot: bytes) -> None:
+  """Save a snapshot next to the leaderboard data."""
+  file_system.write_bytes(file_paths.snapshot_path(), snapshot)
+
+
+def load_snapshot(file_system: FileSystem) -> LeaderboardSnapshot | None:
+  """Map the saved snapshot, or return None if it is missing, not valid, or the json files have changed since."""
+  buffer = file_system.map_bytes(file_paths.snapshot_path())
+  if buffer is None:
+    return None
+  try:
+    snapshot = LeaderboardSnapshot(buffer)
+  except (ValueError, struct.error):
+    return None
+  return snapshot if snapshot.json_digest == digest_json_files(file_system) else None
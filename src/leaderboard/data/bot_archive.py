@@ -0,0 +1,88 @@
+"""An archive of the bots which have not been eligible for a long time, kept out of the leaderboard data.
+
+Without it, every bot which has ever been seen is loaded, merged, ranked and saved in every generation, long after it stopped
+appearing on the leaderboards. A bot is stale once it has not been seen for longer than the archive horizon after its profile
+stopped being eligible, at which point its rows are all unranked. The profiles and rows of the stale bots are moved to
+leaderboard_data/bot_archive.json.gz, and a bot is restored from it with its peaks and creation time when it is seen again.
+"""
+
+import json
+from collections.abc import Collection
+
+from src.leaderboard.chrono.durations import TWO_WEEKS
+from src.leaderboard.data.leaderboard_objects import BotProfile, LeaderboardRow
+from src.leaderboard.fs import compression, file_paths
+from src.leaderboard.fs.file_system import FileSystem
+from src.leaderboard.li.pert_type import PerfType
+
+
+def is_stale(bot_profile: BotProfile, current_time: int, archive_after: int) -> bool:
+  """Return whether a bot's profile has not been eligible for more than archive_after seconds because it was not seen."""
+  return current_time - bot_profile.last_seen > TWO_WEEKS + archive_after
+
+
+class BotArchive:
+  """The profiles and rows of the archived bots."""
+
+  def __init__(
+    self,
+    bot_profiles_by_name: dict[str, BotProfile] | None = None,
+    rows_by_perf_type: dict[PerfType, dict[str, LeaderboardRow]] | None = None,
+  ) -> None:
+    """Initialize an archive, which is empty by default."""
+    self.bot_profiles_by_name = bot_profiles_by_name or {}
+    # The rows of each perf type by name
+    self.rows_by_perf_type = rows_by_perf_type or {}
+
+  @classmethod
+  def deserialize(cls, contents: bytes) -> "BotArchive":
+    """Read a serialized archive."""
+    archive_json = json.loads(compression.decompress(contents))
+    bot_profiles = [BotProfile.from_dict(profile_dict) for profile_dict in archive_json["bot_profiles"]]
+    rows_by_perf_type = {
+      PerfType.from_json(perf_type_str): {row.name: row for row in map(LeaderboardRow.from_dict, row_dicts)}
+      for perf_type_str, row_dicts in archive_json["rows"].items()
+    }
+    return BotArchive({bot_profile.name: bot_profile for bot_profile in bot_profiles}, rows_by_perf_type)
+
+  def serialize(self) -> bytes:
+    """Return the compressed json of the archive, with the profiles and rows sorted by name."""
+    archive_json = {
+      "bot_profiles": [self.bot_profiles_by_name[name].as_dict() for name in sorted(self.bot_profiles_by_name)],
+      "rows": {
+        perf_type.to_string(): [rows[name].as_dict() for name in sorted(rows)]
+        for perf_type, rows in self.rows_by_perf_type.items()
+        if rows
+      },
+    }
+    return compression.compress(json.dumps(archive_json, separators=(",", ":")).encode())
+
+  def add(self, bot_profiles: list[BotProfile], rows_by_perf_type: dict[PerfType, list[LeaderboardRow]]) -> None:
+    """Add the profiles and rows of bots to the archive."""
+    for bot_profile in bot_profiles:
+      self.bot_profiles_by_name[bot_profile.name] = bot_profile
+    for perf_type, rows in rows_by_perf_type.items():
+      archived_rows = self.rows_by_perf_type.setdefault(perf_type, {})
+      for row in rows:
+        archived_rows[row.name] = row
+
+  def restore(self, names: Collection[str]) -> tuple[dict[str, BotProfile], dict[PerfType, list[LeaderboardRow]]]:
+    """Remove the bots with the names which are in the archive from it, and return their profiles and rows."""
+    bot_profiles_by_name = {name: self.bot_profiles_by_name.pop(name) for name in names if name in self.bot_profiles_by_name}
+    rows_by_perf_type: dict[PerfType, list[LeaderboardRow]] = {}
+    for perf_type, archived_rows in self.rows_by_perf_type.items():
+      rows = [archived_rows.pop(name) for name in bot_profiles_by_name if name in archived_rows]
+      if rows:
+        rows_by_perf_type[perf_type] = rows
+    return bot_profiles_by_name, rows_by_perf_type
+
+
+def load_bot_archive(file_system: FileSystem) -> BotArchive:
+  """Load the archive, which is empty if there is no archive file."""
+  contents = file_system.read_bytes(file_paths.bot_archive_path())
+  return BotArchive.deserialize(contents) if contents else BotArchive()
+
+
+def save_bot_archive(file_system: FileSystem, bot_archive: BotArchive) -> None:
+  """Save the archive."""
+  file_system.write_bytes(file_paths.bot_archive_path(), bot_archive.serialize())
@@ -0,0 +1,60 @@
+"""A persistent registry which assigns each bot a dense integer id the first time it is seen.
+
+The names are stored in leaderboard_data/bot_ids.txt next to bot_profiles.json, one per line, and the id of a bot is the index
+of its line. An id is never reassigned, so the data which is stored by id (such as the rating history) stays valid, and new
+names are only ever appended to the file.
+"""
+
+import sys
+from collections.abc import Iterable
+
+from src.leaderboard.fs import file_paths
+from src.leaderboard.fs.file_system import FileSystem
+
+
+class BotRegistry:
+  """The ids of the bots, stored in a file system."""
+
+  def __init__(self, file_system: FileSystem) -> None:
+    """Initialize a registry which reads and writes the files of a file system. Nothing is read until it is needed."""
+    self.file_system = file_system
+    self.names: list[str] | None = None
+    self.id_by_name: dict[str, int] = {}
+
+  def get_names(self) -> list[str]:
+    """Return the name of each bot, indexed by id."""
+    if self.names is None:
+      names_bytes = self.file_system.read_bytes(file_paths.bot_ids_path())
+      self.names = [sys.intern(name) for name in names_bytes.decode().splitlines()] if names_bytes else []
+      self.id_by_name = {name: bot_id for bot_id, name in enumerate(self.names)}
+    return self.names
+
+  def get_id_by_name(self) -> dict[str, int]:
+    """Return the id of each bot by name."""
+    self.get_names()
+    return self.id_by_name
+
+  def get_id(self, name: str) -> int | None:
+    """Return the id of a bot, or None if it has not been registered."""
+    return self.get_id_by_name().get(name)
+
+  def get_name(self, bot_id: int) -> str:
+    """Return the name of the bot with an id."""
+    return self.get_names()[bot_id]
+
+  def register(self, names: Iterable[str]) -> list[int]:
+    """Return the id of each name, assigning the next ids to the names which have not been seen before and saving them."""
+    bot_names = self.get_names()
+    id_by_name = self.id_by_name
+    new_names: list[str] = []
+    bot_ids: list[int] = []
+    for name in names:
+      bot_id = id_by_name.get(name)
+      if bot_id is None:
+        bot_id = id_by_name[name] = len(bot_names)
+        bot_names.append(name)
+        new_names.append(name)
+      bot_ids.append(bot_id)
+    if new_names:
+      self.file_system.append_bytes(file_paths.bot_ids_path(), "".join(f"{name}\n" for name in new_names).encode())
+    return bot_ids
@@ -3,16 +3,24 @@
 import dataclasses
 import json
 from collections import defaultdict
+from collections.abc import Callable, Collection, Iterable
 from typing import Any
 
 from src.leaderboard.chrono.time_provider import TimeProvider
+from src.leaderboard.data.binary_snapshot import load_snapshot
+from src.leaderboard.data.bot_archive import BotArchive, load_bot_archive
+from src.leaderboard.data.bot_registry import BotRegistry
+from src.leaderboard.data.eligibility_expiry import EligibilityExpiry, load_eligibility_expiry
 from src.leaderboard.data.leaderboard_objects import BotPerf, BotProfile, LeaderboardPerf, LeaderboardRow
+from src.leaderboard.data.leaderboard_store import LeaderboardStore
 from src.leaderboard.data.leaderboard_update import LeaderboardUpdate
+from src.leaderboard.data.sightings_buffer import SightingsBuffer, load_sightings_buffer
 from src.leaderboard.fs import file_paths
 from src.leaderboard.fs.file_system import FileSystem
 from src.leaderboard.li.bot_user import BotUser
 from src.leaderboard.li.lichess_client import LichessClient
 from src.leaderboard.li.pert_type import PerfType
+from src.leaderboard.li.users_client import UsersClient
 
 
 def load_json_list(file_system: FileSystem, file_name: str) -> list[dict[str, Any]]:
@@ -29,11 +37,17 @@ def load_bot_profiles(file_system: FileSystem) -> dict[str, BotProfile]:
 
 
 def load_leaderboard_rows(file_system: FileSystem) -> dict[PerfType, list[LeaderboardRow]]:
-  """Load the previous leaderboard rows and return lists of leaderboard rows grouped by perf type."""
+  """Load the previous leaderboard rows and return lists of leaderboard rows grouped by perf type.
+
+  The rows are saved sorted by name, and are only sorted again if the file was not.
+  """
   previous_rows_by_perf_type: dict[PerfType, list[LeaderboardRow]] = {}
   for perf_type in PerfType.all_except_unknown():
     row_json_list = load_json_list(file_system, file_paths.data_path(perf_type))
-    previous_rows_by_perf_type[perf_type] = [LeaderboardRow.from_dict(row_dict) for row_dict in row_json_list]
+    rows = [LeaderboardRow.from_dict(row_dict) for row_dict in row_json_list]
+    if not is_sorted_by_name(row.name for row in rows):
+      rows.sort(key=lambda row: name_sort_key(row.name))
+    previous_rows_by_perf_type[perf_type] = rows
   return previous_rows_by_perf_type
 
 
@@ -48,48 +62,260 @@ class BotInfoResult:
   bot_perfs_by_perf_type: dict[PerfType, list[BotPerf]]
 
 
-def get_online_bot_info(lichess_client: LichessClient) -> BotInfoResult:
-  """Load all of the current online bots and return the information used to generate the leaderboard."""
+def remove_bots(bot_info: BotInfoResult, names: Collection[str]) -> BotInfoResult:
+  """Return the bot info without the profiles and perfs of the bots with the names."""
+  return BotInfoResult(
+    {name: bot_profile for name, bot_profile in bot_info.bot_profiles_by_name.items() if name not in names},
+    {
+      perf_type: [bot_perf for bot_perf in bot_perfs if bot_perf.name not in names]
+      for perf_type, bot_perfs in bot_info.bot_perfs_by_perf_type.items()
+    },
+  )
+
+
+def restore_archived_bots(
+  bot_archive: BotArchive,
+  names: Collection[str],
+  bot_profiles_by_name: dict[str, BotProfile],
+  previous_rows_by_perf_type: dict[PerfType, list[LeaderboardRow]],
+) -> tuple[dict[str, BotProfile], dict[PerfType, list[LeaderboardRow]]]:
+  """Return the bot profiles and previous rows with the bots with the names restored from the archive, sorted by name."""
+  restored_profiles_by_name, restored_rows_by_perf_type = bot_archive.restore(names)
+  rows_by_perf_type = dict(previous_rows_by_perf_type)
+  for perf_type, restored_rows in restored_rows_by_perf_type.items():
+    rows_by_perf_type[perf_type] = sorted(
+      rows_by_perf_type.get(perf_type, []) + restored_rows, key=lambda row: name_sort_key(row.name)
+    )
+  return bot_profiles_by_name | restored_profiles_by_name, rows_by_perf_type
+
+
+def select_perf_types(perf_types: Collection[PerfType] | None) -> list[PerfType]:
+  """Return the perf types in perf_types in order, or all of them if it is None."""
+  return [perf_type for perf_type in PerfType.all_except_unknown() if perf_types is None or perf_type in perf_types]
+
+
+def create_bot_info(
+  bot_users: Iterable[BotUser], online: bool = True, perf_types: Collection[PerfType] | None = None
+) -> BotInfoResult:
+  """Group the bots' perfs by perf type and create profiles for the bots which have played games.
+
+  If perf_types is given, only the perfs of those perf types are included.
+  """
   bot_profiles_by_name: dict[str, BotProfile] = {}
   bot_perfs_by_perf_type: dict[PerfType, list[BotPerf]] = defaultdict(list)
-  for bot_json in lichess_client.get_online_bots().splitlines():
-    bot_user = BotUser.from_json(bot_json)
+  for bot_user in bot_users:
     has_played_games = False
-    for perf in bot_user.perfs:
-      if perf.games:
+    perf_table = bot_user.perf_table
+    for perf_type in perf_table.get_perf_types():
+      if perf_table.get_games(perf_type) and (perf_types is None or perf_type in perf_types):
         has_played_games = True
-        bot_perf = BotPerf(bot_user.username, LeaderboardPerf.from_perf(perf))
-        bot_perfs_by_perf_type[perf.perf_type].append(bot_perf)
+        bot_perf = BotPerf(bot_user.username, LeaderboardPerf.from_perf_table(perf_table, perf_type))
+        bot_perfs_by_perf_type[perf_type].append(bot_perf)
     if has_played_games:
-      bot_profiles_by_name[bot_user.username] = BotProfile.from_bot_user(bot_user)
+      bot_profiles_by_name[bot_user.username] = BotProfile.from_bot_user(bot_user, online)
+  return BotInfoResult(bot_profiles_by_name, bot_perfs_by_perf_type)
+
+
+def combine_bot_info(bot_info: BotInfoResult, overriding_bot_info: BotInfoResult) -> BotInfoResult:
+  """Combine the information of two groups of bots. Bots which are in both groups are taken from overriding_bot_info."""
+  overridden_names = overriding_bot_info.bot_profiles_by_name.keys()
+  bot_perfs_by_perf_type: dict[PerfType, list[BotPerf]] = defaultdict(list)
+  for perf_type, bot_perfs in bot_info.bot_perfs_by_perf_type.items():
+    bot_perfs_by_perf_type[perf_type].extend(bot_perf for bot_perf in bot_perfs if bot_perf.name not in overridden_names)
+  for perf_type, bot_perfs in overriding_bot_info.bot_perfs_by_perf_type.items():
+    bot_perfs_by_perf_type[perf_type].extend(bot_perfs)
+  bot_profiles_by_name = bot_info.bot_profiles_by_name | overriding_bot_info.bot_profiles_by_name
   return BotInfoResult(bot_profiles_by_name, bot_perfs_by_perf_type)
 
 
+def get_online_bot_info(lichess_client: LichessClient, perf_types: Collection[PerfType] | None = None) -> BotInfoResult:
+  """Load all of the current online bots and return the information used to generate the leaderboard.
+
+  Each bot is parsed and bucketed as soon as its line of ndjson arrives, so the whole response is never held in memory. If
+  perf_types is given, the perfs of the other perf types are left out.
+  """
+  return create_bot_info(lichess_client.iter_online_bot_users(perf_types), True, perf_types)
+
+
+def get_sighted_bot_info(
+  sightings_buffer: SightingsBuffer,
+  online_profiles_by_name: dict[str, BotProfile],
+  perf_types: Collection[PerfType] | None = None,
+) -> BotInfoResult:
+  """Return the information of the bots which were seen online since the last generation but which are not online now."""
+  return create_bot_info(
+    (bot_user for bot_user in sightings_buffer.get_bot_users() if bot_user.username not in online_profiles_by_name),
+    False,
+    perf_types,
+  )
+
+
+def get_offline_bot_info(
+  users_client: UsersClient,
+  previous_profiles_by_name: dict[str, BotProfile],
+  online_profiles_by_name: dict[str, BotProfile],
+  perf_types: Collection[PerfType] | None = None,
+) -> BotInfoResult:
+  """Look up the previously seen bots which are not currently online and return their up to date information.
+
+  The bots which could not be looked up are left out, so that they keep their stored profiles and rows.
+  """
+  offline_names = sorted(previous_profiles_by_name.keys() - online_profiles_by_name.keys(), key=name_sort_key)
+  return create_bot_info(users_client.get_users(offline_names), False, perf_types)
+
+
 def merge_bot_profiles(
-  previous_profiles_by_name: dict[str, BotProfile], current_profiles_by_name: dict[str, BotProfile]
+  previous_profiles_by_name: dict[str, BotProfile],
+  current_profiles_by_name: dict[str, BotProfile],
+  refreshed_profiles_by_name: dict[str, BotProfile] | None = None,
 ) -> dict[str, BotProfile]:
-  """Merge and update the previous and current bot profiles."""
+  """Merge and update the previous and current bot profiles.
+
+  Refreshed profiles (of bots which are not currently online) replace previous profiles.
+  """
+  refreshed_profiles_by_name = refreshed_profiles_by_name or {}
   merged_profiles_by_name: dict[str, BotProfile] = {}
-  for name in previous_profiles_by_name.keys() | current_profiles_by_name.keys():
+  for name in previous_profiles_by_name.keys() | current_profiles_by_name.keys() | refreshed_profiles_by_name.keys():
     previous_profile = previous_profiles_by_name.get(name)
     current_profile = current_profiles_by_name.get(name)
+    refreshed_profile = refreshed_profiles_by_name.get(name)
     if previous_profile and current_profile:
       merged_profiles_by_name[name] = current_profile.create_updated_copy_for_for_merge()
     if previous_profile and not current_profile:
-      merged_profiles_by_name[name] = previous_profile
+      if refreshed_profile:
+        merged_profiles_by_name[name] = refreshed_profile.create_refreshed_copy_for_merge()
+      else:
+        merged_profiles_by_name[name] = previous_profile
     if current_profile and not previous_profile:
       merged_profiles_by_name[name] = current_profile
+    if refreshed_profile and not previous_profile and not current_profile:
+      merged_profiles_by_name[name] = refreshed_profile
   return merged_profiles_by_name
 
 
-def create_updates(previous_rows: list[LeaderboardRow], current_bot_perfs: list[BotPerf]) -> list[LeaderboardUpdate]:
-  """Group previous rows and current bot info by bot name and create updates."""
-  previous_row_by_name: dict[str, LeaderboardRow] = {row.name: row for row in previous_rows}
-  current_bot_perfs_by_name: dict[str, BotPerf] = {bot_perf.name: bot_perf for bot_perf in current_bot_perfs}
-  return [
-    LeaderboardUpdate.create_update(previous_row_by_name.get(name), current_bot_perfs_by_name.get(name))
-    for name in previous_row_by_name.keys() | current_bot_perfs_by_name.keys()
-  ]
+def is_sorted_by_name(names: Iterable[str]) -> bool:
+  """Return whether the names are in name_sort_key order."""
+  previous_key: tuple[str, str] | None = None
+  for name in names:
+    key = name_sort_key(name)
+    if previous_key is not None and key < previous_key:
+      return False
+    previous_key = key
+  return True
+
+
+def merge_updates(previous_rows: list[LeaderboardRow], current_bot_perfs: list[BotPerf]) -> list[LeaderboardUpdate]:
+  """Create updates from previous rows and current bot perfs which are both sorted by name_sort_key.
+
+  The two lists are joined by name in a single pass, so there is one update for each name in either list, and the updates are
+  in name_sort_key order. If a name appears more than once in a list, the last one is used.
+  """
+  updates: list[LeaderboardUpdate] = []
+  previous_count = len(previous_rows)
+  current_count = len(current_bot_perfs)
+  previous_index = 0
+  current_index = 0
+  while previous_index < previous_count or current_index < current_count:
+    previous_key = name_sort_key(previous_rows[previous_index].name) if previous_index < previous_count else None
+    current_key = name_sort_key(current_bot_perfs[current_index].name) if current_index < current_count else None
+    previous_row = None
+    current_bot_perf = None
+    if previous_key is not None and (current_key is None or previous_key <= current_key):
+      # Skip to the last row with the same name
+      while (
+        previous_index + 1 < previous_count and previous_rows[previous_index + 1].name == previous_rows[previous_index].name
+      ):
+        previous_index += 1
+      previous_row = previous_rows[previous_index]
+      previous_index += 1
+    if current_key is not None and (previous_key is None or current_key <= previous_key):
+      # Skip to the last perf with the same name
+      while (
+        current_index + 1 < current_count
+        and current_bot_perfs[current_index + 1].name == current_bot_perfs[current_index].name
+      ):
+        current_index += 1
+      current_bot_perf = current_bot_perfs[current_index]
+      current_index += 1
+    updates.append(LeaderboardUpdate.create_update(previous_row, current_bot_perf))
+  return updates
+
+
+def order_rows_like_updates(ranked_rows: list[LeaderboardRow], updates: list[LeaderboardUpdate]) -> list[LeaderboardRow]:
+  """Return the rows ranked from the updates in the order of the updates."""
+  row_by_name = {row.name: row for row in ranked_rows}
+  return [row_by_name[update.get_name()] for update in updates]
+
+
+@dataclasses.dataclass(frozen=True)
+class BotColumns:
+  """The fields of the bot profiles which the ranking depends on, in lists indexed by bot id.
+
+  The profiles are looked up once per generation rather than once per row of every perf type.
+  """
+
+  # The id of each bot by name
+  id_by_name: dict[str, int]
+  # The time each bot was created (seconds since epoch)
+  created: list[int]
+  # Whether each bot's profile is eligible as of the generation, see BotProfile.is_eligible
+  eligible: list[bool]
+
+  @classmethod
+  def create(
+    cls, bot_profiles_by_name: dict[str, BotProfile], current_time: int, registry: BotRegistry | None = None
+  ) -> "BotColumns":
+    """Create the columns of the bot profiles. The ids are those of the registry, or are assigned in order without one."""
+    if registry:
+      registry.register(sorted(bot_profiles_by_name, key=name_sort_key))
+      id_by_name = registry.get_id_by_name()
+    else:
+      id_by_name = {name: bot_id for bot_id, name in enumerate(bot_profiles_by_name)}
+    created = [0] * len(id_by_name)
+    eligible = [False] * len(id_by_name)
+    for name, bot_profile in bot_profiles_by_name.items():
+      bot_id = id_by_name[name]
+      created[bot_id] = bot_profile.created
+      eligible[bot_id] = bot_profile.is_eligible(current_time)
+    return BotColumns(id_by_name, created, eligible)
+
+
+def can_reuse_rows(
+  previous_rows: list[LeaderboardRow],
+  current_bot_perfs: list[BotPerf],
+  bot_columns: BotColumns,
+  current_time: int,
+  candidate_names: Collection[str] | None = None,
+) -> bool:
+  """Return whether creating and ranking the updates of a perf type would reproduce the previous rows exactly.
+
+  This is the case when no bot has a new or changed perf, no row carries a delta from the previous generation, and the passage
+  of time has not changed the eligibility of any bot. If the names of the bots whose eligibility may have changed are given
+  (see EligibilityExpiry), only the eligibility of their rows is checked.
+  """
+  previous_row_by_name = {row.name: row for row in previous_rows}
+  for bot_perf in current_bot_perfs:
+    previous_row = previous_row_by_name.get(bot_perf.name)
+    if not previous_row or previous_row.perf != bot_perf.perf or previous_row.rank_info.peak_rating != bot_perf.perf.rating:
+      return False
+  for row in previous_rows:
+    rank_info = row.rank_info
+    if rank_info.delta_rank or rank_info.delta_rating or rank_info.delta_games or rank_info.peak_rank != rank_info.rank:
+      return False
+  candidate_rows = (
+    previous_rows
+    if candidate_names is None
+    else [previous_row_by_name[name] for name in candidate_names if name in previous_row_by_name]
+  )
+  for row in candidate_rows:
+    rank_info = row.rank_info
+    eligible = bot_columns.eligible[bot_columns.id_by_name[row.name]] and LeaderboardUpdate.check_is_eligible(
+      row.perf.prov, rank_info.last_played, current_time
+    )
+    # The ranks only stay the same if exactly the same bots are eligible
+    if eligible != (rank_info.rank > 0):
+      return False
+  return True
 
 
 def name_sort_key(name: str) -> tuple[str, str]:
@@ -100,20 +326,25 @@ def name_sort_key(name: str) -> tuple[str, str]:
   return (name.lower(), name)
 
 
-def create_ranked_rows(
-  updates: list[LeaderboardUpdate], bot_profiles_by_name: dict[str, BotProfile], current_time: int
-) -> list[LeaderboardRow]:
+def rank_sort_key(rating: int, rd: int, created: int, name: str) -> tuple[int, int, int, tuple[str, str]]:
+  """Return a key for sorting by rank.
+
+  Primary sort: rating descending, Secondary sort: rd ascending, Tertiary sort: created time ascending
+  Further sort by name in lowercase (and then by name) for additional tie breaks
+  """
+  return (-rating, rd, created, name_sort_key(name))
+
+
+def create_ranked_rows(updates: list[LeaderboardUpdate], bot_columns: BotColumns, current_time: int) -> list[LeaderboardRow]:
   """Create the leaderboard rows for each perf type based on a list of updates."""
   new_rows: list[LeaderboardRow] = []
-  # Primary sort: rating descending, Secondary sort: rd ascending, Tertiary sort: created time ascending
-  # Further sort by name in lowercase (and then by name) for additional tie breaks
-  sorted_update_list = sorted(
-    updates,
-    key=lambda update: (
-      -update.get_rating(),
-      update.get_rd(),
-      bot_profiles_by_name[update.get_name()].created,
-      name_sort_key(update.get_name()),
+  id_by_name = bot_columns.id_by_name
+  created = bot_columns.created
+  bot_profile_eligible = bot_columns.eligible
+  sorted_updates = sorted(
+    ((id_by_name[update.get_name()], update) for update in updates),
+    key=lambda bot_update: rank_sort_key(
+      bot_update[1].get_rating(), bot_update[1].get_rd(), created[bot_update[0]], bot_update[1].get_name()
     ),
   )
   # The first in the list will be ranked #1
@@ -121,7 +352,7 @@ def create_ranked_rows(
   # Used for 1224 ranking (https://en.wikipedia.org/wiki/Ranking#Standard_competition_ranking_(%221224%22_ranking))
   same_rank_count = 0
   previous_rating = 0
-  for update in sorted_update_list:
+  for bot_id, update in sorted_updates:
     # Rank equals zero signals that the bot should not be included on the leaderboard
     rank_to_set = 0
     # Eligibility works slightly differently than for lichess' official leaderboards (https://lichess.org/faq#leaderboards)
@@ -129,8 +360,7 @@ def create_ranked_rows(
     # 2. The bot must have appeared online in the last 2 weeks
     # 3. The bot must not have a provisional rating (https://lichess.org/faq#provisional)
     # 4. The bot must have played a game for that perf type in the last 2 weeks
-    bot_profile_eligible = bot_profiles_by_name[update.get_name()].is_eligible(current_time)
-    if bot_profile_eligible and update.is_eligible(current_time):
+    if bot_profile_eligible[bot_id] and update.is_eligible(current_time):
       if update.get_rating() == previous_rating:
         same_rank_count += 1
       else:
@@ -143,6 +373,35 @@ def create_ranked_rows(
   return new_rows
 
 
+# A function which ranks the updates of one perf type, such as create_ranked_rows
+RankRows = Callable[[list[LeaderboardUpdate], BotColumns, int], list[LeaderboardRow]]
+
+
+@dataclasses.dataclass(frozen=True)
+class GenerationOptions:
+  """Optional collaborators and settings for generating the leaderboard data."""
+
+  # The client used to refresh the information of the bots which are offline, if any
+  users_client: UsersClient | None = None
+  # The function used to rank the updates of each perf type
+  rank_rows: RankRows = create_ranked_rows
+  # Whether to keep the existing pages of the perf types whose rows were reused instead of rendering them again. The kept pages
+  # still show the online status and last updated time of when they were rendered.
+  skip_unchanged_pages: bool = False
+  # The store which the leaderboard state is loaded from and saved to, in addition to any json files, if any
+  store: LeaderboardStore | None = None
+  # Whether to write the json files of the leaderboard data. A store is required to keep the state if they are not written.
+  export_json: bool = True
+  # The number of worker processes which generate the leaderboards of the perf types in parallel, or 0 to generate them in
+  # this process
+  workers: int = 0
+  # The perf types whose leaderboards are generated, or None for all of them. The saved data and pages of the other perf types
+  # are left as they are.
+  perf_types: frozenset[PerfType] | None = None
+  # The seconds after a bot's profile stops being eligible when it is moved to the archive, or None to keep every bot
+  archive_after: int | None = None
+
+
 @dataclasses.dataclass(frozen=True)
 class LeaderboardDataResult:
   """The result of generating the leaderboard data.
@@ -154,6 +413,10 @@ class LeaderboardDataResult:
 
   bot_profiles_by_name: dict[str, BotProfile]
   ranked_rows_by_perf_type: dict[PerfType, list[LeaderboardRow]]
+  # The perf types whose previous rows were reused because nothing which affects their ranking changed
+  reused_perf_types: frozenset[PerfType] = frozenset()
+  # The seconds spent creating and ranking the updates of each perf type which was not reused
+  ranking_seconds_by_perf_type: dict[PerfType, float] = dataclasses.field(default_factory=dict[PerfType, float])
 
   @classmethod
   def create_result(
@@ -174,37 +437,205 @@ class LeaderboardDataResult:
     return sorted_ranked_rows
 
 
+def sort_rows_by_rank(rows: list[LeaderboardRow], bot_profiles_by_name: dict[str, BotProfile]) -> list[LeaderboardRow]:
+  """Sort previously ranked rows into the same order as create_ranked_rows."""
+  return sorted(
+    rows, key=lambda row: rank_sort_key(row.perf.rating, row.perf.rd, bot_profiles_by_name[row.name].created, row.name)
+  )
+
+
+def load_leaderboard_data(
+  file_system: FileSystem, online_names: set[str], store: LeaderboardStore | None = None
+) -> LeaderboardDataResult:
+  """Load the saved leaderboard data with the rows in rank order. The bots in online_names are shown as online.
+
+  The data is loaded from the store if there is one, else from the json files.
+  """
+  saved_bot_profiles = store.load_bot_profiles() if store else load_bot_profiles(file_system)
+  saved_rows_by_perf_type = store.load_leaderboard_rows() if store else load_leaderboard_rows(file_system)
+  bot_profiles_by_name = {
+    name: bot_profile.create_updated_copy_for_for_merge() if name in online_names else bot_profile
+    for name, bot_profile in saved_bot_profiles.items()
+  }
+  ranked_rows_by_perf_type = {
+    perf_type: sort_rows_by_rank(rows, bot_profiles_by_name) for perf_type, rows in saved_rows_by_perf_type.items()
+  }
+  return LeaderboardDataResult.create_result(bot_profiles_by_name, ranked_rows_by_perf_type)
+
+
+@dataclasses.dataclass(frozen=True)
+class GenerationInputs:
+  """The data which the leaderboard of each perf type is generated from."""
+
+  # The merged profiles of the previously seen and current bots
+  bot_profiles_by_name: dict[str, BotProfile]
+  # The fields of the merged profiles which the ranking depends on, by bot id
+  bot_columns: BotColumns
+  # The previous leaderboard rows
+  previous_rows_by_perf_type: dict[PerfType, list[LeaderboardRow]]
+  # The perfs of the bots which are online, were sighted or were refreshed
+  current_bot_perfs_by_perf_type: dict[PerfType, list[BotPerf]]
+  # The time of the generation (seconds since epoch)
+  current_time: int
+  # The names of the bots which were restored from the archive because they were seen again
+  restored_names: frozenset[str] = frozenset()
+  # The sightings buffer which the current bot perfs include
+  sightings: SightingsBuffer = dataclasses.field(default_factory=SightingsBuffer)
+  # The archive which the restored bots have been removed from, or None if it was not loaded
+  bot_archive: BotArchive | None = None
+  # The eligibility expiry saved by the previous generation, or None if it is not current
+  eligibility_expiry: EligibilityExpiry | None = None
+  # The names of the bots whose eligibility may have changed since the previous generation by perf type, if they are known
+  candidate_names_by_perf_type: dict[PerfType, frozenset[str]] = dataclasses.field(
+    default_factory=dict[PerfType, frozenset[str]]
+  )
+
+
+@dataclasses.dataclass(frozen=True)
+class RankedPerfType:
+  """The ranked rows of one perf type."""
+
+  # The rows in rank order
+  ranked_rows: list[LeaderboardRow]
+  # The same rows in name_sort_key order, the order in which they are saved
+  name_sorted_rows: list[LeaderboardRow]
+  # Whether the previous rows were reused because nothing changed
+  reused: bool
+
+
+def rank_perf_type(inputs: GenerationInputs, perf_type: PerfType, rank_rows: RankRows) -> RankedPerfType:
+  """Rank the rows of a perf type, reusing the previous rows if nothing changed.
+
+  The previous rows and current bot perfs of the inputs must be sorted by name_sort_key.
+  """
+  previous_rows = inputs.previous_rows_by_perf_type.get(perf_type, [])
+  current_bot_perfs = inputs.current_bot_perfs_by_perf_type.get(perf_type, [])
+  candidate_names = inputs.candidate_names_by_perf_type.get(perf_type)
+  if previous_rows and can_reuse_rows(
+    previous_rows, current_bot_perfs, inputs.bot_columns, inputs.current_time, candidate_names
+  ):
+    return RankedPerfType(sort_rows_by_rank(previous_rows, inputs.bot_profiles_by_name), previous_rows, True)
+  updates = merge_updates(previous_rows, current_bot_perfs)
+  ranked_rows = rank_rows(updates, inputs.bot_columns, inputs.current_time)
+  return RankedPerfType(ranked_rows, order_rows_like_updates(ranked_rows, updates), False)
+
+
 class DataGenerator:
   """Generator of leaderboard data.
 
-  The generator takes a file_system, a lichess_client, and a time_provider as parameters.
+  The generator takes a file_system, a lichess_client, and a time_provider as parameters. If a users_client is also provided,
+  it is used to refresh the information of previously seen bots which are offline. It loads the inputs which the leaderboard
+  of each perf type is then generated from by perf_type_generation.
   """
 
-  def __init__(self, file_system: FileSystem, lichess_client: LichessClient, time_provider: TimeProvider) -> None:
+  def __init__(
+    self,
+    file_system: FileSystem,
+    lichess_client: LichessClient,
+    time_provider: TimeProvider,
+    options: GenerationOptions | None = None,
+  ) -> None:
     """Initialize a new generator."""
     self.file_system: FileSystem = file_system
     self.lichess_client: LichessClient = lichess_client
     self.time_provider: TimeProvider = time_provider
-
-  def generate_leaderboard_data(self) -> LeaderboardDataResult:
-    """Generate and save all leaderboard data."""
+    self.options: GenerationOptions = options or GenerationOptions()
+
+  def load_previous_data(self) -> tuple[dict[str, BotProfile], dict[PerfType, list[LeaderboardRow]]]:
+    """Load the previous bot profiles and rows.
+
+    They are loaded from the store if there is one, else from the snapshot if it is current, else from the json files.
+    """
+    store = self.options.store
+    if store:
+      return store.load_bot_profiles(), store.load_leaderboard_rows()
+    snapshot = load_snapshot(self.file_system)
+    if snapshot:
+      return snapshot.load_bot_profiles(), snapshot.load_leaderboard_rows()
+    return load_bot_profiles(self.file_system), load_leaderboard_rows(self.file_system)
+
+  def load_generation_inputs(self) -> GenerationInputs:
+    """Load the previous leaderboard data and the current bot info which the leaderboards are generated from."""
+    perf_types = self.options.perf_types
     # Load the existing leaderboard data
-    bot_profiles_by_name = load_bot_profiles(self.file_system)
-    previous_rows_by_perf_type = load_leaderboard_rows(self.file_system)
+    bot_profiles_by_name, previous_rows_by_perf_type = self.load_previous_data()
     # Get the current online bot info
-    online_bot_info = get_online_bot_info(self.lichess_client)
+    online_bot_info = get_online_bot_info(self.lichess_client, perf_types)
+    # Include the bots which were seen online by polling since the last generation
+    sightings = load_sightings_buffer(self.file_system)
+    sighted_bot_info = get_sighted_bot_info(sightings, online_bot_info.bot_profiles_by_name, perf_types)
+    # The bots which were seen again after being archived are the ones with ids but without profiles
+    registry = BotRegistry(self.file_system)
+    archived_names = {
+      name
+      for name in online_bot_info.bot_profiles_by_name.keys() | sighted_bot_info.bot_profiles_by_name.keys()
+      if name not in bot_profiles_by_name and registry.get_id(name) is not None
+    }
+    restored_names: frozenset[str] = frozenset()
+    bot_archive: BotArchive | None = None
+    if archived_names and perf_types is None:
+      bot_archive = load_bot_archive(self.file_system)
+      bot_profiles_by_name, previous_rows_by_perf_type = restore_archived_bots(
+        bot_archive, archived_names, bot_profiles_by_name, previous_rows_by_perf_type
+      )
+      restored_names = frozenset(archived_names & bot_profiles_by_name.keys())
+    elif archived_names:
+      # Only a full generation updates the archive, so until then they are left out of the leaderboards
+      online_bot_info = remove_bots(online_bot_info, archived_names)
+      sighted_bot_info = remove_bots(sighted_bot_info, archived_names)
+    # Refresh the info of the bots which are offline, only those on the leaderboards being generated if they were selected
+    refreshed_profiles_by_name = (
+      bot_profiles_by_name
+      if perf_types is None
+      else {
+        row.name: bot_profiles_by_name[row.name]
+        for perf_type in perf_types
+        for row in previous_rows_by_perf_type.get(perf_type, [])
+      }
+    )
+    offline_bot_info = (
+      get_offline_bot_info(
+        self.options.users_client, refreshed_profiles_by_name, online_bot_info.bot_profiles_by_name, perf_types
+      )
+      if self.options.users_client
+      else BotInfoResult({}, {})
+    )
+    # Looking up the offline bots is more recent than polling
+    refreshed_bot_info = combine_bot_info(sighted_bot_info, offline_bot_info)
     # Update the bot profiles
-    updated_bot_profiles = merge_bot_profiles(bot_profiles_by_name, online_bot_info.bot_profiles_by_name)
-    # Combine the data and create update objects for all of the leaderboards
-    updates_by_perf_type = {
-      perf_type: create_updates(
-        previous_rows_by_perf_type.get(perf_type, []), online_bot_info.bot_perfs_by_perf_type.get(perf_type, [])
+    updated_bot_profiles = merge_bot_profiles(
+      bot_profiles_by_name, online_bot_info.bot_profiles_by_name, refreshed_bot_info.bot_profiles_by_name
+    )
+    # Combine the current bot info, sorted by name to be joined with the previous rows
+    current_bot_perfs_by_perf_type = {
+      perf_type: sorted(
+        online_bot_info.bot_perfs_by_perf_type.get(perf_type, [])
+        + refreshed_bot_info.bot_perfs_by_perf_type.get(perf_type, []),
+        key=lambda bot_perf: name_sort_key(bot_perf.name),
       )
-      for perf_type in PerfType.all_except_unknown()
-    }
-    # Create and return the leaderboards with rank information
-    ranked_rows_by_perf_type = {
-      perf_type: create_ranked_rows(updates, updated_bot_profiles, self.time_provider.get_current_time())
-      for perf_type, updates in updates_by_perf_type.items()
+      for perf_type in select_perf_types(perf_types)
     }
-    return LeaderboardDataResult.create_result(updated_bot_profiles, ranked_rows_by_perf_type)
+    # Assign ids to the bots which are seen for the first time and look up the fields of their profiles by id
+    current_time = self.time_provider.get_current_time()
+    bot_columns = BotColumns.create(updated_bot_profiles, current_time, registry)
+    # Only the rows which expired since the previous generation, and those of the flagged and restored bots, can have changed
+    # eligibility without changing otherwise
+    eligibility_expiry = load_eligibility_expiry(self.file_system)
+    changed_names = restored_names.union(
+      name for name, bot_profile in updated_bot_profiles.items() if bot_profile.tos_violation
+    )
+    candidate_names_by_perf_type = (
+      eligibility_expiry.get_candidate_names(registry.get_names(), current_time, changed_names) if eligibility_expiry else {}
+    )
+    return GenerationInputs(
+      updated_bot_profiles,
+      bot_columns,
+      previous_rows_by_perf_type,
+      current_bot_perfs_by_perf_type,
+      current_time,
+      restored_names,
+      sightings,
+      bot_archive,
+      eligibility_expiry,
+      candidate_names_by_perf_type,
+    )
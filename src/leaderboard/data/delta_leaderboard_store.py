@@ -0,0 +1,433 @@
+"""A store of the leaderboard state as a sequence of generation records in leaderboard_data/generations.
+
+Each save writes one record instead of rewriting the json files of every leaderboard. The records are numbered by the
+generation number, so a run which only generates some of the leaderboards writes the record of the current generation again.
+Every keyframe_interval generations, the record is a keyframe with the complete state. Every other record holds the bot
+profiles and rows whose saved fields changed since the previous record, the names of the ones which were removed since then,
+and the number of the previous record. The state as of a record is rebuilt from its keyframe and the records between them.
+
+The deltas of the ranks, ratings and games and the peak rank of a row follow from its previous row, so they are left out of
+the rows of the records which are not keyframes, and a row which is otherwise unchanged is not recorded again. Only the rows
+whose derived fields differ from what their previous rows give, such as the rows of the bots restored from the archive, are
+recorded with all of their fields. A few new or changed ratings move the ranks of most of the rows of a leaderboard, so the
+rows which only moved are not recorded either. The record holds the shift of each range of previous ranks instead.
+
+The bot profiles are recorded as their json dicts, and the rows as lists of their values in the order of ROW_FIELDS, or
+COMPACT_ROW_FIELDS without the derived fields. The records are named so that they sort in order. Since each generation only
+adds a new file, committing the records only adds what changed to the repository.
+"""
+
+import bisect
+import json
+import sys
+from typing import Any
+
+from src.leaderboard.data.binary_snapshot import load_generation_number
+from src.leaderboard.data.data_generator import is_sorted_by_name, name_sort_key
+from src.leaderboard.data.leaderboard_objects import BotProfile, LeaderboardPerf, LeaderboardRow, RankInfo
+from src.leaderboard.data.leaderboard_store import LeaderboardStore
+from src.leaderboard.fs import file_paths
+from src.leaderboard.fs.file_system import FileSystem
+from src.leaderboard.li import json_backend
+from src.leaderboard.li.pert_type import PerfType
+
+
+# The number of generations from one keyframe to the next, a keyframe a day with a generation every two hours
+DEFAULT_KEYFRAME_INTERVAL = 12
+# The fields of a row in the order of its recorded values
+ROW_FIELDS = (
+  "name",
+  "rating",
+  "rd",
+  "prog",
+  "games",
+  "prov",
+  "rank",
+  "delta_rank",
+  "delta_rating",
+  "delta_games",
+  "peak_rank",
+  "peak_rating",
+  "last_played",
+)
+# The fields of a row which do not follow from its previous row, in the order of its compact recorded values
+COMPACT_ROW_FIELDS = ("name", "rating", "rd", "prog", "games", "prov", "rank", "peak_rating", "last_played")
+COMPACT_ROW_INDEXES = tuple(ROW_FIELDS.index(field) for field in COMPACT_ROW_FIELDS)
+
+
+def row_to_values(row: LeaderboardRow) -> list[Any]:
+  """Return the recorded values of a row."""
+  perf = row.perf
+  rank_info = row.rank_info
+  return [
+    row.name,
+    perf.rating,
+    perf.rd,
+    perf.prog,
+    perf.games,
+    int(perf.prov),
+    rank_info.rank,
+    rank_info.delta_rank,
+    rank_info.delta_rating,
+    rank_info.delta_games,
+    rank_info.peak_rank,
+    rank_info.peak_rating,
+    rank_info.last_played,
+  ]
+
+
+def row_from_values(values: list[Any]) -> LeaderboardRow:
+  """Create a row from its recorded values."""
+  (
+    name,
+    rating,
+    rd,
+    prog,
+    games,
+    prov,
+    rank,
+    delta_rank,
+    delta_rating,
+    delta_games,
+    peak_rank,
+    peak_rating,
+    last_played,
+  ) = values
+  return LeaderboardRow(
+    sys.intern(name),
+    LeaderboardPerf(rating, rd, prog, games, bool(prov)),
+    RankInfo(rank, delta_rank, delta_rating, delta_games, peak_rank, peak_rating, last_played),
+  )
+
+
+def compact_values(values: list[Any]) -> list[Any]:
+  """Return the compact recorded values of a row from its recorded values."""
+  return [values[index] for index in COMPACT_ROW_INDEXES]
+
+
+def derive_values(previous_values: list[Any] | None, compact: list[Any]) -> list[Any]:
+  """Return the recorded values of a row from its compact values and the values of its previous row, if it had one.
+
+  The derived fields are found the same way as when the row is ranked (see LeaderboardUpdate.to_leaderboard_row).
+  """
+  name, rating, rd, prog, games, prov, rank, peak_rating, last_played = compact
+  if previous_values is None:
+    return [name, rating, rd, prog, games, prov, rank, 0, 0, 0, rank, peak_rating, last_played]
+  previous_rating, previous_games, previous_rank = previous_values[1], previous_values[4], previous_values[6]
+  return [
+    name,
+    rating,
+    rd,
+    prog,
+    games,
+    prov,
+    rank,
+    previous_rank - rank,
+    rating - previous_rating,
+    games - previous_games,
+    min(previous_rank, rank),
+    peak_rating,
+    last_played,
+  ]
+
+
+def get_rank_shift(rank_shifts: list[list[int]], starts: list[int], rank: int) -> int:
+  """Return how far a previous rank moved, given the [first rank, shift] of each range of ranks and their first ranks.
+
+  The ranks before the first range and the unranked rows do not move.
+  """
+  index = bisect.bisect_right(starts, rank) - 1
+  return rank_shifts[index][1] if rank > 0 and index >= 0 else 0
+
+
+def get_next_values(values: list[Any], rank_shift: int) -> list[Any]:
+  """Return the recorded values of a row in the record after it, if only its rank changed, by rank_shift."""
+  if not rank_shift and values[7] == values[8] == values[9] == 0 and values[10] == values[6]:
+    return values
+  compact = compact_values(values)
+  compact[6] += rank_shift
+  return derive_values(values, compact)
+
+
+class LeaderboardState:
+  """The recorded values of the bot profiles and the rows of each leaderboard, as of one record."""
+
+  def __init__(
+    self,
+    profile_dicts: dict[str, dict[str, Any]] | None = None,
+    row_values_by_perf_type: dict[PerfType, dict[str, list[Any]]] | None = None,
+  ) -> None:
+    """Initialize a state, which is empty by default. The dicts are shared with the states derived from it, not copied."""
+    # The json dict of each bot profile by name
+    self.profile_dicts = profile_dicts or {}
+    # The recorded values of the rows of each perf type by name
+    self.row_values_by_perf_type = row_values_by_perf_type or {perf_type: {} for perf_type in PerfType.all_except_unknown()}
+
+  def apply(self, record: dict[str, Any]) -> "LeaderboardState":
+    """Return the state as of a record which follows this state. A keyframe replaces the whole state.
+
+    The rows which are not in a record which is not a keyframe are unchanged since this state, except for their ranks, which
+    move by the rank shifts of the record, and their derived fields.
+    """
+    keyframe = record.get("keyframe")
+    profile_dicts = {} if keyframe else dict(self.profile_dicts)
+    row_values_by_perf_type: dict[PerfType, dict[str, list[Any]]] = {}
+    for perf_type, previous_row_values in self.row_values_by_perf_type.items():
+      rank_shifts: list[list[int]] = record.get("rank_shifts", {}).get(perf_type.to_string(), [])
+      starts = [start for start, _ in rank_shifts]
+      row_values_by_perf_type[perf_type] = (
+        {}
+        if keyframe
+        else {
+          name: get_next_values(values, get_rank_shift(rank_shifts, starts, values[6]))
+          for name, values in previous_row_values.items()
+        }
+      )
+    for name in record.get("removed_bot_profiles", []):
+      del profile_dicts[name]
+    for profile_dict in record.get("bot_profiles", []):
+      profile_dicts[profile_dict["name"]] = profile_dict
+    for perf_type_str, names in record.get("removed_rows", {}).items():
+      row_values = row_values_by_perf_type[PerfType.from_json(perf_type_str)]
+      for name in names:
+        del row_values[name]
+    for perf_type_str, recorded_values in record.get("rows", {}).items():
+      perf_type = PerfType.from_json(perf_type_str)
+      row_values = row_values_by_perf_type[perf_type]
+      previous_row_values = self.row_values_by_perf_type[perf_type]
+      for values in recorded_values:
+        name = values[0]
+        row_values[name] = values if len(values) == len(ROW_FIELDS) else derive_values(previous_row_values.get(name), values)
+    return LeaderboardState(profile_dicts, row_values_by_perf_type)
+
+  def update(
+    self, bot_profiles: list[BotProfile], name_sorted_rows_by_perf_type: dict[PerfType, list[LeaderboardRow]]
+  ) -> "LeaderboardState":
+    """Return the state with the bot profiles and the rows of the perf types given. The other perf types are unchanged."""
+    return LeaderboardState(
+      {bot_profile.name: bot_profile.as_dict() for bot_profile in bot_profiles},
+      self.row_values_by_perf_type
+      | {
+        perf_type: {row.name: row_to_values(row) for row in name_sorted_rows}
+        for perf_type, name_sorted_rows in name_sorted_rows_by_perf_type.items()
+      },
+    )
+
+  def create_record(self, previous_state: "LeaderboardState | None") -> dict[str, Any]:
+    """Return the record of the changes since a previous state, or a keyframe with the complete state if there is none.
+
+    Empty fields are left out of the record.
+    """
+    base_state = previous_state or LeaderboardState()
+    changed_profile_dicts = [
+      profile_dict for name, profile_dict in self.profile_dicts.items() if base_state.profile_dicts.get(name) != profile_dict
+    ]
+    removed_profile_names = sorted(base_state.profile_dicts.keys() - self.profile_dicts.keys())
+    changed_values_by_perf_type: dict[str, list[list[Any]]] = {}
+    rank_shifts_by_perf_type: dict[str, list[list[int]]] = {}
+    removed_names_by_perf_type: dict[str, list[str]] = {}
+    for perf_type, row_values in self.row_values_by_perf_type.items():
+      base_row_values = base_state.row_values_by_perf_type[perf_type]
+      changed_values, rank_shifts = (
+        (list(row_values.values()), []) if previous_state is None else get_changed_values(base_row_values, row_values)
+      )
+      if changed_values:
+        changed_values_by_perf_type[perf_type.to_string()] = changed_values
+      if rank_shifts:
+        rank_shifts_by_perf_type[perf_type.to_string()] = rank_shifts
+      removed_names = [name for name in base_row_values if name not in row_values]
+      if removed_names:
+        removed_names_by_perf_type[perf_type.to_string()] = removed_names
+    record: dict[str, Any] = {} if previous_state else {"keyframe": True}
+    if changed_profile_dicts:
+      record["bot_profiles"] = changed_profile_dicts
+    if removed_profile_names:
+      record["removed_bot_profiles"] = removed_profile_names
+    if changed_values_by_perf_type:
+      record["rows"] = changed_values_by_perf_type
+    if rank_shifts_by_perf_type:
+      record["rank_shifts"] = rank_shifts_by_perf_type
+    if removed_names_by_perf_type:
+      record["removed_rows"] = removed_names_by_perf_type
+    return record
+
+  def get_bot_profiles(self) -> dict[str, BotProfile]:
+    """Return the bot profiles by name. As with BotProfile.from_dict, the bots are not new and are offline."""
+    bot_profiles = [BotProfile.from_dict(profile_dict) for profile_dict in self.profile_dicts.values()]
+    return {bot_profile.name: bot_profile for bot_profile in bot_profiles}
+
+  def get_leaderboard_rows(self) -> dict[PerfType, list[LeaderboardRow]]:
+    """Return the rows of every perf type, sorted by name. Each row is created from its values here, once per load."""
+    rows_by_perf_type: dict[PerfType, list[LeaderboardRow]] = {}
+    for perf_type, row_values in self.row_values_by_perf_type.items():
+      rows = [row_from_values(values) for values in row_values.values()]
+      # The rows which were added by a delta follow the rows of the keyframe
+      if not is_sorted_by_name(row.name for row in rows):
+        rows.sort(key=lambda row: name_sort_key(row.name))
+      rows_by_perf_type[perf_type] = rows
+    return rows_by_perf_type
+
+
+def get_changed_values(
+  previous_row_values: dict[str, list[Any]], row_values: dict[str, list[Any]]
+) -> tuple[list[list[Any]], list[list[int]]]:
+  """Return the recorded values of the rows which changed since their previous rows, and the rank shifts of the others.
+
+  A few new or changed ratings move the ranks of most of the rows, so the rows which only moved are not recorded. Instead
+  the ranges of their previous ranks which moved by the same amount are recorded as a [first rank, shift] each. A row is
+  recorded with its compact values when its derived fields follow from its previous row, and otherwise with all of its
+  values.
+  """
+  changed_values: list[list[Any]] = []
+  # The previous rank, the shift and the compact values of the ranked rows which are unchanged except for their ranks
+  moved_rows: list[tuple[int, int, list[Any]]] = []
+  for name, values in row_values.items():
+    previous_values = previous_row_values.get(name)
+    compact = compact_values(values)
+    if derive_values(previous_values, compact) != values:
+      changed_values.append(values)
+    elif previous_values is None:
+      changed_values.append(compact)
+    else:
+      previous_rank, rank = previous_values[6], values[6]
+      previous_compact = compact_values(previous_values)
+      previous_compact[6] = rank
+      if previous_compact != compact:
+        changed_values.append(compact)
+      elif previous_rank > 0 and rank > 0:
+        moved_rows.append((previous_rank, rank - previous_rank, compact))
+      elif previous_rank != rank:
+        changed_values.append(compact)
+  moved_rows.sort(key=lambda moved_row: moved_row[0])
+  rank_shifts: list[list[int]] = []
+  for previous_rank, rank_shift, _ in moved_rows:
+    if (rank_shifts[-1][1] if rank_shifts else 0) != rank_shift:
+      rank_shifts.append([previous_rank, rank_shift])
+  # A row which shares its previous rank with a row which moved differently is recorded
+  starts = [start for start, _ in rank_shifts]
+  changed_values.extend(
+    compact
+    for previous_rank, rank_shift, compact in moved_rows
+    if get_rank_shift(rank_shifts, starts, previous_rank) != rank_shift
+  )
+  return changed_values, rank_shifts
+
+
+class DeltaLeaderboardStore(LeaderboardStore):
+  """Store the leaderboard state as generation records, each a delta from the previous record or a keyframe."""
+
+  def __init__(self, file_system: FileSystem, keyframe_interval: int = DEFAULT_KEYFRAME_INTERVAL) -> None:
+    """Initialize a store which reads and writes the records of a file system. Nothing is read until it is needed."""
+    if keyframe_interval < 1:
+      error_msg = f"The keyframe interval must be positive, not {keyframe_interval}"
+      raise ValueError(error_msg)
+    self.file_system = file_system
+    self.keyframe_interval = keyframe_interval
+    self.record_numbers: list[int] | None = None
+    # The number of the keyframe of the latest record, once it is loaded
+    self.keyframe_number: int | None = None
+    # The number and the state of the record before the latest record, unless the latest record is a keyframe
+    self.previous_number: int | None = None
+    self.previous_state: LeaderboardState | None = None
+    # The state as of the latest record, once it is loaded
+    self.state: LeaderboardState | None = None
+
+  def get_record_numbers(self) -> list[int]:
+    """Return the numbers of the records in ascending order."""
+    if self.record_numbers is None:
+      self.record_numbers = [
+        int(file_name.rsplit("/", 1)[-1].removesuffix(".json"))
+        for file_name in self.file_system.list_files(file_paths.generations_dir())
+      ]
+    return self.record_numbers
+
+  def read_record(self, record_number: int) -> dict[str, Any]:
+    """Read one record."""
+    record_json = self.file_system.read_file(file_paths.generation_record_path(record_number))
+    if not record_json:
+      error_msg = f"Generation record {record_number} is missing"
+      raise ValueError(error_msg)
+    return json_backend.loads(record_json)
+
+  def load_states(self, record_number: int) -> tuple[int, int | None, LeaderboardState | None, LeaderboardState]:
+    """Return the number of the keyframe of a record, the number and the state of the record before it, and its state."""
+    # Read the records back to the keyframe
+    records = [self.read_record(record_number)]
+    number = record_number
+    while not records[-1].get("keyframe"):
+      previous_number = records[-1].get("previous_number")
+      if not isinstance(previous_number, int) or previous_number >= number:
+        error_msg = f"Generation record {number} is neither a keyframe nor follows an earlier record"
+        raise ValueError(error_msg)
+      number = previous_number
+      records.append(self.read_record(number))
+    # Apply them from the keyframe on
+    previous_state: LeaderboardState | None = None
+    state = LeaderboardState()
+    for record in reversed(records):
+      previous_state, state = state, state.apply(record)
+    if len(records) == 1:
+      return number, None, None, state
+    return number, records[0]["previous_number"], previous_state, state
+
+  def load_state(self, record_number: int) -> LeaderboardState:
+    """Rebuild the state as of a record from its keyframe and the records between them."""
+    return self.load_states(record_number)[3]
+
+  def get_state(self) -> LeaderboardState:
+    """Return the state as of the latest record, loading it and the records before it the first time."""
+    if self.state is None:
+      record_numbers = self.get_record_numbers()
+      if record_numbers:
+        self.keyframe_number, self.previous_number, self.previous_state, self.state = self.load_states(record_numbers[-1])
+      else:
+        self.state = LeaderboardState()
+    return self.state
+
+  def close(self) -> None:
+    """Do nothing, the records are not held open."""
+
+  def is_empty(self) -> bool:
+    """Return whether there are no records."""
+    return not self.get_record_numbers()
+
+  def load_bot_profiles(self) -> dict[str, BotProfile]:
+    """Load the known bot profiles."""
+    return self.get_state().get_bot_profiles()
+
+  def load_leaderboard_rows(self) -> dict[PerfType, list[LeaderboardRow]]:
+    """Load the leaderboard rows of every perf type, sorted by name."""
+    return self.get_state().get_leaderboard_rows()
+
+  def save(self, bot_profiles: list[BotProfile], name_sorted_rows_by_perf_type: dict[PerfType, list[LeaderboardRow]]) -> None:
+    """Write the record of the current generation, which is a keyframe every keyframe_interval generations.
+
+    If the latest record is of the current generation, it is written again as of the record before it.
+    """
+    record_number = load_generation_number(self.file_system)
+    latest_state = self.get_state()
+    record_numbers = self.get_record_numbers()
+    latest_number = record_numbers[-1] if record_numbers else None
+    if latest_number is not None and record_number < latest_number:
+      error_msg = f"Generation {record_number} is before the latest generation record {latest_number}"
+      raise ValueError(error_msg)
+    if record_number == latest_number:
+      previous_number, previous_state = self.previous_number, self.previous_state
+    else:
+      previous_number, previous_state = latest_number, latest_state if latest_number is not None else None
+    state = latest_state.update(bot_profiles, name_sorted_rows_by_perf_type)
+    if (
+      previous_number is None
+      or previous_state is None
+      or self.keyframe_number is None
+      or record_number - self.keyframe_number >= self.keyframe_interval
+    ):
+      record = state.create_record(None)
+      self.keyframe_number, previous_number, previous_state = record_number, None, None
+    else:
+      record = state.create_record(previous_state) | {"previous_number": previous_number}
+    record_json = json.dumps(record, separators=(",", ":"))
+    self.file_system.write_file(file_paths.generation_record_path(record_number), record_json)
+    if record_number != latest_number:
+      record_numbers.append(record_number)
+    self.previous_number, self.previous_state, self.state = previous_number, previous_state, state
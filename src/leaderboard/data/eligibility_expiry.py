@@ -0,0 +1,165 @@
+"""An index of when the eligibility of the rows of each leaderboard can next change.
+
+A ranked row stays eligible until the earlier of the bot's last_seen and the row's last_played is more than TWO_WEEKS ago, so
+for each leaderboard the index keeps the deadlines min(last_seen, last_played) + TWO_WEEKS of the ranked rows in ascending
+order, with the ids of their bots in the BotRegistry, and the time the rows were ranked at. The rows whose deadlines fall
+between that time and the time of the next generation are found with a binary search. An unranked row can only become
+eligible without changing if its profile becomes eligible, so the index also keeps the ids of the bots of the unranked rows
+which are otherwise eligible. Together they are the only unchanged rows whose eligibility can change with the passage of time
+or new bot profiles, except for the bots which are flagged for violating the TOS and the bots restored from the archive.
+
+The index is saved to leaderboard_data/eligibility_expiry.bin next to the data it was built from after each generation, and is
+stamped with the generation number. It is only loaded while the generation number has not changed since.
+"""
+
+import bisect
+import dataclasses
+import struct
+from array import array
+from collections.abc import Collection
+
+from src.leaderboard.chrono.durations import TWO_WEEKS
+from src.leaderboard.data.binary_snapshot import load_generation_number
+from src.leaderboard.data.leaderboard_objects import BotProfile, LeaderboardRow
+from src.leaderboard.data.leaderboard_update import LeaderboardUpdate
+from src.leaderboard.data.rating_history import from_little_endian_bytes, to_little_endian_bytes
+from src.leaderboard.fs import file_paths
+from src.leaderboard.fs.file_system import FileSystem
+from src.leaderboard.li.pert_type import PerfType
+
+
+MAGIC = b"LBEXPIRY"
+# The version of the format, which is increased whenever the format changes
+VERSION = 2
+# The magic bytes, version, generation number and perf type count
+HEADER = struct.Struct("<8sIqI")
+# The perf type, the time the rows were ranked at, the number of deadlines and the number of waiting ids
+PERF_TYPE_RECORD = struct.Struct("<BqII")
+
+
+@dataclasses.dataclass(frozen=True)
+class PerfTypeExpiry:
+  """When the ranked rows of one leaderboard expire, and which unranked rows are waiting on the profiles of their bots."""
+
+  # The time the rows were ranked at (seconds since epoch)
+  ranked_at: int
+  # The times after which the ranked rows are no longer eligible, ascending
+  deadlines: "array[int]"
+  # The id of the bot of each deadline
+  deadline_ids: "array[int]"
+  # The ids of the bots of the unranked rows which are only ineligible because of their profiles
+  waiting_ids: "array[int]"
+
+  @classmethod
+  def create(
+    cls, rows: list[LeaderboardRow], bot_profiles_by_name: dict[str, BotProfile], id_by_name: dict[str, int], ranked_at: int
+  ) -> "PerfTypeExpiry":
+    """Create the expiry of the rows of a leaderboard ranked at a time."""
+    deadlines: list[tuple[int, int]] = []
+    waiting_ids: array[int] = array("I")
+    for row in rows:
+      rank_info = row.rank_info
+      if rank_info.rank > 0:
+        deadline = min(bot_profiles_by_name[row.name].last_seen, rank_info.last_played) + TWO_WEEKS
+        deadlines.append((deadline, id_by_name[row.name]))
+      elif LeaderboardUpdate.check_is_eligible(row.perf.prov, rank_info.last_played, ranked_at):
+        waiting_ids.append(id_by_name[row.name])
+    deadlines.sort()
+    return PerfTypeExpiry(
+      ranked_at,
+      array("q", (deadline for deadline, _ in deadlines)),
+      array("I", (bot_id for _, bot_id in deadlines)),
+      waiting_ids,
+    )
+
+  def get_candidate_ids(self, current_time: int) -> list[int] | None:
+    """Return the ids of the bots whose rows may have changed eligibility between the time they were ranked and a time.
+
+    Return None if the time is before the rows were ranked, as the index cannot tell which rows were eligible then.
+    """
+    if current_time < self.ranked_at:
+      return None
+    start = bisect.bisect_left(self.deadlines, self.ranked_at)
+    end = bisect.bisect_left(self.deadlines, current_time, start)
+    return self.deadline_ids[start:end].tolist() + self.waiting_ids.tolist()
+
+
+@dataclasses.dataclass(frozen=True)
+class EligibilityExpiry:
+  """The expiry of the rows of every leaderboard as of a generation."""
+
+  # The generation the index was saved in
+  generation_number: int
+  expiry_by_perf_type: dict[PerfType, PerfTypeExpiry]
+
+  def get_candidate_names(
+    self, names: list[str], current_time: int, changed_names: Collection[str]
+  ) -> dict[PerfType, frozenset[str]]:
+    """Return the names of the bots whose rows may have changed eligibility by a time, by perf type.
+
+    The names are looked up by id in names, and the changed names are candidates in every leaderboard. The perf types whose
+    candidates cannot be found are left out.
+    """
+    candidate_names_by_perf_type: dict[PerfType, frozenset[str]] = {}
+    for perf_type, expiry in self.expiry_by_perf_type.items():
+      candidate_ids = expiry.get_candidate_ids(current_time)
+      if candidate_ids is not None:
+        candidate_names_by_perf_type[perf_type] = frozenset([names[bot_id] for bot_id in candidate_ids]).union(changed_names)
+    return candidate_names_by_perf_type
+
+  @classmethod
+  def deserialize(cls, contents: bytes) -> "EligibilityExpiry":
+    """Read a serialized index. Raises a ValueError if it is not valid."""
+    if len(contents) < HEADER.size:
+      error_msg = "The eligibility expiry is truncated"
+      raise ValueError(error_msg)
+    magic, version, generation_number, perf_type_count = HEADER.unpack_from(contents)
+    if magic != MAGIC or version != VERSION:
+      error_msg = f"Unsupported eligibility expiry {magic!r} version {version}"
+      raise ValueError(error_msg)
+    offset = HEADER.size
+    expiry_by_perf_type: dict[PerfType, PerfTypeExpiry] = {}
+    for _ in range(perf_type_count):
+      if len(contents) < offset + PERF_TYPE_RECORD.size:
+        error_msg = "The eligibility expiry is truncated"
+        raise ValueError(error_msg)
+      perf_type_value, ranked_at, deadline_count, waiting_count = PERF_TYPE_RECORD.unpack_from(contents, offset)
+      offset += PERF_TYPE_RECORD.size
+      columns: list[array[int]] = []
+      for typecode, count in (("q", deadline_count), ("I", deadline_count), ("I", waiting_count)):
+        size = count * array(typecode).itemsize
+        if len(contents) < offset + size:
+          error_msg = "The eligibility expiry is truncated"
+          raise ValueError(error_msg)
+        columns.append(from_little_endian_bytes(typecode, contents[offset : offset + size]))
+        offset += size
+      expiry_by_perf_type[PerfType(perf_type_value)] = PerfTypeExpiry(ranked_at, *columns)
+    if offset != len(contents):
+      error_msg = "The eligibility expiry has an unexpected length"
+      raise ValueError(error_msg)
+    return EligibilityExpiry(generation_number, expiry_by_perf_type)
+
+  def serialize(self) -> bytes:
+    """Return the bytes of the index."""
+    parts = [HEADER.pack(MAGIC, VERSION, self.generation_number, len(self.expiry_by_perf_type))]
+    for perf_type, expiry in self.expiry_by_perf_type.items():
+      parts.append(PERF_TYPE_RECORD.pack(perf_type.value, expiry.ranked_at, len(expiry.deadlines), len(expiry.waiting_ids)))
+      parts.extend(to_little_endian_bytes(column) for column in (expiry.deadlines, expiry.deadline_ids, expiry.waiting_ids))
+    return b"".join(parts)
+
+
+def save_eligibility_expiry(file_system: FileSystem, eligibility_expiry: EligibilityExpiry) -> None:
+  """Save an index next to the leaderboard data."""
+  file_system.write_bytes(file_paths.eligibility_expiry_path(), eligibility_expiry.serialize())
+
+
+def load_eligibility_expiry(file_system: FileSystem) -> EligibilityExpiry | None:
+  """Load the saved index, or return None if it is missing, not valid, or older than the current generation."""
+  contents = file_system.read_bytes(file_paths.eligibility_expiry_path())
+  if not contents:
+    return None
+  try:
+    eligibility_expiry = EligibilityExpiry.deserialize(contents)
+  except ValueError:
+    return None
+  return eligibility_expiry if eligibility_expiry.generation_number == load_generation_number(file_system) else None
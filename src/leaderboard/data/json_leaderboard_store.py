@@ -0,0 +1,59 @@
+"""A store of the leaderboard state in the json files of leaderboard_data."""
+
+import json
+
+from src.leaderboard.data.data_generator import load_bot_profiles, load_leaderboard_rows, name_sort_key
+from src.leaderboard.data.leaderboard_objects import BotProfile, LeaderboardRow
+from src.leaderboard.data.leaderboard_store import LeaderboardStore
+from src.leaderboard.fs import file_paths
+from src.leaderboard.fs.file_system import FileSystem
+from src.leaderboard.li.pert_type import PerfType
+
+
+def serialize_bot_profiles(bot_profiles: list[BotProfile]) -> str:
+  """Return the contents of the bot profiles file: the profiles sorted by name as a json list."""
+  sorted_bot_profiles = sorted(bot_profiles, key=lambda bot_profile: name_sort_key(bot_profile.name))
+  return json.dumps([bot_profile.as_dict() for bot_profile in sorted_bot_profiles], indent=2)
+
+
+def serialize_rows(name_sorted_rows: list[LeaderboardRow]) -> str:
+  """Return the contents of a data file: the rows, which are already sorted by name, as a json list."""
+  return json.dumps([row.as_dict() for row in name_sorted_rows], indent=2)
+
+
+class JsonLeaderboardStore(LeaderboardStore):
+  """Store the bot profiles in bot_profiles.json and the rows of each leaderboard in {perf_type}.json.
+
+  These files are also the export of the leaderboard data, which is committed with the leaderboard html.
+  """
+
+  def __init__(self, file_system: FileSystem) -> None:
+    """Initialize a store which reads and writes the files of a file system."""
+    self.file_system = file_system
+
+  def close(self) -> None:
+    """Do nothing, the files are not held open."""
+
+  def is_empty(self) -> bool:
+    """Return whether there is no bot profiles file."""
+    return not self.file_system.read_file(file_paths.bot_profiles_path())
+
+  def load_bot_profiles(self) -> dict[str, BotProfile]:
+    """Load the known bot profiles."""
+    return load_bot_profiles(self.file_system)
+
+  def load_leaderboard_rows(self) -> dict[PerfType, list[LeaderboardRow]]:
+    """Load the leaderboard rows of every perf type, sorted by name."""
+    return load_leaderboard_rows(self.file_system)
+
+  def save(self, bot_profiles: list[BotProfile], name_sorted_rows_by_perf_type: dict[PerfType, list[LeaderboardRow]]) -> None:
+    """Write the bot profiles file and the data files of the perf types given."""
+    self.file_system.write_file(file_paths.bot_profiles_path(), serialize_bot_profiles(bot_profiles))
+    for perf_type, name_sorted_rows in name_sorted_rows_by_perf_type.items():
+      self.file_system.write_file(file_paths.data_path(perf_type), serialize_rows(name_sorted_rows))
+
+  def delete(self) -> None:
+    """Delete the bot profiles file and the data files, once the state is kept by another store instead."""
+    self.file_system.delete_file(file_paths.bot_profiles_path())
+    for perf_type in PerfType.all_except_unknown():
+      self.file_system.delete_file(file_paths.data_path(perf_type))
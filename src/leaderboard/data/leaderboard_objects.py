@@ -1,14 +1,20 @@
-"""Dataclasses related rows in a leaderboard."""
+"""Dataclasses related rows in a leaderboard.
+
+The dataclasses use slots, and the names read from json are interned, so that a bot's name is shared by its profile and its
+rows in every leaderboard. They are converted to and from json dicts by serializers generated from their fields.
+"""
 
 import dataclasses
 from typing import Any
 
 from src.leaderboard.chrono.durations import TWO_WEEKS
-from src.leaderboard.data import default_remover
-from src.leaderboard.li.bot_user import BotUser, Perf
+from src.leaderboard.data import serializers
+from src.leaderboard.li.bot_user import BotUser
+from src.leaderboard.li.perf_table import PerfTable
+from src.leaderboard.li.pert_type import PerfType
 
 
-@dataclasses.dataclass(frozen=True)
+@dataclasses.dataclass(frozen=True, slots=True)
 class BotProfile:
   """Information related to the bot's profile.
 
@@ -35,10 +41,10 @@ class BotProfile:
   online: bool
 
   @classmethod
-  def from_bot_user(cls, bot_user: BotUser) -> "BotProfile":
+  def from_bot_user(cls, bot_user: BotUser, online: bool = True) -> "BotProfile":
     """Create a BotProfile from a BotUser.
 
-    The bot will be assumed to be new and to be online.
+    The bot will be assumed to be new. Unless otherwise specified, the bot will be assumed to be online.
     """
     return BotProfile(
       bot_user.username,
@@ -50,8 +56,8 @@ class BotProfile:
       bot_user.tos_violation,
       # Assume the bot is new - this simplifies updates
       True,
-      # If we are creating a BotProfile from a BotUser then the bot is online
-      True,
+      # Usually if we are creating a BotProfile from a BotUser then the bot is online
+      online,
     )
 
   @classmethod
@@ -60,19 +66,7 @@ class BotProfile:
 
     The bot will be assumed not to be new and to be offline.
     """
-    return BotProfile(
-      json_dict.get("name", ""),
-      json_dict.get("flair", ""),
-      json_dict.get("flag", ""),
-      json_dict.get("created", 0),
-      json_dict.get("last_seen", 0),
-      json_dict.get("patron", False),
-      json_dict.get("tos_violation", False),
-      # If we are loading from json the bot is not new
-      False,
-      # Assume the bot is offline - this simplifies updates
-      False,
-    )
+    return bot_profile_from_dict(json_dict)
 
   def create_updated_copy_for_for_merge(self) -> "BotProfile":
     """Create an updated copy of the profile.
@@ -91,6 +85,23 @@ class BotProfile:
       True,
     )
 
+  def create_refreshed_copy_for_merge(self) -> "BotProfile":
+    """Create an updated copy of the profile for a bot which was looked up while offline.
+
+    The updated copy has new set to False and online set to False.
+    """
+    return BotProfile(
+      self.name,
+      self.flair,
+      self.flag,
+      self.created,
+      self.last_seen,
+      self.patron,
+      self.tos_violation,
+      False,
+      False,
+    )
+
   def is_eligible(self, current_time: int) -> bool:
     """Return whether the bot is eligible for the leaderboard."""
     seen_in_last_two_weeks = current_time - self.last_seen <= TWO_WEEKS
@@ -101,10 +112,10 @@ class BotProfile:
 
     Values will only be set if they are not equal to their default values.
     """
-    return default_remover.to_dict_without_defaults(dataclasses.asdict(self))
+    return bot_profile_to_dict(self)
 
 
-@dataclasses.dataclass(frozen=True)
+@dataclasses.dataclass(frozen=True, slots=True)
 class LeaderboardPerf:
   """Information related to a bot's performance for a particular PerfType.
 
@@ -123,23 +134,18 @@ class LeaderboardPerf:
   prov: bool
 
   @classmethod
-  def from_perf(cls, perf: Perf) -> "LeaderboardPerf":
-    """Create a LeaderboardPerf from a Perf."""
-    return LeaderboardPerf(perf.rating, perf.rd, perf.prog, perf.games, perf.prov)
+  def from_perf_table(cls, perf_table: PerfTable, perf_type: PerfType) -> "LeaderboardPerf":
+    """Create a LeaderboardPerf from one perf of a PerfTable."""
+    games, rating, rd, prog, prov = perf_table.get_perf_values(perf_type)
+    return LeaderboardPerf(rating, rd, prog, games, prov)
 
   @classmethod
   def from_dict(cls, json_dict: dict[str, Any]) -> "LeaderboardPerf":
     """Create a LeaderboardPerf from a json dict."""
-    return LeaderboardPerf(
-      json_dict.get("rating", 0),
-      json_dict.get("rd", 0),
-      json_dict.get("prog", 0),
-      json_dict.get("games", 0),
-      json_dict.get("prov", False),
-    )
+    return leaderboard_perf_from_dict(json_dict)
 
 
-@dataclasses.dataclass(frozen=True)
+@dataclasses.dataclass(frozen=True, slots=True)
 class BotPerf:
   """A pair of bot name and LeaderboardPerf."""
 
@@ -147,7 +153,7 @@ class BotPerf:
   perf: LeaderboardPerf
 
 
-@dataclasses.dataclass(frozen=True)
+@dataclasses.dataclass(frozen=True, slots=True)
 class RankInfo:
   """Information related to the bot's rank in the leaderboard row."""
 
@@ -170,18 +176,10 @@ class RankInfo:
   @classmethod
   def from_dict(cls, json_dict: dict[str, Any]) -> "RankInfo":
     """Create a RankInfo from a json dict."""
-    return RankInfo(
-      json_dict.get("rank", 0),
-      json_dict.get("delta_rank", 0),
-      json_dict.get("delta_rating", 0),
-      json_dict.get("delta_games", 0),
-      json_dict.get("peak_rank", 0),
-      json_dict.get("peak_rating", 0),
-      json_dict.get("last_played", 0),
-    )
+    return rank_info_from_dict(json_dict)
 
 
-@dataclasses.dataclass(frozen=True)
+@dataclasses.dataclass(frozen=True, slots=True)
 class LeaderboardRow:
   """Data that is specific to a row on a particular leaderboard."""
 
@@ -195,15 +193,32 @@ class LeaderboardRow:
   @classmethod
   def from_dict(cls, json_dict: dict[str, Any]) -> "LeaderboardRow":
     """Create a LeaderboardRow from a json dict."""
-    return LeaderboardRow(
-      json_dict.get("name", ""),
-      LeaderboardPerf.from_dict(json_dict.get("perf", {})),
-      RankInfo.from_dict(json_dict.get("rank_info", {})),
-    )
+    return leaderboard_row_from_dict(json_dict)
 
   def as_dict(self) -> dict[str, Any]:
     """Return the LeaderboardRow represented as a dict.
 
     Values will only be set if they are not equal to their default values.
     """
-    return default_remover.to_dict_without_defaults(dataclasses.asdict(self))
+    return leaderboard_row_to_dict(self)
+
+
+# Serializers generated from the fields of the dataclasses
+bot_profile_from_dict = serializers.create_from_dict(
+  BotProfile,
+  # If we are loading from json the bot is not new, and assume the bot is offline - this simplifies updates
+  fixed_values={"new": False, "online": False},
+  interned_fields={"name"},
+)
+bot_profile_to_dict = serializers.create_to_dict(BotProfile)
+leaderboard_perf_from_dict = serializers.create_from_dict(LeaderboardPerf)
+rank_info_from_dict = serializers.create_from_dict(RankInfo)
+leaderboard_row_from_dict = serializers.create_from_dict(
+  LeaderboardRow,
+  {"perf": leaderboard_perf_from_dict, "rank_info": rank_info_from_dict},
+  interned_fields={"name"},
+)
+leaderboard_row_to_dict = serializers.create_to_dict(
+  LeaderboardRow,
+  {"perf": serializers.create_to_dict(LeaderboardPerf), "rank_info": serializers.create_to_dict(RankInfo)},
+)
@@ -0,0 +1,53 @@
+"""A store of the leaderboard state which is loaded and saved between generations."""
+
+import abc
+from types import TracebackType
+from typing import Self
+
+from src.leaderboard.data.leaderboard_objects import BotProfile, LeaderboardRow
+from src.leaderboard.li.pert_type import PerfType
+
+
+class LeaderboardStore(abc.ABC):
+  """A store of the bot profiles and the rows of each leaderboard, which is closed when it is used as a context manager."""
+
+  def __enter__(self) -> Self:
+    """Return the store."""
+    return self
+
+  def __exit__(
+    self, exc_type: type[BaseException] | None, exc_value: BaseException | None, traceback: TracebackType | None
+  ) -> None:
+    """Close the store."""
+    self.close()
+
+  @abc.abstractmethod
+  def close(self) -> None:
+    """Release anything the store holds open."""
+    ...
+
+  @abc.abstractmethod
+  def is_empty(self) -> bool:
+    """Return whether nothing has been saved in the store."""
+    ...
+
+  @abc.abstractmethod
+  def load_bot_profiles(self) -> dict[str, BotProfile]:
+    """Load the known bot profiles."""
+    ...
+
+  @abc.abstractmethod
+  def load_leaderboard_rows(self) -> dict[PerfType, list[LeaderboardRow]]:
+    """Load the leaderboard rows of every perf type, sorted by name."""
+    ...
+
+  @abc.abstractmethod
+  def save(self, bot_profiles: list[BotProfile], name_sorted_rows_by_perf_type: dict[PerfType, list[LeaderboardRow]]) -> None:
+    """Save the bot profiles and the rows of the perf types given. The rows of the other perf types are left unchanged."""
+    ...
+
+
+def copy_leaderboard_state(source: LeaderboardStore, target: LeaderboardStore) -> None:
+  """Save everything in the source store to the target store."""
+  bot_profiles = list(source.load_bot_profiles().values())
+  target.save(bot_profiles, source.load_leaderboard_rows())
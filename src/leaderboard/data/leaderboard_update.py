@@ -10,6 +10,8 @@ from src.leaderboard.data.leaderboard_objects import BotPerf, LeaderboardRow, Ra
 class LeaderboardUpdate(abc.ABC):
   """The information required to update a row in the leaderboard."""
 
+  __slots__ = ()
+
   @abc.abstractmethod
   def get_name(self) -> str:
     """Return the bot's name."""
@@ -26,9 +28,18 @@ class LeaderboardUpdate(abc.ABC):
     ...
 
   @abc.abstractmethod
+  def get_prov(self) -> bool:
+    """Return whether the bot's rating is provisional."""
+    ...
+
+  @abc.abstractmethod
+  def get_last_played(self, current_time: int) -> int:
+    """Return the last time the bot played a game for the perf type."""
+    ...
+
   def is_eligible(self, current_time: int) -> bool:
     """Return whether the bot is eligible for the leaderboard."""
-    ...
+    return LeaderboardUpdate.check_is_eligible(self.get_prov(), self.get_last_played(current_time), current_time)
 
   @abc.abstractmethod
   def to_leaderboard_row(self, rank: int, current_time: int) -> LeaderboardRow:
@@ -57,7 +68,7 @@ class LeaderboardUpdate(abc.ABC):
     return not prov and played_in_last_two_weeks
 
 
-@dataclasses.dataclass(frozen=True)
+@dataclasses.dataclass(frozen=True, slots=True)
 class PreviousRowOnlyUpdate(LeaderboardUpdate):
   """Only the previous row was found.
 
@@ -78,9 +89,14 @@ class PreviousRowOnlyUpdate(LeaderboardUpdate):
     """Return the bot's rating deviation."""
     return self.row.perf.rd
 
-  def is_eligible(self, current_time: int) -> bool:
-    """Return whether the bot is eligible for the leaderboard."""
-    return LeaderboardUpdate.check_is_eligible(self.row.perf.prov, self.row.rank_info.last_played, current_time)
+  def get_prov(self) -> bool:
+    """Return whether the bot's rating is provisional."""
+    return self.row.perf.prov
+
+  def get_last_played(self, current_time: int) -> int:
+    """Return the last time the bot played a game for the perf type."""
+    del current_time
+    return self.row.rank_info.last_played
 
   def to_leaderboard_row(self, rank: int, current_time: int) -> LeaderboardRow:
     """Convert the update information into a leaderboard row."""
@@ -95,7 +111,7 @@ class PreviousRowOnlyUpdate(LeaderboardUpdate):
     return LeaderboardRow(self.row.name, self.row.perf, rank_info)
 
 
-@dataclasses.dataclass(frozen=True)
+@dataclasses.dataclass(frozen=True, slots=True)
 class CurrentBotPerfOnlyUpdate(LeaderboardUpdate):
   """Only the current perf was found.
 
@@ -116,9 +132,14 @@ class CurrentBotPerfOnlyUpdate(LeaderboardUpdate):
     """Return the bot's rating deviation."""
     return self.bot_perf.perf.rd
 
-  def is_eligible(self, current_time: int) -> bool:
-    """Return whether the bot is eligible for the leaderboard."""
-    return LeaderboardUpdate.check_is_eligible(self.bot_perf.perf.prov, current_time, current_time)
+  def get_prov(self) -> bool:
+    """Return whether the bot's rating is provisional."""
+    return self.bot_perf.perf.prov
+
+  def get_last_played(self, current_time: int) -> int:
+    """Return the last time the bot played a game for the perf type."""
+    # We don't actually know when the last played was in this case, so give the bot the benefit of the doubt.
+    return current_time
 
   def to_leaderboard_row(self, rank: int, current_time: int) -> LeaderboardRow:
     """Convert the update information into a leaderboard row."""
@@ -133,7 +154,7 @@ class CurrentBotPerfOnlyUpdate(LeaderboardUpdate):
     return LeaderboardRow(self.bot_perf.name, self.bot_perf.perf, rank_info)
 
 
-@dataclasses.dataclass(frozen=True)
+@dataclasses.dataclass(frozen=True, slots=True)
 class FullUpdate(LeaderboardUpdate):
   """The bot is already on the leaderboard and we have new data."""
 
@@ -159,10 +180,14 @@ class FullUpdate(LeaderboardUpdate):
     last_played = current_time if delta_games else self.previous_row.rank_info.last_played
     return delta_games, last_played
 
-  def is_eligible(self, current_time: int) -> bool:
-    """Return whether the bot is eligible for the leaderboard."""
+  def get_prov(self) -> bool:
+    """Return whether the bot's rating is provisional."""
+    return self.current_bot_perf.perf.prov
+
+  def get_last_played(self, current_time: int) -> int:
+    """Return the last time the bot played a game for the perf type."""
     _, last_played = self.get_delta_games_and_last_played(current_time)
-    return LeaderboardUpdate.check_is_eligible(self.current_bot_perf.perf.prov, last_played, current_time)
+    return last_played
 
   def to_leaderboard_row(self, rank: int, current_time: int) -> LeaderboardRow:
     """Convert the update information into a leaderboard row."""
@@ -0,0 +1,240 @@
+"""An append-only history of the rating and rank of every bot in every leaderboard.
+
+Each generation appends a record for each row whose rating, rd, games or rank changed since the previous generation (or for
+every row if the history is empty). The fields of the records are stored in separate fixed-width little-endian columns in
+leaderboard_data/history, with the bots identified by their ids in the BotRegistry. Each record also stores the index of the
+previous record of the same bot and perf type, so with the index of the latest record of each bot and perf type (the heads)
+a bot's series is read by following its records backwards, in time proportional to the length of the series.
+
+The heads are saved next to the columns after each generation, so that a generation only reads the heads instead of the whole
+history. They are stamped with the number of records they were built from, and are only rebuilt from the columns when they
+are missing or out of date.
+"""
+
+import bisect
+import dataclasses
+import struct
+import sys
+from array import array
+
+from src.leaderboard.data.bot_registry import BotRegistry
+from src.leaderboard.data.leaderboard_objects import LeaderboardRow
+from src.leaderboard.fs import file_paths
+from src.leaderboard.fs.file_system import FileSystem
+from src.leaderboard.li.pert_type import PerfType
+
+
+# The typecode of each column of the records
+RECORD_COLUMNS = {
+  "perf_type": "B",
+  "bot_id": "I",
+  "rating": "i",
+  "rd": "i",
+  "games": "i",
+  "rank": "i",
+  # The index of the previous record of the same bot and perf type, or -1 if there is none
+  "previous": "i",
+}
+# The typecode of each column of the generations
+GENERATION_COLUMNS = {
+  "generation_number": "q",
+  "generation_time": "q",
+  # The index of the first record of the generation
+  "generation_start": "I",
+}
+# The number of records the heads were built from
+HEADS_HEADER = struct.Struct("<q")
+
+
+def to_little_endian_bytes(values: "array[int]") -> bytes:
+  """Return the bytes of an array in little-endian order."""
+  if sys.byteorder == "big":  # pragma: no cover - depends on the platform
+    values = array(values.typecode, values)
+    values.byteswap()
+  return values.tobytes()
+
+
+def from_little_endian_bytes(typecode: str, contents: bytes | memoryview) -> "array[int]":
+  """Return the array of the values of a typecode in little-endian bytes."""
+  values: array[int] = array(typecode)
+  values.frombytes(contents)
+  if sys.byteorder == "big":  # pragma: no cover - depends on the platform
+    values.byteswap()
+  return values
+
+
+def get_head_key(bot_id: int, perf_type: PerfType) -> int:
+  """Return the key of a bot and perf type in the heads."""
+  return bot_id << 8 | perf_type.value
+
+
+def select_changed_rows(previous_rows: list[LeaderboardRow], rows: list[LeaderboardRow]) -> list[LeaderboardRow]:
+  """Return the rows which are new or whose rating, rd, games or rank differ from the bot's previous row."""
+  previous_rows_by_name = {row.name: row for row in previous_rows}
+  changed_rows: list[LeaderboardRow] = []
+  for row in rows:
+    previous_row = previous_rows_by_name.get(row.name)
+    if (
+      not previous_row
+      or previous_row.perf.rating != row.perf.rating
+      or previous_row.perf.rd != row.perf.rd
+      or previous_row.perf.games != row.perf.games
+      or previous_row.rank_info.rank != row.rank_info.rank
+    ):
+      changed_rows.append(row)
+  return changed_rows
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class HistoryPoint:
+  """The rating and rank of a bot in one leaderboard as of one generation."""
+
+  # The generation number
+  generation: int
+  # The time of the generation (seconds since epoch)
+  time: int
+  # The bot's rating
+  rating: int
+  # The bot's rating deviation
+  rd: int
+  # The number of games the bot has played
+  games: int
+  # The bot's rank on the leaderboard, or 0 if it was not eligible
+  rank: int
+
+
+class RatingHistory:
+  """The history of the ratings and ranks of the bots, stored in the columns of a file system."""
+
+  def __init__(self, file_system: FileSystem, registry: BotRegistry | None = None) -> None:
+    """Initialize a history which reads and writes the files of a file system. Nothing is read until it is needed.
+
+    The bots are identified by the ids of the registry, which is the registry of the file system by default.
+    """
+    self.file_system = file_system
+    self.registry = registry or BotRegistry(file_system)
+    self.heads: dict[int, int] | None = None
+
+  def get_record_count(self) -> int:
+    """Return the number of records in the history."""
+    previous_column = self.file_system.map_bytes(file_paths.history_path("previous"))
+    return len(previous_column) // 4 if previous_column else 0
+
+  def load_column(self, column: str) -> "array[int]":
+    """Load all of the values of a column."""
+    typecode = RECORD_COLUMNS.get(column) or GENERATION_COLUMNS[column]
+    return from_little_endian_bytes(typecode, self.file_system.read_bytes(file_paths.history_path(column)) or b"")
+
+  def get_heads(self) -> dict[int, int]:
+    """Return the index of the latest record of each bot and perf type, rebuilding the saved heads if they are out of date."""
+    if self.heads is None:
+      record_count = self.get_record_count()
+      heads_bytes = self.file_system.read_bytes(file_paths.history_heads_path())
+      if heads_bytes and HEADS_HEADER.unpack_from(heads_bytes)[0] == record_count:
+        values = from_little_endian_bytes("q", memoryview(heads_bytes)[HEADS_HEADER.size :])
+        head_count = len(values) // 2
+        self.heads = dict(zip(values[:head_count], values[head_count:], strict=True))
+      else:
+        bot_ids = self.load_column("bot_id")
+        perf_types = self.load_column("perf_type")
+        self.heads = {
+          bot_id << 8 | perf_type: index for index, (bot_id, perf_type) in enumerate(zip(bot_ids, perf_types, strict=True))
+        }
+        self.save_heads()
+    return self.heads
+
+  def save_heads(self) -> None:
+    """Save the heads as of the current number of records."""
+    heads = self.get_heads()
+    values = array("q", heads.keys())
+    values.extend(heads.values())
+    heads_bytes = HEADS_HEADER.pack(self.get_record_count()) + to_little_endian_bytes(values)
+    self.file_system.write_bytes(file_paths.history_heads_path(), heads_bytes)
+
+  def append_rows(
+    self, generation_number: int, current_time: int, rows_by_perf_type: dict[PerfType, list[LeaderboardRow]]
+  ) -> int:
+    """Append a record of each row as a generation and return the number of records appended.
+
+    The heads are updated but not saved, so that many generations can be appended before saving them once.
+    """
+    record_count = self.get_record_count()
+    heads = self.get_heads()
+    columns: dict[str, array[int]] = {column: array(typecode) for column, typecode in RECORD_COLUMNS.items()}
+    for perf_type, rows in rows_by_perf_type.items():
+      bot_ids = self.registry.register(row.name for row in rows)
+      for row, bot_id in zip(rows, bot_ids, strict=True):
+        head_key = get_head_key(bot_id, perf_type)
+        columns["perf_type"].append(perf_type.value)
+        columns["bot_id"].append(bot_id)
+        columns["rating"].append(row.perf.rating)
+        columns["rd"].append(row.perf.rd)
+        columns["games"].append(row.perf.games)
+        columns["rank"].append(row.rank_info.rank)
+        columns["previous"].append(heads.get(head_key, -1))
+        heads[head_key] = record_count + len(columns["previous"]) - 1
+    generation_values = (generation_number, current_time, record_count)
+    for (column, typecode), value in zip(GENERATION_COLUMNS.items(), generation_values, strict=True):
+      self.file_system.append_bytes(file_paths.history_path(column), to_little_endian_bytes(array(typecode, (value,))))
+    # The previous column is appended last, as it determines the number of records
+    for column, values in columns.items():
+      self.file_system.append_bytes(file_paths.history_path(column), to_little_endian_bytes(values))
+    return len(columns["previous"])
+
+  def append_generation(
+    self,
+    generation_number: int,
+    current_time: int,
+    previous_rows_by_perf_type: dict[PerfType, list[LeaderboardRow]],
+    rows_by_perf_type: dict[PerfType, list[LeaderboardRow]],
+  ) -> int:
+    """Append the records of the rows which changed since the previous rows and return the number of records appended.
+
+    If the history is empty, every row is recorded.
+    """
+    changed_rows_by_perf_type = (
+      {
+        perf_type: select_changed_rows(previous_rows_by_perf_type.get(perf_type, []), rows)
+        for perf_type, rows in rows_by_perf_type.items()
+      }
+      if self.get_record_count()
+      else rows_by_perf_type
+    )
+    appended_count = self.append_rows(generation_number, current_time, changed_rows_by_perf_type)
+    self.save_heads()
+    return appended_count
+
+  def load_series(self, name: str, perf_type: PerfType) -> list[HistoryPoint]:
+    """Return the recorded ratings and ranks of a bot in the leaderboard of a perf type, oldest first."""
+    bot_id = self.registry.get_id(name)
+    if bot_id is None:
+      return []
+    record = self.get_heads().get(get_head_key(bot_id, perf_type), -1)
+    if record < 0:
+      return []
+    generation_numbers = self.load_column("generation_number")
+    generation_times = self.load_column("generation_time")
+    generation_starts = self.load_column("generation_start")
+    views = {column: self.file_system.map_bytes(file_paths.history_path(column)) or b"" for column in RECORD_COLUMNS}
+    readers = {column: struct.Struct(f"<{typecode}") for column, typecode in RECORD_COLUMNS.items()}
+
+    def read(column: str, index: int) -> int:
+      reader = readers[column]
+      return reader.unpack_from(views[column], index * reader.size)[0]
+
+    points: list[HistoryPoint] = []
+    while record >= 0:
+      generation_index = bisect.bisect_right(generation_starts, record) - 1
+      points.append(
+        HistoryPoint(
+          generation_numbers[generation_index],
+          generation_times[generation_index],
+          read("rating", record),
+          read("rd", record),
+          read("games", record),
+          read("rank", record),
+        )
+      )
+      record = read("previous", record)
+    points.reverse()
+    return points
@@ -0,0 +1,72 @@
+"""Module providing serializers generated from the fields of dataclasses.
+
+The generated to_dict functions produce the same dict as default_remover.to_dict_without_defaults(dataclasses.asdict(obj)),
+but read each field once and leave out unset/default values directly, without copying the dataclass first. The generated
+from_dict functions read each field with json_dict.get and the default of the field's type.
+"""
+
+import dataclasses
+import sys
+from collections.abc import Callable, Collection
+from typing import Any, TypeVar
+
+
+T = TypeVar("T")
+
+
+def compile_function(source: str, function_name: str, namespace: dict[str, Any]) -> Any:  # noqa: ANN401 - generated code
+  """Compile the source of a function and return the function."""
+  exec(source, namespace)  # noqa: S102 - the source is generated from dataclass field names
+  return namespace[function_name]
+
+
+def create_to_dict(
+  data_class: type[T], nested_to_dicts: dict[str, Callable[[Any], dict[str, Any]]] | None = None
+) -> Callable[[T], dict[str, Any]]:
+  """Generate a function which converts a dataclass into a dict, but leaves out unset/default values.
+
+  Fields which hold dataclasses are converted with the function in nested_to_dicts for that field.
+  """
+  nested_to_dicts = nested_to_dicts or {}
+  lines = ["def to_dict(obj):", "  result = {}"]
+  for field in dataclasses.fields(data_class):  # pyright: ignore[reportArgumentType] - T is always a dataclass
+    getter = f"obj.{field.name}"
+    value = f"nested_{field.name}({getter})" if field.name in nested_to_dicts else getter
+    lines.extend((f"  value = {value}", "  if value:", f"    result[{field.name!r}] = value"))
+  lines.append("  return result")
+  namespace = {f"nested_{name}": to_dict for name, to_dict in nested_to_dicts.items()}
+  return compile_function("\n".join(lines), "to_dict", namespace)
+
+
+def create_from_dict(
+  data_class: type[T],
+  nested_from_dicts: dict[str, Callable[[dict[str, Any]], Any]] | None = None,
+  fixed_values: dict[str, Any] | None = None,
+  interned_fields: Collection[str] = (),
+) -> Callable[[dict[str, Any]], T]:
+  """Generate a function which creates a dataclass from a json dict.
+
+  Missing values default to the empty value of the field's type. Fields which hold dataclasses are created with the function
+  in nested_from_dicts for that field, fields in fixed_values are not read from the json dict, and the strings of the fields in
+  interned_fields are interned.
+  """
+  nested_from_dicts = nested_from_dicts or {}
+  fixed_values = fixed_values or {}
+  namespace: dict[str, Any] = {"data_class": data_class, "intern": sys.intern}
+  arguments: list[str] = []
+  for field in dataclasses.fields(data_class):  # pyright: ignore[reportArgumentType] - T is always a dataclass
+    name = field.name
+    if name in fixed_values:
+      namespace[f"fixed_{name}"] = fixed_values[name]
+      arguments.append(f"fixed_{name}")
+    elif name in nested_from_dicts:
+      namespace[f"nested_{name}"] = nested_from_dicts[name]
+      arguments.append(f"nested_{name}(get({name!r}) or {{}})")
+    else:
+      if field.type not in {str, int, bool}:
+        error_msg = f"Cannot generate from_dict for {data_class.__name__}.{name} of type {field.type}"
+        raise ValueError(error_msg)
+      value = f"get({name!r}, {field.type()!r})"
+      arguments.append(f"intern({value})" if name in interned_fields else value)
+  lines = ["def from_dict(json_dict):", "  get = json_dict.get", f"  return data_class({', '.join(arguments)})"]
+  return compile_function("\n".join(lines), "from_dict", namespace)
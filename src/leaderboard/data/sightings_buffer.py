@@ -0,0 +1,98 @@
+"""A buffer of the bots which have been seen online since the leaderboards were last generated.
+
+Polling the online bots several times between generations means that bots which are only online for a short time are not
+missed. Each poll is folded into the buffer, which holds at most one entry per bot no matter how many polls happen.
+"""
+
+import json
+from collections.abc import Iterable
+
+from src.leaderboard.fs import file_paths
+from src.leaderboard.fs.file_system import FileSystem
+from src.leaderboard.li.bot_user import BotUser
+
+
+def merge_sightings(previous: BotUser, current: BotUser) -> BotUser:
+  """Merge two sightings of the same bot.
+
+  The profile of the most recent sighting is used. For each perf type, the perf of the most recent sighting which includes it
+  is used.
+  """
+  newer, older = (current, previous) if current.seen_at >= previous.seen_at else (previous, current)
+  return BotUser(
+    newer.username,
+    newer.flair,
+    newer.flag,
+    newer.created_at,
+    newer.seen_at,
+    newer.patron,
+    newer.tos_violation,
+    older.perf_table.updated_with(newer.perf_table),
+  )
+
+
+class SightingsBuffer:
+  """The most recent sighting of each bot, keyed by the bot's name."""
+
+  def __init__(self, bot_users: Iterable[BotUser] = ()) -> None:
+    """Create a buffer containing the bot users."""
+    self.bot_users_by_name: dict[str, BotUser] = {}
+    self.add_all(bot_users)
+
+  def __len__(self) -> int:
+    """Return the number of bots in the buffer."""
+    return len(self.bot_users_by_name)
+
+  def add(self, bot_user: BotUser) -> None:
+    """Fold a sighting of a bot into the buffer."""
+    previous = self.bot_users_by_name.get(bot_user.username)
+    self.bot_users_by_name[bot_user.username] = merge_sightings(previous, bot_user) if previous else bot_user
+
+  def add_all(self, bot_users: Iterable[BotUser]) -> None:
+    """Fold several sightings into the buffer."""
+    for bot_user in bot_users:
+      self.add(bot_user)
+
+  def discard(self, bot_user: BotUser) -> None:
+    """Remove a bot from the buffer if its sighting is bot_user, so that a more recent sighting is kept."""
+    if self.bot_users_by_name.get(bot_user.username) == bot_user:
+      del self.bot_users_by_name[bot_user.username]
+
+  def get_bot_users(self) -> list[BotUser]:
+    """Return the most recent sighting of each bot."""
+    return list(self.bot_users_by_name.values())
+
+  @classmethod
+  def from_ndjson(cls, ndjson: str) -> "SightingsBuffer":
+    """Create a buffer from the ndjson representation."""
+    return SightingsBuffer(BotUser.from_json(bot_json) for bot_json in ndjson.splitlines() if bot_json)
+
+  def to_ndjson(self) -> str:
+    """Return the buffer represented as ndjson in the same format as the lichess API."""
+    return "".join(
+      f"{json.dumps(bot_user.to_json_dict(), separators=(',', ':'))}\n" for bot_user in self.bot_users_by_name.values()
+    )
+
+
+def load_sightings_buffer(file_system: FileSystem) -> SightingsBuffer:
+  """Load the sightings buffer. The buffer is empty if it has not been saved."""
+  return SightingsBuffer.from_ndjson(file_system.read_file(file_paths.sightings_path()) or "")
+
+
+def save_sightings_buffer(file_system: FileSystem, sightings_buffer: SightingsBuffer) -> None:
+  """Save the sightings buffer, replacing the previous buffer."""
+  file_system.write_file(file_paths.sightings_path(), sightings_buffer.to_ndjson())
+
+
+def consume_sightings(file_system: FileSystem, consumed_buffer: SightingsBuffer) -> None:
+  """Remove the sightings of consumed_buffer from the saved buffer.
+
+  The saved buffer is loaded again, so the sightings which a poller saved after consumed_buffer was loaded are kept for the
+  next generation.
+  """
+  if not len(consumed_buffer):
+    return
+  buffer = load_sightings_buffer(file_system)
+  for bot_user in consumed_buffer.get_bot_users():
+    buffer.discard(bot_user)
+  save_sightings_buffer(file_system, buffer)
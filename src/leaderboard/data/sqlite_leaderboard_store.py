@@ -0,0 +1,198 @@
+"""A store of the leaderboard state in a SQLite database.
+
+The store remembers the values it last loaded or saved, so saving only writes the bot profiles and rows which changed. The
+rows are keyed by (perf_type, name), and indexed by (perf_type, rank) for reading the top of a leaderboard.
+"""
+
+import sqlite3
+import sys
+from pathlib import Path
+
+from src.leaderboard.data.data_generator import is_sorted_by_name, name_sort_key
+from src.leaderboard.data.leaderboard_objects import BotProfile, LeaderboardPerf, LeaderboardRow, RankInfo
+from src.leaderboard.data.leaderboard_store import LeaderboardStore
+from src.leaderboard.li.pert_type import PerfType
+
+
+# The values of a bot profile as stored: name, flair, flag, created, last_seen, patron, tos_violation
+BotProfileValues = tuple[str, str, str, int, int, bool, bool]
+# The values of a row as stored: perf_type, name, the perf fields and the rank info fields
+RowValues = tuple[str, str, int, int, int, int, bool, int, int, int, int, int, int, int]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS bot_profiles (
+  name TEXT PRIMARY KEY,
+  flair TEXT NOT NULL,
+  flag TEXT NOT NULL,
+  created INTEGER NOT NULL,
+  last_seen INTEGER NOT NULL,
+  patron INTEGER NOT NULL,
+  tos_violation INTEGER NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS leaderboard_rows (
+  perf_type TEXT NOT NULL,
+  name TEXT NOT NULL,
+  rating INTEGER NOT NULL,
+  rd INTEGER NOT NULL,
+  prog INTEGER NOT NULL,
+  games INTEGER NOT NULL,
+  prov INTEGER NOT NULL,
+  rank INTEGER NOT NULL,
+  delta_rank INTEGER NOT NULL,
+  delta_rating INTEGER NOT NULL,
+  delta_games INTEGER NOT NULL,
+  peak_rank INTEGER NOT NULL,
+  peak_rating INTEGER NOT NULL,
+  last_played INTEGER NOT NULL,
+  PRIMARY KEY (perf_type, name)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS leaderboard_rows_by_rank ON leaderboard_rows (perf_type, rank);
+"""
+
+
+def bot_profile_to_values(bot_profile: BotProfile) -> BotProfileValues:
+  """Return the stored values of a bot profile. Whether the bot is new or online is not stored."""
+  return (
+    bot_profile.name,
+    bot_profile.flair,
+    bot_profile.flag,
+    bot_profile.created,
+    bot_profile.last_seen,
+    bot_profile.patron,
+    bot_profile.tos_violation,
+  )
+
+
+def bot_profile_from_values(values: BotProfileValues) -> BotProfile:
+  """Create a bot profile from its stored values. As with BotProfile.from_dict, the bot is not new and is offline."""
+  name, flair, flag, created, last_seen, patron, tos_violation = values
+  return BotProfile(sys.intern(name), flair, flag, created, last_seen, bool(patron), bool(tos_violation), False, False)
+
+
+def row_to_values(perf_type: PerfType, row: LeaderboardRow) -> RowValues:
+  """Return the stored values of a row."""
+  perf = row.perf
+  rank_info = row.rank_info
+  return (
+    perf_type.to_string(),
+    row.name,
+    perf.rating,
+    perf.rd,
+    perf.prog,
+    perf.games,
+    perf.prov,
+    rank_info.rank,
+    rank_info.delta_rank,
+    rank_info.delta_rating,
+    rank_info.delta_games,
+    rank_info.peak_rank,
+    rank_info.peak_rating,
+    rank_info.last_played,
+  )
+
+
+def row_from_values(values: RowValues) -> LeaderboardRow:
+  """Create a row from its stored values."""
+  (
+    _,
+    name,
+    rating,
+    rd,
+    prog,
+    games,
+    prov,
+    rank,
+    delta_rank,
+    delta_rating,
+    delta_games,
+    peak_rank,
+    peak_rating,
+    last_played,
+  ) = values
+  return LeaderboardRow(
+    sys.intern(name),
+    LeaderboardPerf(rating, rd, prog, games, bool(prov)),
+    RankInfo(rank, delta_rank, delta_rating, delta_games, peak_rank, peak_rating, last_played),
+  )
+
+
+class SqliteLeaderboardStore(LeaderboardStore):
+  """Store the bot profiles and the rows of each leaderboard in a SQLite database."""
+
+  def __init__(self, database: Path | str) -> None:
+    """Open (and create if needed) the database at a path, or an in-memory database if database is ":memory:"."""
+    if database != ":memory:":
+      Path(database).parent.mkdir(parents=True, exist_ok=True)
+    self.connection = sqlite3.connect(database)
+    self.connection.executescript(SCHEMA)
+    # The values last loaded from or saved to the database
+    self.saved_profile_values: dict[str, BotProfileValues] | None = None
+    self.saved_row_values_by_perf_type: dict[PerfType, dict[str, RowValues]] = {}
+
+  def close(self) -> None:
+    """Close the database connection."""
+    self.connection.close()
+
+  def is_empty(self) -> bool:
+    """Return whether no bot profiles have been saved."""
+    return self.connection.execute("SELECT 1 FROM bot_profiles LIMIT 1").fetchone() is None
+
+  def get_saved_profile_values(self) -> dict[str, BotProfileValues]:
+    """Return the stored values of every bot profile by name."""
+    if self.saved_profile_values is None:
+      rows: list[BotProfileValues] = self.connection.execute("SELECT * FROM bot_profiles").fetchall()
+      self.saved_profile_values = {values[0]: values for values in rows}
+    return self.saved_profile_values
+
+  def get_saved_row_values(self, perf_type: PerfType) -> dict[str, RowValues]:
+    """Return the stored values of every row of a perf type by name, in name_sort_key order for ascii names."""
+    if perf_type not in self.saved_row_values_by_perf_type:
+      rows: list[RowValues] = self.connection.execute(
+        "SELECT * FROM leaderboard_rows WHERE perf_type = ? ORDER BY lower(name), name", (perf_type.to_string(),)
+      ).fetchall()
+      self.saved_row_values_by_perf_type[perf_type] = {values[1]: values for values in rows}
+    return self.saved_row_values_by_perf_type[perf_type]
+
+  def load_bot_profiles(self) -> dict[str, BotProfile]:
+    """Load the known bot profiles."""
+    return {name: bot_profile_from_values(values) for name, values in self.get_saved_profile_values().items()}
+
+  def load_leaderboard_rows(self) -> dict[PerfType, list[LeaderboardRow]]:
+    """Load the leaderboard rows of every perf type, sorted by name."""
+    rows_by_perf_type: dict[PerfType, list[LeaderboardRow]] = {}
+    for perf_type in PerfType.all_except_unknown():
+      rows = [row_from_values(values) for values in self.get_saved_row_values(perf_type).values()]
+      # The database orders like name_sort_key, except that its lower() only lowercases ascii letters, so names with other
+      # letters (which lichess usernames cannot have) may need sorting
+      if not is_sorted_by_name(row.name for row in rows):
+        rows.sort(key=lambda row: name_sort_key(row.name))
+      rows_by_perf_type[perf_type] = rows
+    return rows_by_perf_type
+
+  def save(self, bot_profiles: list[BotProfile], name_sorted_rows_by_perf_type: dict[PerfType, list[LeaderboardRow]]) -> None:
+    """Write the bot profiles and rows which changed since they were last loaded or saved, in one transaction."""
+    saved_profile_values = self.get_saved_profile_values()
+    profile_values = {bot_profile.name: bot_profile_to_values(bot_profile) for bot_profile in bot_profiles}
+    changed_row_values: list[RowValues] = []
+    removed_row_keys: list[tuple[str, str]] = []
+    row_values_by_perf_type: dict[PerfType, dict[str, RowValues]] = {}
+    for perf_type, rows in name_sorted_rows_by_perf_type.items():
+      saved_row_values = self.get_saved_row_values(perf_type)
+      row_values = {row.name: row_to_values(perf_type, row) for row in rows}
+      changed_row_values.extend(values for name, values in row_values.items() if saved_row_values.get(name) != values)
+      removed_row_keys.extend((perf_type.to_string(), name) for name in saved_row_values.keys() - row_values.keys())
+      row_values_by_perf_type[perf_type] = row_values
+    with self.connection:
+      self.connection.executemany(
+        "INSERT OR REPLACE INTO bot_profiles VALUES (?, ?, ?, ?, ?, ?, ?)",
+        (values for name, values in profile_values.items() if saved_profile_values.get(name) != values),
+      )
+      self.connection.executemany(
+        "DELETE FROM bot_profiles WHERE name = ?", ((name,) for name in saved_profile_values.keys() - profile_values.keys())
+      )
+      self.connection.executemany(
+        "INSERT OR REPLACE INTO leaderboard_rows VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", changed_row_values
+      )
+      self.connection.executemany("DELETE FROM leaderboard_rows WHERE perf_type = ? AND name = ?", removed_row_keys)
+    self.saved_profile_values = profile_values
+    self.saved_row_values_by_perf_type.update(row_values_by_perf_type)
@@ -0,0 +1,66 @@
+"""A NumPy implementation of create_ranked_rows.
+
+The sort keys and eligibility of every update are packed into arrays, ordered with a single lexsort, and the 1224 ranks are
+computed in one vectorized pass. The result is identical to data_generator.create_ranked_rows.
+
+numpy is optional. Use is_available to check whether it is installed. It is imported by name, so that the type checker sees
+a module whose members are Any whether or not numpy is installed.
+"""
+
+import importlib
+
+from src.leaderboard.chrono.durations import TWO_WEEKS
+from src.leaderboard.data.data_generator import BotColumns
+from src.leaderboard.data.leaderboard_objects import LeaderboardRow
+from src.leaderboard.data.leaderboard_update import LeaderboardUpdate
+
+
+try:
+  np = importlib.import_module("numpy")
+except ImportError:  # pragma: no cover - depends on the environment
+  np = None
+
+
+def is_available() -> bool:
+  """Return True if numpy is installed."""
+  return np is not None
+
+
+def create_ranked_rows(updates: list[LeaderboardUpdate], bot_columns: BotColumns, current_time: int) -> list[LeaderboardRow]:
+  """Create the leaderboard rows for each perf type based on a list of updates."""
+  if not np:
+    error_msg = "The numpy ranking engine requires numpy"
+    raise ValueError(error_msg)
+  count = len(updates)
+  names = [update.get_name() for update in updates]
+  id_by_name = bot_columns.id_by_name
+  bot_ids = np.fromiter((id_by_name[name] for name in names), np.int64, count)
+
+  # Pack the sort keys and the inputs to eligibility into arrays
+  ratings = np.fromiter((update.get_rating() for update in updates), np.int64, count)
+  rds = np.fromiter((update.get_rd() for update in updates), np.int64, count)
+  created = np.array(bot_columns.created, np.int64)[bot_ids]
+  bot_profile_eligible = np.array(bot_columns.eligible, np.bool_)[bot_ids]
+  prov = np.fromiter((update.get_prov() for update in updates), np.bool_, count)
+  last_played = np.fromiter((update.get_last_played(current_time) for update in updates), np.int64, count)
+  # Unicode arrays compare by code point, like str
+  name_keys = np.array(names, dtype=np.str_)
+  lower_name_keys = np.array([name.lower() for name in names], dtype=np.str_)
+
+  # The last key is the primary key: rating descending, rd, created time, then name in lowercase and name for tie breaks
+  order = np.lexsort((name_keys, lower_name_keys, created, rds, -ratings))
+
+  # Same eligibility as LeaderboardUpdate.is_eligible, for the bots whose profiles are eligible
+  eligible = bot_profile_eligible & ~prov & (current_time - last_played <= TWO_WEEKS)
+  sorted_eligible = eligible[order]
+  eligible_ratings = ratings[order][sorted_eligible]
+  # 1224 ranking: each bot gets the rank of the first eligible bot with the same rating. As in create_ranked_rows, the rating
+  # before the first bot is taken to be 0, so leading bots with a rating of 0 are not ranked.
+  previous_ratings = np.concatenate((np.zeros(1, np.int64), eligible_ratings[:-1]))
+  run_starts = np.where(eligible_ratings != previous_ratings, np.arange(1, eligible_ratings.size + 1), 0)
+  sorted_ranks = np.zeros(count, np.int64)
+  sorted_ranks[sorted_eligible] = np.maximum.accumulate(run_starts) if run_starts.size else run_starts
+
+  sorted_indices: list[int] = order.tolist()
+  ranks: list[int] = sorted_ranks.tolist()
+  return [updates[index].to_leaderboard_row(rank, current_time) for index, rank in zip(sorted_indices, ranks, strict=True)]
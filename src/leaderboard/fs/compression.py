@@ -0,0 +1,96 @@
+"""Module containing functions for compressing files.
+
+gzip is always available. zstd is used when the zstandard package is installed. zstandard is imported by name, so that the
+type checker does not depend on whether it is installed.
+"""
+
+import gzip
+import importlib
+import io
+
+
+try:
+  zstandard = importlib.import_module("zstandard")
+except ImportError:  # pragma: no cover - depends on the environment
+  zstandard = None
+
+
+# A good balance between speed and size for text
+GZIP_COMPRESS_LEVEL = 6
+# Compresses ndjson much better than gzip while still being fast
+ZSTD_COMPRESS_LEVEL = 10
+
+GZIP_EXTENSION = ".gz"
+ZSTD_EXTENSION = ".zst"
+
+# The first bytes of compressed data, used to detect the format
+ZSTD_MAGIC_NUMBER = b"\x28\xb5\x2f\xfd"
+
+
+def compress(data: bytes) -> bytes:
+  """Compress data with gzip."""
+  return gzip.compress(data, compresslevel=GZIP_COMPRESS_LEVEL, mtime=0)
+
+
+def create_compressed_writer(file: io.BufferedIOBase) -> io.BufferedIOBase:
+  """Return a file which compresses what is written to it into file with gzip. The data is complete once it is closed."""
+  return gzip.GzipFile(fileobj=file, mode="wb", compresslevel=GZIP_COMPRESS_LEVEL, mtime=0)
+
+
+def create_compressed_writer_for_extension(file: io.BufferedIOBase, extension: str) -> io.BufferedIOBase:
+  """Return a file which compresses what is written to it into file in the format corresponding to a file extension.
+
+  The data is complete once it is closed, which leaves file open.
+  """
+  if extension == GZIP_EXTENSION:
+    return create_compressed_writer(file)
+  if extension == ZSTD_EXTENSION:
+    if not zstandard:
+      error_msg = "zstd compression requires the zstandard package"
+      raise ValueError(error_msg)
+    return zstandard.ZstdCompressor(level=ZSTD_COMPRESS_LEVEL).stream_writer(file, closefd=False)
+  error_msg = f"Unknown compression extension: {extension}"
+  raise ValueError(error_msg)
+
+
+def compress_zstd(data: bytes) -> bytes:
+  """Compress data with zstd."""
+  if not zstandard:
+    error_msg = "zstd compression requires the zstandard package"
+    raise ValueError(error_msg)
+  return zstandard.ZstdCompressor(level=ZSTD_COMPRESS_LEVEL).compress(data)
+
+
+def get_preferred_extension() -> str:
+  """Return the extension of the best available compression format."""
+  return ZSTD_EXTENSION if zstandard else GZIP_EXTENSION
+
+
+def compress_for_extension(data: bytes, extension: str) -> bytes:
+  """Compress data in the format corresponding to a file extension (".gz" or ".zst")."""
+  if extension == GZIP_EXTENSION:
+    return compress(data)
+  if extension == ZSTD_EXTENSION:
+    return compress_zstd(data)
+  error_msg = f"Unknown compression extension: {extension}"
+  raise ValueError(error_msg)
+
+
+def decompress(data: bytes) -> bytes:
+  """Decompress data which was compressed with gzip or zstd."""
+  if data.startswith(ZSTD_MAGIC_NUMBER):
+    if not zstandard:
+      error_msg = "zstd decompression requires the zstandard package"
+      raise ValueError(error_msg)
+    return zstandard.ZstdDecompressor().decompress(data)
+  return gzip.decompress(data)
+
+
+def open_decompressed(data: bytes) -> io.BufferedIOBase:
+  """Return a file which decompresses data which was compressed with gzip or zstd.
+
+  gzip is decompressed as the file is read, zstd is decompressed all at once.
+  """
+  if data.startswith(ZSTD_MAGIC_NUMBER):
+    return io.BytesIO(decompress(data))
+  return gzip.GzipFile(fileobj=io.BytesIO(data))
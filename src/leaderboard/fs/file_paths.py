@@ -4,6 +4,8 @@ from src.leaderboard.li.pert_type import PerfType
 
 
 LEADERBOARD_DATA_DIR = "leaderboard_data"
+# Files which are only needed locally between runs and which are not committed
+LEADERBOARD_CACHE_DIR = "leaderboard_cache"
 
 
 def bot_profiles_path() -> str:
@@ -11,6 +13,16 @@ def bot_profiles_path() -> str:
   return f"{LEADERBOARD_DATA_DIR}/bot_profiles.json"
 
 
+def bot_archive_path() -> str:
+  """Return "leaderboard_data/bot_archive.json.gz"."""
+  return f"{LEADERBOARD_DATA_DIR}/bot_archive.json.gz"
+
+
+def bot_ids_path() -> str:
+  """Return "leaderboard_data/bot_ids.txt"."""
+  return f"{LEADERBOARD_DATA_DIR}/bot_ids.txt"
+
+
 def data_path(perf_type: PerfType) -> str:
   """Return "leaderboard_data/{perf_type.to_string()}.json"."""
   return f"{LEADERBOARD_DATA_DIR}/{perf_type.to_string()}.json"
@@ -21,6 +33,74 @@ def generation_number_path() -> str:
   return f"{LEADERBOARD_DATA_DIR}/generation_number.txt"
 
 
+def generations_dir() -> str:
+  """Return "leaderboard_data/generations"."""
+  return f"{LEADERBOARD_DATA_DIR}/generations"
+
+
+def generation_record_path(record_number: int) -> str:
+  """Return "leaderboard_data/generations/{record_number:08d}.json"."""
+  return f"{generations_dir()}/{record_number:08d}.json"
+
+
+def history_dir() -> str:
+  """Return "leaderboard_data/history"."""
+  return f"{LEADERBOARD_DATA_DIR}/history"
+
+
+def history_path(column: str) -> str:
+  """Return "leaderboard_data/history/{column}.bin"."""
+  return f"{history_dir()}/{column}.bin"
+
+
+def history_heads_path() -> str:
+  """Return "leaderboard_data/history/heads.bin"."""
+  return f"{history_dir()}/heads.bin"
+
+
+def eligibility_expiry_path() -> str:
+  """Return "leaderboard_data/eligibility_expiry.bin"."""
+  return f"{LEADERBOARD_DATA_DIR}/eligibility_expiry.bin"
+
+
+def sightings_path() -> str:
+  """Return "leaderboard_cache/sightings.ndjson"."""
+  return f"{LEADERBOARD_CACHE_DIR}/sightings.ndjson"
+
+
+def online_bots_cache_path() -> str:
+  """Return "leaderboard_cache/online_bots.ndjson.gz"."""
+  return f"{LEADERBOARD_CACHE_DIR}/online_bots.ndjson.gz"
+
+
+def online_bot_users_cache_path() -> str:
+  """Return "leaderboard_cache/online_bots.bin"."""
+  return f"{LEADERBOARD_CACHE_DIR}/online_bots.bin"
+
+
+def leaderboard_database_path() -> str:
+  """Return "leaderboard_cache/leaderboard.sqlite3"."""
+  return f"{LEADERBOARD_CACHE_DIR}/leaderboard.sqlite3"
+
+
+def snapshot_path() -> str:
+  """Return "leaderboard_data/leaderboard_snapshot.bin"."""
+  return f"{LEADERBOARD_DATA_DIR}/leaderboard_snapshot.bin"
+
+
+def recordings_dir() -> str:
+  """Return "leaderboard_cache/recordings"."""
+  return f"{LEADERBOARD_CACHE_DIR}/recordings"
+
+
+def recording_path(recorded_at: int, sequence: int, extension: str) -> str:
+  """Return "leaderboard_cache/recordings/online_bots_{recorded_at}_{sequence:03d}.ndjson{extension}".
+
+  The sequence number tells apart the recordings made in the same second.
+  """
+  return f"{recordings_dir()}/online_bots_{recorded_at}_{sequence:03d}.ndjson{extension}"
+
+
 def html_path(name: str) -> str:
   """Return "leaderboard_html/{name}.html"."""
   return f"leaderboard_html/{name}.html"
@@ -15,3 +15,38 @@ class FileSystem(abc.ABC):
   def write_file(self, file_name: str, file_contents: str) -> None:
     """Save the contents to a file."""
     ...
+
+  @abc.abstractmethod
+  def read_bytes(self, file_name: str) -> bytes | None:
+    """Load and return all of the contents of a binary file."""
+    ...
+
+  @abc.abstractmethod
+  def write_bytes(self, file_name: str, file_contents: bytes) -> None:
+    """Save the contents to a binary file."""
+    ...
+
+  @abc.abstractmethod
+  def append_bytes(self, file_name: str, file_contents: bytes) -> None:
+    """Append the contents to the end of a binary file, creating it if it does not exist."""
+    ...
+
+  @abc.abstractmethod
+  def map_bytes(self, file_name: str) -> memoryview | None:
+    """Return a read-only view of all of the contents of a binary file, which is mapped into memory if possible."""
+    ...
+
+  @abc.abstractmethod
+  def get_size(self, file_name: str) -> int | None:
+    """Return the size of a file in bytes, or None if it does not exist."""
+    ...
+
+  @abc.abstractmethod
+  def delete_file(self, file_name: str) -> None:
+    """Delete a file if it exists."""
+    ...
+
+  @abc.abstractmethod
+  def list_files(self, directory: str) -> list[str]:
+    """Return the sorted paths of the files directly inside a directory, or an empty list if it does not exist."""
+    ...
@@ -1,5 +1,6 @@
 """An implementation of FileSystem which actually writes to and from disk."""
 
+import mmap
 from pathlib import Path
 
 from src.leaderboard.fs.file_system import FileSystem
@@ -8,9 +9,17 @@ from src.leaderboard.fs.file_system import FileSystem
 class RealFileSystem(FileSystem):
   """Read and write files from disk."""
 
+  def __init__(self, root_dir: Path | None = None) -> None:
+    """Initialize a file system which resolves file names relative to root_dir (by default the working directory)."""
+    self.root_dir = root_dir
+
+  def resolve(self, file_name: str) -> Path:
+    """Return the path of a file name."""
+    return self.root_dir / file_name if self.root_dir else Path(file_name)
+
   def read_file(self, file_name: str) -> str | None:
     """Load and return all of the contents of a file."""
-    path = Path(file_name)
+    path = self.resolve(file_name)
     if not path.exists():
       return None
     with path.open() as file:
@@ -18,7 +27,55 @@ class RealFileSystem(FileSystem):
 
   def write_file(self, file_name: str, file_contents: str) -> None:
     """Save the contents to a file."""
-    path = Path(file_name)
+    path = self.resolve(file_name)
     path.parent.mkdir(parents=True, exist_ok=True)
     with path.open("w", encoding="utf-8") as file:
       file.write(file_contents)
+
+  def read_bytes(self, file_name: str) -> bytes | None:
+    """Load and return all of the contents of a binary file."""
+    path = self.resolve(file_name)
+    if not path.exists():
+      return None
+    return path.read_bytes()
+
+  def write_bytes(self, file_name: str, file_contents: bytes) -> None:
+    """Save the contents to a binary file."""
+    path = self.resolve(file_name)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(file_contents)
+
+  def append_bytes(self, file_name: str, file_contents: bytes) -> None:
+    """Append the contents to the end of a binary file, creating it if it does not exist."""
+    path = self.resolve(file_name)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("ab") as file:
+      file.write(file_contents)
+
+  def map_bytes(self, file_name: str) -> memoryview | None:
+    """Return a read-only view of all of the contents of a binary file, which is mapped into memory unless it is empty."""
+    path = self.resolve(file_name)
+    if not path.exists():
+      return None
+    with path.open("rb") as file:
+      # An empty file cannot be mapped
+      if not path.stat().st_size:
+        return memoryview(b"")
+      # The mapping stays open after the file is closed, for as long as the view is referenced
+      return memoryview(mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ))
+
+  def get_size(self, file_name: str) -> int | None:
+    """Return the size of a file in bytes, or None if it does not exist."""
+    path = self.resolve(file_name)
+    return path.stat().st_size if path.is_file() else None
+
+  def delete_file(self, file_name: str) -> None:
+    """Delete a file if it exists."""
+    self.resolve(file_name).unlink(missing_ok=True)
+
+  def list_files(self, directory: str) -> list[str]:
+    """Return the sorted paths of the files directly inside a directory, or an empty list if it does not exist."""
+    path = self.resolve(directory)
+    if not path.is_dir():
+      return []
+    return sorted(f"{directory}/{child.name}" for child in path.iterdir() if child.is_file())
@@ -0,0 +1,92 @@
+"""An implementation of UsersClient which calls the lichess API concurrently using asyncio."""
+
+import asyncio
+from typing import Any
+
+import requests
+
+from src.leaderboard.li import http_session
+from src.leaderboard.li.bot_user import BotUser
+from src.leaderboard.li.real_lichess_client import LICHESS_BASE_URL
+from src.leaderboard.li.token_bucket import TokenBucket
+from src.leaderboard.li.users_client import UsersClient
+from src.leaderboard.log.log_writer import LogWriter
+
+
+USERS_PATH = "/api/users"
+# The maximum number of usernames the API accepts in one request
+MAX_USERS_PER_REQUEST = 300
+# The number of requests allowed to be in flight at once
+MAX_CONCURRENT_REQUESTS = 2
+# The sustained number of requests per second
+REQUESTS_PER_SECOND = 1.0
+# The number of requests which may be sent in a burst before the rate limit applies
+REQUEST_BURST = 2
+
+
+class AsyncLichessClient(UsersClient):
+  """Looks up users with the lichess bulk users API (https://lichess.org/api#tag/Users/operation/apiUsers).
+
+  Usernames are split into batches which are requested concurrently, limited both by the number of requests in flight and
+  by a token bucket rate limiter. Each request is made with a pooled and retrying session. A batch which still fails is
+  logged and left out of the result, so that its bots keep their stored profiles, without failing the other batches.
+  """
+
+  def __init__(  # noqa: PLR0913, PLR0917 - every argument has a default
+    self,
+    session: requests.Session | None = None,
+    base_url: str = LICHESS_BASE_URL,
+    max_concurrent_requests: int = MAX_CONCURRENT_REQUESTS,
+    requests_per_second: float = REQUESTS_PER_SECOND,
+    request_burst: int = REQUEST_BURST,
+    log_writer: LogWriter | None = None,
+  ) -> None:
+    """Initialize a new client, creating a pooled and retrying session if one is not provided.
+
+    The failed batches are logged to log_writer if it is provided.
+    """
+    self.session = session or http_session.create_session()
+    self.users_url = f"{base_url}{USERS_PATH}"
+    self.max_concurrent_requests = max_concurrent_requests
+    self.requests_per_second = requests_per_second
+    self.request_burst = request_burst
+    self.log_writer = log_writer
+
+  def get_users(self, usernames: list[str]) -> list[BotUser]:
+    """Return the users with the given usernames."""
+    if not usernames:
+      return []
+    return asyncio.run(self.fetch_users(usernames))
+
+  async def fetch_users(self, usernames: list[str]) -> list[BotUser]:
+    """Fetch the users in batches, running several requests concurrently. The users of the failed batches are left out."""
+    # The rate limiter must be created within the running event loop
+    rate_limiter = TokenBucket(self.requests_per_second, self.request_burst)
+    semaphore = asyncio.Semaphore(self.max_concurrent_requests)
+
+    async def fetch_batch(batch: list[str]) -> list[BotUser]:
+      async with semaphore:
+        await rate_limiter.acquire()
+        try:
+          return await asyncio.to_thread(self.post_users, batch)
+        except (OSError, ValueError) as error:
+          # Network errors are OSErrors and malformed json is a ValueError
+          if self.log_writer:
+            self.log_writer.info("Looking up %d users failed, keeping their stored profiles: %s", len(batch), error)
+          return []
+
+    batches = [usernames[i : i + MAX_USERS_PER_REQUEST] for i in range(0, len(usernames), MAX_USERS_PER_REQUEST)]
+    results = await asyncio.gather(*(fetch_batch(batch) for batch in batches))
+    return [bot_user for batch_result in results for bot_user in batch_result]
+
+  def post_users(self, usernames: list[str]) -> list[BotUser]:
+    """Request a single batch of users. This blocks, so it is run in a worker thread."""
+    response = self.session.post(
+      self.users_url,
+      data=",".join(usernames),
+      headers={"Accept": "application/json", "Content-Type": "text/plain"},
+      timeout=http_session.TIMEOUT,
+    )
+    response.raise_for_status()
+    user_json_list: list[dict[str, Any]] = response.json()
+    return [BotUser.from_json_dict(user_json) for user_json in user_json_list]
@@ -4,9 +4,12 @@ These dataclasses include methods for parsing their corresponding lichess json r
 """
 
 import dataclasses
-import json
+import sys
+from collections.abc import Collection, Iterable
 from typing import Any
 
+from src.leaderboard.li import json_backend
+from src.leaderboard.li.perf_table import PerfTable, PerfValues, create_perf_table
 from src.leaderboard.li.pert_type import PerfType
 
 
@@ -34,15 +37,18 @@ class Perf:
   prov: bool
 
   @classmethod
-  def from_json_dict(cls, perf_type_key: str, perf_json: dict[str, Any]) -> "Perf":
-    """Create a Perf based on a json key and value."""
-    perf_type = PerfType.from_json(perf_type_key)
-    games = perf_json.get("games", 0)
-    rating = perf_json.get("rating", 0)
-    rd = perf_json.get("rd", 0)
-    prog = perf_json.get("prog", 0)
-    prov = perf_json.get("prov", False)
-    return Perf(perf_type, games, rating, rd, prog, prov)
+  def from_perf_table(cls, perf_table: PerfTable, perf_type: PerfType) -> "Perf":
+    """Create a Perf from one perf of a PerfTable."""
+    return Perf(perf_type, *perf_table.get_perf_values(perf_type))
+
+  def get_values(self) -> PerfValues:
+    """Return the (games, rating, rd, prog, prov) of the Perf."""
+    return self.games, self.rating, self.rd, self.prog, self.prov
+
+  def to_json_dict(self) -> dict[str, Any]:
+    """Return the lichess json value of the Perf, leaving out default values."""
+    perf_json = {"games": self.games, "rating": self.rating, "rd": self.rd, "prog": self.prog, "prov": self.prov}
+    return {key: value for key, value in perf_json.items() if value}
 
 
 @dataclasses.dataclass(frozen=True)
@@ -66,15 +72,24 @@ class BotUser:
   patron: bool
   # If the bot has violated the terms of service
   tos_violation: bool
-  # The bot's list of performance ratings
-  perfs: list[Perf]
+  # The bot's performance ratings
+  perf_table: PerfTable
 
   @classmethod
-  def from_json(cls, json_str: str) -> "BotUser":
-    """Parse a line of ndjson and converts it to an BotUser."""
-    json_dict = json.loads(json_str)
+  def from_json(cls, json_str: str | bytes, perf_types: Collection[PerfType] | None = None) -> "BotUser":
+    """Parse a line of ndjson and converts it to an BotUser. If perf_types is given, only their perfs are read."""
+    return BotUser.from_json_dict(json_backend.loads(json_str), perf_types)
 
-    username = json_dict.get("username", "")
+  @classmethod
+  def from_json_dict(cls, json_dict: dict[str, Any], perf_types: Collection[PerfType] | None = None) -> "BotUser":
+    """Convert a lichess user json dict to a BotUser.
+
+    Only the fields used by the leaderboards are read. Perfs which are not leaderboard perf types (puzzle, storm, ...) are
+    dropped, as are the perfs which are not in perf_types if it is given, and the rest are copied straight into the bot's
+    PerfTable.
+    """
+    # Interned to be shared with the names in the leaderboard data
+    username = sys.intern(json_dict.get("username", ""))
     flair = json_dict.get("flair", "")
     profile_dict = json_dict.get("profile", {})
     flag = profile_dict.get("flag", "")
@@ -83,8 +98,38 @@ class BotUser:
     patron = json_dict.get("patron", False)
     tos_violation = json_dict.get("tosViolation", False)
 
-    perfs: list[Perf] = []
-    for perf_type_key, perf_json in json_dict.get("perfs", []).items():
-      perfs.append(Perf.from_json_dict(perf_type_key, perf_json))
-
-    return BotUser(username, flair, flag, created_at, seen_at, patron, tos_violation, perfs)
+    perf_table = PerfTable.from_json_dict(json_dict.get("perfs", {}), perf_types)
+
+    return BotUser(username, flair, flag, created_at, seen_at, patron, tos_violation, perf_table)
+
+  @property
+  def perfs(self) -> list[Perf]:
+    """Return the bot's perfs in order of their perf type."""
+    return [Perf.from_perf_table(self.perf_table, perf_type) for perf_type in self.perf_table.get_perf_types()]
+
+  def to_json_dict(self) -> dict[str, Any]:
+    """Return the BotUser represented as a lichess user json dict, leaving out default values.
+
+    This is the inverse of from_json_dict.
+    """
+    user_json: dict[str, Any] = {"username": self.username}
+    if self.flair:
+      user_json["flair"] = self.flair
+    if self.flag:
+      user_json["profile"] = {"flag": self.flag}
+    if self.created_at:
+      user_json["createdAt"] = self.created_at * 1000
+    if self.seen_at:
+      user_json["seenAt"] = self.seen_at * 1000
+    if self.patron:
+      user_json["patron"] = True
+    if self.tos_violation:
+      user_json["tosViolation"] = True
+    if self.perfs:
+      user_json["perfs"] = {perf.perf_type.to_string(): perf.to_json_dict() for perf in self.perfs}
+    return user_json
+
+
+def create_perf_table_from_perfs(perfs: Iterable[Perf]) -> PerfTable:
+  """Create a PerfTable containing the perfs."""
+  return create_perf_table((perf.perf_type, perf.get_values()) for perf in perfs)
@@ -0,0 +1,126 @@
+"""An implementation of LichessClient which caches the online bots on disk and makes conditional requests."""
+
+from collections.abc import Collection, Iterator
+from http import HTTPStatus
+
+import requests
+
+from src.leaderboard.chrono.time_provider import TimeProvider
+from src.leaderboard.li.bot_user import BotUser
+from src.leaderboard.li.lichess_client import LichessClient
+from src.leaderboard.li.pert_type import PerfType
+from src.leaderboard.li.real_lichess_client import RealLichessClient
+from src.leaderboard.li.response_cache import ResponseCache, ResponseHeader
+
+
+class CachingLichessClient(LichessClient):
+  """Wraps a RealLichessClient with an on-disk response cache.
+
+  The online bots are fetched at most once per client. The request includes the validators (ETag and Last-Modified) of the
+  cached response, so when nothing has changed lichess responds with 304 Not Modified and the cached body is used. The bots
+  parsed from the cached body by the previous generation are then loaded instead of parsing it again.
+
+  A modified body is streamed: each line is yielded to the parser and compressed into the cache as it is received, so the
+  body is never held in memory all at once. The cache is replaced once every line has been read.
+
+  In offline mode the cached body, or the bots parsed from it, are replayed without touching the network.
+  """
+
+  def __init__(
+    self,
+    lichess_client: RealLichessClient,
+    response_cache: ResponseCache,
+    time_provider: TimeProvider,
+    offline: bool = False,
+  ) -> None:
+    """Initialize a new client."""
+    self.lichess_client = lichess_client
+    self.response_cache = response_cache
+    self.time_provider = time_provider
+    self.offline = offline
+    self.response_header: ResponseHeader | None = None
+    # The modified response, which is streamed by the first call to iter_online_bots
+    self.unread_response: requests.Response | None = None
+    self.modified = True
+
+  def get_response_header(self) -> ResponseHeader:
+    """Return the header of the online bots, requesting them if they have not already been requested."""
+    if not self.response_header:
+      self.response_header = self.replay() if self.offline else self.fetch()
+    return self.response_header
+
+  def replay(self) -> ResponseHeader:
+    """Return the header of the cached response without making a request."""
+    response_header = self.response_cache.load_header()
+    if not response_header:
+      error_msg = f"Cannot replay the online bots, nothing has been cached in {self.response_cache.file_name}"
+      raise ValueError(error_msg)
+    return response_header
+
+  def fetch(self) -> ResponseHeader:
+    """Make a conditional request and return the header of the cached response if it has not been modified.
+
+    Otherwise the response is kept open to be streamed.
+    """
+    previous_header = self.response_cache.load_header()
+    etag = previous_header.etag if previous_header else ""
+    last_modified = previous_header.last_modified if previous_header else ""
+    response = self.lichess_client.request_online_bots(etag, last_modified)
+    if previous_header and response.status_code == HTTPStatus.NOT_MODIFIED:
+      response.close()
+      self.modified = False
+      return previous_header
+    self.unread_response = response
+    return ResponseHeader(
+      response.headers.get("ETag", ""), response.headers.get("Last-Modified", ""), self.time_provider.get_current_time()
+    )
+
+  def stream_response(self, response: requests.Response, response_header: ResponseHeader) -> Iterator[str]:
+    """Yield the lines of a response as they are received, and save them to the cache once they have all been read."""
+    writer = self.response_cache.create_writer(response_header)
+    with response:
+      for line in response.iter_lines():
+        # Skip keep-alive new lines
+        if line:
+          writer.write_line(line)
+          yield line.decode("utf-8")
+    writer.save()
+
+  def has_online_bots_changed(self) -> bool:
+    """Return False if lichess reported that the online bots have not been modified since they were cached."""
+    self.get_response_header()
+    return self.modified
+
+  def get_online_bots(self) -> str:
+    """Return a list of online bots represented as ndjson."""
+    return "".join(f"{bot_json}\n" for bot_json in self.iter_online_bots())
+
+  def iter_online_bots(self) -> Iterator[str]:
+    """Yield the online bots one line of ndjson at a time, streaming them if they were modified."""
+    response_header = self.get_response_header()
+    if self.unread_response:
+      response, self.unread_response = self.unread_response, None
+      yield from self.stream_response(response, response_header)
+    else:
+      yield from self.response_cache.iter_lines()
+
+  def iter_online_bot_users(
+    self,
+    perf_types: Collection[PerfType] | None = None,  # noqa: ARG002 - every perf is kept for the next generation
+  ) -> Iterator[BotUser]:
+    """Yield the online bots parsed one at a time, loading them if they were parsed from the same response before.
+
+    Otherwise every perf is parsed whatever perf_types is, and the parsed bots are saved for the next generation.
+    """
+    response_header = self.get_response_header()
+    if not self.unread_response:
+      bot_users = self.response_cache.load_bot_users(response_header)
+      if bot_users is not None:
+        yield from bot_users
+        return
+    writer = self.response_cache.create_bot_users_writer(response_header)
+    for bot_json in self.iter_online_bots():
+      bot_user = BotUser.from_json(bot_json)
+      writer.write_bot_user(bot_user)
+      yield bot_user
+    writer.save()
@@ -0,0 +1,56 @@
+"""Module containing a function for creating a pooled http session which retries failed requests."""
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+# Seconds to wait for a connection to be established (this includes the TLS handshake)
+CONNECT_TIMEOUT = 5
+# Seconds to wait between bytes received from the server
+READ_TIMEOUT = 30
+# The timeout passed to requests
+TIMEOUT = (CONNECT_TIMEOUT, READ_TIMEOUT)
+
+# The maximum number of times a request is retried
+MAX_RETRIES = 5
+# Retries back off exponentially: 0.5s, 1s, 2s, 4s, ...
+BACKOFF_FACTOR = 0.5
+# A random amount of time (up to this many seconds) which is added to each backoff
+BACKOFF_JITTER = 1.0
+# The maximum amount of time (in seconds) to back off between retries
+BACKOFF_MAX = 30
+# The longest `Retry-After` (in seconds) we are willing to honor
+RETRY_AFTER_MAX = 120
+# Too many requests and transient server errors
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+# All of the requests made to lichess are safe to repeat
+RETRY_METHODS = ("GET", "POST")
+
+# The number of connections kept alive for reuse
+POOL_SIZE = 4
+
+
+def create_retry() -> Retry:
+  """Create a bounded exponential backoff (with jitter) retry strategy which respects `Retry-After`."""
+  return Retry(
+    total=MAX_RETRIES,
+    allowed_methods=RETRY_METHODS,
+    status_forcelist=RETRY_STATUS_CODES,
+    backoff_factor=BACKOFF_FACTOR,
+    backoff_jitter=BACKOFF_JITTER,
+    backoff_max=BACKOFF_MAX,
+    respect_retry_after_header=True,
+    retry_after_max=RETRY_AFTER_MAX,
+    # Return the last response so that raise_for_status can report the status
+    raise_on_status=False,
+  )
+
+
+def create_session() -> requests.Session:
+  """Create a session which keeps connections alive and retries failed requests."""
+  adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE, max_retries=create_retry())
+  session = requests.Session()
+  session.mount("https://", adapter)
+  session.mount("http://", adapter)
+  return session
@@ -0,0 +1,27 @@
+"""Module containing the json decoder used to parse lichess responses.
+
+orjson is used when it is installed, otherwise the standard library json module is used. orjson is imported by name, so that
+the type checker sees the same signature for loads whether or not orjson is installed.
+"""
+
+import importlib
+import json
+from typing import Any
+
+
+try:
+  orjson = importlib.import_module("orjson")
+except ImportError:  # pragma: no cover - depends on the environment
+  orjson = None
+
+
+def get_backend_name() -> str:
+  """Return the name of the library used to decode json."""
+  return "orjson" if orjson else "json"
+
+
+def loads(json_str: str | bytes) -> Any:  # noqa: ANN401 - json may decode to any type
+  """Decode a json document."""
+  if orjson:
+    return orjson.loads(json_str)
+  return json.loads(json_str)
@@ -1,6 +1,10 @@
 """Client for communicating with lichess."""
 
 import abc
+from collections.abc import Collection, Iterator
+
+from src.leaderboard.li.bot_user import BotUser
+from src.leaderboard.li.pert_type import PerfType
 
 
 class LichessClient(abc.ABC):
@@ -10,3 +14,23 @@ class LichessClient(abc.ABC):
   def get_online_bots(self) -> str:
     """Return a list of online bots represented as ndjson."""
     ...
+
+  @abc.abstractmethod
+  def iter_online_bots(self) -> Iterator[str]:
+    """Yield the online bots one line of ndjson at a time as they are received."""
+    ...
+
+  def iter_online_bot_users(self, perf_types: Collection[PerfType] | None = None) -> Iterator[BotUser]:
+    """Yield the online bots parsed one at a time as they are received.
+
+    If perf_types is given, the perfs of the other perf types may be left out.
+    """
+    for bot_json in self.iter_online_bots():
+      yield BotUser.from_json(bot_json, perf_types)
+
+  def has_online_bots_changed(self) -> bool:
+    """Return whether the online bots may have changed since they were last fetched.
+
+    Clients which do not keep track of previous responses always return True.
+    """
+    return True
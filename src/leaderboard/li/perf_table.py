@@ -0,0 +1,133 @@
+"""A compact table of a bot's performances for every perf type."""
+
+import array
+from collections.abc import Collection, Iterable, Iterator
+from typing import Any
+
+from src.leaderboard.li.pert_type import PERF_TYPE_BY_JSON_NAME, PerfType
+
+
+# The offsets of the values of a perf within its block of the table
+GAMES = 0
+RATING = 1
+RD = 2
+PROG = 3
+PROV = 4
+FIELD_COUNT = 5
+
+# Perf types in the order of their values, which is the order of the blocks of the table
+PERF_TYPES_BY_VALUE = sorted(PerfType, key=lambda perf_type: perf_type.value)
+# A table with every value zero, copied to create new tables
+EMPTY_VALUES = array.array("i", bytes(array.array("i").itemsize * len(PERF_TYPES_BY_VALUE) * FIELD_COUNT))
+
+# The (games, rating, rd, prog, prov) of a perf
+PerfValues = tuple[int, int, int, int, bool]
+
+
+class PerfTable:
+  """The games, rating, rd, prog and prov of each of a bot's perfs.
+
+  The values are stored in a single fixed-size array of ints with one block per perf type, indexed by PerfType.value. A
+  bitmask records which perf types the bot has. Reading a perf is direct indexing, and no object is created per perf.
+  """
+
+  def __init__(self, values: "array.array[int] | None" = None, present_mask: int = 0) -> None:
+    """Initialize a table, empty by default."""
+    self.values = values if values is not None else array.array("i", EMPTY_VALUES)
+    self.present_mask = present_mask
+
+  @classmethod
+  def from_json_dict(cls, perfs_json: dict[str, Any], perf_types: Collection[PerfType] | None = None) -> "PerfTable":
+    """Create a table from the `perfs` of a lichess user, dropping perfs which are not leaderboard perf types.
+
+    If perf_types is given, the perfs of the other perf types are dropped too.
+    """
+    perf_table = PerfTable()
+    for perf_type_key, perf_json in perfs_json.items():
+      perf_type = PERF_TYPE_BY_JSON_NAME.get(perf_type_key)
+      if perf_type and (perf_types is None or perf_type in perf_types):
+        perf_table.set_perf(
+          perf_type,
+          (
+            perf_json.get("games", 0),
+            perf_json.get("rating", 0),
+            perf_json.get("rd", 0),
+            perf_json.get("prog", 0),
+            perf_json.get("prov", False),
+          ),
+        )
+    return perf_table
+
+  def set_perf(self, perf_type: PerfType, perf_values: PerfValues) -> None:
+    """Set the (games, rating, rd, prog, prov) of one perf."""
+    offset = perf_type.value * FIELD_COUNT
+    self.values[offset : offset + FIELD_COUNT] = array.array("i", perf_values)
+    self.present_mask |= 1 << perf_type.value
+
+  def has_perf(self, perf_type: PerfType) -> bool:
+    """Return True if the bot has a perf for perf_type."""
+    return bool(self.present_mask & (1 << perf_type.value))
+
+  def get_perf_types(self) -> Iterator[PerfType]:
+    """Yield the perf types the bot has, in order of their values."""
+    for perf_type in PERF_TYPES_BY_VALUE:
+      if self.present_mask & (1 << perf_type.value):
+        yield perf_type
+
+  def get_perf_values(self, perf_type: PerfType) -> PerfValues:
+    """Return the (games, rating, rd, prog, prov) of one perf."""
+    games, rating, rd, prog, prov = self.values[perf_type.value * FIELD_COUNT : (perf_type.value + 1) * FIELD_COUNT]
+    return games, rating, rd, prog, bool(prov)
+
+  def get_games(self, perf_type: PerfType) -> int:
+    """Return the number of games the bot has played."""
+    return self.values[perf_type.value * FIELD_COUNT + GAMES]
+
+  def get_rating(self, perf_type: PerfType) -> int:
+    """Return the bot's rating."""
+    return self.values[perf_type.value * FIELD_COUNT + RATING]
+
+  def get_rd(self, perf_type: PerfType) -> int:
+    """Return the bot's rating deviation."""
+    return self.values[perf_type.value * FIELD_COUNT + RD]
+
+  def get_prog(self, perf_type: PerfType) -> int:
+    """Return the bot's rating change over the last 12 games."""
+    return self.values[perf_type.value * FIELD_COUNT + PROG]
+
+  def get_prov(self, perf_type: PerfType) -> bool:
+    """Return True if the bot's rating is provisional."""
+    return bool(self.values[perf_type.value * FIELD_COUNT + PROV])
+
+  def updated_with(self, other: "PerfTable") -> "PerfTable":
+    """Return a copy of this table with each of the perfs in other replacing the perf of the same type."""
+    perf_table = PerfTable(array.array("i", self.values), self.present_mask | other.present_mask)
+    for perf_type in other.get_perf_types():
+      offset = perf_type.value * FIELD_COUNT
+      perf_table.values[offset : offset + FIELD_COUNT] = other.values[offset : offset + FIELD_COUNT]
+    return perf_table
+
+  def __eq__(self, other: object) -> bool:
+    """Return True if both tables have the same perfs."""
+    if not isinstance(other, PerfTable):
+      return NotImplemented
+    if self.present_mask != other.present_mask:
+      return False
+    return all(self.get_perf_values(perf_type) == other.get_perf_values(perf_type) for perf_type in self.get_perf_types())
+
+  def __hash__(self) -> int:
+    """Return a hash of the perfs. Tables are not modified once they are created."""
+    return hash(tuple((perf_type, self.get_perf_values(perf_type)) for perf_type in self.get_perf_types()))
+
+  def __repr__(self) -> str:
+    """Return the perfs as a readable string."""
+    perfs = ", ".join(f"{perf_type.to_string()}={self.get_perf_values(perf_type)}" for perf_type in self.get_perf_types())
+    return f"PerfTable({perfs})"
+
+
+def create_perf_table(perfs: Iterable[tuple[PerfType, PerfValues]]) -> PerfTable:
+  """Create a table from pairs of perf type and (games, rating, rd, prog, prov)."""
+  perf_table = PerfTable()
+  for perf_type, perf_values in perfs:
+    perf_table.set_perf(perf_type, perf_values)
+  return perf_table
@@ -57,41 +57,11 @@ class PerfType(Enum):
   @classmethod
   def from_json(cls, json_str: str) -> "PerfType":
     """Return the corresponding PerfType based on the json representation."""
-    name_to_perf_type = {
-      "bullet": PerfType.BULLET,
-      "blitz": PerfType.BLITZ,
-      "rapid": PerfType.RAPID,
-      "classical": PerfType.CLASSICAL,
-      "correspondence": PerfType.CORRESPONDENCE,
-      "chess960": PerfType.CHESS960,
-      "antichess": PerfType.ANTICHESS,
-      "threeCheck": PerfType.THREE_CHECK,
-      "atomic": PerfType.ATOMIC,
-      "kingOfTheHill": PerfType.KING_OF_THE_HILL,
-      "crazyhouse": PerfType.CRAZYHOUSE,
-      "horde": PerfType.HORDE,
-      "racingKings": PerfType.RACING_KINGS,
-    }
-    return name_to_perf_type.get(json_str, PerfType.UNKNOWN)
+    return PERF_TYPE_BY_JSON_NAME.get(json_str, PerfType.UNKNOWN)
 
   def to_string(self) -> str:
     """Return the original string (json) representation."""
-    perf_type_to_name = {
-      PerfType.BULLET: "bullet",
-      PerfType.BLITZ: "blitz",
-      PerfType.RAPID: "rapid",
-      PerfType.CLASSICAL: "classical",
-      PerfType.CORRESPONDENCE: "correspondence",
-      PerfType.CHESS960: "chess960",
-      PerfType.ANTICHESS: "antichess",
-      PerfType.THREE_CHECK: "threeCheck",
-      PerfType.ATOMIC: "atomic",
-      PerfType.KING_OF_THE_HILL: "kingOfTheHill",
-      PerfType.CRAZYHOUSE: "crazyhouse",
-      PerfType.HORDE: "horde",
-      PerfType.RACING_KINGS: "racingKings",
-    }
-    return perf_type_to_name.get(self, "unknown")
+    return JSON_NAME_BY_PERF_TYPE.get(self, "unknown")
 
   def get_readable_name(self) -> str:
     """Return a readable name for the perf type with spaces, ect."""
@@ -111,3 +81,22 @@ class PerfType(Enum):
       PerfType.RACING_KINGS: "Racing Kings",
     }
     return perf_type_to_name.get(self, "Unknown")
+
+
+# The json representations of the known perf types. Built once, as perf types are looked up for every perf of every bot.
+PERF_TYPE_BY_JSON_NAME = {
+  "bullet": PerfType.BULLET,
+  "blitz": PerfType.BLITZ,
+  "rapid": PerfType.RAPID,
+  "classical": PerfType.CLASSICAL,
+  "correspondence": PerfType.CORRESPONDENCE,
+  "chess960": PerfType.CHESS960,
+  "antichess": PerfType.ANTICHESS,
+  "threeCheck": PerfType.THREE_CHECK,
+  "atomic": PerfType.ATOMIC,
+  "kingOfTheHill": PerfType.KING_OF_THE_HILL,
+  "crazyhouse": PerfType.CRAZYHOUSE,
+  "horde": PerfType.HORDE,
+  "racingKings": PerfType.RACING_KINGS,
+}
+JSON_NAME_BY_PERF_TYPE = {perf_type: json_name for json_name, perf_type in PERF_TYPE_BY_JSON_NAME.items()}
@@ -1,21 +1,84 @@
 """An implementation of LichessClient which actually calls the lichess API."""
 
+from collections.abc import Iterator
+from types import TracebackType
+
 import requests
 
+from src.leaderboard.li import http_session
 from src.leaderboard.li.lichess_client import LichessClient
 
 
+LICHESS_BASE_URL = "https://lichess.org"
+ONLINE_BOTS_PATH = "/api/bot/online"
+ONLINE_BOTS_HEADERS = {"Accept": "application/x-ndjson"}
+# The maximum number of bots the API will return
+ONLINE_BOTS_PARAMS = {"nb": 512}
+
+
 class RealLichessClient(LichessClient):
-  """Calls the lichess API."""
+  """Calls the lichess API.
+
+  A single session is used for the lifetime of the client so that connections are pooled and kept alive. Requests which fail
+  to connect, time out, or receive a 429 or 5xx response are retried with exponential backoff.
+  """
+
+  def __init__(self, session: requests.Session | None = None, base_url: str = LICHESS_BASE_URL) -> None:
+    """Initialize a new client, creating a pooled and retrying session if one is not provided.
+
+    A different base_url can be used to point the client at a stand-in server.
+    """
+    self.session = session or http_session.create_session()
+    self.base_url = base_url
+    self.online_bots_url = f"{base_url}{ONLINE_BOTS_PATH}"
+
+  def __enter__(self) -> "RealLichessClient":
+    """Return the client."""
+    return self
+
+  def __exit__(
+    self, exc_type: type[BaseException] | None, exc_value: BaseException | None, traceback: TracebackType | None
+  ) -> None:
+    """Close the client."""
+    self.close()
+
+  def close(self) -> None:
+    """Close the session and any pooled connections."""
+    self.session.close()
+
+  def request_online_bots(self, etag: str = "", last_modified: str = "") -> requests.Response:
+    """Request the online bots and return the streamed response, which should be closed by the caller.
+
+    If an etag or last_modified validator is provided, the request is conditional and the response may be 304 Not Modified.
+    """
+    headers = dict(ONLINE_BOTS_HEADERS)
+    if etag:
+      headers["If-None-Match"] = etag
+    if last_modified:
+      headers["If-Modified-Since"] = last_modified
+    response = self.session.get(
+      self.online_bots_url, headers=headers, params=ONLINE_BOTS_PARAMS, timeout=http_session.TIMEOUT, stream=True
+    )
+    try:
+      response.raise_for_status()
+    except requests.HTTPError:
+      # Release the pooled connection, the caller never sees the response
+      response.close()
+      raise
+    return response
 
   def get_online_bots(self) -> str:
-    """Return a list of online bots represented as ndjson.
+    """Return a list of online bots represented as ndjson."""
+    with self.request_online_bots() as response:
+      return response.text
+
+  def iter_online_bots(self) -> Iterator[str]:
+    """Yield the online bots one line of ndjson at a time as they are received.
 
-    Timeout of 10 seconds. No exception handling.
+    The response body is never held in memory all at once.
     """
-    url = "https://lichess.org/api/bot/online"
-    headers = {"Accept": "application/x-ndjson"}
-    params = {"nb": 512}
-    response = requests.get(url, headers=headers, params=params, timeout=10, stream=True)
-    response.raise_for_status()
-    return response.text
+    with self.request_online_bots() as response:
+      for line in response.iter_lines():
+        # Skip keep-alive new lines
+        if line:
+          yield line.decode("utf-8")
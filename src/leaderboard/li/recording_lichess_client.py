@@ -0,0 +1,82 @@
+"""An implementation of LichessClient which records the online bots it fetches."""
+
+import io
+from collections.abc import Collection, Iterator
+
+from src.leaderboard.chrono.time_provider import TimeProvider
+from src.leaderboard.fs import compression, file_paths
+from src.leaderboard.fs.file_system import FileSystem
+from src.leaderboard.li.bot_user import BotUser
+from src.leaderboard.li.lichess_client import LichessClient
+from src.leaderboard.li.pert_type import PerfType
+
+
+class RecordingLichessClient(LichessClient):
+  """Wraps another LichessClient and writes each fetched ndjson body to a timestamped, compressed archive.
+
+  Recordings made in the same second are numbered in sequence, so that none of them is overwritten.
+
+  The recordings can be served by ReplayLichessClient to run generations offline against real responses.
+  """
+
+  def __init__(
+    self, lichess_client: LichessClient, file_system: FileSystem, time_provider: TimeProvider, extension: str | None = None
+  ) -> None:
+    """Initialize a recorder which compresses with the format for extension (by default, the best available)."""
+    self.lichess_client = lichess_client
+    self.file_system = file_system
+    self.time_provider = time_provider
+    self.extension = extension or compression.get_preferred_extension()
+    self.recorded_file_names: list[str] = []
+
+  def create_recording_name(self) -> str:
+    """Return the name of a new recording, numbered after the recordings already made in the same second."""
+    recorded_at = self.time_provider.get_current_time()
+    sequence = 0
+    while self.file_system.get_size(file_paths.recording_path(recorded_at, sequence, self.extension)) is not None:
+      sequence += 1
+    return file_paths.recording_path(recorded_at, sequence, self.extension)
+
+  def save_recording(self, compressed_ndjson: bytes) -> None:
+    """Write compressed ndjson to a new recording."""
+    file_name = self.create_recording_name()
+    self.file_system.write_bytes(file_name, compressed_ndjson)
+    self.recorded_file_names.append(file_name)
+
+  def record(self, ndjson: str) -> None:
+    """Write ndjson to a new recording."""
+    self.save_recording(compression.compress_for_extension(ndjson.encode(), self.extension))
+
+  def has_online_bots_changed(self) -> bool:
+    """Return False if the online bots are known to be unchanged since they were last fetched."""
+    return self.lichess_client.has_online_bots_changed()
+
+  def get_online_bots(self) -> str:
+    """Return a list of online bots represented as ndjson."""
+    online_bots = self.lichess_client.get_online_bots()
+    self.record(online_bots)
+    return online_bots
+
+  def iter_online_bots(self) -> Iterator[str]:
+    """Yield the online bots one line of ndjson at a time.
+
+    Each line is compressed as it is yielded, so the body is never held in memory uncompressed, and the recording is written
+    once every line has been read.
+    """
+    compressed_buffer = io.BytesIO()
+    with compression.create_compressed_writer_for_extension(compressed_buffer, self.extension) as compressed_file:
+      for bot_json in self.lichess_client.iter_online_bots():
+        compressed_file.write(f"{bot_json}\n".encode())
+        yield bot_json
+    self.save_recording(compressed_buffer.getvalue())
+
+  def iter_online_bot_users(self, perf_types: Collection[PerfType] | None = None) -> Iterator[BotUser]:
+    """Yield the online bots parsed one at a time.
+
+    When they are unchanged nothing new was fetched, so they are not recorded and the wrapped client may load them without
+    parsing them again.
+    """
+    if self.has_online_bots_changed():
+      yield from super().iter_online_bot_users(perf_types)
+    else:
+      yield from self.lichess_client.iter_online_bot_users(perf_types)
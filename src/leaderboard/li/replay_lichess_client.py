@@ -0,0 +1,60 @@
+"""An implementation of LichessClient which serves recorded online bots."""
+
+import io
+from collections.abc import Iterator, Sequence
+
+from src.leaderboard.fs import compression, file_paths
+from src.leaderboard.fs.file_system import FileSystem
+from src.leaderboard.li.lichess_client import LichessClient
+
+
+class ReplayLichessClient(LichessClient):
+  """Serves the recordings written by RecordingLichessClient without touching the network.
+
+  Each fetch serves the next recording in the sequence, starting over after the last one, so any number of generations can
+  be run offline. The recordings are decompressed once and kept in memory.
+  """
+
+  def __init__(self, file_system: FileSystem, file_names: Sequence[str]) -> None:
+    """Initialize a client which replays the recordings in file_names in order."""
+    if not file_names:
+      error_msg = "There are no recordings to replay"
+      raise ValueError(error_msg)
+    self.file_system = file_system
+    self.file_names = list(file_names)
+    self.bodies: dict[str, str] = {}
+    self.replay_count = 0
+
+  @classmethod
+  def from_recordings(cls, file_system: FileSystem, count: int | None = None) -> "ReplayLichessClient":
+    """Create a client which replays the recordings in leaderboard_cache/recordings (only the latest count if given)."""
+    file_names = file_system.list_files(file_paths.recordings_dir())
+    return ReplayLichessClient(file_system, file_names[-count:] if count else file_names)
+
+  def load(self, file_name: str) -> str:
+    """Return the decompressed ndjson of a recording."""
+    if file_name not in self.bodies:
+      data = self.file_system.read_bytes(file_name)
+      if data is None:
+        error_msg = f"Missing recording: {file_name}"
+        raise ValueError(error_msg)
+      self.bodies[file_name] = compression.decompress(data).decode()
+    return self.bodies[file_name]
+
+  def next_body(self) -> str:
+    """Return the next recording in the sequence."""
+    file_name = self.file_names[self.replay_count % len(self.file_names)]
+    self.replay_count += 1
+    return self.load(file_name)
+
+  def get_online_bots(self) -> str:
+    """Return a list of online bots represented as ndjson."""
+    return self.next_body()
+
+  def iter_online_bots(self) -> Iterator[str]:
+    """Yield the online bots one line of ndjson at a time."""
+    for line in io.StringIO(self.next_body()):
+      # Lines read from StringIO keep their line endings
+      bot_json = line.rstrip("\n")
+      if bot_json:
+        yield bot_json
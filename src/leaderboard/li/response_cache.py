@@ -0,0 +1,194 @@
+"""An on-disk cache of the most recent response from the lichess get online bots API.
+
+Next to the compressed body, the cache keeps the bots parsed from it, so that a response which has not been modified is not
+parsed again. The parsed bots are stamped with the header of the response they were parsed from and are made of:
+- a header with the magic bytes, the version and the length of the json of the response header, followed by that json
+- for each bot, a fixed-width record, the utf-8 bytes of its name, flair and flag, and then the values of its PerfTable
+
+The parsed bots are only kept locally, so the values are written in the native byte order.
+"""
+
+import array
+import dataclasses
+import io
+import json
+import struct
+import sys
+from collections.abc import Iterator
+
+from src.leaderboard.fs import compression, file_paths
+from src.leaderboard.fs.file_system import FileSystem
+from src.leaderboard.li.bot_user import BotUser
+from src.leaderboard.li.perf_table import EMPTY_VALUES, PerfTable
+
+
+BOT_USERS_MAGIC = b"LBBOTUSR"
+# The version of the format of the parsed bots, which is increased whenever the format changes
+BOT_USERS_VERSION = 1
+# The magic bytes, version and the length of the json of the response header
+BOT_USERS_HEADER = struct.Struct("<8sII")
+# created_at, seen_at, patron, tos_violation, the present mask of the PerfTable, and the lengths of the name, flair and flag
+BOT_USER_RECORD = struct.Struct("<qqBBIHHH")
+# The number of bytes of the values of a PerfTable
+PERF_TABLE_SIZE = len(EMPTY_VALUES) * EMPTY_VALUES.itemsize
+
+
+@dataclasses.dataclass(frozen=True)
+class ResponseHeader:
+  """The validators used to make conditional requests, along with the time the response was received."""
+
+  # The value of the ETag header
+  etag: str
+  # The value of the Last-Modified header
+  last_modified: str
+  # The time the response was received (seconds since epoch)
+  fetched_at: int
+
+  def to_json(self) -> str:
+    """Return the json representation, which is the first line of a cached response."""
+    return json.dumps({"etag": self.etag, "last_modified": self.last_modified, "fetched_at": self.fetched_at})
+
+  @classmethod
+  def from_json(cls, header: str) -> "ResponseHeader":
+    """Create a ResponseHeader from its json representation."""
+    header_dict = json.loads(header)
+    return ResponseHeader(header_dict.get("etag", ""), header_dict.get("last_modified", ""), header_dict.get("fetched_at", 0))
+
+
+class CachedResponseWriter:
+  """Compresses a response line by line as it is received, so that the body is never held in memory uncompressed."""
+
+  def __init__(self, response_cache: "ResponseCache", header: ResponseHeader) -> None:
+    """Initialize a writer which saves a response with header to response_cache."""
+    self.response_cache = response_cache
+    self.compressed_buffer = io.BytesIO()
+    self.compressed_file = compression.create_compressed_writer(self.compressed_buffer)
+    self.compressed_file.write(f"{header.to_json()}\n".encode())
+
+  def write_line(self, line: bytes) -> None:
+    """Append a line of the body."""
+    self.compressed_file.write(line)
+    self.compressed_file.write(b"\n")
+
+  def save(self) -> None:
+    """Replace the cached response with the lines which have been written."""
+    self.compressed_file.close()
+    self.response_cache.file_system.write_bytes(self.response_cache.file_name, self.compressed_buffer.getvalue())
+
+
+class BotUsersWriter:
+  """Collects the bots parsed from a response as they are parsed, to save them next to the response."""
+
+  def __init__(self, response_cache: "ResponseCache", header: ResponseHeader) -> None:
+    """Initialize a writer which saves the bots parsed from a response with header to response_cache."""
+    self.response_cache = response_cache
+    header_json = header.to_json().encode()
+    self.parts = [BOT_USERS_HEADER.pack(BOT_USERS_MAGIC, BOT_USERS_VERSION, len(header_json)), header_json]
+
+  def write_bot_user(self, bot_user: BotUser) -> None:
+    """Append a parsed bot."""
+    name, flair, flag = bot_user.username.encode(), bot_user.flair.encode(), bot_user.flag.encode()
+    perf_table = bot_user.perf_table
+    self.parts.append(
+      BOT_USER_RECORD.pack(
+        bot_user.created_at,
+        bot_user.seen_at,
+        bot_user.patron,
+        bot_user.tos_violation,
+        perf_table.present_mask,
+        len(name),
+        len(flair),
+        len(flag),
+      )
+    )
+    self.parts.extend((name, flair, flag, perf_table.values.tobytes()))
+
+  def save(self) -> None:
+    """Replace the parsed bots with the bots which have been written."""
+    self.response_cache.file_system.write_bytes(self.response_cache.bot_users_file_name, b"".join(self.parts))
+
+
+def deserialize_bot_users(data: bytes) -> tuple[ResponseHeader, list[BotUser]]:
+  """Read the parsed bots and the header of the response they were parsed from. Raises a ValueError if they are not valid."""
+  if len(data) < BOT_USERS_HEADER.size:
+    error_msg = "The parsed bots are truncated"
+    raise ValueError(error_msg)
+  magic, version, header_size = BOT_USERS_HEADER.unpack_from(data)
+  if magic != BOT_USERS_MAGIC or version != BOT_USERS_VERSION:
+    error_msg = f"Unsupported parsed bots {magic!r} version {version}"
+    raise ValueError(error_msg)
+  offset = BOT_USERS_HEADER.size + header_size
+  header = ResponseHeader.from_json(data[BOT_USERS_HEADER.size : offset].decode())
+  bot_users: list[BotUser] = []
+  while offset < len(data):
+    created_at, seen_at, patron, tos_violation, present_mask, name_size, flair_size, flag_size = BOT_USER_RECORD.unpack_from(
+      data, offset
+    )
+    offset += BOT_USER_RECORD.size
+    strings_end = offset + name_size + flair_size + flag_size
+    if len(data) < strings_end + PERF_TABLE_SIZE:
+      error_msg = "The parsed bots are truncated"
+      raise ValueError(error_msg)
+    # Interned to be shared with the names in the leaderboard data, as when they are parsed
+    name = sys.intern(data[offset : offset + name_size].decode())
+    flair = data[offset + name_size : offset + name_size + flair_size].decode()
+    flag = data[offset + name_size + flair_size : strings_end].decode()
+    values = array.array("i")
+    values.frombytes(data[strings_end : strings_end + PERF_TABLE_SIZE])
+    offset = strings_end + PERF_TABLE_SIZE
+    perf_table = PerfTable(values, present_mask)
+    bot_users.append(BotUser(name, flair, flag, created_at, seen_at, bool(patron), bool(tos_violation), perf_table))
+  return header, bot_users
+
+
+class ResponseCache:
+  """Saves and loads a single compressed response."""
+
+  def __init__(self, file_system: FileSystem, file_name: str | None = None, bot_users_file_name: str | None = None) -> None:
+    """Initialize a cache which is stored in file_name (by default leaderboard_cache/online_bots.ndjson.gz).
+
+    The parsed bots are stored in bot_users_file_name (by default leaderboard_cache/online_bots.bin).
+    """
+    self.file_system = file_system
+    self.file_name = file_name or file_paths.online_bots_cache_path()
+    self.bot_users_file_name = bot_users_file_name or file_paths.online_bot_users_cache_path()
+
+  def load_header(self) -> ResponseHeader | None:
+    """Return the header of the cached response, without decompressing the body, or None if nothing has been cached."""
+    data = self.file_system.read_bytes(self.file_name)
+    if not data:
+      return None
+    with compression.open_decompressed(data) as file:
+      return ResponseHeader.from_json(file.readline().decode())
+
+  def iter_lines(self) -> Iterator[str]:
+    """Yield the non-empty lines of the cached body, decompressing them as they are read."""
+    data = self.file_system.read_bytes(self.file_name)
+    if not data:
+      return
+    with compression.open_decompressed(data) as file:
+      # Skip the header
+      file.readline()
+      for line in file:
+        bot_json = line.rstrip(b"\n").decode()
+        if bot_json:
+          yield bot_json
+
+  def create_writer(self, header: ResponseHeader) -> CachedResponseWriter:
+    """Return a writer which replaces the cached response with a response with header once it is saved."""
+    return CachedResponseWriter(self, header)
+
+  def load_bot_users(self, header: ResponseHeader) -> list[BotUser] | None:
+    """Return the bots parsed from the response with header, or None if they are missing, invalid, or from another response."""
+    data = self.file_system.read_bytes(self.bot_users_file_name)
+    if not data:
+      return None
+    try:
+      bot_users_header, bot_users = deserialize_bot_users(data)
+    except (ValueError, struct.error):
+      return None
+    return bot_users if bot_users_header == header else None
+
+  def create_bot_users_writer(self, header: ResponseHeader) -> BotUsersWriter:
+    """Return a writer which replaces the parsed bots with the bots parsed from a response with header once it is saved."""
+    return BotUsersWriter(self, header)
@@ -0,0 +1,38 @@
+"""A token bucket for limiting the rate of asynchronous requests."""
+
+import asyncio
+import time
+
+
+class TokenBucket:
+  """Limits the rate of requests to `rate` per second while allowing bursts of up to `capacity` requests.
+
+  The bucket starts full. Each call to acquire removes a token, waiting for one to be refilled if the bucket is empty.
+  """
+
+  def __init__(self, rate: float, capacity: int) -> None:
+    """Initialize a full bucket."""
+    if rate <= 0 or capacity < 1:
+      error_msg = f"Invalid token bucket: rate={rate}, capacity={capacity}"
+      raise ValueError(error_msg)
+    self.rate = rate
+    self.capacity = capacity
+    self.tokens = float(capacity)
+    self.last_refill = time.monotonic()
+    self.lock = asyncio.Lock()
+
+  def refill(self) -> None:
+    """Add the tokens which have accumulated since the last refill."""
+    now = time.monotonic()
+    self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.rate)
+    self.last_refill = now
+
+  async def acquire(self) -> None:
+    """Wait until a token is available and then take it."""
+    # Holding the lock while sleeping hands out tokens in the order they were requested
+    async with self.lock:
+      self.refill()
+      if self.tokens < 1:
+        await asyncio.sleep((1 - self.tokens) / self.rate)
+        self.refill()
+      self.tokens -= 1
@@ -0,0 +1,18 @@
+"""Client for looking up lichess users in bulk."""
+
+import abc
+
+from src.leaderboard.li.bot_user import BotUser
+
+
+class UsersClient(abc.ABC):
+  """Interface for looking up lichess users in bulk."""
+
+  @abc.abstractmethod
+  def get_users(self, usernames: list[str]) -> list[BotUser]:
+    """Return the users with the given usernames.
+
+    Users which do not exist (or whose accounts have been closed) may be left out of the result, as may users who could not be
+    looked up, so that they keep their stored profiles.
+    """
+    ...
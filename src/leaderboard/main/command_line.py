@@ -0,0 +1,115 @@
+"""Module containing the command line arguments for leaderboard generation."""
+
+import argparse
+from collections.abc import Sequence
+
+from src.leaderboard.data import vectorized_ranking
+from src.leaderboard.li.pert_type import PERF_TYPE_BY_JSON_NAME, PerfType
+from src.leaderboard.li.real_lichess_client import LICHESS_BASE_URL
+
+
+# The default number of minutes between polls in polling mode
+DEFAULT_POLL_INTERVAL_MINUTES = 5
+# The engines which can be used to rank the leaderboards, the first is the default
+RANKING_ENGINES = ("python", "numpy")
+# The stores which the leaderboard state can be loaded from and saved to, the first is the default
+STORES = ("json", "sqlite", "delta")
+
+
+def parse_perf_types(value: str) -> frozenset[PerfType]:
+  """Parse a comma separated list of perf types, such as "blitz,bullet"."""
+  perf_types: set[PerfType] = set()
+  for perf_type_str in value.split(","):
+    perf_type = PERF_TYPE_BY_JSON_NAME.get(perf_type_str.strip())
+    if not perf_type:
+      error_msg = f"unknown perf type {perf_type_str!r}, expected one of {', '.join(PERF_TYPE_BY_JSON_NAME)}"
+      raise argparse.ArgumentTypeError(error_msg)
+    perf_types.add(perf_type)
+  return frozenset(perf_types)
+
+
+def create_argument_parser() -> argparse.ArgumentParser:
+  """Create the parser for the command line arguments."""
+  parser = argparse.ArgumentParser(prog="python -m src.leaderboard", description="Generate lichess bot leaderboards.")
+  parser.add_argument(
+    "--poll",
+    action="store_true",
+    help="instead of generating the leaderboards, poll the online bots and buffer them for the next generation",
+  )
+  parser.add_argument(
+    "--poll-interval",
+    type=float,
+    default=DEFAULT_POLL_INTERVAL_MINUTES,
+    metavar="MINUTES",
+    help=f"the number of minutes between polls (default: {DEFAULT_POLL_INTERVAL_MINUTES})",
+  )
+  parser.add_argument(
+    "--base-url",
+    default=LICHESS_BASE_URL,
+    help=f"the url of the lichess API, for example a local stand-in server (default: {LICHESS_BASE_URL})",
+  )
+  parser.add_argument(
+    "--record",
+    action="store_true",
+    help="also archive each fetched online bots response in leaderboard_cache/recordings for replaying later",
+  )
+  parser.add_argument(
+    "--ranking",
+    choices=RANKING_ENGINES,
+    default=RANKING_ENGINES[0],
+    help=f"the engine used to rank the leaderboards, numpy requires numpy to be installed (default: {RANKING_ENGINES[0]})",
+  )
+  parser.add_argument(
+    "--store",
+    choices=STORES,
+    default=STORES[0],
+    help=(
+      "where the leaderboard state is kept between runs, the json files are written except with delta, which writes a record "
+      f"of what changed in each generation to leaderboard_data/generations instead (default: {STORES[0]})"
+    ),
+  )
+  parser.add_argument(
+    "--workers",
+    type=int,
+    default=0,
+    help="the number of processes which generate the leaderboards of the perf types in parallel (default: 0, no processes)",
+  )
+  parser.add_argument(
+    "--skip-unchanged-pages",
+    action="store_true",
+    help="keep the existing pages of the leaderboards which did not change instead of rendering them again",
+  )
+  parser.add_argument(
+    "--perf",
+    type=parse_perf_types,
+    metavar="PERF_TYPES",
+    help=(
+      "only generate the leaderboards of these comma separated perf types, such as blitz,bullet, and the index. The data "
+      "files and pages of the other perf types are left as they are (default: all perf types)"
+    ),
+  )
+  parser.add_argument(
+    "--archive-after",
+    type=int,
+    metavar="DAYS",
+    help=(
+      "move the bots which have not been eligible for more than this many days because they were not seen to "
+      "leaderboard_data/bot_archive.json.gz, until they are seen again (default: keep every bot)"
+    ),
+  )
+  parser.add_argument(
+    "--render-only",
+    action="store_true",
+    help="instead of generating the leaderboards, render the html from the saved data and the cached online bots",
+  )
+  return parser
+
+
+def parse_arguments(args: Sequence[str] | None = None) -> argparse.Namespace:
+  """Parse the command line arguments. If args is None, sys.argv is used."""
+  parser = create_argument_parser()
+  arguments = parser.parse_args(args)
+  # Fail before generating anything rather than in the middle of a run
+  if arguments.ranking == "numpy" and not vectorized_ranking.is_available():
+    parser.error("--ranking numpy requires numpy to be installed")
+  return arguments
@@ -0,0 +1,228 @@
+"""Backfill the rating history from the generations committed to a git clone of the leaderboard-pages branch.
+
+Each generation of the leaderboards is committed as "Generate leaderboard # N #". The data files of those commits are read
+through `git cat-file --batch`, which streams every blob through a single git process instead of starting one per file, and
+the commits are split into contiguous chunks which are decoded in parallel processes. Each process compares every commit with
+the one before it and only returns the rows which changed, which are then appended to an empty rating history in order.
+
+Usage: python -m src.leaderboard.main.history_backfill REPO_DIR [--ref REF] [--output DIR] [--workers N]
+"""
+
+import argparse
+import dataclasses
+import functools
+import re
+import subprocess
+from collections.abc import Iterable, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from types import TracebackType
+
+from src.leaderboard.data.leaderboard_objects import LeaderboardRow
+from src.leaderboard.data.rating_history import RatingHistory, select_changed_rows
+from src.leaderboard.fs import file_paths
+from src.leaderboard.fs.file_system import FileSystem
+from src.leaderboard.fs.real_file_system import RealFileSystem
+from src.leaderboard.li import json_backend
+from src.leaderboard.li.pert_type import PerfType
+from src.leaderboard.log.log_writer import LogWriter
+from src.leaderboard.log.real_log_writer import RealLogWriter
+
+
+# The branch which the generations are committed to
+DEFAULT_REF = "leaderboard-pages"
+# The number of consecutive commits decoded by a process at a time
+DEFAULT_CHUNK_SIZE = 50
+# The subject of the commit of a generation
+GENERATION_SUBJECT = re.compile(r"Generate leaderboard # (\d+) #")
+
+
+@dataclasses.dataclass(frozen=True)
+class GenerationCommit:
+  """A commit of the leaderboard data of one generation."""
+
+  # The commit hash
+  sha: str
+  # The generation number in the commit subject
+  generation_number: int
+  # The author time (seconds since epoch), which unlike the commit time is kept when the branch is rebased
+  time: int
+
+
+def list_generation_commits(repo_dir: Path, ref: str) -> list[GenerationCommit]:
+  """Return the commits of the generations reachable from a ref, oldest first."""
+  log = subprocess.run(  # noqa: S603 - the arguments are not interpreted by a shell
+    ["git", "-C", str(repo_dir), "log", "--reverse", "--format=%H %at %s", ref],  # noqa: S607 - git is found on the path
+    check=True,
+    capture_output=True,
+    text=True,
+  ).stdout
+  generation_commits: list[GenerationCommit] = []
+  for line in log.splitlines():
+    sha, author_time, subject = line.split(" ", 2)
+    match = GENERATION_SUBJECT.fullmatch(subject)
+    if match:
+      generation_commits.append(GenerationCommit(sha, int(match.group(1)), int(author_time)))
+  return generation_commits
+
+
+class GitBlobReader:
+  """Reader of the blobs of a git repository through one `git cat-file --batch` process."""
+
+  def __init__(self, repo_dir: Path) -> None:
+    """Start the git process."""
+    self.process = subprocess.Popen(  # noqa: S603 - the arguments are not interpreted by a shell
+      ["git", "-C", str(repo_dir), "cat-file", "--batch"],  # noqa: S607 - git is found on the path
+      stdin=subprocess.PIPE,
+      stdout=subprocess.PIPE,
+    )
+
+  def __enter__(self) -> "GitBlobReader":
+    """Return the reader."""
+    return self
+
+  def __exit__(
+    self, exc_type: type[BaseException] | None, exc_value: BaseException | None, traceback: TracebackType | None
+  ) -> None:
+    """Stop the git process."""
+    self.close()
+
+  def close(self) -> None:
+    """Stop the git process."""
+    if self.process.stdin:
+      self.process.stdin.close()
+    self.process.wait()
+    if self.process.stdout:
+      self.process.stdout.close()
+
+  def read_blobs(self, object_names: list[str]) -> list[bytes | None]:
+    """Return the contents of each object, such as "{commit}:{path}", or None if it does not exist."""
+    stdin, stdout = self.process.stdin, self.process.stdout
+    if not stdin or not stdout:
+      error_msg = "The git process has no pipes"
+      raise ValueError(error_msg)
+    # The requests are written together, each response is a header line and then the contents
+    stdin.write("".join(f"{object_name}\n" for object_name in object_names).encode())
+    stdin.flush()
+    blobs: list[bytes | None] = []
+    for _ in object_names:
+      header = stdout.readline()
+      if header.endswith(b" missing\n"):
+        blobs.append(None)
+        continue
+      size = int(header.split()[2])
+      blobs.append(stdout.read(size))
+      # Each blob is followed by a newline
+      stdout.read(1)
+    return blobs
+
+
+def read_commit_rows(blob_reader: GitBlobReader, commit: GenerationCommit) -> dict[PerfType, list[LeaderboardRow]] | None:
+  """Read the rows of every perf type in the data files of a commit, or return None if the commit has no data files.
+
+  The data files are deleted once the leaderboard state is kept by the delta store, whose generations are recorded in the
+  history as they are generated.
+  """
+  perf_types = list(PerfType.all_except_unknown())
+  blobs = blob_reader.read_blobs([f"{commit.sha}:{file_paths.data_path(perf_type)}" for perf_type in perf_types])
+  if not any(blob is not None for blob in blobs):
+    return None
+  return {
+    perf_type: [LeaderboardRow.from_dict(row_dict) for row_dict in json_backend.loads(blob)] if blob else []
+    for perf_type, blob in zip(perf_types, blobs, strict=True)
+  }
+
+
+def decode_chunk(
+  repo_dir: Path, chunk: tuple[GenerationCommit | None, list[GenerationCommit]]
+) -> list[tuple[GenerationCommit, dict[PerfType, list[LeaderboardRow]]]]:
+  """Return the rows of each commit of a chunk which changed since the previous commit, starting from the commit before it.
+
+  The commits without data files are left out.
+  """
+  previous_commit, commits = chunk
+  changed_rows: list[tuple[GenerationCommit, dict[PerfType, list[LeaderboardRow]]]] = []
+  with GitBlobReader(repo_dir) as blob_reader:
+    previous_rows_by_perf_type = (read_commit_rows(blob_reader, previous_commit) if previous_commit else None) or {}
+    for commit in commits:
+      rows_by_perf_type = read_commit_rows(blob_reader, commit)
+      if rows_by_perf_type is None:
+        continue
+      changed_rows_by_perf_type = {
+        perf_type: select_changed_rows(previous_rows_by_perf_type.get(perf_type, []), rows)
+        for perf_type, rows in rows_by_perf_type.items()
+      }
+      changed_rows.append((commit, changed_rows_by_perf_type))
+      previous_rows_by_perf_type = rows_by_perf_type
+  return changed_rows
+
+
+def append_chunks(
+  history: RatingHistory,
+  decoded_chunks: Iterable[list[tuple[GenerationCommit, dict[PerfType, list[LeaderboardRow]]]]],
+  log_writer: LogWriter,
+) -> int:
+  """Append the changed rows of the commits of each decoded chunk to the history in order and return how many were appended."""
+  generation_count = 0
+  for decoded_chunk in decoded_chunks:
+    if not decoded_chunk:
+      continue
+    generation_count += len(decoded_chunk)
+    record_count = sum(
+      history.append_rows(commit.generation_number, commit.time, changed_rows_by_perf_type)
+      for commit, changed_rows_by_perf_type in decoded_chunk
+    )
+    log_writer.info(
+      "Backfilled generations %d to %d: %d records",
+      decoded_chunk[0][0].generation_number,
+      decoded_chunk[-1][0].generation_number,
+      record_count,
+    )
+  return generation_count
+
+
+def backfill_history(
+  repo_dir: Path, file_system: FileSystem, log_writer: LogWriter, ref: str = DEFAULT_REF, workers: int = 0
+) -> int:
+  """Append the generations committed to a ref of a git clone to an empty rating history and return how many were appended.
+
+  If workers is positive, the commits are decoded in that many processes.
+  """
+  history = RatingHistory(file_system)
+  if history.get_record_count():
+    error_msg = "The rating history is not empty, backfilling must happen before any generation is recorded"
+    raise ValueError(error_msg)
+  commits = list_generation_commits(repo_dir, ref)
+  chunks = [
+    (commits[start - 1] if start else None, commits[start : start + DEFAULT_CHUNK_SIZE])
+    for start in range(0, len(commits), DEFAULT_CHUNK_SIZE)
+  ]
+  decode = functools.partial(decode_chunk, repo_dir)
+  if workers <= 0:
+    generation_count = append_chunks(history, map(decode, chunks), log_writer)
+  else:
+    with ProcessPoolExecutor(workers) as executor:
+      generation_count = append_chunks(history, executor.map(decode, chunks), log_writer)
+  history.save_heads()
+  return generation_count
+
+
+def parse_arguments(args: Sequence[str] | None = None) -> argparse.Namespace:
+  """Parse the command line arguments. If args is None, sys.argv is used."""
+  parser = argparse.ArgumentParser(prog="python -m src.leaderboard.main.history_backfill", description=__doc__)
+  parser.add_argument("repo_dir", type=Path, help="a git clone which contains the commits of the generations")
+  parser.add_argument("--ref", default=DEFAULT_REF, help=f"the ref whose generations are read (default: {DEFAULT_REF})")
+  parser.add_argument(
+    "--output", type=Path, default=Path(), help="the directory which the history is written under (default: current)"
+  )
+  parser.add_argument("--workers", type=int, default=0, help="the number of processes which decode the commits (default: 0)")
+  return parser.parse_args(args)
+
+
+if __name__ == "__main__":
+  arguments = parse_arguments()
+  log_writer = RealLogWriter(__name__)
+  generation_count = backfill_history(
+    arguments.repo_dir, RealFileSystem(arguments.output), log_writer, arguments.ref, arguments.workers
+  )
+  log_writer.info("Backfilled %d generations", generation_count)
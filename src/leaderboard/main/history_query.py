@@ -0,0 +1,56 @@
+"""Query the rating history of a bot in the leaderboard of a perf type.
+
+Logs the generation, time, rating, rd, games and rank of each record of the bot, and can also render the ratings as an svg.
+
+Usage: python -m src.leaderboard.main.history_query NAME PERF_TYPE [--svg FILE]
+"""
+
+import argparse
+from collections.abc import Sequence
+
+from src.leaderboard.chrono.date_formatter import format_yyyy_mm_dd_hh_mm_ss
+from src.leaderboard.data.rating_history import HistoryPoint, RatingHistory
+from src.leaderboard.fs.file_system import FileSystem
+from src.leaderboard.fs.real_file_system import RealFileSystem
+from src.leaderboard.li.pert_type import PERF_TYPE_BY_JSON_NAME, PerfType
+from src.leaderboard.log.log_writer import LogWriter
+from src.leaderboard.log.real_log_writer import RealLogWriter
+from src.leaderboard.page.rating_chart import render_rating_chart
+
+
+def query_history(
+  file_system: FileSystem, log_writer: LogWriter, name: str, perf_type: PerfType, svg_file_name: str | None = None
+) -> list[HistoryPoint]:
+  """Log the history of a bot in the leaderboard of a perf type, save it as an svg if a file name is given, and return it."""
+  points = RatingHistory(file_system).load_series(name, perf_type)
+  if not points:
+    log_writer.info("No history of %s in %s", name, perf_type.to_string())
+  for point in points:
+    log_writer.info(
+      "#%d %s: rating %d, rd %d, games %d, rank %d",
+      point.generation,
+      format_yyyy_mm_dd_hh_mm_ss(point.time),
+      point.rating,
+      point.rd,
+      point.games,
+      point.rank,
+    )
+  if svg_file_name:
+    file_system.write_file(svg_file_name, render_rating_chart(f"{name} {perf_type.get_readable_name()}", points))
+  return points
+
+
+def parse_arguments(args: Sequence[str] | None = None) -> argparse.Namespace:
+  """Parse the command line arguments. If args is None, sys.argv is used."""
+  parser = argparse.ArgumentParser(prog="python -m src.leaderboard.main.history_query", description=__doc__)
+  parser.add_argument("name", help="the name of the bot")
+  parser.add_argument("perf_type", choices=PERF_TYPE_BY_JSON_NAME, help="the perf type of the leaderboard")
+  parser.add_argument("--svg", metavar="FILE", help="also render the ratings as an svg chart to this file")
+  return parser.parse_args(args)
+
+
+if __name__ == "__main__":
+  arguments = parse_arguments()
+  query_history(
+    RealFileSystem(), RealLogWriter(__name__), arguments.name, PerfType.from_json(arguments.perf_type), arguments.svg
+  )
@@ -1,64 +1,277 @@
 """Leaderboard generator."""
 
-import json
 import time
 
+from src.leaderboard.chrono.fixed_time_provider import FixedTimeProvider
 from src.leaderboard.chrono.time_provider import TimeProvider
-from src.leaderboard.data.data_generator import DataGenerator
+from src.leaderboard.data import sightings_buffer
+from src.leaderboard.data.binary_snapshot import digest_json_files, load_generation_number, save_snapshot, serialize_snapshot
+from src.leaderboard.data.bot_archive import is_stale, load_bot_archive, save_bot_archive
+from src.leaderboard.data.data_generator import (
+  DataGenerator,
+  GenerationInputs,
+  GenerationOptions,
+  LeaderboardDataResult,
+  load_leaderboard_data,
+  select_perf_types,
+  sort_rows_by_rank,
+)
+from src.leaderboard.data.eligibility_expiry import EligibilityExpiry, PerfTypeExpiry, save_eligibility_expiry
+from src.leaderboard.data.json_leaderboard_store import JsonLeaderboardStore, serialize_bot_profiles
+from src.leaderboard.data.leaderboard_objects import BotProfile
+from src.leaderboard.data.rating_history import RatingHistory
 from src.leaderboard.fs import file_paths
 from src.leaderboard.fs.file_system import FileSystem
 from src.leaderboard.li.lichess_client import LichessClient
 from src.leaderboard.log.log_writer import LogWriter
+from src.leaderboard.main import perf_type_generation
+from src.leaderboard.main.perf_type_generation import PerfTypeResult
 from src.leaderboard.page.html_generator import HtmlGenerator
 
 
-def increment_generation_number(file_system: FileSystem) -> None:
-  """Increments the value generation number number file."""
-  value_str = file_system.read_file(file_paths.generation_number_path())
-  value = int(value_str) if value_str else 0
-  file_system.write_file(file_paths.generation_number_path(), str(value + 1))
+def increment_generation_number(file_system: FileSystem) -> int:
+  """Increments the value generation number number file and returns the new value."""
+  value = load_generation_number(file_system) + 1
+  file_system.write_file(file_paths.generation_number_path(), str(value))
+  return value
+
+
+def estimate_seconds_saved(seconds: float, row_count: int, skipped_row_count: int) -> float:
+  """Estimate the seconds saved by skipping rows from the seconds it took to process row_count other rows."""
+  return seconds / row_count * skipped_row_count if row_count else 0.0
 
 
 class LeaderboardGenerator:
   """Generator of leaderboards."""
 
   def __init__(
-    self, file_system: FileSystem, lichess_client: LichessClient, time_provider: TimeProvider, log_writer: LogWriter
+    self,
+    file_system: FileSystem,
+    lichess_client: LichessClient,
+    time_provider: TimeProvider,
+    log_writer: LogWriter,
+    options: GenerationOptions | None = None,
   ) -> None:
     """Initialize a new generator."""
     self.file_system = file_system
     self.lichess_client = lichess_client
     self.time_provider = time_provider
     self.log_writer = log_writer
+    self.options = options or GenerationOptions()
 
   def generate_leaderboards(self) -> None:
     """Generate the leaderboards."""
     # Start timer
     start_time = time.time()
     self.log_writer.info("Generating leaderboards...")
+    self.log_selected_perf_types()
+
+    # The leaderboards are still generated, because eligibility expires and offline bots change with the passage of time
+    if not self.lichess_client.has_online_bots_changed():
+      self.log_writer.info("Online bots unchanged, reusing the bots parsed from the cached response")
+
+    # Load the data which the leaderboards are generated from
+    data_generator = DataGenerator(self.file_system, self.lichess_client, self.time_provider, self.options)
+    inputs = data_generator.load_generation_inputs()
 
-    # Generate leaderboard data
-    data_generator = DataGenerator(self.file_system, self.lichess_client, self.time_provider)
-    leaderboard_data = data_generator.generate_leaderboard_data()
+    # Rank, serialize and render the leaderboard of each selected perf type
+    perf_types = select_perf_types(self.options.perf_types)
+    tasks = [
+      perf_type_generation.create_task(
+        inputs,
+        perf_type,
+        self.options.skip_unchanged_pages and bool(self.file_system.read_file(file_paths.html_path(perf_type.to_string()))),
+        self.options.export_json,
+      )
+      for perf_type in perf_types
+    ]
+    results = perf_type_generation.generate_perf_types(inputs, tasks, self.options.rank_rows, self.options.workers)
+    # Move the stale bots to the archive, which only a full generation updates
+    bot_profiles_by_name = inputs.bot_profiles_by_name
+    if self.options.perf_types is None and (self.options.archive_after is not None or inputs.restored_names):
+      bot_profiles_by_name, results = self.update_bot_archive(inputs, results)
+    # The leaderboards which were not selected are only shown on the index, with their previous rows
+    unselected_rows_by_perf_type = {
+      perf_type: rows for perf_type, rows in inputs.previous_rows_by_perf_type.items() if perf_type not in perf_types
+    }
+    leaderboard_data = LeaderboardDataResult(
+      bot_profiles_by_name,
+      {perf_type: sort_rows_by_rank(rows, bot_profiles_by_name) for perf_type, rows in unselected_rows_by_perf_type.items()}
+      | {result.perf_type: result.ranked_rows for result in results},
+      frozenset(result.perf_type for result in results if result.reused),
+      {result.perf_type: result.data_seconds for result in results if not result.reused},
+    )
 
+    # Make note of how many times we have generated the leaderboards, before the store records the generation
+    generation_number = (
+      increment_generation_number(self.file_system)
+      if self.options.perf_types is None
+      else load_generation_number(self.file_system)
+    )
     # Save the leaderboard data
-    bot_profile_dicts = [bot_profile.as_dict() for bot_profile in leaderboard_data.get_bot_profiles_sorted()]
-    self.file_system.write_file(file_paths.bot_profiles_path(), json.dumps(bot_profile_dicts, indent=2))
-    for perf_type, rows in leaderboard_data.get_ranked_rows_sorted().items():
-      row_dicts = [row.as_dict() for row in rows]
-      self.file_system.write_file(file_paths.data_path(perf_type), json.dumps(row_dicts, indent=2))
+    bot_profiles = leaderboard_data.get_bot_profiles_sorted()
+    self.save_leaderboard_data(bot_profiles, results)
+    # The sightings have been included in the leaderboard data, unless only some of the leaderboards were generated
+    if self.options.perf_types is None:
+      sightings_buffer.consume_sightings(self.file_system, inputs.sightings)
 
-    # Generate leaderboard html
-    html_generator = HtmlGenerator(self.time_provider)
-    html_by_name = html_generator.generate_leaderboard_html(leaderboard_data)
+    # Save the leaderboard html, the kept pages are unchanged
+    html_generator = HtmlGenerator(FixedTimeProvider(inputs.current_time))
+    self.file_system.write_file(file_paths.html_path("index"), html_generator.generate_index_html(leaderboard_data))
+    for result in results:
+      if result.html:
+        self.file_system.write_file(file_paths.html_path(result.perf_type.to_string()), result.html)
 
-    # Save the leaderboard html
-    for name, html in html_by_name.items():
-      self.file_system.write_file(file_paths.html_path(name), html)
+    # Report the perf types which were skipped
+    self.log_skipped_perf_types(results)
 
-    # Make note of how many times we have generated the leaderboards
-    increment_generation_number(self.file_system)
+    name_sorted_rows_by_perf_type = unselected_rows_by_perf_type | {
+      result.perf_type: result.name_sorted_rows for result in results
+    }
+    if self.options.perf_types is None:
+      # Record the ratings and ranks which changed in the history
+      RatingHistory(self.file_system).append_generation(
+        generation_number, inputs.current_time, inputs.previous_rows_by_perf_type, name_sorted_rows_by_perf_type
+      )
+    # Save when the eligibility of each row can next change, so that the next generation only checks those rows
+    self.save_eligibility_expiry(inputs, bot_profiles_by_name, results)
+    # Save a snapshot of the leaderboard data for loading it quickly while the json files are unchanged
+    if not self.options.store:
+      json_digest = digest_json_files(self.file_system)
+      save_snapshot(self.file_system, serialize_snapshot(json_digest, bot_profiles, name_sorted_rows_by_perf_type))
 
     # Print time elapsed
     time_elapsed = time.time() - start_time
     self.log_writer.info("Finished in %.2fs", time_elapsed)
+
+  def save_leaderboard_data(self, bot_profiles: list[BotProfile], results: list[PerfTypeResult]) -> None:
+    """Save the bot profiles and the rows of the perf types to the json files and the store, if any.
+
+    The data of the reused perf types is unchanged, so it is not saved again.
+    """
+    if self.options.export_json:
+      self.file_system.write_file(file_paths.bot_profiles_path(), serialize_bot_profiles(bot_profiles))
+      for result in results:
+        if result.data_json:
+          self.file_system.write_file(file_paths.data_path(result.perf_type), result.data_json)
+    if self.options.store:
+      self.options.store.save(
+        bot_profiles, {result.perf_type: result.name_sorted_rows for result in results if not result.reused}
+      )
+      if not self.options.export_json:
+        # The state is only kept in the store, so any json files which it was seeded from would go stale
+        JsonLeaderboardStore(self.file_system).delete()
+
+  def save_eligibility_expiry(
+    self, inputs: GenerationInputs, bot_profiles_by_name: dict[str, BotProfile], results: list[PerfTypeResult]
+  ) -> None:
+    """Save the eligibility expiry of the generated leaderboards as of the current generation number.
+
+    The expiry of the leaderboards which were not generated is kept from the previous index, if it was current.
+    """
+    expiry_by_perf_type = (inputs.eligibility_expiry.expiry_by_perf_type if inputs.eligibility_expiry else {}) | {
+      result.perf_type: PerfTypeExpiry.create(
+        result.name_sorted_rows, bot_profiles_by_name, inputs.bot_columns.id_by_name, inputs.current_time
+      )
+      for result in results
+    }
+    eligibility_expiry = EligibilityExpiry(load_generation_number(self.file_system), expiry_by_perf_type)
+    save_eligibility_expiry(self.file_system, eligibility_expiry)
+
+  def render_leaderboards(self) -> None:
+    """Render the leaderboards html from the saved leaderboard data without generating new data."""
+    # Start timer
+    start_time = time.time()
+    self.log_writer.info("Rendering leaderboards...")
+    self.log_selected_perf_types()
+
+    # Load the saved leaderboard data, showing the bots in the online bots response as online
+    online_names = {bot_user.username for bot_user in self.lichess_client.iter_online_bot_users()}
+    leaderboard_data = load_leaderboard_data(self.file_system, online_names, self.options.store)
+
+    # Generate and save leaderboard html
+    self.save_html(leaderboard_data)
+
+    # Print time elapsed
+    time_elapsed = time.time() - start_time
+    self.log_writer.info("Finished in %.2fs", time_elapsed)
+
+  def update_bot_archive(
+    self, inputs: GenerationInputs, results: list[PerfTypeResult]
+  ) -> tuple[dict[str, BotProfile], list[PerfTypeResult]]:
+    """Move the stale bots to the archive and remove the restored bots from it.
+
+    Return the bot profiles and results without the stale bots. Their rows are all unranked, so the ranks of the other rows
+    are unchanged.
+    """
+    archive_after = self.options.archive_after
+    stale_names: set[str] = (
+      set()
+      if archive_after is None
+      else {
+        name
+        for name, bot_profile in inputs.bot_profiles_by_name.items()
+        if is_stale(bot_profile, inputs.current_time, archive_after)
+      }
+    )
+    if not stale_names and not inputs.restored_names:
+      return inputs.bot_profiles_by_name, results
+    # The restored bots have already been removed from the archive if it was loaded
+    bot_archive = inputs.bot_archive or load_bot_archive(self.file_system)
+    bot_archive.add(
+      [inputs.bot_profiles_by_name[name] for name in stale_names],
+      {result.perf_type: [row for row in result.name_sorted_rows if row.name in stale_names] for result in results},
+    )
+    save_bot_archive(self.file_system, bot_archive)
+    if inputs.restored_names:
+      self.log_writer.info("Restored %d bots from the archive", len(inputs.restored_names))
+    if not stale_names:
+      return inputs.bot_profiles_by_name, results
+    self.log_writer.info("Archived %d stale bots", len(stale_names))
+    bot_profiles_by_name = {
+      name: bot_profile for name, bot_profile in inputs.bot_profiles_by_name.items() if name not in stale_names
+    }
+    return bot_profiles_by_name, [
+      perf_type_generation.remove_rows(result, stale_names, self.options.export_json) for result in results
+    ]
+
+  def log_selected_perf_types(self) -> None:
+    """Log the perf types which were selected, if only some of them were."""
+    if self.options.perf_types is not None:
+      perf_types = select_perf_types(self.options.perf_types)
+      self.log_writer.info("Only %s and the index", ", ".join(perf_type.to_string() for perf_type in perf_types))
+
+  def log_skipped_perf_types(self, results: list[PerfTypeResult]) -> None:
+    """Log the perf types whose previous rows were reused and estimate the time that saved."""
+    reused_results = [result for result in results if result.reused]
+    if not reused_results:
+      return
+    kept_results = [result for result in reused_results if not result.html]
+    seconds_saved = estimate_seconds_saved(
+      sum(result.data_seconds for result in results if not result.reused),
+      sum(len(result.ranked_rows) for result in results if not result.reused),
+      sum(len(result.ranked_rows) for result in reused_results),
+    ) + estimate_seconds_saved(
+      sum(result.render_seconds for result in results if result.html),
+      sum(len(result.ranked_rows) for result in results if result.html),
+      sum(len(result.ranked_rows) for result in kept_results),
+    )
+    self.log_writer.info(
+      "Skipped unchanged perf types %s (%d kept pages), saving about %.2fs",
+      ", ".join(sorted(result.perf_type.to_string() for result in reused_results)),
+      len(kept_results),
+      seconds_saved,
+    )
+
+  def save_html(self, leaderboard_data: LeaderboardDataResult) -> None:
+    """Generate the leaderboard html of the selected perf types and the index and save it."""
+    html_generator = HtmlGenerator(self.time_provider)
+    if self.options.perf_types is None:
+      html_by_name = html_generator.generate_leaderboard_html(leaderboard_data)
+    else:
+      html_by_name = {"index": html_generator.generate_index_html(leaderboard_data)} | {
+        perf_type.to_string(): html_generator.generate_perf_type_html(leaderboard_data, perf_type)
+        for perf_type in select_perf_types(self.options.perf_types)
+      }
+    for name, html in html_by_name.items():
+      self.file_system.write_file(file_paths.html_path(name), html)
@@ -0,0 +1,169 @@
+"""Generation of the data file and page of the leaderboard of each perf type.
+
+The leaderboards of the perf types are independent, so they can be generated in a pool of worker processes. The bot profiles
+are handed to each worker once when it starts rather than being pickled with every task, and every worker generates a perf
+type exactly as the sequential path does, so the output is the same either way.
+"""
+
+import dataclasses
+import time
+from collections.abc import Collection
+from concurrent.futures import ProcessPoolExecutor
+
+from src.leaderboard.chrono.fixed_time_provider import FixedTimeProvider
+from src.leaderboard.data.data_generator import (
+  BotColumns,
+  GenerationInputs,
+  LeaderboardDataResult,
+  RankRows,
+  rank_perf_type,
+)
+from src.leaderboard.data.json_leaderboard_store import serialize_rows
+from src.leaderboard.data.leaderboard_objects import BotPerf, BotProfile, LeaderboardRow
+from src.leaderboard.li.pert_type import PerfType
+from src.leaderboard.page.html_generator import HtmlGenerator
+
+
+@dataclasses.dataclass(frozen=True)
+class PerfTypeTask:
+  """The data needed to generate the leaderboard of one perf type."""
+
+  perf_type: PerfType
+  # The previous rows of the leaderboard
+  previous_rows: list[LeaderboardRow]
+  # The current perfs of the bots for the perf type
+  current_bot_perfs: list[BotPerf]
+  # Whether to keep the existing page instead of rendering it again if the previous rows are reused
+  keep_unchanged_page: bool
+  # Whether to serialize the rows for the data file
+  export_json: bool = True
+  # The names of the bots whose eligibility may have changed since the previous generation, if they are known
+  candidate_names: frozenset[str] | None = None
+
+
+@dataclasses.dataclass(frozen=True)
+class PerfTypeResult:
+  """The generated leaderboard of one perf type."""
+
+  perf_type: PerfType
+  # The rows in rank order
+  ranked_rows: list[LeaderboardRow]
+  # The rows in name_sort_key order
+  name_sorted_rows: list[LeaderboardRow]
+  # Whether the previous rows were reused because nothing changed
+  reused: bool
+  # The contents of the data file, or empty if the previous rows were reused or it is not exported
+  data_json: str
+  # The page html, or empty if the existing page is kept
+  html: str
+  # The seconds spent ranking and serializing the rows, and rendering the page
+  data_seconds: float
+  render_seconds: float
+
+
+def create_task(
+  inputs: GenerationInputs, perf_type: PerfType, keep_unchanged_page: bool = False, export_json: bool = True
+) -> PerfTypeTask:
+  """Create the task of a perf type from the inputs of a generation."""
+  return PerfTypeTask(
+    perf_type,
+    inputs.previous_rows_by_perf_type.get(perf_type, []),
+    inputs.current_bot_perfs_by_perf_type.get(perf_type, []),
+    keep_unchanged_page,
+    export_json,
+    inputs.candidate_names_by_perf_type.get(perf_type),
+  )
+
+
+class PerfTypeGenerator:
+  """Generator of the leaderboard of one perf type at a time."""
+
+  def __init__(
+    self, bot_profiles_by_name: dict[str, BotProfile], bot_columns: BotColumns, current_time: int, rank_rows: RankRows
+  ) -> None:
+    """Initialize a new generator."""
+    self.bot_profiles_by_name = bot_profiles_by_name
+    self.bot_columns = bot_columns
+    self.current_time = current_time
+    self.rank_rows = rank_rows
+    self.html_generator = HtmlGenerator(FixedTimeProvider(current_time))
+
+  def generate(self, task: PerfTypeTask) -> PerfTypeResult:
+    """Rank the rows of the task's perf type, serialize them and render the page."""
+    start_time = time.perf_counter()
+    inputs = GenerationInputs(
+      self.bot_profiles_by_name,
+      self.bot_columns,
+      {task.perf_type: task.previous_rows},
+      {task.perf_type: task.current_bot_perfs},
+      self.current_time,
+      candidate_names_by_perf_type={} if task.candidate_names is None else {task.perf_type: task.candidate_names},
+    )
+    ranked_perf_type = rank_perf_type(inputs, task.perf_type, self.rank_rows)
+    ranked_rows = ranked_perf_type.ranked_rows
+    reused = ranked_perf_type.reused
+    data_json = "" if reused or not task.export_json else serialize_rows(ranked_perf_type.name_sorted_rows)
+    render_start_time = time.perf_counter()
+    html = (
+      ""
+      if reused and task.keep_unchanged_page
+      else self.html_generator.generate_perf_type_html(
+        LeaderboardDataResult(self.bot_profiles_by_name, {task.perf_type: ranked_rows}), task.perf_type
+      )
+    )
+    end_time = time.perf_counter()
+    return PerfTypeResult(
+      task.perf_type,
+      ranked_rows,
+      ranked_perf_type.name_sorted_rows,
+      reused,
+      data_json,
+      html,
+      render_start_time - start_time,
+      end_time - render_start_time,
+    )
+
+
+def remove_rows(result: PerfTypeResult, names: Collection[str], export_json: bool) -> PerfTypeResult:
+  """Return the result without the rows of the bots with the names.
+
+  If any rows are removed, the result is no longer reused, so that the rows are saved again.
+  """
+  name_sorted_rows = [row for row in result.name_sorted_rows if row.name not in names]
+  if len(name_sorted_rows) == len(result.name_sorted_rows):
+    return result
+  return dataclasses.replace(
+    result,
+    ranked_rows=[row for row in result.ranked_rows if row.name not in names],
+    name_sorted_rows=name_sorted_rows,
+    reused=False,
+    data_json=serialize_rows(name_sorted_rows) if export_json else "",
+  )
+
+
+# The generator of a worker process, created once by initialize_worker
+worker_generators: list[PerfTypeGenerator] = []
+
+
+def initialize_worker(
+  bot_profiles_by_name: dict[str, BotProfile], bot_columns: BotColumns, current_time: int, rank_rows: RankRows
+) -> None:
+  """Create the generator shared by the tasks of a worker process."""
+  worker_generators[:] = [PerfTypeGenerator(bot_profiles_by_name, bot_columns, current_time, rank_rows)]
+
+
+def generate_in_worker(task: PerfTypeTask) -> PerfTypeResult:
+  """Generate the leaderboard of a perf type with the generator of the worker process."""
+  return worker_generators[0].generate(task)
+
+
+def generate_perf_types(
+  inputs: GenerationInputs, tasks: list[PerfTypeTask], rank_rows: RankRows, workers: int = 0
+) -> list[PerfTypeResult]:
+  """Generate the leaderboards of the tasks in order. If workers is positive, they are generated in that many processes."""
+  if workers <= 0:
+    perf_type_generator = PerfTypeGenerator(inputs.bot_profiles_by_name, inputs.bot_columns, inputs.current_time, rank_rows)
+    return [perf_type_generator.generate(task) for task in tasks]
+  initargs = (inputs.bot_profiles_by_name, inputs.bot_columns, inputs.current_time, rank_rows)
+  with ProcessPoolExecutor(workers, initializer=initialize_worker, initargs=initargs) as executor:
+    return list(executor.map(generate_in_worker, tasks))
@@ -0,0 +1,53 @@
+"""Poller which accumulates the bots seen online between leaderboard generations."""
+
+import time
+from collections.abc import Callable
+
+from src.leaderboard.data import sightings_buffer
+from src.leaderboard.fs.file_system import FileSystem
+from src.leaderboard.li.bot_user import BotUser
+from src.leaderboard.li.lichess_client import LichessClient
+from src.leaderboard.log.log_writer import LogWriter
+
+
+class SightingsPoller:
+  """Polls the online bots and folds each snapshot into the sightings buffer."""
+
+  def __init__(
+    self,
+    file_system: FileSystem,
+    lichess_client: LichessClient,
+    log_writer: LogWriter,
+    sleep: Callable[[float], None] = time.sleep,
+  ) -> None:
+    """Initialize a new poller."""
+    self.file_system = file_system
+    self.lichess_client = lichess_client
+    self.log_writer = log_writer
+    self.sleep = sleep
+
+  def poll(self) -> None:
+    """Fetch the online bots once and save them to the sightings buffer."""
+    buffer = sightings_buffer.load_sightings_buffer(self.file_system)
+    online_count = 0
+    for bot_json in self.lichess_client.iter_online_bots():
+      buffer.add(BotUser.from_json(bot_json))
+      online_count += 1
+    sightings_buffer.save_sightings_buffer(self.file_system, buffer)
+    self.log_writer.info("Polled %d online bots, %d bots buffered", online_count, len(buffer))
+
+  def run(self, interval_seconds: float, poll_count: int | None = None) -> None:
+    """Poll once every interval_seconds, poll_count times or forever if poll_count is None.
+
+    A failed poll is logged and does not stop the poller.
+    """
+    polls_completed = 0
+    while poll_count is None or polls_completed < poll_count:
+      try:
+        self.poll()
+      except (OSError, ValueError) as error:
+        # Network errors are OSErrors and malformed json is a ValueError
+        self.log_writer.info("Poll failed: %s", error)
+      polls_completed += 1
+      if poll_count is None or polls_completed < poll_count:
+        self.sleep(interval_seconds)
@@ -276,21 +276,30 @@ class HtmlGenerator:
 
   def generate_leaderboard_html(self, leaderboard_data: LeaderboardDataResult) -> dict[str, str]:
     """Generate index and leaderboard html."""
-    current_time = self.time_provider.get_current_time()
     html_by_name: dict[str, str] = {}
     # Create index html
-    html_by_name["index"] = self.jinja_env.get_template("index.html.jinja").render(
+    html_by_name["index"] = self.generate_index_html(leaderboard_data)
+    # Create leaderboard html
+    for perf_type in PerfType.all_except_unknown():
+      html_by_name[perf_type.to_string()] = self.generate_perf_type_html(leaderboard_data, perf_type)
+    # Return file name to html contents map
+    return html_by_name
+
+  def generate_index_html(self, leaderboard_data: LeaderboardDataResult) -> str:
+    """Generate the index html, which previews the top of each leaderboard."""
+    current_time = self.time_provider.get_current_time()
+    return self.jinja_env.get_template("index.html.jinja").render(
       main_frame=MainFrame.from_perf_type(None, current_time),
       preview_leaderboards=[
         HtmlLeaderboard.from_leaderboard_data(leaderboard_data, perf_type, current_time, True)
         for perf_type in PerfType.all_except_unknown()
       ],
     )
-    # Create leaderboard html
-    for perf_type in PerfType.all_except_unknown():
-      html_by_name[perf_type.to_string()] = self.jinja_env.get_template("leaderboard.html.jinja").render(
-        main_frame=MainFrame.from_perf_type(perf_type, current_time),
-        leaderboard=HtmlLeaderboard.from_leaderboard_data(leaderboard_data, perf_type, current_time),
-      )
-    # Return file name to html contents map
-    return html_by_name
+
+  def generate_perf_type_html(self, leaderboard_data: LeaderboardDataResult, perf_type: PerfType) -> str:
+    """Generate the leaderboard html of a perf type."""
+    current_time = self.time_provider.get_current_time()
+    return self.jinja_env.get_template("leaderboard.html.jinja").render(
+      main_frame=MainFrame.from_perf_type(perf_type, current_time),
+      leaderboard=HtmlLeaderboard.from_leaderboard_data(leaderboard_data, perf_type, current_time),
+    )
@@ -0,0 +1,42 @@
+"""Module for rendering the rating history of a bot as an svg chart."""
+
+import html
+
+from src.leaderboard.data.rating_history import HistoryPoint
+
+
+# The size of the chart in pixels
+CHART_WIDTH = 600
+CHART_HEIGHT = 200
+# The space around the line so that it is not drawn on the edges of the chart
+CHART_MARGIN = 10
+
+
+def get_chart_coordinates(points: list[HistoryPoint], width: int, height: int) -> list[tuple[float, float]]:
+  """Return the position of each point in a chart: the time along the x axis and the rating up the y axis."""
+  if not points:
+    return []
+  min_time = min(point.time for point in points)
+  time_range = max(point.time for point in points) - min_time or 1
+  min_rating = min(point.rating for point in points)
+  rating_range = max(point.rating for point in points) - min_rating or 1
+  plot_width = width - 2 * CHART_MARGIN
+  plot_height = height - 2 * CHART_MARGIN
+  return [
+    (
+      CHART_MARGIN + (point.time - min_time) / time_range * plot_width,
+      CHART_MARGIN + (1 - (point.rating - min_rating) / rating_range) * plot_height,
+    )
+    for point in points
+  ]
+
+
+def render_rating_chart(title: str, points: list[HistoryPoint], width: int = CHART_WIDTH, height: int = CHART_HEIGHT) -> str:
+  """Render the ratings of a bot's history as an svg line chart."""
+  coordinates = " ".join(f"{x:.1f},{y:.1f}" for x, y in get_chart_coordinates(points, width, height))
+  return (
+    f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" viewBox="0 0 {width} {height}">'
+    f"<title>{html.escape(title)}</title>"
+    f'<polyline points="{coordinates}" fill="none" stroke="currentColor" stroke-width="2"/>'
+    "</svg>"
+  )
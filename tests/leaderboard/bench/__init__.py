@@ -0,0 +1 @@
+"""Tests for src.leaderboard.bench."""
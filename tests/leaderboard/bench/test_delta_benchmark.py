@@ -0,0 +1,38 @@
+"""Tests for delta_benchmark.py."""
+
+import unittest
+from unittest import mock
+
+from src.leaderboard.bench import delta_benchmark
+from src.leaderboard.data.data_generator import GenerationOptions
+from src.leaderboard.data.delta_leaderboard_store import DeltaLeaderboardStore
+from src.leaderboard.fs import file_paths
+from tests.leaderboard.fs.in_memory_file_system import InMemoryFileSystem
+from tests.leaderboard.log.fake_log_writer import FakeLogWriter
+
+
+class TestDeltaBenchmark(unittest.TestCase):
+  """Tests for delta_benchmark functions."""
+
+  def test_run_generations(self) -> None:
+    file_system = InMemoryFileSystem()
+    lichess_client = delta_benchmark.write_recordings(file_system, 20, 3)
+    options = GenerationOptions(store=DeltaLeaderboardStore(file_system), export_json=False)
+    changed_bytes = delta_benchmark.run_generations(file_system, lichess_client, FakeLogWriter(), options)
+    self.assertEqual(len(changed_bytes), 3)
+    self.assertEqual(len(file_system.list_files(file_paths.generations_dir())), 3)
+
+  def test_run_benchmark(self) -> None:
+    log_writer = FakeLogWriter()
+    with mock.patch.object(log_writer, "info") as info:
+      delta_benchmark.run_benchmark(log_writer, (10,), 4, 2)
+
+    # The bytes written per generation are logged, and then the load times after the rebuilt state matched the json files
+    bytes_logged, load_logged = info.call_args_list[-2:]
+    _, bot_count, generation_count, json_bytes, delta_bytes, bytes_per_delta, ratio = bytes_logged.args
+    self.assertEqual((bot_count, generation_count), (10, 4))
+    self.assertGreater(delta_bytes, bytes_per_delta)
+    self.assertAlmostEqual(ratio, json_bytes / delta_bytes, delta=0.1)
+    # The last record is a delta since the keyframe before it
+    self.assertEqual(load_logged.args[1], 10)
+    self.assertEqual(load_logged.args[3], 1)
@@ -0,0 +1,22 @@
+"""Tests for ingest_benchmark.py."""
+
+import unittest
+from unittest import mock
+
+from src.leaderboard.bench import ingest_benchmark
+from tests.leaderboard.log.fake_log_writer import FakeLogWriter
+
+
+class TestIngestBenchmark(unittest.TestCase):
+  """Tests for ingest_benchmark functions."""
+
+  def test_run_benchmark(self) -> None:
+    log_writer = FakeLogWriter()
+    with mock.patch.object(log_writer, "info") as info:
+      ingest_benchmark.run_benchmark(log_writer, (10,))
+
+    # One line for each representation with the time, live allocations and peak bytes per bot
+    self.assertListEqual([logged.args[1:3] for logged in info.call_args_list], [(10, "perf lists"), (10, "perf tables")])
+    for logged in info.call_args_list:
+      self.assertGreater(logged.args[4], 0)
+      self.assertGreater(logged.args[5], 0)
@@ -0,0 +1,20 @@
+"""Tests for load_benchmark.py."""
+
+import unittest
+
+from src.leaderboard.bench import load_benchmark
+from src.leaderboard.bench.synthetic_bots import PopulationConfig
+from tests.leaderboard.log.fake_log_writer import FakeLogWriter
+
+
+class TestLoadBenchmark(unittest.TestCase):
+  """Tests for load_benchmark functions."""
+
+  def test_run_load_test(self) -> None:
+    generation_seconds = load_benchmark.run_load_test(PopulationConfig(bot_count=20, churn=0.5), FakeLogWriter(), 2)
+    self.assertEqual(len(generation_seconds), 2)
+
+  def test_parse_arguments(self) -> None:
+    arguments = load_benchmark.parse_arguments(["--bots", "10", "20", "--generations", "1"])
+    self.assertListEqual(arguments.bots, [10, 20])
+    self.assertEqual(arguments.generations, 1)
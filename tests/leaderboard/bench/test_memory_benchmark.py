@@ -0,0 +1,35 @@
+"""Tests for memory_benchmark.py."""
+
+import unittest
+from unittest import mock
+
+from src.leaderboard.bench import memory_benchmark
+from tests.leaderboard.log.fake_log_writer import FakeLogWriter
+
+
+class TestMemoryBenchmark(unittest.TestCase):
+  """Tests for memory_benchmark functions."""
+
+  def test_save_and_load_leaderboard_data(self) -> None:
+    lines = memory_benchmark.synthetic_bots.create_online_bots_lines(20)
+    leaderboard_data = memory_benchmark.generate_leaderboard_data(lines)
+    loaded_data = memory_benchmark.load_leaderboard_data(*memory_benchmark.save_leaderboard_data(leaderboard_data))
+    self.assertEqual(loaded_data.get_ranked_rows_sorted(), leaderboard_data.get_ranked_rows_sorted())
+
+  def test_run_benchmark(self) -> None:
+    log_writer = FakeLogWriter()
+    with mock.patch.object(log_writer, "info") as info:
+      memory_benchmark.run_benchmark(log_writer, (10, 20))
+
+    # One line for each size with the rows per bot and the bytes retained per bot by the generated and loaded data
+    self.assertEqual(info.call_count, 2)
+    for bot_count, logged in zip((10, 20), info.call_args_list, strict=True):
+      leaderboard_data = memory_benchmark.generate_leaderboard_data(
+        memory_benchmark.synthetic_bots.create_online_bots_lines(bot_count)
+      )
+      row_count = sum(len(rows) for rows in leaderboard_data.get_ranked_rows_sorted().values())
+      _, logged_bot_count, rows_per_bot, generated_bytes_per_bot, loaded_bytes_per_bot = logged.args
+      self.assertEqual(logged_bot_count, bot_count)
+      self.assertEqual(rows_per_bot, row_count / bot_count)
+      self.assertGreater(generated_bytes_per_bot, 0)
+      self.assertGreater(loaded_bytes_per_bot, 0)
@@ -0,0 +1,36 @@
+"""Tests for parse_benchmark.py."""
+
+import unittest
+from unittest import mock
+
+from src.leaderboard.bench import parse_benchmark, synthetic_bots
+from src.leaderboard.li.bot_user import BotUser
+from src.leaderboard.li.pert_type import PerfType
+from tests.leaderboard.log.fake_log_writer import FakeLogWriter
+
+
+class TestParseBenchmark(unittest.TestCase):
+  """Tests for parse_benchmark functions."""
+
+  def test_parsers_agree_on_leaderboard_perfs(self) -> None:
+    for line in synthetic_bots.create_online_bots_lines(20):
+      stdlib_bot_user = parse_benchmark.parse_with_stdlib(line)
+      bot_user = BotUser.from_json(line)
+      leaderboard_perfs = [perf for perf in stdlib_bot_user.perfs if perf.perf_type != PerfType.UNKNOWN]
+      self.assertListEqual(bot_user.perfs, leaderboard_perfs)
+      self.assertEqual(bot_user.username, stdlib_bot_user.username)
+
+  def test_run_benchmark(self) -> None:
+    log_writer = FakeLogWriter()
+    with mock.patch.object(log_writer, "info") as info:
+      parse_benchmark.run_benchmark(log_writer, (10,))
+
+    # The json backend is logged, followed by the times and throughputs of both parsers
+    self.assertEqual(info.call_count, 2)
+    backend_logged, parsers_logged = info.call_args_list
+    self.assertEqual(backend_logged.args[1], parse_benchmark.json_backend.get_backend_name())
+    _, bot_count, stdlib_seconds, stdlib_rate, fast_seconds, fast_rate, speedup = parsers_logged.args
+    self.assertEqual(bot_count, 10)
+    self.assertAlmostEqual(stdlib_rate, bot_count / stdlib_seconds)
+    self.assertAlmostEqual(fast_rate, bot_count / fast_seconds)
+    self.assertAlmostEqual(speedup, stdlib_seconds / fast_seconds)
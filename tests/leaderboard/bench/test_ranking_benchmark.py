@@ -0,0 +1,31 @@
+"""Tests for ranking_benchmark.py."""
+
+import unittest
+from unittest import mock
+
+from src.leaderboard.bench import ranking_benchmark
+from tests.leaderboard.log.fake_log_writer import FakeLogWriter
+
+
+@unittest.skipUnless(ranking_benchmark.vectorized_ranking.is_available(), "numpy is not installed")
+class TestRankingBenchmark(unittest.TestCase):
+  """Tests for ranking_benchmark functions."""
+
+  def test_run_benchmark(self) -> None:
+    log_writer = FakeLogWriter()
+    with mock.patch.object(log_writer, "info") as info:
+      ranking_benchmark.run_benchmark(log_writer, (10,))
+
+    # The engines ranked the rows the same, and the speedup is logged
+    info.assert_called_once()
+    _, row_count, python_seconds, numpy_seconds, speedup = info.call_args.args
+    self.assertEqual(row_count, 10)
+    self.assertAlmostEqual(speedup, python_seconds / numpy_seconds)
+
+  def test_run_benchmark_different_rows(self) -> None:
+    # The benchmark fails if the engines rank the rows differently
+    with (
+      mock.patch.object(ranking_benchmark.vectorized_ranking, "create_ranked_rows", return_value=[]),
+      self.assertRaises(ValueError),
+    ):
+      ranking_benchmark.run_benchmark(FakeLogWriter(), (10,))
@@ -0,0 +1,32 @@
+"""Tests for replay_benchmark.py."""
+
+import unittest
+
+from src.leaderboard.bench import replay_benchmark, synthetic_bots
+from src.leaderboard.fs import compression, file_paths
+from src.leaderboard.li.replay_lichess_client import ReplayLichessClient
+from tests.leaderboard.fs.in_memory_file_system import InMemoryFileSystem
+from tests.leaderboard.log.fake_log_writer import FakeLogWriter
+
+
+class TestReplayBenchmark(unittest.TestCase):
+  """Tests for replay_benchmark functions."""
+
+  def test_run_generations(self) -> None:
+    recording_file_system = InMemoryFileSystem()
+    ndjson = "".join(f"{line}\n" for line in synthetic_bots.create_online_bots_lines(10))
+    recording_file_system.write_bytes(file_paths.recording_path(1, 0, ".gz"), compression.compress(ndjson.encode()))
+    lichess_client = ReplayLichessClient.from_recordings(recording_file_system)
+    file_system = InMemoryFileSystem()
+
+    generation_seconds = replay_benchmark.run_generations(file_system, lichess_client, FakeLogWriter(), 3, 0)
+
+    self.assertEqual(len(generation_seconds), 3)
+    self.assertEqual(file_system.read_file(file_paths.generation_number_path()), "3")
+    self.assertIn("Synthetic-Bot-0", file_system.read_file(file_paths.bot_profiles_path()) or "")
+
+  def test_parse_arguments(self) -> None:
+    arguments = replay_benchmark.parse_arguments(["--generations", "3", "--recordings", "2"])
+    self.assertEqual(arguments.generations, 3)
+    self.assertEqual(arguments.recordings, 2)
+    self.assertIsNone(arguments.profile)
@@ -0,0 +1,30 @@
+"""Tests for serializer_benchmark.py."""
+
+import unittest
+from unittest import mock
+
+from src.leaderboard.bench import serializer_benchmark, synthetic_rows
+from src.leaderboard.data import data_generator
+from tests.leaderboard.log.fake_log_writer import FakeLogWriter
+
+
+class TestSerializerBenchmark(unittest.TestCase):
+  """Tests for serializer_benchmark functions."""
+
+  def test_conversions_agree(self) -> None:
+    updates, bot_profiles_by_name = synthetic_rows.create_ranking_inputs(50)
+    bot_columns = data_generator.BotColumns.create(bot_profiles_by_name, synthetic_rows.CURRENT_TIME)
+    for row in data_generator.create_ranked_rows(updates, bot_columns, synthetic_rows.CURRENT_TIME):
+      self.assertEqual(serializer_benchmark.row_to_dict_with_asdict(row), row.as_dict())
+      self.assertEqual(serializer_benchmark.row_from_dict_by_hand(row.as_dict()), row)
+
+  def test_run_benchmark(self) -> None:
+    log_writer = FakeLogWriter()
+    with mock.patch.object(log_writer, "info") as info:
+      serializer_benchmark.run_benchmark(log_writer, (10,))
+
+    # One line for each direction with the throughputs of both approaches
+    self.assertListEqual([logged.args[1:3] for logged in info.call_args_list], [(10, "to_dict"), (10, "from_dict")])
+    for logged in info.call_args_list:
+      _, _, _, previous_rate, generated_rate, speedup = logged.args
+      self.assertAlmostEqual(speedup, generated_rate / previous_rate)
@@ -0,0 +1,40 @@
+"""Tests for snapshot_benchmark.py."""
+
+import unittest
+from unittest import mock
+
+from src.leaderboard.bench import snapshot_benchmark
+from tests.leaderboard.fs.in_memory_file_system import InMemoryFileSystem
+from tests.leaderboard.log.fake_log_writer import FakeLogWriter
+
+
+class TestSnapshotBenchmark(unittest.TestCase):
+  """Tests for snapshot_benchmark functions."""
+
+  def test_loads_agree(self) -> None:
+    file_system = InMemoryFileSystem()
+    snapshot_benchmark.save_leaderboard_data(file_system, 20)
+    self.assertEqual(snapshot_benchmark.load_snapshot(file_system), snapshot_benchmark.load_json(file_system))
+
+  def test_load_missing_snapshot(self) -> None:
+    with self.assertRaises(ValueError):
+      snapshot_benchmark.load_snapshot(InMemoryFileSystem())
+
+  def test_run_benchmark(self) -> None:
+    log_writer = FakeLogWriter()
+    with mock.patch.object(log_writer, "info") as info:
+      snapshot_benchmark.run_benchmark(log_writer, (10,))
+
+    # The snapshot matched the json files, and both load times are logged
+    info.assert_called_once()
+    _, bot_count, json_seconds, snapshot_seconds, speedup = info.call_args.args
+    self.assertEqual(bot_count, 10)
+    self.assertAlmostEqual(speedup, json_seconds / snapshot_seconds)
+
+  def test_run_benchmark_stale_snapshot(self) -> None:
+    # A snapshot which does not match the json files is not loaded
+    with (
+      mock.patch.object(snapshot_benchmark.binary_snapshot, "digest_json_files", side_effect=[b"saved", b"loaded"]),
+      self.assertRaises(ValueError),
+    ):
+      snapshot_benchmark.run_benchmark(FakeLogWriter(), (10,))
@@ -0,0 +1,47 @@
+"""Tests for stand_in_server.py."""
+
+import unittest
+
+import requests
+
+from src.leaderboard.bench import stand_in_server
+from src.leaderboard.bench.stand_in_server import StandInServer
+from src.leaderboard.bench.synthetic_bots import PopulationConfig, SyntheticPopulation
+from src.leaderboard.chrono.fixed_time_provider import FixedTimeProvider
+from src.leaderboard.li.async_lichess_client import AsyncLichessClient
+from src.leaderboard.li.bot_user import BotUser
+from src.leaderboard.li.real_lichess_client import RealLichessClient
+
+
+def create_population(bot_count: int) -> SyntheticPopulation:
+  """Create a small population which does not churn."""
+  return SyntheticPopulation(PopulationConfig(bot_count=bot_count, churn=0.0), FixedTimeProvider(0))
+
+
+class TestStandInServer(unittest.TestCase):
+  """Tests for StandInServer."""
+
+  def test_streams_online_bots(self) -> None:
+    with (
+      StandInServer(create_population(250), lines_per_second=100_000) as server,
+      RealLichessClient(base_url=server.base_url) as lichess_client,
+    ):
+      bot_users = [BotUser.from_json(bot_json) for bot_json in lichess_client.iter_online_bots()]
+    self.assertEqual(len(bot_users), 250)
+    self.assertEqual(bot_users[-1].username, "Synthetic-Bot-249")
+
+  def test_looks_up_users(self) -> None:
+    with StandInServer(create_population(10)) as server:
+      bot_users = AsyncLichessClient(base_url=server.base_url).get_users(["Synthetic-Bot-3", "missing"])
+    self.assertListEqual([bot_user.username for bot_user in bot_users], ["Synthetic-Bot-3"])
+
+  def test_unknown_path(self) -> None:
+    with StandInServer(create_population(1)) as server:
+      response = requests.get(f"{server.base_url}/api/unknown", timeout=5)
+    self.assertEqual(response.status_code, 404)
+
+  def test_parse_arguments(self) -> None:
+    arguments = stand_in_server.parse_arguments(["--bots", "100", "--churn", "0.5", "--tos-violations", "0.25"])
+    config = stand_in_server.create_population_config(arguments, arguments.bots)
+    self.assertEqual(config, PopulationConfig(bot_count=100, churn=0.5, tos_violation_fraction=0.25))
+    self.assertEqual(arguments.port, stand_in_server.DEFAULT_PORT)
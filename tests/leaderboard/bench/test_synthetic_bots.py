@@ -0,0 +1,52 @@
+"""Tests for synthetic_bots.py."""
+
+import unittest
+
+from src.leaderboard.bench import synthetic_bots
+from src.leaderboard.bench.synthetic_bots import PopulationConfig, SyntheticPopulation
+from src.leaderboard.chrono.fixed_time_provider import FixedTimeProvider
+from src.leaderboard.li.bot_user import BotUser
+from src.leaderboard.li.pert_type import PerfType
+
+
+class TestSyntheticBots(unittest.TestCase):
+  """Tests for synthetic_bots functions."""
+
+  def test_create_online_bots_lines(self) -> None:
+    lines = synthetic_bots.create_online_bots_lines(10)
+    self.assertEqual(len(lines), 10)
+    bot_users = [BotUser.from_json(line) for line in lines]
+    self.assertListEqual([bot_user.username for bot_user in bot_users], [f"Synthetic-Bot-{index}" for index in range(10)])
+
+  def test_create_online_bots_lines_is_reproducible(self) -> None:
+    self.assertListEqual(synthetic_bots.create_online_bots_lines(5, 1), synthetic_bots.create_online_bots_lines(5, 1))
+
+
+class TestSyntheticPopulation(unittest.TestCase):
+  """Tests for SyntheticPopulation."""
+
+  def test_take_snapshot_churns(self) -> None:
+    population = SyntheticPopulation(PopulationConfig(bot_count=100, churn=0.2), FixedTimeProvider(1000))
+    first_snapshot = [BotUser.from_json(line) for line in population.take_snapshot()]
+    second_snapshot = [BotUser.from_json(line) for line in population.take_snapshot()]
+
+    self.assertEqual(len(first_snapshot), 100)
+    self.assertEqual(len(second_snapshot), 100)
+    first_names = {bot_user.username for bot_user in first_snapshot}
+    second_names = {bot_user.username for bot_user in second_snapshot}
+    self.assertEqual(len(first_names - second_names), 20)
+    self.assertEqual(first_snapshot[0].seen_at, 1000)
+
+  def test_population_config(self) -> None:
+    config = PopulationConfig(bot_count=50, perf_coverage=1.0, provisional_fraction=1.0, tos_violation_fraction=1.0)
+    for line in SyntheticPopulation(config, FixedTimeProvider(0)).take_snapshot():
+      bot_user = BotUser.from_json(line)
+      self.assertTrue(bot_user.tos_violation)
+      self.assertEqual(len(bot_user.perfs), len(list(PerfType.all_except_unknown())))
+      self.assertTrue(all(perf.prov for perf in bot_user.perfs))
+
+  def test_lookup_users_includes_offline_bots(self) -> None:
+    population = SyntheticPopulation(PopulationConfig(bot_count=10, churn=1.0), FixedTimeProvider(0))
+    population.take_snapshot()
+    lines = population.lookup_users(["synthetic-bot-0", "Synthetic-Bot-15", "missing"])
+    self.assertListEqual([BotUser.from_json(line).username for line in lines], ["Synthetic-Bot-0", "Synthetic-Bot-15"])
@@ -0,0 +1,130 @@
+"""Tests for binary_snapshot.py."""
+
+import unittest
+
+from src.leaderboard.data import binary_snapshot
+from src.leaderboard.data.binary_snapshot import LeaderboardSnapshot
+from src.leaderboard.data.leaderboard_objects import BotProfile, LeaderboardPerf, LeaderboardRow, RankInfo
+from src.leaderboard.fs import file_paths
+from src.leaderboard.li.pert_type import PerfType
+from tests.leaderboard.chrono.epoch_seconds import DATE_2021_04_01, DATE_2025_04_01
+from tests.leaderboard.fs.in_memory_file_system import InMemoryFileSystem
+
+
+BOT_PROFILES = [
+  BotProfile("Bot-1", "activity.lichess-horse", "_earth", DATE_2021_04_01, DATE_2025_04_01, True, False, False, False),
+  BotProfile("bot-1", "", "", DATE_2021_04_01, DATE_2025_04_01, False, True, False, False),
+  BotProfile("Bøt-2", "", "NO", DATE_2021_04_01, DATE_2025_04_01, False, False, False, False),
+]
+BULLET_ROWS = [
+  LeaderboardRow("Bot-1", LeaderboardPerf(2000, 45, 0, 100, False), RankInfo(1, 0, 0, 0, 1, 2000, DATE_2025_04_01)),
+  LeaderboardRow("bot-1", LeaderboardPerf(1950, 60, -3, 50, True), RankInfo(0, 0, 0, 0, 0, 1950, DATE_2025_04_01)),
+  LeaderboardRow("Bøt-2", LeaderboardPerf(1900, 45, 7, 100, False), RankInfo(2, -1, -10, 5, 1, 1910, DATE_2025_04_01)),
+]
+BLITZ_ROWS = [
+  LeaderboardRow("Bøt-2", LeaderboardPerf(1800, 50, 0, 10, False), RankInfo(1, 0, 0, 0, 1, 1800, DATE_2025_04_01)),
+]
+ROWS_BY_PERF_TYPE = {PerfType.BULLET: BULLET_ROWS, PerfType.BLITZ: BLITZ_ROWS, PerfType.RAPID: []}
+
+
+JSON_DIGEST = bytes(range(binary_snapshot.DIGEST_SIZE))
+
+
+def save_snapshot(file_system: InMemoryFileSystem) -> None:
+  """Save a snapshot of the test data stamped with the digest of the json files of a file system."""
+  snapshot = binary_snapshot.serialize_snapshot(
+    binary_snapshot.digest_json_files(file_system), BOT_PROFILES, ROWS_BY_PERF_TYPE
+  )
+  binary_snapshot.save_snapshot(file_system, snapshot)
+
+
+class TestLeaderboardSnapshot(unittest.TestCase):
+  """Tests for LeaderboardSnapshot."""
+
+  def test_round_trip(self) -> None:
+    snapshot = LeaderboardSnapshot(
+      memoryview(binary_snapshot.serialize_snapshot(JSON_DIGEST, BOT_PROFILES, ROWS_BY_PERF_TYPE))
+    )
+    self.assertEqual(snapshot.json_digest, JSON_DIGEST)
+    bot_profiles_by_name = snapshot.load_bot_profiles()
+    self.assertListEqual(list(bot_profiles_by_name.values()), BOT_PROFILES)
+    leaderboard_rows = snapshot.load_leaderboard_rows()
+    self.assertListEqual(leaderboard_rows[PerfType.BULLET], BULLET_ROWS)
+    self.assertListEqual(leaderboard_rows[PerfType.BLITZ], BLITZ_ROWS)
+    self.assertListEqual(leaderboard_rows[PerfType.RAPID], [])
+    self.assertListEqual(leaderboard_rows[PerfType.CLASSICAL], [])
+    # The names of the profiles and rows are shared
+    self.assertIs(leaderboard_rows[PerfType.BLITZ][0].name, bot_profiles_by_name["Bøt-2"].name)
+
+  def test_strings_are_decoded_when_needed(self) -> None:
+    snapshot = LeaderboardSnapshot(
+      memoryview(binary_snapshot.serialize_snapshot(JSON_DIGEST, BOT_PROFILES, ROWS_BY_PERF_TYPE))
+    )
+    # Only the names of the perf types have been decoded
+    self.assertEqual(sum(string is not None for string in snapshot.strings), len(ROWS_BY_PERF_TYPE))
+    snapshot.load_rows(PerfType.BLITZ)
+    self.assertEqual(sum(string is not None for string in snapshot.strings), len(ROWS_BY_PERF_TYPE) + 1)
+
+  def test_invalid_snapshot(self) -> None:
+    contents = binary_snapshot.serialize_snapshot(JSON_DIGEST, BOT_PROFILES, ROWS_BY_PERF_TYPE)
+    for invalid_contents in (b"", b"NOTASNAPSHOT" + contents[12:], contents[:-1], contents + b"\x00"):
+      with self.assertRaises(ValueError):
+        LeaderboardSnapshot(memoryview(invalid_contents))
+
+
+class TestBinarySnapshotFunctions(unittest.TestCase):
+  """Tests for binary_snapshot functions."""
+
+  def test_load_generation_number(self) -> None:
+    file_system = InMemoryFileSystem()
+    self.assertEqual(binary_snapshot.load_generation_number(file_system), 0)
+    file_system.write_file(file_paths.generation_number_path(), "12")
+    self.assertEqual(binary_snapshot.load_generation_number(file_system), 12)
+
+  def test_digest_json_files(self) -> None:
+    file_system = InMemoryFileSystem()
+    digests = {binary_snapshot.digest_json_files(file_system)}
+    # An empty file differs from a missing file
+    file_system.write_file(file_paths.bot_profiles_path(), "")
+    digests.add(binary_snapshot.digest_json_files(file_system))
+    file_system.write_file(file_paths.bot_profiles_path(), "[]")
+    digests.add(binary_snapshot.digest_json_files(file_system))
+    # Moving contents from one file to the next changes the digest
+    file_system.write_file(file_paths.bot_profiles_path(), "[")
+    file_system.write_file(file_paths.data_path(PerfType.BULLET), "]")
+    digests.add(binary_snapshot.digest_json_files(file_system))
+    # Writing contents of the same size again does not
+    file_system.write_file(file_paths.data_path(PerfType.BULLET), "}")
+    digests.add(binary_snapshot.digest_json_files(file_system))
+    # A new generation does
+    file_system.write_file(file_paths.generation_number_path(), "1")
+    digests.add(binary_snapshot.digest_json_files(file_system))
+    self.assertEqual(len(digests), 5)
+    self.assertTrue(all(len(digest) == binary_snapshot.DIGEST_SIZE for digest in digests))
+
+  def test_load_snapshot(self) -> None:
+    file_system = InMemoryFileSystem()
+    self.assertIsNone(binary_snapshot.load_snapshot(file_system))
+    file_system.write_file(file_paths.bot_profiles_path(), "[]")
+    save_snapshot(file_system)
+    snapshot = binary_snapshot.load_snapshot(file_system)
+    self.assertIsNotNone(snapshot)
+    if snapshot:
+      self.assertListEqual(list(snapshot.load_bot_profiles().values()), BOT_PROFILES)
+
+  def test_load_stale_snapshot(self) -> None:
+    file_system = InMemoryFileSystem()
+    file_system.write_file(file_paths.generation_number_path(), "2")
+    save_snapshot(file_system)
+    # A data file is changed without a new generation, for example by restoring an older data file
+    file_system.write_file(file_paths.data_path(PerfType.BLITZ), "[]")
+    self.assertIsNone(binary_snapshot.load_snapshot(file_system))
+    # The generation number is changed, for example by pulling the leaderboard data without the snapshot
+    save_snapshot(file_system)
+    file_system.write_file(file_paths.generation_number_path(), "3")
+    self.assertIsNone(binary_snapshot.load_snapshot(file_system))
+
+  def test_load_invalid_snapshot(self) -> None:
+    file_system = InMemoryFileSystem()
+    file_system.write_bytes(file_paths.snapshot_path(), b"\x00" * 100)
+    self.assertIsNone(binary_snapshot.load_snapshot(file_system))
@@ -0,0 +1,60 @@
+"""Tests for bot_archive.py."""
+
+import unittest
+
+from src.leaderboard.chrono.durations import ONE_DAY, TWO_WEEKS
+from src.leaderboard.data import bot_archive
+from src.leaderboard.data.bot_archive import BotArchive
+from src.leaderboard.data.leaderboard_objects import BotProfile, LeaderboardPerf, LeaderboardRow, RankInfo
+from src.leaderboard.li.pert_type import PerfType
+from tests.leaderboard.chrono.epoch_seconds import DATE_2021_04_01, DATE_2025_04_01
+from tests.leaderboard.fs.in_memory_file_system import InMemoryFileSystem
+
+
+BOT_1_PROFILE = BotProfile("Bot-1", "", "NO", DATE_2021_04_01, DATE_2025_04_01, True, False, False, False)
+BOT_2_PROFILE = BotProfile("Bot-2", "", "", DATE_2021_04_01, DATE_2025_04_01, False, True, False, False)
+BOT_1_ROW_BULLET = LeaderboardRow("Bot-1", LeaderboardPerf(2000, 45, 0, 100, False), RankInfo(0, 0, 0, 0, 3, 2100, 0))
+BOT_2_ROW_BULLET = LeaderboardRow("Bot-2", LeaderboardPerf(1900, 45, 0, 100, False), RankInfo(0, 0, 0, 0, 0, 1900, 0))
+BOT_1_ROW_BLITZ = LeaderboardRow("Bot-1", LeaderboardPerf(1800, 60, 0, 10, True), RankInfo(0, 0, 0, 0, 0, 1800, 0))
+
+
+def create_bot_archive() -> BotArchive:
+  """Create an archive of both bots."""
+  archive = BotArchive()
+  archive.add([BOT_1_PROFILE, BOT_2_PROFILE], {PerfType.BULLET: [BOT_1_ROW_BULLET, BOT_2_ROW_BULLET]})
+  archive.add([], {PerfType.BLITZ: [BOT_1_ROW_BLITZ]})
+  return archive
+
+
+class TestBotArchive(unittest.TestCase):
+  """Tests for BotArchive."""
+
+  def test_is_stale(self) -> None:
+    self.assertFalse(bot_archive.is_stale(BOT_1_PROFILE, DATE_2025_04_01 + TWO_WEEKS + ONE_DAY, ONE_DAY))
+    self.assertTrue(bot_archive.is_stale(BOT_1_PROFILE, DATE_2025_04_01 + TWO_WEEKS + ONE_DAY + 1, ONE_DAY))
+
+  def test_restore(self) -> None:
+    archive = create_bot_archive()
+    bot_profiles_by_name, rows_by_perf_type = archive.restore(["Bot-1", "Bot-3"])
+    self.assertDictEqual(bot_profiles_by_name, {"Bot-1": BOT_1_PROFILE})
+    self.assertDictEqual(rows_by_perf_type, {PerfType.BULLET: [BOT_1_ROW_BULLET], PerfType.BLITZ: [BOT_1_ROW_BLITZ]})
+    # The restored bots are no longer archived
+    self.assertDictEqual(archive.bot_profiles_by_name, {"Bot-2": BOT_2_PROFILE})
+    self.assertTupleEqual(archive.restore(["Bot-1"]), ({}, {}))
+
+  def test_serialize(self) -> None:
+    archive = BotArchive.deserialize(create_bot_archive().serialize())
+    self.assertDictEqual(archive.bot_profiles_by_name, {"Bot-1": BOT_1_PROFILE, "Bot-2": BOT_2_PROFILE})
+    self.assertDictEqual(
+      archive.rows_by_perf_type,
+      {
+        PerfType.BULLET: {"Bot-1": BOT_1_ROW_BULLET, "Bot-2": BOT_2_ROW_BULLET},
+        PerfType.BLITZ: {"Bot-1": BOT_1_ROW_BLITZ},
+      },
+    )
+
+  def test_load_bot_archive(self) -> None:
+    file_system = InMemoryFileSystem()
+    self.assertDictEqual(bot_archive.load_bot_archive(file_system).bot_profiles_by_name, {})
+    bot_archive.save_bot_archive(file_system, create_bot_archive())
+    self.assertListEqual(list(bot_archive.load_bot_archive(file_system).bot_profiles_by_name), ["Bot-1", "Bot-2"])
@@ -0,0 +1,31 @@
+"""Tests for bot_registry.py."""
+
+import unittest
+
+from src.leaderboard.data.bot_registry import BotRegistry
+from src.leaderboard.fs import file_paths
+from tests.leaderboard.fs.in_memory_file_system import InMemoryFileSystem
+
+
+class TestBotRegistry(unittest.TestCase):
+  """Tests for BotRegistry."""
+
+  def test_register(self) -> None:
+    file_system = InMemoryFileSystem()
+    registry = BotRegistry(file_system)
+    self.assertListEqual(registry.register(["Bot-1", "Bot-2", "Bot-1"]), [0, 1, 0])
+    self.assertListEqual(registry.register(["bot-1", "Bot-2"]), [2, 1])
+    self.assertEqual(file_system.read_bytes(file_paths.bot_ids_path()), b"Bot-1\nBot-2\nbot-1\n")
+    # Nothing is written if every name has an id
+    self.assertListEqual(registry.register(["Bot-2"]), [1])
+    self.assertEqual(file_system.read_bytes(file_paths.bot_ids_path()), b"Bot-1\nBot-2\nbot-1\n")
+
+  def test_ids_are_kept(self) -> None:
+    file_system = InMemoryFileSystem()
+    BotRegistry(file_system).register(["Bot-1", "Bot-2"])
+    registry = BotRegistry(file_system)
+    self.assertEqual(registry.get_id("Bot-2"), 1)
+    self.assertIsNone(registry.get_id("Bot-3"))
+    self.assertEqual(registry.get_name(0), "Bot-1")
+    self.assertListEqual(registry.register(["Bot-3", "Bot-1"]), [2, 0])
+    self.assertListEqual(BotRegistry(file_system).get_names(), ["Bot-1", "Bot-2", "Bot-3"])
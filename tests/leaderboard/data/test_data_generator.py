@@ -3,12 +3,18 @@
 import json
 import unittest
 
+from src.leaderboard.bench import synthetic_rows
+from src.leaderboard.chrono.durations import ONE_DAY, TWO_WEEKS
 from src.leaderboard.chrono.fixed_time_provider import FixedTimeProvider
-from src.leaderboard.data import data_generator as data_generator_functions
-from src.leaderboard.data.data_generator import DataGenerator
+from src.leaderboard.data import binary_snapshot, data_generator as data_generator_functions
+from src.leaderboard.data.bot_archive import BotArchive
+from src.leaderboard.data.bot_registry import BotRegistry
+from src.leaderboard.data.data_generator import BotColumns, DataGenerator
 from src.leaderboard.data.leaderboard_objects import BotPerf, BotProfile, LeaderboardPerf, LeaderboardRow, RankInfo
 from src.leaderboard.data.leaderboard_update import CurrentBotPerfOnlyUpdate, LeaderboardUpdate
+from src.leaderboard.data.sightings_buffer import SightingsBuffer
 from src.leaderboard.fs import file_paths
+from src.leaderboard.li.bot_user import BotUser
 from src.leaderboard.li.pert_type import PerfType
 from tests.leaderboard.chrono.epoch_seconds import (
   DATE_2021_04_01,
@@ -19,6 +25,7 @@ from tests.leaderboard.chrono.epoch_seconds import (
 )
 from tests.leaderboard.fs.in_memory_file_system import InMemoryFileSystem
 from tests.leaderboard.li.fake_lichess_client import FakeLichessClient
+from tests.leaderboard.li.fake_users_client import FakeUsersClient
 
 
 # Bot profiles
@@ -28,6 +35,7 @@ BOT_3_PROFILE = BotProfile("Bot-3", "", "", DATE_2023_04_01, DATE_2025_04_01, Fa
 BOT_4_PROFILE = BotProfile("Bot-4", "", "", DATE_2024_04_01, DATE_2025_04_01, False, False, False, True)
 
 BOT_PROFILES_BY_NAME = {"Bot-1": BOT_1_PROFILE, "Bot-2": BOT_2_PROFILE, "Bot-3": BOT_3_PROFILE, "Bot-4": BOT_4_PROFILE}
+BOT_COLUMNS = BotColumns.create(BOT_PROFILES_BY_NAME, DATE_2025_04_01)
 
 # Bullet leaderboard data
 BOT_1_PERF_BULLET = BotPerf("Bot-1", LeaderboardPerf(3000, 0, 0, 1000, False))
@@ -150,6 +158,45 @@ class TestDataGeneratorFunctions(unittest.TestCase):
     }
     self.assertDictEqual(bot_info.bot_perfs_by_perf_type, expected_bot_perfs_by_perf_type)
 
+  def test_get_online_bot_info_selected_perf_types(self) -> None:
+    lichess_client = FakeLichessClient()
+    lichess_client.set_online_bots(
+      "\n".join(
+        [
+          remove_whitespace(BOT_1_CURRENT_JSON),
+          """{ "username": "Bot-3", "perfs": { "bullet": { "games": 1000 }, "rapid": { "games": 10 } } }""",
+        ]
+      )
+    )
+    bot_info = data_generator_functions.get_online_bot_info(lichess_client, frozenset((PerfType.BLITZ,)))
+    # The bots which have not played the selected perf types have no profile
+    self.assertListEqual(list(bot_info.bot_profiles_by_name.keys()), ["Bot-1"])
+    self.assertDictEqual(bot_info.bot_perfs_by_perf_type, {PerfType.BLITZ: [BOT_1_CURRENT_PERF_BLITZ]})
+
+  def test_remove_bots(self) -> None:
+    bot_info = data_generator_functions.BotInfoResult(
+      {"Bot-1": BOT_1_PROFILE, "Bot-2": BOT_2_PROFILE}, {PerfType.BULLET: [BOT_1_PERF_BULLET, BOT_2_PERF_BULLET]}
+    )
+    self.assertEqual(
+      data_generator_functions.remove_bots(bot_info, {"Bot-2"}),
+      data_generator_functions.BotInfoResult({"Bot-1": BOT_1_PROFILE}, {PerfType.BULLET: [BOT_1_PERF_BULLET]}),
+    )
+
+  def test_restore_archived_bots(self) -> None:
+    bot_archive = BotArchive()
+    bot_archive.add([BOT_1_PROFILE], {PerfType.BULLET: [BOT_1_ROW_BULLET]})
+    bot_profiles_by_name, rows_by_perf_type = data_generator_functions.restore_archived_bots(
+      bot_archive, {"Bot-1"}, {"Bot-2": BOT_2_PROFILE}, {PerfType.BULLET: [BOT_2_ROW_BULLET]}
+    )
+    self.assertDictEqual(bot_profiles_by_name, {"Bot-2": BOT_2_PROFILE, "Bot-1": BOT_1_PROFILE})
+    self.assertDictEqual(rows_by_perf_type, {PerfType.BULLET: [BOT_1_ROW_BULLET, BOT_2_ROW_BULLET]})
+
+  def test_select_perf_types(self) -> None:
+    self.assertListEqual(data_generator_functions.select_perf_types(None), list(PerfType.all_except_unknown()))
+    self.assertListEqual(
+      data_generator_functions.select_perf_types({PerfType.RAPID, PerfType.BULLET}), [PerfType.BULLET, PerfType.RAPID]
+    )
+
   def test_get_online_bot_info_only_one_perf_played(self) -> None:
     lichess_client = FakeLichessClient()
     lichess_client.set_online_bots(
@@ -166,6 +213,61 @@ class TestDataGeneratorFunctions(unittest.TestCase):
     self.assertDictEqual(bot_info.bot_profiles_by_name, {})
     self.assertDictEqual(bot_info.bot_perfs_by_perf_type, {})
 
+  def test_get_offline_bot_info(self) -> None:
+    users_client = FakeUsersClient()
+    users_client.set_users([BotUser.from_json(BOT_2_CURRENT_JSON)])
+    previous_profiles_by_name = {"Bot-1": BOT_1_PROFILE, "Bot-2": BOT_2_PROFILE, "Bot-3": BOT_3_PROFILE}
+    bot_info = data_generator_functions.get_offline_bot_info(
+      users_client, previous_profiles_by_name, {"Bot-1": BOT_1_CURRENT_PROFILE}
+    )
+    # Only the bots which are not online are looked up
+    self.assertListEqual(users_client.requested_usernames, ["Bot-2", "Bot-3"])
+    # The looked up bots are offline
+    self.assertFalse(bot_info.bot_profiles_by_name["Bot-2"].online)
+    self.assertListEqual(list(bot_info.bot_profiles_by_name.keys()), ["Bot-2"])
+    self.assertListEqual(bot_info.bot_perfs_by_perf_type[PerfType.BULLET], [BOT_2_CURRENT_PERF_BULLET])
+
+  def test_merge_bot_profiles_refreshed(self) -> None:
+    previous_profiles_by_name = {"Bot-1": BOT_1_PROFILE, "Bot-2": BOT_2_PROFILE}
+    current_profiles_by_name = {"Bot-1": BOT_1_CURRENT_PROFILE}
+    refreshed_profiles_by_name = {"Bot-1": BOT_1_PROFILE, "Bot-2": BOT_2_CURRENT_PROFILE}
+    merged_profiles_by_name = data_generator_functions.merge_bot_profiles(
+      previous_profiles_by_name, current_profiles_by_name, refreshed_profiles_by_name
+    )
+    # The online profile takes precedence over the refreshed profile
+    self.assertEqual(merged_profiles_by_name["Bot-1"], BOT_1_CURRENT_PROFILE.create_updated_copy_for_for_merge())
+    self.assertEqual(merged_profiles_by_name["Bot-2"], BOT_2_CURRENT_PROFILE.create_refreshed_copy_for_merge())
+    self.assertFalse(merged_profiles_by_name["Bot-2"].online)
+
+  def test_get_sighted_bot_info(self) -> None:
+    buffer = SightingsBuffer([BotUser.from_json(BOT_1_CURRENT_JSON), BotUser.from_json(BOT_2_CURRENT_JSON)])
+    bot_info = data_generator_functions.get_sighted_bot_info(buffer, {"Bot-1": BOT_1_CURRENT_PROFILE})
+    # Bots which are currently online are left out
+    self.assertListEqual(list(bot_info.bot_profiles_by_name.keys()), ["Bot-2"])
+    self.assertFalse(bot_info.bot_profiles_by_name["Bot-2"].online)
+    self.assertListEqual(bot_info.bot_perfs_by_perf_type[PerfType.BLITZ], [BOT_2_CURRENT_PERF_BLITZ])
+
+  def test_combine_bot_info(self) -> None:
+    bot_info = data_generator_functions.BotInfoResult(
+      {"Bot-1": BOT_1_PROFILE, "Bot-2": BOT_2_PROFILE},
+      {PerfType.BULLET: [BOT_1_PERF_BULLET, BOT_2_PERF_BULLET], PerfType.BLITZ: [BOT_1_CURRENT_PERF_BLITZ]},
+    )
+    overriding_bot_info = data_generator_functions.BotInfoResult(
+      {"Bot-1": BOT_1_CURRENT_PROFILE}, {PerfType.BULLET: [BOT_1_CURRENT_PERF_BULLET]}
+    )
+    combined_bot_info = data_generator_functions.combine_bot_info(bot_info, overriding_bot_info)
+    self.assertDictEqual(combined_bot_info.bot_profiles_by_name, {"Bot-1": BOT_1_CURRENT_PROFILE, "Bot-2": BOT_2_PROFILE})
+    self.assertDictEqual(
+      dict(combined_bot_info.bot_perfs_by_perf_type),
+      {PerfType.BULLET: [BOT_2_PERF_BULLET, BOT_1_CURRENT_PERF_BULLET], PerfType.BLITZ: []},
+    )
+
+  def test_merge_bot_profiles_refreshed_only(self) -> None:
+    refreshed_profile = BotProfile("Bot-1", "", "", DATE_2021_04_01, DATE_2025_04_01, False, False, True, False)
+    merged_profiles_by_name = data_generator_functions.merge_bot_profiles({}, {}, {"Bot-1": refreshed_profile})
+    # The bot is new but offline
+    self.assertDictEqual(merged_profiles_by_name, {"Bot-1": refreshed_profile})
+
   def test_merge_bot_profiles(self) -> None:
     previous_profiles_by_name = {"Bot-1": BOT_1_PROFILE}
     current_profiles_by_name = {"Bot-1": BOT_1_CURRENT_PROFILE}
@@ -176,13 +278,82 @@ class TestDataGeneratorFunctions(unittest.TestCase):
     self.assertDictEqual(data_generator_functions.merge_bot_profiles(previous_profiles_by_name, {}), previous_profiles_by_name)
     self.assertDictEqual(data_generator_functions.merge_bot_profiles({}, current_profiles_by_name), current_profiles_by_name)
 
-  def test_create_updates(self) -> None:
-    updates = data_generator_functions.create_updates([], [BOT_1_CURRENT_PERF_BULLET, BOT_2_CURRENT_PERF_BULLET])
+  def test_merge_updates_current_bot_perfs_only(self) -> None:
+    updates = data_generator_functions.merge_updates([], [BOT_1_CURRENT_PERF_BULLET, BOT_2_CURRENT_PERF_BULLET])
     expected_updates = [
       CurrentBotPerfOnlyUpdate(BOT_1_CURRENT_PERF_BULLET),
       CurrentBotPerfOnlyUpdate(BOT_2_CURRENT_PERF_BULLET),
     ]
-    self.assertCountEqual(updates, expected_updates)
+    self.assertListEqual(updates, expected_updates)
+
+  def test_merge_updates(self) -> None:
+    previous_rows = [BOT_1_ROW_BULLET, BOT_2_ROW_BULLET]
+    current_bot_perfs = [BOT_2_CURRENT_PERF_BULLET, BOT_3_PERF_BULLET]
+    updates = data_generator_functions.merge_updates(previous_rows, current_bot_perfs)
+    expected_updates = [
+      LeaderboardUpdate.create_update(BOT_1_ROW_BULLET, None),
+      LeaderboardUpdate.create_update(BOT_2_ROW_BULLET, BOT_2_CURRENT_PERF_BULLET),
+      LeaderboardUpdate.create_update(None, BOT_3_PERF_BULLET),
+    ]
+    self.assertListEqual(updates, expected_updates)
+
+  def test_merge_updates_joins_by_name(self) -> None:
+    ranking_updates, bot_profiles_by_name = synthetic_rows.create_ranking_inputs(300)
+    rows = data_generator_functions.create_ranked_rows(
+      ranking_updates, BotColumns.create(bot_profiles_by_name, synthetic_rows.CURRENT_TIME), synthetic_rows.CURRENT_TIME
+    )
+    previous_rows = sorted(rows[::2], key=lambda row: data_generator_functions.name_sort_key(row.name))
+    current_bot_perfs = sorted(
+      (BotPerf(row.name, row.perf) for row in rows[::3]),
+      key=lambda bot_perf: data_generator_functions.name_sort_key(bot_perf.name),
+    )
+    updates = data_generator_functions.merge_updates(previous_rows, current_bot_perfs)
+    previous_row_by_name = {row.name: row for row in previous_rows}
+    current_bot_perf_by_name = {bot_perf.name: bot_perf for bot_perf in current_bot_perfs}
+    # There is one update for each name, made from the previous row and current perf with that name
+    self.assertCountEqual(
+      [update.get_name() for update in updates], previous_row_by_name.keys() | current_bot_perf_by_name.keys()
+    )
+    for update in updates:
+      name = update.get_name()
+      self.assertEqual(
+        update, LeaderboardUpdate.create_update(previous_row_by_name.get(name), current_bot_perf_by_name.get(name))
+      )
+    self.assertTrue(data_generator_functions.is_sorted_by_name(update.get_name() for update in updates))
+
+  def test_merge_updates_duplicate_names(self) -> None:
+    updates = data_generator_functions.merge_updates([], [BOT_2_PERF_BULLET, BOT_2_CURRENT_PERF_BULLET])
+    self.assertListEqual(updates, [CurrentBotPerfOnlyUpdate(BOT_2_CURRENT_PERF_BULLET)])
+
+  def test_is_sorted_by_name(self) -> None:
+    self.assertTrue(data_generator_functions.is_sorted_by_name(["Bot-1", "bot-1", "Bot-2"]))
+    self.assertFalse(data_generator_functions.is_sorted_by_name(["bot-1", "Bot-1"]))
+    self.assertTrue(data_generator_functions.is_sorted_by_name([]))
+
+  def test_order_rows_like_updates(self) -> None:
+    updates: list[LeaderboardUpdate] = [
+      CurrentBotPerfOnlyUpdate(BOT_2_PERF_BULLET),
+      CurrentBotPerfOnlyUpdate(BOT_1_PERF_BULLET),
+    ]
+    ranked_rows = data_generator_functions.create_ranked_rows(updates, BOT_COLUMNS, DATE_2025_04_01)
+    rows = data_generator_functions.order_rows_like_updates(ranked_rows, updates)
+    self.assertListEqual([row.name for row in rows], ["Bot-2", "Bot-1"])
+
+  def test_bot_columns(self) -> None:
+    stale_profile = BotProfile("Bot-5", "", "", DATE_2021_04_01, DATE_2021_04_01, False, False, False, True)
+    bot_columns = BotColumns.create({"Bot-2": BOT_2_PROFILE, "Bot-5": stale_profile}, DATE_2025_04_01)
+    self.assertDictEqual(bot_columns.id_by_name, {"Bot-2": 0, "Bot-5": 1})
+    self.assertListEqual(bot_columns.created, [DATE_2022_04_01, DATE_2021_04_01])
+    self.assertListEqual(bot_columns.eligible, [True, False])
+
+  def test_bot_columns_with_registry(self) -> None:
+    registry = BotRegistry(InMemoryFileSystem())
+    registry.register(["Bot-9"])
+    bot_columns = BotColumns.create({"Bot-2": BOT_2_PROFILE, "Bot-1": BOT_1_PROFILE}, DATE_2025_04_01, registry)
+    # New bots are registered in name order, and the ids of the bots without profiles are kept
+    self.assertDictEqual(bot_columns.id_by_name, {"Bot-9": 0, "Bot-1": 1, "Bot-2": 2})
+    self.assertListEqual(bot_columns.created, [0, DATE_2021_04_01, DATE_2022_04_01])
+    self.assertListEqual(bot_columns.eligible, [False, True, True])
 
   def test_create_sort_key(self) -> None:
     bot_names = ["BOT-4", "Bot-2", "Bot-5", "bot-3", "bot-1", "Bot-4", "Bot-1"]
@@ -195,7 +366,7 @@ class TestDataGeneratorFunctions(unittest.TestCase):
       CurrentBotPerfOnlyUpdate(BOT_1_PERF_BULLET),
       CurrentBotPerfOnlyUpdate(BOT_4_PERF_BULLET),
     ]
-    leaderboard_rows = data_generator_functions.create_ranked_rows(updates, BOT_PROFILES_BY_NAME, DATE_2025_04_01)
+    leaderboard_rows = data_generator_functions.create_ranked_rows(updates, BOT_COLUMNS, DATE_2025_04_01)
     expected_leaderboard_rows = [
       LeaderboardRow("Bot-1", BOT_1_PERF_BULLET.perf, RankInfo(1, 0, 0, 0, 1, 3000, DATE_2025_04_01)),
       LeaderboardRow("Bot-2", BOT_2_PERF_BULLET.perf, RankInfo(2, 0, 0, 0, 2, 2900, DATE_2025_04_01)),
@@ -210,7 +381,7 @@ class TestDataGeneratorFunctions(unittest.TestCase):
       CurrentBotPerfOnlyUpdate(BOT_4_PERF_BULLET),
       CurrentBotPerfOnlyUpdate(BOT_3_PERF_BULLET),
     ]
-    leaderboard_rows = data_generator_functions.create_ranked_rows(updates, BOT_PROFILES_BY_NAME, DATE_2025_04_01)
+    leaderboard_rows = data_generator_functions.create_ranked_rows(updates, BOT_COLUMNS, DATE_2025_04_01)
     expected_leaderboard_rows = [
       LeaderboardRow("Bot-1", BOT_1_PERF_BULLET.perf, RankInfo(1, 0, 0, 0, 1, 3000, DATE_2025_04_01)),
       LeaderboardRow("Bot-2", BOT_2_PERF_BULLET.perf, RankInfo(2, 0, 0, 0, 2, 2900, DATE_2025_04_01)),
@@ -226,7 +397,7 @@ class TestDataGeneratorFunctions(unittest.TestCase):
       CurrentBotPerfOnlyUpdate(BOT_1_PERF_BULLET),
       CurrentBotPerfOnlyUpdate(BOT_1_PERF_BULLET),
     ]
-    leaderboard_rows = data_generator_functions.create_ranked_rows(updates, BOT_PROFILES_BY_NAME, DATE_2025_04_01)
+    leaderboard_rows = data_generator_functions.create_ranked_rows(updates, BOT_COLUMNS, DATE_2025_04_01)
     expected_leaderboard_rows = [
       LeaderboardRow("Bot-1", BOT_1_PERF_BULLET.perf, RankInfo(1, 0, 0, 0, 1, 3000, DATE_2025_04_01)),
       LeaderboardRow("Bot-1", BOT_1_PERF_BULLET.perf, RankInfo(1, 0, 0, 0, 1, 3000, DATE_2025_04_01)),
@@ -244,7 +415,7 @@ class TestDataGeneratorFunctions(unittest.TestCase):
       CurrentBotPerfOnlyUpdate(bot_3_perf),
       CurrentBotPerfOnlyUpdate(bot_1_perf),
     ]
-    leaderboard_rows = data_generator_functions.create_ranked_rows(updates, BOT_PROFILES_BY_NAME, DATE_2025_04_01)
+    leaderboard_rows = data_generator_functions.create_ranked_rows(updates, BOT_COLUMNS, DATE_2025_04_01)
     expected_leaderboard_rows = [
       LeaderboardRow("Bot-1", bot_1_perf.perf, RankInfo(1, 0, 0, 0, 1, 3000, DATE_2025_04_01)),
       LeaderboardRow("Bot-2", bot_2_perf.perf, RankInfo(1, 0, 0, 0, 1, 3000, DATE_2025_04_01)),
@@ -257,7 +428,9 @@ class TestDataGeneratorFunctions(unittest.TestCase):
     ineligible_bot_1_perf = BotPerf("Bot-1", LeaderboardPerf(3000, 0, 0, 1000, True))
     updates: list[LeaderboardUpdate] = [CurrentBotPerfOnlyUpdate(ineligible_bot_1_perf)]
     bot_profiles_by_name = {"Bot-1": BotProfile("Bot-1", "", "", DATE_2021_04_01, DATE_2025_04_01, False, False, False, True)}
-    leaderboard_rows = data_generator_functions.create_ranked_rows(updates, bot_profiles_by_name, DATE_2025_04_01)
+    leaderboard_rows = data_generator_functions.create_ranked_rows(
+      updates, BotColumns.create(bot_profiles_by_name, DATE_2025_04_01), DATE_2025_04_01
+    )
     self.assertEqual(leaderboard_rows[0].rank_info.rank, 0)
 
   def test_create_ranked_rows_no_ineligible(self) -> None:
@@ -265,7 +438,9 @@ class TestDataGeneratorFunctions(unittest.TestCase):
     updates: list[LeaderboardUpdate] = [CurrentBotPerfOnlyUpdate(ineligible_bot_1_perf)]
     # Don't include last seen greater than two weeks
     bot_profiles_by_name = {"Bot-1": BotProfile("Bot-1", "", "", DATE_2021_04_01, DATE_2021_04_01, False, False, False, True)}
-    leaderboard_rows = data_generator_functions.create_ranked_rows(updates, bot_profiles_by_name, DATE_2025_04_01)
+    leaderboard_rows = data_generator_functions.create_ranked_rows(
+      updates, BotColumns.create(bot_profiles_by_name, DATE_2025_04_01), DATE_2025_04_01
+    )
     self.assertEqual(leaderboard_rows[0].rank_info.rank, 0)
 
   def test_create_ranked_rows_1224_ineligible(self) -> None:
@@ -278,40 +453,72 @@ class TestDataGeneratorFunctions(unittest.TestCase):
       CurrentBotPerfOnlyUpdate(bot_2_perf),
       CurrentBotPerfOnlyUpdate(bot_3_perf),
     ]
-    leaderboard_rows = data_generator_functions.create_ranked_rows(updates, BOT_PROFILES_BY_NAME, DATE_2025_04_01)
+    leaderboard_rows = data_generator_functions.create_ranked_rows(updates, BOT_COLUMNS, DATE_2025_04_01)
     self.assertEqual(leaderboard_rows[0].rank_info.rank, 1)
     self.assertEqual(leaderboard_rows[1].rank_info.rank, 0)
     self.assertEqual(leaderboard_rows[2].rank_info.rank, 2)
 
+  def test_can_reuse_rows(self) -> None:
+    rows = data_generator_functions.create_ranked_rows(
+      [CurrentBotPerfOnlyUpdate(BOT_1_PERF_BULLET), CurrentBotPerfOnlyUpdate(BOT_2_PERF_BULLET)],
+      BOT_COLUMNS,
+      DATE_2025_04_01,
+    )
+    next_day_columns = BotColumns.create(BOT_PROFILES_BY_NAME, DATE_2025_04_01 + ONE_DAY)
+    self.assertTrue(
+      data_generator_functions.can_reuse_rows(rows, [BOT_1_PERF_BULLET], next_day_columns, DATE_2025_04_01 + ONE_DAY)
+    )
+    # The rows have changed
+    self.assertFalse(
+      data_generator_functions.can_reuse_rows(rows, [BOT_3_PERF_BULLET], next_day_columns, DATE_2025_04_01 + ONE_DAY)
+    )
+    # The rows carry deltas from the previous generation
+    self.assertFalse(data_generator_functions.can_reuse_rows([BOT_2_ROW_BULLET], [], BOT_COLUMNS, DATE_2025_04_01))
+    # The bots have not played in the last two weeks
+    later_time = DATE_2025_04_01 + TWO_WEEKS + ONE_DAY
+    self.assertFalse(
+      data_generator_functions.can_reuse_rows(rows, [], BotColumns.create(BOT_PROFILES_BY_NAME, later_time), later_time)
+    )
+
+  def test_can_reuse_rows_candidate_names(self) -> None:
+    rows = data_generator_functions.create_ranked_rows(
+      [CurrentBotPerfOnlyUpdate(BOT_1_PERF_BULLET), CurrentBotPerfOnlyUpdate(BOT_2_PERF_BULLET)],
+      BOT_COLUMNS,
+      DATE_2025_04_01,
+    )
+    later_time = DATE_2025_04_01 + TWO_WEEKS + ONE_DAY
+    later_columns = BotColumns.create(BOT_PROFILES_BY_NAME, later_time)
+    # Only the eligibility of the candidates is checked
+    self.assertTrue(data_generator_functions.can_reuse_rows(rows, [], later_columns, later_time, []))
+    self.assertTrue(data_generator_functions.can_reuse_rows(rows, [], later_columns, later_time, ["Bot-3"]))
+    self.assertFalse(data_generator_functions.can_reuse_rows(rows, [], later_columns, later_time, ["Bot-2"]))
+
+  def test_can_reuse_rows_changed_perf(self) -> None:
+    rows = data_generator_functions.create_ranked_rows(
+      [CurrentBotPerfOnlyUpdate(BOT_1_PERF_BULLET)], BOT_COLUMNS, DATE_2025_04_01
+    )
+    changed_bot_1_perf = BotPerf("Bot-1", LeaderboardPerf(3000, 0, 0, 1001, False))
+    self.assertFalse(data_generator_functions.can_reuse_rows(rows, [changed_bot_1_perf], BOT_COLUMNS, DATE_2025_04_01))
+
 
 class TestDataGenerator(unittest.TestCase):
   """Tests for DataGenerator."""
 
-  def test_create_all_leaderboards(self) -> None:
+  def test_load_previous_data_from_current_snapshot(self) -> None:
     file_system = InMemoryFileSystem()
-
-    bullet_leaderboard_json = [BOT_1_ROW_BULLET.as_dict(), BOT_2_ROW_BULLET.as_dict()]
-    file_system.write_file(file_paths.data_path(PerfType.BULLET), json.dumps(bullet_leaderboard_json))
-
-    bot_profiles_json = [BOT_1_PROFILE.as_dict(), BOT_2_PROFILE.as_dict()]
-    file_system.write_file(file_paths.bot_profiles_path(), json.dumps(bot_profiles_json))
-
-    lichess_client = FakeLichessClient()
-    lichess_client.set_online_bots("\n".join([remove_whitespace(BOT_1_CURRENT_JSON), remove_whitespace(BOT_2_CURRENT_JSON)]))
-
-    time_provider = FixedTimeProvider(DATE_2025_04_01)
-
-    data_generator = DataGenerator(file_system, lichess_client, time_provider)
-    leaderboard_data = data_generator.generate_leaderboard_data()
-
-    expected_ranked_rows = [
-      LeaderboardRow("Bot-1", BOT_1_CURRENT_PERF_BULLET.perf, RankInfo(2, -1, -50, 100, 1, 3000, DATE_2025_04_01)),
-      LeaderboardRow("Bot-2", BOT_2_CURRENT_PERF_BULLET.perf, RankInfo(1, 1, 100, 100, 1, 3000, DATE_2025_04_01)),
-    ]
-    self.assertListEqual(leaderboard_data.get_ranked_rows_sorted()[PerfType.BULLET], expected_ranked_rows)
-
-    expected_bot_profiles = [
-      BOT_1_CURRENT_PROFILE.create_updated_copy_for_for_merge(),
-      BOT_2_CURRENT_PROFILE.create_updated_copy_for_for_merge(),
-    ]
-    self.assertEqual(leaderboard_data.get_bot_profiles_sorted(), expected_bot_profiles)
+    file_system.write_file(file_paths.bot_profiles_path(), json.dumps([BOT_1_PROFILE.as_dict()]))
+    file_system.write_file(file_paths.data_path(PerfType.BULLET), json.dumps([BOT_1_ROW_BULLET.as_dict()]))
+    json_digest = binary_snapshot.digest_json_files(file_system)
+    snapshot = binary_snapshot.serialize_snapshot(json_digest, [BOT_2_PROFILE], {PerfType.BULLET: [BOT_2_ROW_BULLET]})
+    binary_snapshot.save_snapshot(file_system, snapshot)
+    data_generator = DataGenerator(file_system, FakeLichessClient(), FixedTimeProvider(DATE_2025_04_01))
+
+    bot_profiles_by_name, previous_rows_by_perf_type = data_generator.load_previous_data()
+    self.assertListEqual(list(bot_profiles_by_name), ["Bot-2"])
+    self.assertListEqual(previous_rows_by_perf_type[PerfType.BULLET], [BOT_2_ROW_BULLET])
+
+    # The json files are loaded once they no longer match the snapshot
+    file_system.write_file(file_paths.bot_profiles_path(), json.dumps([BOT_1_PROFILE.as_dict()], indent=2))
+    bot_profiles_by_name, previous_rows_by_perf_type = data_generator.load_previous_data()
+    self.assertListEqual(list(bot_profiles_by_name), ["Bot-1"])
+    self.assertListEqual(previous_rows_by_perf_type[PerfType.BULLET], [BOT_1_ROW_BULLET])
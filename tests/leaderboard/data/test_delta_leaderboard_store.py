@@ -0,0 +1,256 @@
+"""Tests for delta_leaderboard_store.py."""
+
+import json
+import unittest
+from typing import Any
+
+from src.leaderboard.data import delta_leaderboard_store
+from src.leaderboard.data.delta_leaderboard_store import DeltaLeaderboardStore
+from src.leaderboard.data.json_leaderboard_store import JsonLeaderboardStore
+from src.leaderboard.data.leaderboard_objects import BotProfile, LeaderboardPerf, LeaderboardRow, RankInfo
+from src.leaderboard.data.leaderboard_store import copy_leaderboard_state
+from src.leaderboard.fs import file_paths
+from src.leaderboard.li.pert_type import PerfType
+from tests.leaderboard.chrono.epoch_seconds import DATE_2021_04_01, DATE_2025_04_01
+from tests.leaderboard.fs.in_memory_file_system import InMemoryFileSystem
+
+
+BOT_PROFILES = [
+  BotProfile("Bot-1", "flair", "_earth", DATE_2021_04_01, DATE_2025_04_01, True, False, False, False),
+  BotProfile("bot-1", "", "", DATE_2021_04_01, DATE_2025_04_01, False, True, False, False),
+  BotProfile("Bot-2", "", "", DATE_2021_04_01, DATE_2025_04_01, False, False, False, False),
+]
+# Sorted by name_sort_key
+BULLET_ROWS = [
+  LeaderboardRow("Bot-1", LeaderboardPerf(2000, 45, 0, 100, False), RankInfo(1, 0, 0, 0, 1, 2000, DATE_2025_04_01)),
+  LeaderboardRow("bot-1", LeaderboardPerf(1950, 60, 3, 50, True), RankInfo(0, 0, 0, 0, 0, 1950, DATE_2025_04_01)),
+  LeaderboardRow("Bot-2", LeaderboardPerf(1900, 45, 0, 100, False), RankInfo(2, 1, -10, 5, 2, 1910, DATE_2025_04_01)),
+]
+# Bot-2 of BULLET_ROWS in the next generation, without its deltas
+CHANGED_ROW = LeaderboardRow("Bot-2", BULLET_ROWS[2].perf, RankInfo(2, 0, 0, 0, 2, 1910, DATE_2025_04_01))
+NEW_ROW = LeaderboardRow("Bot-0", LeaderboardPerf(1500, 45, 0, 10, False), RankInfo(3, 0, 0, 0, 3, 1500, DATE_2025_04_01))
+# Bot-2 of BULLET_ROWS after it won games and passed Bot-1
+PASSING_ROW = LeaderboardRow(
+  "Bot-2", LeaderboardPerf(1990, 45, 0, 105, False), RankInfo(1, 1, 90, 5, 1, 1990, DATE_2025_04_01)
+)
+PASSED_ROW = LeaderboardRow("Bot-1", BULLET_ROWS[0].perf, RankInfo(2, -1, 0, 0, 1, 2000, DATE_2025_04_01))
+
+
+def read_record(file_system: InMemoryFileSystem, record_number: int) -> dict[str, Any]:
+  """Read the json of a record."""
+  return json.loads(file_system.file_system[file_paths.generation_record_path(record_number)])
+
+
+def save_generation(
+  store: DeltaLeaderboardStore,
+  generation_number: int,
+  rows_by_perf_type: dict[PerfType, list[LeaderboardRow]],
+  bot_profiles: list[BotProfile] = BOT_PROFILES,
+) -> None:
+  """Save the bot profiles and rows of a generation to a store."""
+  store.file_system.write_file(file_paths.generation_number_path(), str(generation_number))
+  store.save(bot_profiles, rows_by_perf_type)
+
+
+def compact(row: LeaderboardRow) -> list[Any]:
+  """Return the compact recorded values of a row."""
+  return delta_leaderboard_store.compact_values(delta_leaderboard_store.row_to_values(row))
+
+
+class TestDeltaLeaderboardStoreFunctions(unittest.TestCase):
+  """Tests for delta_leaderboard_store functions."""
+
+  def test_row_values(self) -> None:
+    for row in BULLET_ROWS:
+      values = delta_leaderboard_store.row_to_values(row)
+      self.assertEqual(len(values), len(delta_leaderboard_store.ROW_FIELDS))
+      self.assertEqual(delta_leaderboard_store.row_from_values(values), row)
+      self.assertEqual(len(compact(row)), len(delta_leaderboard_store.COMPACT_ROW_FIELDS))
+
+  def test_derive_values(self) -> None:
+    previous_values = delta_leaderboard_store.row_to_values(BULLET_ROWS[2])
+    self.assertListEqual(
+      delta_leaderboard_store.derive_values(previous_values, compact(PASSING_ROW)),
+      delta_leaderboard_store.row_to_values(PASSING_ROW),
+    )
+    self.assertListEqual(
+      delta_leaderboard_store.derive_values(None, compact(NEW_ROW)), delta_leaderboard_store.row_to_values(NEW_ROW)
+    )
+    # An unchanged row loses its deltas in the next generation
+    self.assertListEqual(
+      delta_leaderboard_store.get_next_values(previous_values, 0), delta_leaderboard_store.row_to_values(CHANGED_ROW)
+    )
+    self.assertListEqual(
+      delta_leaderboard_store.get_next_values(delta_leaderboard_store.row_to_values(BULLET_ROWS[0]), 1),
+      delta_leaderboard_store.row_to_values(PASSED_ROW),
+    )
+
+  def test_get_changed_values(self) -> None:
+    # Bot-4 and Bot-5 are tied
+    previous_ranks = {"Bot-1": 1, "Bot-2": 2, "Bot-3": 3, "Bot-4": 4, "Bot-5": 4, "Bot-6": 6}
+    previous_row_values = {
+      name: [name, 2000 - rank, 45, 0, 100, 0, rank, 0, 0, 0, rank, 2000, 0] for name, rank in previous_ranks.items()
+    }
+    # Bot-6 passes Bot-2 to Bot-4, and Bot-4 moves down and Bot-5 does not
+    ranks = {"Bot-1": 1, "Bot-2": 3, "Bot-3": 4, "Bot-4": 5, "Bot-5": 4, "Bot-6": 2}
+    row_values: dict[str, list[Any]] = {}
+    for name, values in previous_row_values.items():
+      compact = delta_leaderboard_store.compact_values(values)
+      compact[1] += 10 if name == "Bot-6" else 0
+      compact[6] = ranks[name]
+      row_values[name] = delta_leaderboard_store.derive_values(values, compact)
+
+    changed_values, rank_shifts = delta_leaderboard_store.get_changed_values(previous_row_values, row_values)
+    # The rows which moved the same as the rows around them are not recorded
+    self.assertListEqual([values[0] for values in changed_values], ["Bot-6", "Bot-4"])
+    self.assertListEqual(rank_shifts, [[2, 1], [4, 0]])
+    state = delta_leaderboard_store.LeaderboardState(row_values_by_perf_type={PerfType.BULLET: previous_row_values})
+    record = {"rows": {"bullet": changed_values}, "rank_shifts": {"bullet": rank_shifts}}
+    self.assertDictEqual(state.apply(record).row_values_by_perf_type[PerfType.BULLET], row_values)
+
+
+class TestDeltaLeaderboardStore(unittest.TestCase):
+  """Tests for DeltaLeaderboardStore."""
+
+  def test_save_and_load(self) -> None:
+    file_system = InMemoryFileSystem()
+    store = DeltaLeaderboardStore(file_system)
+    self.assertTrue(store.is_empty())
+    save_generation(store, 5, {PerfType.BULLET: BULLET_ROWS})
+    self.assertFalse(store.is_empty())
+    # The record is numbered by the generation
+    self.assertListEqual(file_system.list_files(file_paths.generations_dir()), [file_paths.generation_record_path(5)])
+
+    store = DeltaLeaderboardStore(file_system)
+    self.assertDictEqual(store.load_bot_profiles(), {bot_profile.name: bot_profile for bot_profile in BOT_PROFILES})
+    leaderboard_rows = store.load_leaderboard_rows()
+    self.assertListEqual(leaderboard_rows[PerfType.BULLET], BULLET_ROWS)
+    self.assertListEqual(leaderboard_rows[PerfType.BLITZ], [])
+
+  def test_save_only_writes_changes(self) -> None:
+    file_system = InMemoryFileSystem()
+    store = DeltaLeaderboardStore(file_system)
+    save_generation(store, 0, {PerfType.BULLET: BULLET_ROWS, PerfType.BLITZ: BULLET_ROWS})
+    save_generation(store, 1, {PerfType.BULLET: [NEW_ROW, BULLET_ROWS[0], CHANGED_ROW]}, BOT_PROFILES[:2])
+
+    self.assertEqual(read_record(file_system, 0)["keyframe"], True)
+    # The row which only lost its deltas is not recorded, but the row which kept them is recorded with all of its values
+    self.assertDictEqual(
+      read_record(file_system, 1),
+      {
+        "removed_bot_profiles": ["Bot-2"],
+        "rows": {"bullet": [compact(NEW_ROW)], "blitz": [delta_leaderboard_store.row_to_values(BULLET_ROWS[2])]},
+        "removed_rows": {"bullet": ["bot-1"]},
+        "previous_number": 0,
+      },
+    )
+    store = DeltaLeaderboardStore(file_system)
+    self.assertListEqual(list(store.load_bot_profiles()), ["Bot-1", "bot-1"])
+    leaderboard_rows = store.load_leaderboard_rows()
+    self.assertListEqual(leaderboard_rows[PerfType.BULLET], [NEW_ROW, BULLET_ROWS[0], CHANGED_ROW])
+    self.assertListEqual(leaderboard_rows[PerfType.BLITZ], BULLET_ROWS)
+
+  def test_derived_fields_are_left_out(self) -> None:
+    file_system = InMemoryFileSystem()
+    store = DeltaLeaderboardStore(file_system)
+    save_generation(store, 0, {PerfType.BULLET: [BULLET_ROWS[0], CHANGED_ROW]})
+    save_generation(store, 1, {PerfType.BULLET: [PASSED_ROW, PASSING_ROW]})
+    # Bot-1 only moved down a rank, which is recorded as a shift of the rows from rank 1 on
+    self.assertDictEqual(
+      read_record(file_system, 1),
+      {"rows": {"bullet": [compact(PASSING_ROW)]}, "rank_shifts": {"bullet": [[1, 1]]}, "previous_number": 0},
+    )
+    # The rows are unchanged in the next generation, so only their deltas change and nothing is recorded
+    settled_rows = [
+      LeaderboardRow("Bot-1", PASSED_ROW.perf, RankInfo(2, 0, 0, 0, 2, 2000, DATE_2025_04_01)),
+      LeaderboardRow("Bot-2", PASSING_ROW.perf, RankInfo(1, 0, 0, 0, 1, 1990, DATE_2025_04_01)),
+    ]
+    save_generation(store, 2, {PerfType.BULLET: settled_rows})
+    self.assertDictEqual(read_record(file_system, 2), {"previous_number": 1})
+
+    self.assertListEqual(store.load_state(1).get_leaderboard_rows()[PerfType.BULLET], [PASSED_ROW, PASSING_ROW])
+    self.assertListEqual(DeltaLeaderboardStore(file_system).load_leaderboard_rows()[PerfType.BULLET], settled_rows)
+
+  def test_keyframes(self) -> None:
+    file_system = InMemoryFileSystem()
+    store = DeltaLeaderboardStore(file_system, keyframe_interval=2)
+    rows_by_record = [BULLET_ROWS, [BULLET_ROWS[0], BULLET_ROWS[1], CHANGED_ROW], [NEW_ROW, BULLET_ROWS[0]], [NEW_ROW]]
+    for generation_number, rows in enumerate(rows_by_record):
+      save_generation(store, generation_number, {PerfType.BULLET: rows})
+
+    self.assertListEqual([read_record(file_system, record).get("keyframe", False) for record in range(4)], [1, 0, 1, 0])
+    # The state as of each record is rebuilt from its keyframe
+    store = DeltaLeaderboardStore(file_system, keyframe_interval=2)
+    for record_number, rows in enumerate(rows_by_record):
+      self.assertListEqual(store.load_state(record_number).get_leaderboard_rows()[PerfType.BULLET], rows)
+    # A keyframe also contains the rows of the perf types which were not given
+    save_generation(store, 4, {PerfType.BLITZ: BULLET_ROWS})
+    self.assertListEqual(list(read_record(file_system, 4)["rows"]), ["bullet", "blitz"])
+
+  def test_deltas_are_since_the_previous_record(self) -> None:
+    file_system = InMemoryFileSystem()
+    store = DeltaLeaderboardStore(file_system)
+    save_generation(store, 0, {PerfType.BULLET: BULLET_ROWS})
+    save_generation(store, 1, {PerfType.BULLET: [BULLET_ROWS[0], BULLET_ROWS[1], CHANGED_ROW]})
+    save_generation(store, 2, {PerfType.BULLET: [NEW_ROW, BULLET_ROWS[0], BULLET_ROWS[1], CHANGED_ROW]})
+
+    # The row which changed in the first delta is not recorded again
+    self.assertDictEqual(read_record(file_system, 2), {"rows": {"bullet": [compact(NEW_ROW)]}, "previous_number": 1})
+    store = DeltaLeaderboardStore(file_system)
+    self.assertListEqual(
+      store.load_leaderboard_rows()[PerfType.BULLET], [NEW_ROW, BULLET_ROWS[0], BULLET_ROWS[1], CHANGED_ROW]
+    )
+    # So every record since the keyframe is needed to rebuild the state
+    del file_system.file_system[file_paths.generation_record_path(1)]
+    with self.assertRaises(ValueError):
+      DeltaLeaderboardStore(file_system).load_leaderboard_rows()
+
+  def test_save_same_generation(self) -> None:
+    file_system = InMemoryFileSystem()
+    store = DeltaLeaderboardStore(file_system)
+    save_generation(store, 0, {PerfType.BULLET: BULLET_ROWS})
+    save_generation(store, 1, {PerfType.BULLET: [NEW_ROW, *BULLET_ROWS]})
+    # Generating some of the leaderboards again writes the record of the generation again, still since the record before it
+    save_generation(store, 1, {PerfType.BLITZ: [NEW_ROW]})
+    self.assertEqual(len(file_system.list_files(file_paths.generations_dir())), 2)
+    self.assertDictEqual(
+      read_record(file_system, 1),
+      {
+        "rows": {
+          "bullet": [compact(NEW_ROW), delta_leaderboard_store.row_to_values(BULLET_ROWS[2])],
+          "blitz": [compact(NEW_ROW)],
+        },
+        "previous_number": 0,
+      },
+    )
+    leaderboard_rows = DeltaLeaderboardStore(file_system).load_leaderboard_rows()
+    self.assertListEqual(leaderboard_rows[PerfType.BULLET], [NEW_ROW, *BULLET_ROWS])
+    self.assertListEqual(leaderboard_rows[PerfType.BLITZ], [NEW_ROW])
+    # A generation before the latest record can not be saved
+    with self.assertRaises(ValueError):
+      save_generation(store, 0, {PerfType.BLITZ: []})
+
+  def test_load_state_errors(self) -> None:
+    file_system = InMemoryFileSystem()
+    store = DeltaLeaderboardStore(file_system, keyframe_interval=2)
+    save_generation(store, 0, {PerfType.BULLET: BULLET_ROWS})
+    save_generation(store, 1, {PerfType.BULLET: [CHANGED_ROW]})
+    with self.assertRaises(ValueError):
+      store.load_state(2)
+    # Without the keyframe, the deltas which follow it can not be applied
+    file_system.write_file(file_paths.generation_record_path(0), "{}")
+    with self.assertRaises(ValueError):
+      store.load_state(1)
+    del file_system.file_system[file_paths.generation_record_path(0)]
+    with self.assertRaises(ValueError):
+      store.load_state(1)
+    with self.assertRaises(ValueError):
+      DeltaLeaderboardStore(file_system, keyframe_interval=0)
+
+  def test_copy_leaderboard_state(self) -> None:
+    json_store = JsonLeaderboardStore(InMemoryFileSystem())
+    json_store.save(BOT_PROFILES, {PerfType.BULLET: BULLET_ROWS})
+    store = DeltaLeaderboardStore(InMemoryFileSystem())
+    copy_leaderboard_state(json_store, store)
+    self.assertDictEqual(store.load_bot_profiles(), json_store.load_bot_profiles())
+    self.assertDictEqual(store.load_leaderboard_rows(), json_store.load_leaderboard_rows())
@@ -0,0 +1,109 @@
+"""Tests for eligibility_expiry.py."""
+
+import unittest
+
+from src.leaderboard.chrono.durations import ONE_DAY, TWO_WEEKS
+from src.leaderboard.data import eligibility_expiry
+from src.leaderboard.data.eligibility_expiry import EligibilityExpiry, PerfTypeExpiry
+from src.leaderboard.data.leaderboard_objects import BotProfile, LeaderboardPerf, LeaderboardRow, RankInfo
+from src.leaderboard.fs import file_paths
+from src.leaderboard.li.pert_type import PerfType
+from tests.leaderboard.chrono.epoch_seconds import DATE_2021_04_01, DATE_2025_04_01
+from tests.leaderboard.fs.in_memory_file_system import InMemoryFileSystem
+
+
+BOT_PROFILES_BY_NAME = {
+  "Bot-1": BotProfile("Bot-1", "", "", DATE_2021_04_01, DATE_2025_04_01, False, False, False, False),
+  "Bot-2": BotProfile("Bot-2", "", "", DATE_2021_04_01, DATE_2025_04_01, False, False, False, False),
+  "Bot-3": BotProfile("Bot-3", "", "", DATE_2021_04_01, DATE_2025_04_01, False, True, False, False),
+  "Bot-4": BotProfile("Bot-4", "", "", DATE_2021_04_01, DATE_2025_04_01, False, False, False, False),
+}
+ID_BY_NAME = {"Bot-1": 0, "Bot-2": 1, "Bot-3": 2, "Bot-4": 3}
+BULLET_ROWS = [
+  # Ranked until a day before the bot's profile expires
+  LeaderboardRow("Bot-1", LeaderboardPerf(2000, 45, 0, 100, False), RankInfo(1, 0, 0, 0, 1, 2000, DATE_2025_04_01 - ONE_DAY)),
+  LeaderboardRow("Bot-2", LeaderboardPerf(1900, 45, 0, 100, False), RankInfo(2, 0, 0, 0, 2, 1900, DATE_2025_04_01)),
+  # Only unranked because the bot violated the TOS
+  LeaderboardRow("Bot-3", LeaderboardPerf(1800, 45, 0, 100, False), RankInfo(0, 0, 0, 0, 0, 1800, DATE_2025_04_01)),
+  # Unranked because the rating is provisional
+  LeaderboardRow("Bot-4", LeaderboardPerf(1700, 150, 0, 5, True), RankInfo(0, 0, 0, 0, 0, 1700, DATE_2025_04_01)),
+]
+NAMES = ["Bot-1", "Bot-2", "Bot-3", "Bot-4"]
+
+
+def create_eligibility_expiry(generation_number: int) -> EligibilityExpiry:
+  """Create the expiry of the bullet rows ranked at DATE_2025_04_01 and the blitz rows ranked a day later."""
+  return EligibilityExpiry(
+    generation_number,
+    {
+      PerfType.BULLET: PerfTypeExpiry.create(BULLET_ROWS, BOT_PROFILES_BY_NAME, ID_BY_NAME, DATE_2025_04_01),
+      PerfType.BLITZ: PerfTypeExpiry.create([], BOT_PROFILES_BY_NAME, ID_BY_NAME, DATE_2025_04_01 + ONE_DAY),
+    },
+  )
+
+
+class TestPerfTypeExpiry(unittest.TestCase):
+  """Tests for PerfTypeExpiry."""
+
+  def test_create(self) -> None:
+    expiry = create_eligibility_expiry(1).expiry_by_perf_type[PerfType.BULLET]
+    self.assertEqual(expiry.ranked_at, DATE_2025_04_01)
+    self.assertEqual(expiry.deadlines.tolist(), [DATE_2025_04_01 - ONE_DAY + TWO_WEEKS, DATE_2025_04_01 + TWO_WEEKS])
+    self.assertEqual(expiry.deadline_ids.tolist(), [0, 1])
+    self.assertEqual(expiry.waiting_ids.tolist(), [2])
+
+  def test_get_candidate_ids(self) -> None:
+    expiry = create_eligibility_expiry(1).expiry_by_perf_type[PerfType.BULLET]
+    self.assertEqual(expiry.get_candidate_ids(DATE_2025_04_01), [2])
+    self.assertEqual(expiry.get_candidate_ids(DATE_2025_04_01 - ONE_DAY + TWO_WEEKS), [2])
+    self.assertEqual(expiry.get_candidate_ids(DATE_2025_04_01 - ONE_DAY + TWO_WEEKS + 1), [0, 2])
+    self.assertEqual(expiry.get_candidate_ids(DATE_2025_04_01 + TWO_WEEKS + 1), [0, 1, 2])
+    # The rows which expired before they were ranked are not candidates
+    self.assertEqual(
+      PerfTypeExpiry.create(BULLET_ROWS, BOT_PROFILES_BY_NAME, ID_BY_NAME, DATE_2025_04_01 + TWO_WEEKS).get_candidate_ids(
+        DATE_2025_04_01 + TWO_WEEKS + 1
+      ),
+      [1, 2],
+    )
+    # The index cannot tell which rows were eligible before they were ranked
+    self.assertIsNone(expiry.get_candidate_ids(DATE_2025_04_01 - 1))
+
+
+class TestEligibilityExpiry(unittest.TestCase):
+  """Tests for EligibilityExpiry."""
+
+  def test_get_candidate_names(self) -> None:
+    expiry = create_eligibility_expiry(1)
+    self.assertDictEqual(
+      expiry.get_candidate_names(NAMES, DATE_2025_04_01 + ONE_DAY, ["Bot-4"]),
+      {PerfType.BULLET: frozenset(["Bot-3", "Bot-4"]), PerfType.BLITZ: frozenset(["Bot-4"])},
+    )
+    self.assertDictEqual(
+      expiry.get_candidate_names(NAMES, DATE_2025_04_01 + TWO_WEEKS + 1, []),
+      {PerfType.BULLET: frozenset(["Bot-1", "Bot-2", "Bot-3"]), PerfType.BLITZ: frozenset[str]()},
+    )
+    # The perf types which were ranked later are left out
+    self.assertDictEqual(expiry.get_candidate_names(NAMES, DATE_2025_04_01, []), {PerfType.BULLET: frozenset(["Bot-3"])})
+
+  def test_serialize(self) -> None:
+    expiry = create_eligibility_expiry(3)
+    self.assertEqual(EligibilityExpiry.deserialize(expiry.serialize()), expiry)
+    with self.assertRaises(ValueError):
+      EligibilityExpiry.deserialize(b"NOTEXPIRY" + expiry.serialize()[9:])
+    with self.assertRaises(ValueError):
+      EligibilityExpiry.deserialize(expiry.serialize()[:-1])
+
+  def test_load_eligibility_expiry(self) -> None:
+    file_system = InMemoryFileSystem()
+    self.assertIsNone(eligibility_expiry.load_eligibility_expiry(file_system))
+    eligibility_expiry.save_eligibility_expiry(file_system, create_eligibility_expiry(1))
+    # The index is stale until the generation it was created in
+    self.assertIsNone(eligibility_expiry.load_eligibility_expiry(file_system))
+    file_system.write_file(file_paths.generation_number_path(), "1")
+    self.assertEqual(eligibility_expiry.load_eligibility_expiry(file_system), create_eligibility_expiry(1))
+    file_system.write_file(file_paths.generation_number_path(), "2")
+    self.assertIsNone(eligibility_expiry.load_eligibility_expiry(file_system))
+    # An index which is not valid is ignored
+    file_system.write_file(file_paths.generation_number_path(), "1")
+    file_system.write_bytes(file_paths.eligibility_expiry_path(), b"LBEXPIRY")
+    self.assertIsNone(eligibility_expiry.load_eligibility_expiry(file_system))
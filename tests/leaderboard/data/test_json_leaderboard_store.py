@@ -0,0 +1,48 @@
+"""Tests for json_leaderboard_store.py."""
+
+import unittest
+
+from src.leaderboard.data.json_leaderboard_store import JsonLeaderboardStore
+from src.leaderboard.data.leaderboard_objects import BotProfile, LeaderboardPerf, LeaderboardRow, RankInfo
+from src.leaderboard.fs import file_paths
+from src.leaderboard.li.pert_type import PerfType
+from tests.leaderboard.chrono.epoch_seconds import DATE_2021_04_01, DATE_2025_04_01
+from tests.leaderboard.fs.in_memory_file_system import InMemoryFileSystem
+
+
+BOT_PROFILES = [
+  BotProfile("bot-2", "", "", DATE_2021_04_01, DATE_2025_04_01, False, False, False, False),
+  BotProfile("Bot-1", "", "_earth", DATE_2021_04_01, DATE_2025_04_01, True, False, False, False),
+]
+BULLET_ROWS = [
+  LeaderboardRow("Bot-1", LeaderboardPerf(2000, 45, 0, 100, False), RankInfo(1, 0, 0, 0, 1, 2000, DATE_2025_04_01)),
+  LeaderboardRow("bot-2", LeaderboardPerf(1900, 45, 0, 100, False), RankInfo(2, 0, 0, 0, 2, 1900, DATE_2025_04_01)),
+]
+
+
+class TestJsonLeaderboardStore(unittest.TestCase):
+  """Tests for JsonLeaderboardStore."""
+
+  def test_save_and_load(self) -> None:
+    store = JsonLeaderboardStore(InMemoryFileSystem())
+    self.assertTrue(store.is_empty())
+    store.save(BOT_PROFILES, {PerfType.BULLET: BULLET_ROWS})
+    self.assertFalse(store.is_empty())
+    self.assertDictEqual(store.load_bot_profiles(), {bot_profile.name: bot_profile for bot_profile in BOT_PROFILES})
+    leaderboard_rows = store.load_leaderboard_rows()
+    self.assertListEqual(leaderboard_rows[PerfType.BULLET], BULLET_ROWS)
+    self.assertListEqual(leaderboard_rows[PerfType.BLITZ], [])
+
+  def test_save_sorts_bot_profiles_by_name(self) -> None:
+    file_system = InMemoryFileSystem()
+    JsonLeaderboardStore(file_system).save(BOT_PROFILES, {})
+    bot_profiles_json = file_system.read_file(file_paths.bot_profiles_path()) or ""
+    self.assertLess(bot_profiles_json.index("Bot-1"), bot_profiles_json.index("bot-2"))
+
+  def test_delete(self) -> None:
+    file_system = InMemoryFileSystem()
+    store = JsonLeaderboardStore(file_system)
+    store.save(BOT_PROFILES, {PerfType.BULLET: BULLET_ROWS})
+    store.delete()
+    self.assertTrue(store.is_empty())
+    self.assertDictEqual(file_system.file_system, {})
@@ -3,7 +3,8 @@
 import unittest
 
 from src.leaderboard.data.leaderboard_objects import BotProfile, LeaderboardPerf, LeaderboardRow, RankInfo
-from src.leaderboard.li.bot_user import BotUser, Perf
+from src.leaderboard.li.bot_user import BotUser
+from src.leaderboard.li.perf_table import PerfTable, create_perf_table
 from src.leaderboard.li.pert_type import PerfType
 from tests.leaderboard.chrono import epoch_seconds
 from tests.leaderboard.chrono.epoch_seconds import DATE_2024_01_01, DATE_2025_04_01
@@ -13,7 +14,7 @@ class TestBotProfile(unittest.TestCase):
   """Tests for BotProfile."""
 
   def test_from_perf(self) -> None:
-    bot_user = BotUser("Bot1", "flair", "flag", DATE_2024_01_01, DATE_2025_04_01, True, True, [])
+    bot_user = BotUser("Bot1", "flair", "flag", DATE_2024_01_01, DATE_2025_04_01, True, True, PerfTable())
     self.assertEqual(
       BotProfile.from_bot_user(bot_user),
       BotProfile("Bot1", "flair", "flag", DATE_2024_01_01, DATE_2025_04_01, True, True, True, True),
@@ -39,6 +40,11 @@ class TestBotProfile(unittest.TestCase):
     self.assertFalse(updated_copy.new)
     self.assertTrue(updated_copy.online)
 
+  def test_create_refreshed_copy_for_merge(self) -> None:
+    refreshed_copy = BotProfile("", "", "", 0, 0, False, False, True, True).create_refreshed_copy_for_merge()
+    self.assertFalse(refreshed_copy.new)
+    self.assertFalse(refreshed_copy.online)
+
   def test_is_eligible_last_seen(self) -> None:
     bot_profile = BotProfile("", "", "", 0, epoch_seconds.from_date(2025, 4, 1), False, False, True, True)
     self.assertTrue(bot_profile.is_eligible(epoch_seconds.from_date(2025, 4, 15)))
@@ -51,13 +57,23 @@ class TestBotProfile(unittest.TestCase):
   def test_from_dict_default(self) -> None:
     self.assertEqual(BotProfile.from_dict({}), BotProfile("", "", "", 0, 0, False, False, False, False))
 
+  def test_from_dict_shares_name_with_rows(self) -> None:
+    # Build the names at runtime so that they are not the same constant
+    bot_profile = BotProfile.from_dict({"name": "".join(["Bot", "1"])})
+    row = LeaderboardRow.from_dict({"name": "".join(["Bot", "1"])})
+    self.assertIs(bot_profile.name, row.name)
+
+  def test_slots(self) -> None:
+    self.assertFalse(hasattr(BotProfile.from_dict({}), "__dict__"))
+    self.assertFalse(hasattr(LeaderboardRow.from_dict({}), "__dict__"))
+
 
 class TestLeaderboardPerf(unittest.TestCase):
   """Tests for LeaderboardPerf."""
 
-  def test_from_perf(self) -> None:
-    perf = Perf(PerfType.BULLET, 100, 1450, 25, -10, True)
-    self.assertEqual(LeaderboardPerf.from_perf(perf), LeaderboardPerf(1450, 25, -10, 100, True))
+  def test_from_perf_table(self) -> None:
+    perf_table = create_perf_table([(PerfType.BULLET, (100, 1450, 25, -10, True))])
+    self.assertEqual(LeaderboardPerf.from_perf_table(perf_table, PerfType.BULLET), LeaderboardPerf(1450, 25, -10, 100, True))
 
   def test_from_dict(self) -> None:
     json_dict = {"rating": 1450, "rd": 25, "prog": -10, "games": 100, "prov": True}
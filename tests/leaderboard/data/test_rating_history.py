@@ -0,0 +1,110 @@
+"""Tests for rating_history.py."""
+
+import unittest
+
+from src.leaderboard.data import rating_history
+from src.leaderboard.data.leaderboard_objects import LeaderboardPerf, LeaderboardRow, RankInfo
+from src.leaderboard.data.rating_history import HistoryPoint, RatingHistory
+from src.leaderboard.fs import file_paths
+from src.leaderboard.li.pert_type import PerfType
+from tests.leaderboard.chrono.epoch_seconds import DATE_2024_04_01, DATE_2025_04_01
+from tests.leaderboard.fs.in_memory_file_system import InMemoryFileSystem
+
+
+def create_row(name: str, rating: int, games: int, rank: int) -> LeaderboardRow:
+  """Create a row with a rating, number of games and rank."""
+  return LeaderboardRow(name, LeaderboardPerf(rating, 50, 0, games, False), RankInfo(rank, 0, 0, 0, rank, rating, 0))
+
+
+BOT_1_ROW_1 = create_row("Bot-1", 2000, 10, 1)
+BOT_2_ROW_1 = create_row("Bot-2", 1900, 10, 2)
+BOT_1_ROW_2 = create_row("Bot-1", 1950, 12, 2)
+BOT_2_ROW_2 = create_row("Bot-2", 1960, 12, 1)
+BOT_3_ROW_2 = create_row("Bot-3", 1500, 1, 0)
+
+
+def append_generations(history: RatingHistory) -> None:
+  """Append two generations of bullet and blitz rows."""
+  history.append_generation(
+    1, DATE_2024_04_01, {}, {PerfType.BULLET: [BOT_1_ROW_1, BOT_2_ROW_1], PerfType.BLITZ: [BOT_1_ROW_1]}
+  )
+  history.append_generation(
+    2,
+    DATE_2025_04_01,
+    {PerfType.BULLET: [BOT_1_ROW_1, BOT_2_ROW_1], PerfType.BLITZ: [BOT_1_ROW_1]},
+    {PerfType.BULLET: [BOT_1_ROW_2, BOT_2_ROW_2, BOT_3_ROW_2], PerfType.BLITZ: [BOT_1_ROW_1]},
+  )
+
+
+class TestRatingHistoryFunctions(unittest.TestCase):
+  """Tests for rating_history functions."""
+
+  def test_little_endian_bytes(self) -> None:
+    values = rating_history.from_little_endian_bytes("i", b"\x01\x00\x00\x00\xff\xff\xff\xff")
+    self.assertListEqual(list(values), [1, -1])
+    self.assertEqual(rating_history.to_little_endian_bytes(values), b"\x01\x00\x00\x00\xff\xff\xff\xff")
+
+  def test_select_changed_rows(self) -> None:
+    unchanged_row = create_row("Bot-4", 1800, 5, 3)
+    rank_changed_row = create_row("Bot-5", 1700, 5, 4)
+    changed_rows = rating_history.select_changed_rows(
+      [BOT_1_ROW_1, BOT_2_ROW_1, unchanged_row, create_row("Bot-5", 1700, 5, 5)],
+      [BOT_1_ROW_2, BOT_3_ROW_2, unchanged_row, rank_changed_row],
+    )
+    self.assertListEqual(changed_rows, [BOT_1_ROW_2, BOT_3_ROW_2, rank_changed_row])
+
+
+class TestRatingHistory(unittest.TestCase):
+  """Tests for RatingHistory."""
+
+  def test_load_series(self) -> None:
+    file_system = InMemoryFileSystem()
+    append_generations(RatingHistory(file_system))
+    history = RatingHistory(file_system)
+    self.assertListEqual(
+      history.load_series("Bot-1", PerfType.BULLET),
+      [HistoryPoint(1, DATE_2024_04_01, 2000, 50, 10, 1), HistoryPoint(2, DATE_2025_04_01, 1950, 50, 12, 2)],
+    )
+    # The blitz row did not change, so it was only recorded once
+    self.assertListEqual(history.load_series("Bot-1", PerfType.BLITZ), [HistoryPoint(1, DATE_2024_04_01, 2000, 50, 10, 1)])
+    self.assertListEqual(history.load_series("Bot-3", PerfType.BULLET), [HistoryPoint(2, DATE_2025_04_01, 1500, 50, 1, 0)])
+    self.assertListEqual(history.load_series("Bot-2", PerfType.BLITZ), [])
+    self.assertListEqual(history.load_series("Bot-4", PerfType.BULLET), [])
+
+  def test_append_generation(self) -> None:
+    file_system = InMemoryFileSystem()
+    history = RatingHistory(file_system)
+    self.assertEqual(history.append_generation(1, DATE_2024_04_01, {}, {PerfType.BULLET: [BOT_1_ROW_1, BOT_2_ROW_1]}), 2)
+    self.assertEqual(history.append_generation(2, DATE_2025_04_01, {}, {PerfType.BULLET: []}), 0)
+    self.assertEqual(history.get_record_count(), 2)
+    self.assertEqual(file_system.read_bytes(file_paths.bot_ids_path()), b"Bot-1\nBot-2\n")
+    self.assertListEqual(list(history.load_column("generation_start")), [0, 2])
+
+  def test_append_generation_to_empty_history_records_every_row(self) -> None:
+    history = RatingHistory(InMemoryFileSystem())
+    rows_by_perf_type = {PerfType.BULLET: [BOT_1_ROW_1, BOT_2_ROW_1]}
+    self.assertEqual(history.append_generation(1, DATE_2024_04_01, rows_by_perf_type, rows_by_perf_type), 2)
+    self.assertEqual(history.append_generation(2, DATE_2025_04_01, rows_by_perf_type, rows_by_perf_type), 0)
+
+  def test_heads_are_saved_with_the_history(self) -> None:
+    file_system = InMemoryFileSystem()
+    history = RatingHistory(file_system)
+    append_generations(history)
+    # The saved heads are used without reading the columns they are built from
+    del file_system.binary_files[file_paths.history_path("bot_id")]
+    del file_system.binary_files[file_paths.history_path("perf_type")]
+    self.assertDictEqual(RatingHistory(file_system).get_heads(), history.get_heads())
+
+  def test_heads_are_rebuilt(self) -> None:
+    file_system = InMemoryFileSystem()
+    append_generations(RatingHistory(file_system))
+    expected_series = RatingHistory(file_system).load_series("Bot-2", PerfType.BULLET)
+    self.assertEqual(len(expected_series), 2)
+    # Missing heads
+    del file_system.binary_files[file_paths.history_heads_path()]
+    self.assertListEqual(RatingHistory(file_system).load_series("Bot-2", PerfType.BULLET), expected_series)
+    # Out of date heads
+    saved_heads = file_system.binary_files[file_paths.history_heads_path()]
+    RatingHistory(file_system).append_generation(3, DATE_2025_04_01, {}, {PerfType.BULLET: [BOT_1_ROW_1]})
+    file_system.write_bytes(file_paths.history_heads_path(), saved_heads)
+    self.assertEqual(len(RatingHistory(file_system).load_series("Bot-1", PerfType.BULLET)), 3)
@@ -0,0 +1,64 @@
+"""Tests for serializers.py."""
+
+import dataclasses
+import unittest
+
+from src.leaderboard.bench import synthetic_rows
+from src.leaderboard.data import data_generator, default_remover, serializers
+from src.leaderboard.data.leaderboard_objects import BotProfile, LeaderboardRow
+
+
+@dataclasses.dataclass(frozen=True)
+class Inner:
+  """A dataclass held by another dataclass."""
+
+  count: int
+  label: str
+
+
+@dataclasses.dataclass(frozen=True)
+class Outer:
+  """A dataclass which holds another dataclass."""
+
+  name: str
+  enabled: bool
+  inner: Inner
+
+
+@dataclasses.dataclass(frozen=True)
+class Unsupported:
+  """A dataclass with a field which from_dict can not be generated for."""
+
+  values: list[int]
+
+
+class TestSerializersFunctions(unittest.TestCase):
+  """Tests for serializers functions."""
+
+  def test_create_to_dict(self) -> None:
+    to_dict = serializers.create_to_dict(Outer, {"inner": serializers.create_to_dict(Inner)})
+    self.assertDictEqual(to_dict(Outer("name", False, Inner(1, ""))), {"name": "name", "inner": {"count": 1}})
+    self.assertDictEqual(to_dict(Outer("", False, Inner(0, ""))), {})
+
+  def test_create_from_dict(self) -> None:
+    from_dict = serializers.create_from_dict(
+      Outer, {"inner": serializers.create_from_dict(Inner)}, {"enabled": True}, interned_fields={"name"}
+    )
+    self.assertEqual(from_dict({"name": "name", "enabled": False, "inner": {"count": 1}}), Outer("name", True, Inner(1, "")))
+    self.assertEqual(from_dict({}), Outer("", True, Inner(0, "")))
+
+  def test_create_from_dict_unsupported_type(self) -> None:
+    with self.assertRaises(ValueError):
+      serializers.create_from_dict(Unsupported)
+
+  def test_to_dict_matches_default_remover(self) -> None:
+    updates, bot_profiles_by_name = synthetic_rows.create_ranking_inputs(200)
+    bot_columns = data_generator.BotColumns.create(bot_profiles_by_name, synthetic_rows.CURRENT_TIME)
+    rows = data_generator.create_ranked_rows(updates, bot_columns, synthetic_rows.CURRENT_TIME)
+    for row in rows:
+      self.assertEqual(row.as_dict(), default_remover.to_dict_without_defaults(dataclasses.asdict(row)))
+      self.assertEqual(LeaderboardRow.from_dict(row.as_dict()), row)
+    for bot_profile in bot_profiles_by_name.values():
+      self.assertEqual(bot_profile.as_dict(), default_remover.to_dict_without_defaults(dataclasses.asdict(bot_profile)))
+      # Loaded profiles are not new and offline
+      self.assertEqual(BotProfile.from_dict(bot_profile.as_dict()), dataclasses.replace(bot_profile, new=False, online=False))
@@ -0,0 +1,95 @@
+"""Tests for sightings_buffer.py."""
+
+import unittest
+
+from src.leaderboard.data import sightings_buffer
+from src.leaderboard.data.sightings_buffer import SightingsBuffer
+from src.leaderboard.fs import file_paths
+from src.leaderboard.li.bot_user import BotUser, Perf, create_perf_table_from_perfs
+from src.leaderboard.li.perf_table import PerfTable
+from src.leaderboard.li.pert_type import PerfType
+from tests.leaderboard.chrono.epoch_seconds import DATE_2024_04_01, DATE_2025_04_01
+from tests.leaderboard.fs.in_memory_file_system import InMemoryFileSystem
+
+
+BULLET_1500 = Perf(PerfType.BULLET, 10, 1500, 60, 0, False)
+BULLET_1600 = Perf(PerfType.BULLET, 20, 1600, 50, 0, False)
+BLITZ_1700 = Perf(PerfType.BLITZ, 30, 1700, 45, 10, False)
+EARLIER_PERFS = create_perf_table_from_perfs([BULLET_1500, BLITZ_1700])
+LATER_PERFS = create_perf_table_from_perfs([BULLET_1600])
+MERGED_PERFS = create_perf_table_from_perfs([BULLET_1600, BLITZ_1700])
+
+EARLIER_SIGHTING = BotUser("Bot-1", "", "", 0, DATE_2024_04_01, False, False, EARLIER_PERFS)
+LATER_SIGHTING = BotUser("Bot-1", "flair", "FR", 0, DATE_2025_04_01, True, False, LATER_PERFS)
+MERGED_SIGHTING = BotUser("Bot-1", "flair", "FR", 0, DATE_2025_04_01, True, False, MERGED_PERFS)
+
+
+class TestSightingsBufferFunctions(unittest.TestCase):
+  """Tests for sightings_buffer functions."""
+
+  def test_merge_sightings(self) -> None:
+    self.assertEqual(sightings_buffer.merge_sightings(EARLIER_SIGHTING, LATER_SIGHTING), MERGED_SIGHTING)
+    # The order of the sightings does not matter
+    self.assertEqual(sightings_buffer.merge_sightings(LATER_SIGHTING, EARLIER_SIGHTING), MERGED_SIGHTING)
+
+  def test_load_empty(self) -> None:
+    self.assertEqual(len(sightings_buffer.load_sightings_buffer(InMemoryFileSystem())), 0)
+
+  def test_save_and_load(self) -> None:
+    file_system = InMemoryFileSystem()
+    sightings_buffer.save_sightings_buffer(file_system, SightingsBuffer([MERGED_SIGHTING]))
+    self.assertListEqual(sightings_buffer.load_sightings_buffer(file_system).get_bot_users(), [MERGED_SIGHTING])
+
+  def test_consume_sightings(self) -> None:
+    file_system = InMemoryFileSystem()
+    sightings_buffer.consume_sightings(file_system, SightingsBuffer())
+    # Nothing is written if nothing was consumed
+    self.assertNotIn(file_paths.sightings_path(), file_system.file_system)
+    sightings_buffer.save_sightings_buffer(file_system, SightingsBuffer([MERGED_SIGHTING]))
+    sightings_buffer.consume_sightings(file_system, sightings_buffer.load_sightings_buffer(file_system))
+    self.assertEqual(len(sightings_buffer.load_sightings_buffer(file_system)), 0)
+
+  def test_consume_sightings_keeps_later_sightings(self) -> None:
+    file_system = InMemoryFileSystem()
+    sightings_buffer.save_sightings_buffer(file_system, SightingsBuffer([EARLIER_SIGHTING]))
+    consumed_buffer = sightings_buffer.load_sightings_buffer(file_system)
+    # A poller saves more sightings while the consumed ones are being generated
+    later_bot_user = BotUser("Bot-2", "", "", 0, DATE_2025_04_01, False, False, LATER_PERFS)
+    sightings_buffer.save_sightings_buffer(file_system, SightingsBuffer([EARLIER_SIGHTING, LATER_SIGHTING, later_bot_user]))
+    sightings_buffer.consume_sightings(file_system, consumed_buffer)
+    self.assertListEqual(
+      sightings_buffer.load_sightings_buffer(file_system).get_bot_users(), [MERGED_SIGHTING, later_bot_user]
+    )
+
+
+class TestSightingsBuffer(unittest.TestCase):
+  """Tests for SightingsBuffer."""
+
+  def test_add(self) -> None:
+    buffer = SightingsBuffer()
+    buffer.add(EARLIER_SIGHTING)
+    buffer.add(LATER_SIGHTING)
+    self.assertEqual(len(buffer), 1)
+    self.assertListEqual(buffer.get_bot_users(), [MERGED_SIGHTING])
+
+  def test_discard(self) -> None:
+    buffer = SightingsBuffer([MERGED_SIGHTING])
+    # A different sighting of the bot is not discarded
+    buffer.discard(EARLIER_SIGHTING)
+    self.assertEqual(len(buffer), 1)
+    buffer.discard(MERGED_SIGHTING)
+    self.assertEqual(len(buffer), 0)
+
+  def test_size_is_bounded_by_number_of_bots(self) -> None:
+    buffer = SightingsBuffer()
+    for seen_at in range(100):
+      buffer.add_all(
+        BotUser(f"Bot-{index}", "", "", 0, seen_at, False, False, create_perf_table_from_perfs([BULLET_1500]))
+        for index in range(3)
+      )
+    self.assertEqual(len(buffer), 3)
+    self.assertEqual(len(buffer.to_ndjson().splitlines()), 3)
+
+  def test_ndjson_round_trip(self) -> None:
+    buffer = SightingsBuffer([MERGED_SIGHTING, BotUser("Bot-2", "", "", 0, 0, False, True, PerfTable())])
+    self.assertListEqual(SightingsBuffer.from_ndjson(buffer.to_ndjson()).get_bot_users(), buffer.get_bot_users())
@@ -0,0 +1,107 @@
+"""Tests for sqlite_leaderboard_store.py."""
+
+import tempfile
+import unittest
+from pathlib import Path
+
+from src.leaderboard.data import sqlite_leaderboard_store
+from src.leaderboard.data.json_leaderboard_store import JsonLeaderboardStore
+from src.leaderboard.data.leaderboard_objects import BotProfile, LeaderboardPerf, LeaderboardRow, RankInfo
+from src.leaderboard.data.leaderboard_store import copy_leaderboard_state
+from src.leaderboard.data.sqlite_leaderboard_store import SqliteLeaderboardStore
+from src.leaderboard.li.pert_type import PerfType
+from tests.leaderboard.chrono.epoch_seconds import DATE_2021_04_01, DATE_2025_04_01
+from tests.leaderboard.fs.in_memory_file_system import InMemoryFileSystem
+
+
+BOT_PROFILES = [
+  BotProfile("Bot-1", "flair", "_earth", DATE_2021_04_01, DATE_2025_04_01, True, False, False, False),
+  BotProfile("bot-1", "", "", DATE_2021_04_01, DATE_2025_04_01, False, True, False, False),
+  BotProfile("Bot-2", "", "", DATE_2021_04_01, DATE_2025_04_01, False, False, False, False),
+]
+# Sorted by name_sort_key
+BULLET_ROWS = [
+  LeaderboardRow("Bot-1", LeaderboardPerf(2000, 45, 0, 100, False), RankInfo(1, 0, 0, 0, 1, 2000, DATE_2025_04_01)),
+  LeaderboardRow("bot-1", LeaderboardPerf(1950, 60, 3, 50, True), RankInfo(0, 0, 0, 0, 0, 1950, DATE_2025_04_01)),
+  LeaderboardRow("Bot-2", LeaderboardPerf(1900, 45, 0, 100, False), RankInfo(2, 1, -10, 5, 2, 1910, DATE_2025_04_01)),
+]
+
+
+class TestSqliteLeaderboardStoreFunctions(unittest.TestCase):
+  """Tests for sqlite_leaderboard_store functions."""
+
+  def test_row_values(self) -> None:
+    for row in BULLET_ROWS:
+      values = sqlite_leaderboard_store.row_to_values(PerfType.BULLET, row)
+      self.assertEqual(sqlite_leaderboard_store.row_from_values(values), row)
+
+  def test_bot_profile_values(self) -> None:
+    for bot_profile in BOT_PROFILES:
+      values = sqlite_leaderboard_store.bot_profile_to_values(bot_profile)
+      self.assertEqual(sqlite_leaderboard_store.bot_profile_from_values(values), bot_profile)
+
+
+class TestSqliteLeaderboardStore(unittest.TestCase):
+  """Tests for SqliteLeaderboardStore."""
+
+  def test_save_and_load(self) -> None:
+    with SqliteLeaderboardStore(":memory:") as store:
+      self.assertTrue(store.is_empty())
+      store.save(BOT_PROFILES, {PerfType.BULLET: BULLET_ROWS})
+      self.assertFalse(store.is_empty())
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+      database_path = Path(temp_dir) / "cache" / "leaderboard.sqlite3"
+      with SqliteLeaderboardStore(database_path) as store:
+        store.save(BOT_PROFILES, {PerfType.BULLET: BULLET_ROWS})
+      with SqliteLeaderboardStore(database_path) as store:
+        self.assertDictEqual(store.load_bot_profiles(), {bot_profile.name: bot_profile for bot_profile in BOT_PROFILES})
+        leaderboard_rows = store.load_leaderboard_rows()
+        self.assertListEqual(leaderboard_rows[PerfType.BULLET], BULLET_ROWS)
+        self.assertListEqual(leaderboard_rows[PerfType.BLITZ], [])
+
+  def test_database_orders_by_name_sort_key(self) -> None:
+    with tempfile.TemporaryDirectory() as temp_dir:
+      database_path = Path(temp_dir) / "leaderboard.sqlite3"
+      with SqliteLeaderboardStore(database_path) as store:
+        store.save(BOT_PROFILES, {PerfType.BULLET: BULLET_ROWS})
+      with SqliteLeaderboardStore(database_path) as store:
+        self.assertListEqual(list(store.get_saved_row_values(PerfType.BULLET)), [row.name for row in BULLET_ROWS])
+
+  def test_load_sorts_names_which_are_not_ascii(self) -> None:
+    # The database lowercases "Ébot" to itself, which sorts it before "éa"
+    rows = [
+      LeaderboardRow(name, LeaderboardPerf(1900, 45, 0, 100, False), RankInfo(0, 0, 0, 0, 0, 1900, DATE_2025_04_01))
+      for name in ("éa", "Ébot")
+    ]
+    bot_profiles = [BotProfile(row.name, "", "", DATE_2021_04_01, DATE_2025_04_01, False, False, False, False) for row in rows]
+    with tempfile.TemporaryDirectory() as temp_dir:
+      database_path = Path(temp_dir) / "leaderboard.sqlite3"
+      with SqliteLeaderboardStore(database_path) as store:
+        store.save(bot_profiles, {PerfType.BULLET: rows})
+      with SqliteLeaderboardStore(database_path) as store:
+        self.assertListEqual(list(store.get_saved_row_values(PerfType.BULLET)), ["Ébot", "éa"])
+        self.assertListEqual(store.load_leaderboard_rows()[PerfType.BULLET], rows)
+
+  def test_save_only_writes_changes(self) -> None:
+    with SqliteLeaderboardStore(":memory:") as store:
+      store.save(BOT_PROFILES, {PerfType.BULLET: BULLET_ROWS, PerfType.BLITZ: BULLET_ROWS})
+      store.load_leaderboard_rows()
+      total_changes = store.connection.total_changes
+
+      changed_row = LeaderboardRow("Bot-2", BULLET_ROWS[2].perf, RankInfo(2, 0, 0, 0, 2, 1910, DATE_2025_04_01))
+      store.save(BOT_PROFILES, {PerfType.BULLET: [BULLET_ROWS[0], changed_row]})
+
+      # One row was replaced and one row was deleted
+      self.assertEqual(store.connection.total_changes - total_changes, 2)
+      leaderboard_rows = store.load_leaderboard_rows()
+      self.assertListEqual(leaderboard_rows[PerfType.BULLET], [BULLET_ROWS[0], changed_row])
+      self.assertListEqual(leaderboard_rows[PerfType.BLITZ], BULLET_ROWS)
+
+  def test_copy_leaderboard_state(self) -> None:
+    json_store = JsonLeaderboardStore(InMemoryFileSystem())
+    json_store.save(BOT_PROFILES, {PerfType.BULLET: BULLET_ROWS})
+    with SqliteLeaderboardStore(":memory:") as store:
+      copy_leaderboard_state(json_store, store)
+      self.assertDictEqual(store.load_bot_profiles(), json_store.load_bot_profiles())
+      self.assertDictEqual(store.load_leaderboard_rows(), json_store.load_leaderboard_rows())
@@ -0,0 +1,50 @@
+"""Tests for vectorized_ranking.py."""
+
+import unittest
+
+from src.leaderboard.bench import synthetic_rows
+from src.leaderboard.data import data_generator, vectorized_ranking
+from src.leaderboard.data.leaderboard_objects import BotPerf, BotProfile, LeaderboardPerf
+from src.leaderboard.data.leaderboard_update import CurrentBotPerfOnlyUpdate, LeaderboardUpdate
+from tests.leaderboard.chrono.epoch_seconds import DATE_2021_04_01, DATE_2022_04_01, DATE_2025_04_01
+
+
+BOT_PROFILES_BY_NAME = {
+  "Bot-1": BotProfile("Bot-1", "", "", DATE_2021_04_01, DATE_2025_04_01, False, False, False, True),
+  "Bot-2": BotProfile("Bot-2", "", "", DATE_2022_04_01, DATE_2025_04_01, False, False, False, True),
+  "bot-2": BotProfile("bot-2", "", "", DATE_2022_04_01, DATE_2025_04_01, False, False, False, True),
+}
+
+
+@unittest.skipUnless(vectorized_ranking.is_available(), "numpy is not installed")
+class TestVectorizedRanking(unittest.TestCase):
+  """Tests for vectorized_ranking functions."""
+
+  def assert_same_ranking(self, updates: list[LeaderboardUpdate], bot_profiles_by_name: dict[str, BotProfile]) -> None:
+    bot_columns = data_generator.BotColumns.create(bot_profiles_by_name, DATE_2025_04_01)
+    expected_rows = data_generator.create_ranked_rows(updates, bot_columns, DATE_2025_04_01)
+    leaderboard_rows = vectorized_ranking.create_ranked_rows(updates, bot_columns, DATE_2025_04_01)
+    self.assertListEqual(leaderboard_rows, expected_rows)
+
+  def test_create_ranked_rows_empty(self) -> None:
+    self.assertListEqual(vectorized_ranking.create_ranked_rows([], data_generator.BotColumns({}, [], []), DATE_2025_04_01), [])
+
+  def test_create_ranked_rows_ties(self) -> None:
+    updates: list[LeaderboardUpdate] = [
+      CurrentBotPerfOnlyUpdate(BotPerf("bot-2", LeaderboardPerf(2900, 45, 0, 10, False))),
+      CurrentBotPerfOnlyUpdate(BotPerf("Bot-2", LeaderboardPerf(2900, 45, 0, 10, False))),
+      CurrentBotPerfOnlyUpdate(BotPerf("Bot-1", LeaderboardPerf(2900, 45, 0, 10, False))),
+    ]
+    self.assert_same_ranking(updates, BOT_PROFILES_BY_NAME)
+
+  def test_create_ranked_rows_leading_zero_rating(self) -> None:
+    updates: list[LeaderboardUpdate] = [
+      CurrentBotPerfOnlyUpdate(BotPerf("Bot-1", LeaderboardPerf(0, 45, 0, 10, False))),
+      CurrentBotPerfOnlyUpdate(BotPerf("Bot-2", LeaderboardPerf(0, 45, 0, 10, False))),
+    ]
+    self.assert_same_ranking(updates, BOT_PROFILES_BY_NAME)
+
+  def test_create_ranked_rows_matches_python(self) -> None:
+    for seed in range(5):
+      updates, bot_profiles_by_name = synthetic_rows.create_ranking_inputs(500, seed, DATE_2025_04_01)
+      self.assert_same_ranking(updates, bot_profiles_by_name)
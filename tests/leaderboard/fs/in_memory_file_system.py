@@ -7,8 +7,9 @@ class InMemoryFileSystem(FileSystem):
   """Represents a file system as a mapping from str -> list[str]."""
 
   def __init__(self) -> None:
-    """Initialize a dict to represent the file system."""
+    """Initialize dicts to represent the file system."""
     self.file_system: dict[str, str] = {}
+    self.binary_files: dict[str, bytes] = {}
 
   def read_file(self, file_name: str) -> str | None:
     """Load and return all of the contents of a file."""
@@ -17,3 +18,40 @@ class InMemoryFileSystem(FileSystem):
   def write_file(self, file_name: str, file_contents: str) -> None:
     """Save the contents to a file."""
     self.file_system[file_name] = file_contents
+
+  def read_bytes(self, file_name: str) -> bytes | None:
+    """Load and return all of the contents of a binary file."""
+    return self.binary_files.get(file_name)
+
+  def write_bytes(self, file_name: str, file_contents: bytes) -> None:
+    """Save the contents to a binary file."""
+    self.binary_files[file_name] = file_contents
+
+  def append_bytes(self, file_name: str, file_contents: bytes) -> None:
+    """Append the contents to the end of a binary file, creating it if it does not exist."""
+    self.binary_files[file_name] = self.binary_files.get(file_name, b"") + file_contents
+
+  def map_bytes(self, file_name: str) -> memoryview | None:
+    """Return a read-only view of all of the contents of a binary file."""
+    file_contents = self.binary_files.get(file_name)
+    return memoryview(file_contents) if file_contents is not None else None
+
+  def get_size(self, file_name: str) -> int | None:
+    """Return the size of a file in bytes, or None if it does not exist."""
+    if file_name in self.binary_files:
+      return len(self.binary_files[file_name])
+    return len(self.file_system[file_name].encode()) if file_name in self.file_system else None
+
+  def delete_file(self, file_name: str) -> None:
+    """Delete a file if it exists."""
+    self.file_system.pop(file_name, None)
+    self.binary_files.pop(file_name, None)
+
+  def list_files(self, directory: str) -> list[str]:
+    """Return the sorted paths of the files directly inside a directory, or an empty list if it does not exist."""
+    prefix = f"{directory}/"
+    return sorted(
+      file_name
+      for file_name in self.file_system.keys() | self.binary_files.keys()
+      if file_name.startswith(prefix) and "/" not in file_name.removeprefix(prefix)
+    )
@@ -0,0 +1,54 @@
+"""Tests for compression.py."""
+
+import io
+import unittest
+
+from src.leaderboard.fs import compression
+
+
+DATA = b'{"username":"Bot-1"}\n' * 100
+
+
+class TestCompression(unittest.TestCase):
+  """Tests for compression functions."""
+
+  def test_round_trip(self) -> None:
+    compressed = compression.compress(DATA)
+    self.assertLess(len(compressed), len(DATA))
+    self.assertEqual(compression.decompress(compressed), DATA)
+
+  def test_compress_is_deterministic(self) -> None:
+    self.assertEqual(compression.compress(b"data"), compression.compress(b"data"))
+
+  @unittest.skipUnless(compression.zstandard, "zstandard is not installed")
+  def test_zstd_round_trip(self) -> None:
+    compressed = compression.compress_zstd(DATA)
+    self.assertTrue(compressed.startswith(compression.ZSTD_MAGIC_NUMBER))
+    self.assertEqual(compression.decompress(compressed), DATA)
+
+  def test_compress_for_extension(self) -> None:
+    extension = compression.get_preferred_extension()
+    self.assertEqual(compression.decompress(compression.compress_for_extension(DATA, extension)), DATA)
+    self.assertEqual(compression.compress_for_extension(DATA, ".gz"), compression.compress(DATA))
+    with self.assertRaises(ValueError):
+      compression.compress_for_extension(DATA, ".bz2")
+
+  def test_compressed_writer(self) -> None:
+    file = io.BytesIO()
+    with compression.create_compressed_writer(file) as compressed_file:
+      compressed_file.write(DATA)
+    self.assertEqual(compression.decompress(file.getvalue()), DATA)
+
+  def test_compressed_writer_for_extension(self) -> None:
+    file = io.BytesIO()
+    with compression.create_compressed_writer_for_extension(file, compression.get_preferred_extension()) as compressed_file:
+      compressed_file.write(DATA[:10])
+      compressed_file.write(DATA[10:])
+    self.assertEqual(compression.decompress(file.getvalue()), DATA)
+    with self.assertRaises(ValueError):
+      compression.create_compressed_writer_for_extension(io.BytesIO(), ".bz2")
+
+  def test_open_decompressed(self) -> None:
+    with compression.open_decompressed(compression.compress(DATA)) as file:
+      self.assertEqual(file.readline(), b'{"username":"Bot-1"}\n')
+      self.assertEqual(file.read(), DATA[len(b'{"username":"Bot-1"}\n') :])
@@ -12,5 +12,39 @@ class TestFileFilePaths(unittest.TestCase):
   def test_data_path(self) -> None:
     self.assertEqual(file_paths.data_path(PerfType.BULLET), "leaderboard_data/bullet.json")
 
+  def test_bot_archive_path(self) -> None:
+    self.assertEqual(file_paths.bot_archive_path(), "leaderboard_data/bot_archive.json.gz")
+
+  def test_bot_ids_path(self) -> None:
+    self.assertEqual(file_paths.bot_ids_path(), "leaderboard_data/bot_ids.txt")
+
   def test_html_path(self) -> None:
     self.assertEqual(file_paths.html_path("index"), "leaderboard_html/index.html")
+
+  def test_sightings_path(self) -> None:
+    self.assertEqual(file_paths.sightings_path(), "leaderboard_cache/sightings.ndjson")
+
+  def test_recording_path(self) -> None:
+    self.assertEqual(file_paths.recording_path(123, 4, ".gz"), "leaderboard_cache/recordings/online_bots_123_004.ndjson.gz")
+
+  def test_online_bots_cache_paths(self) -> None:
+    self.assertEqual(file_paths.online_bots_cache_path(), "leaderboard_cache/online_bots.ndjson.gz")
+    self.assertEqual(file_paths.online_bot_users_cache_path(), "leaderboard_cache/online_bots.bin")
+
+  def test_leaderboard_database_path(self) -> None:
+    self.assertEqual(file_paths.leaderboard_database_path(), "leaderboard_cache/leaderboard.sqlite3")
+
+  def test_snapshot_path(self) -> None:
+    self.assertEqual(file_paths.snapshot_path(), "leaderboard_data/leaderboard_snapshot.bin")
+
+  def test_history_paths(self) -> None:
+    self.assertEqual(file_paths.history_dir(), "leaderboard_data/history")
+    self.assertEqual(file_paths.history_path("rating"), "leaderboard_data/history/rating.bin")
+    self.assertEqual(file_paths.history_heads_path(), "leaderboard_data/history/heads.bin")
+
+  def test_eligibility_expiry_path(self) -> None:
+    self.assertEqual(file_paths.eligibility_expiry_path(), "leaderboard_data/eligibility_expiry.bin")
+
+  def test_generation_record_paths(self) -> None:
+    self.assertEqual(file_paths.generations_dir(), "leaderboard_data/generations")
+    self.assertEqual(file_paths.generation_record_path(12), "leaderboard_data/generations/00000012.json")
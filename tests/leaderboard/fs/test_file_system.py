@@ -16,3 +16,38 @@ class TestFileSystem(unittest.TestCase):
     file_system = InMemoryFileSystem()
     file_system.write_file(FILE_NAME, FILE_LINES)
     self.assertEqual(file_system.read_file(FILE_NAME), FILE_LINES)
+
+  def test_save_and_load_bytes(self) -> None:
+    file_system = InMemoryFileSystem()
+    self.assertIsNone(file_system.read_bytes(FILE_NAME))
+    file_system.write_bytes(FILE_NAME, FILE_LINES.encode())
+    self.assertEqual(file_system.read_bytes(FILE_NAME), FILE_LINES.encode())
+
+  def test_append_bytes(self) -> None:
+    file_system = InMemoryFileSystem()
+    file_system.append_bytes(FILE_NAME, b"\x00")
+    file_system.append_bytes(FILE_NAME, b"\x01")
+    self.assertEqual(file_system.read_bytes(FILE_NAME), b"\x00\x01")
+
+  def test_map_bytes(self) -> None:
+    file_system = InMemoryFileSystem()
+    self.assertIsNone(file_system.map_bytes(FILE_NAME))
+    file_system.write_bytes(FILE_NAME, FILE_LINES.encode())
+    self.assertEqual(file_system.map_bytes(FILE_NAME), FILE_LINES.encode())
+
+  def test_get_size(self) -> None:
+    file_system = InMemoryFileSystem()
+    self.assertIsNone(file_system.get_size(FILE_NAME))
+    file_system.write_file(FILE_NAME, "ø")
+    self.assertEqual(file_system.get_size(FILE_NAME), 2)
+    file_system.write_bytes(FILE_NAME, b"\x00")
+    self.assertEqual(file_system.get_size(FILE_NAME), 1)
+
+  def test_list_files(self) -> None:
+    file_system = InMemoryFileSystem()
+    file_system.write_file("dir/b.txt", "")
+    file_system.write_bytes("dir/a.bin", b"")
+    file_system.write_file("dir/sub/c.txt", "")
+    file_system.write_file("directory.txt", "")
+    self.assertListEqual(file_system.list_files("dir"), ["dir/a.bin", "dir/b.txt"])
+    self.assertListEqual(file_system.list_files("missing"), [])
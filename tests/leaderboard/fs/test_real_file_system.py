@@ -0,0 +1,83 @@
+"""Tests for real_file_system.py."""
+
+import tempfile
+import unittest
+from pathlib import Path
+
+from src.leaderboard.fs.real_file_system import RealFileSystem
+
+
+class TestRealFileSystem(unittest.TestCase):
+  """Tests for RealFileSystem."""
+
+  def test_save_and_load(self) -> None:
+    with tempfile.TemporaryDirectory() as temp_dir:
+      file_name = str(Path(temp_dir) / "dir" / "file.txt")
+      file_system = RealFileSystem()
+      self.assertIsNone(file_system.read_file(file_name))
+      file_system.write_file(file_name, "contents")
+      self.assertEqual(file_system.read_file(file_name), "contents")
+
+  def test_save_and_load_bytes(self) -> None:
+    with tempfile.TemporaryDirectory() as temp_dir:
+      file_name = str(Path(temp_dir) / "dir" / "file.bin")
+      file_system = RealFileSystem()
+      self.assertIsNone(file_system.read_bytes(file_name))
+      file_system.write_bytes(file_name, b"\x00\x01")
+      self.assertEqual(file_system.read_bytes(file_name), b"\x00\x01")
+
+  def test_append_bytes(self) -> None:
+    with tempfile.TemporaryDirectory() as temp_dir:
+      file_system = RealFileSystem(Path(temp_dir))
+      file_system.append_bytes("dir/file.bin", b"\x00")
+      file_system.append_bytes("dir/file.bin", b"\x01")
+      self.assertEqual(file_system.read_bytes("dir/file.bin"), b"\x00\x01")
+
+  def test_map_bytes(self) -> None:
+    with tempfile.TemporaryDirectory() as temp_dir:
+      file_system = RealFileSystem(Path(temp_dir))
+      self.assertIsNone(file_system.map_bytes("file.bin"))
+      file_system.write_bytes("file.bin", b"\x00\x01")
+      view = file_system.map_bytes("file.bin")
+      self.assertIsNotNone(view)
+      if view is not None:
+        self.assertEqual(view.tobytes(), b"\x00\x01")
+        self.assertTrue(view.readonly)
+        view.release()
+      file_system.write_bytes("empty.bin", b"")
+      self.assertEqual(file_system.map_bytes("empty.bin"), b"")
+
+  def test_get_size(self) -> None:
+    with tempfile.TemporaryDirectory() as temp_dir:
+      file_system = RealFileSystem(Path(temp_dir))
+      self.assertIsNone(file_system.get_size("file.txt"))
+      file_system.write_file("file.txt", "ø")
+      self.assertEqual(file_system.get_size("file.txt"), 2)
+      # A directory is not a file
+      self.assertIsNone(file_system.get_size("."))
+
+  def test_delete_file(self) -> None:
+    with tempfile.TemporaryDirectory() as temp_dir:
+      file_system = RealFileSystem(Path(temp_dir))
+      file_system.write_file("file.txt", "contents")
+      file_system.delete_file("file.txt")
+      self.assertIsNone(file_system.read_file("file.txt"))
+      # Deleting a missing file does nothing
+      file_system.delete_file("file.txt")
+
+  def test_list_files(self) -> None:
+    with tempfile.TemporaryDirectory() as temp_dir:
+      file_system = RealFileSystem()
+      file_system.write_file(f"{temp_dir}/b.txt", "")
+      file_system.write_bytes(f"{temp_dir}/a.bin", b"")
+      file_system.write_file(f"{temp_dir}/sub/c.txt", "")
+      self.assertListEqual(file_system.list_files(temp_dir), [f"{temp_dir}/a.bin", f"{temp_dir}/b.txt"])
+      self.assertListEqual(file_system.list_files(f"{temp_dir}/missing"), [])
+
+  def test_root_dir(self) -> None:
+    with tempfile.TemporaryDirectory() as temp_dir:
+      file_system = RealFileSystem(Path(temp_dir))
+      file_system.write_file("dir/file.txt", "contents")
+      self.assertEqual((Path(temp_dir) / "dir" / "file.txt").read_text(), "contents")
+      self.assertEqual(file_system.read_file("dir/file.txt"), "contents")
+      self.assertListEqual(file_system.list_files("dir"), ["dir/file.txt"])
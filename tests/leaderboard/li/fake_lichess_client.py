@@ -1,5 +1,7 @@
 """Test implementation of LichessClient which allows setting the response."""
 
+from collections.abc import Iterator
+
 from src.leaderboard.li.lichess_client import LichessClient
 
 
@@ -9,11 +11,26 @@ class FakeLichessClient(LichessClient):
   def __init__(self) -> None:
     """Create a fake lichess client and set the fake response to empty string by default."""
     self.fake_response = ""
+    self.online_bots_changed = True
 
   def set_online_bots(self, fake_response: str) -> None:
     """Set the value to be returned by get_online_bots."""
     self.fake_response = fake_response
 
+  def set_online_bots_changed(self, online_bots_changed: bool) -> None:
+    """Set the value to be returned by has_online_bots_changed."""
+    self.online_bots_changed = online_bots_changed
+
+  def has_online_bots_changed(self) -> bool:
+    """Return whether the online bots have changed since they were last fetched."""
+    return self.online_bots_changed
+
   def get_online_bots(self) -> str:
     """Return a list of online bots represented as ndjson."""
     return self.fake_response
+
+  def iter_online_bots(self) -> Iterator[str]:
+    """Yield the online bots one line of ndjson at a time."""
+    for line in self.fake_response.splitlines():
+      if line:
+        yield line
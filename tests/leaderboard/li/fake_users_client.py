@@ -0,0 +1,22 @@
+"""Test implementation of UsersClient which allows setting the users."""
+
+from src.leaderboard.li.bot_user import BotUser
+from src.leaderboard.li.users_client import UsersClient
+
+
+class FakeUsersClient(UsersClient):
+  """A fake implementation of UsersClient."""
+
+  def __init__(self) -> None:
+    """Create a fake users client with no users."""
+    self.bot_users_by_name: dict[str, BotUser] = {}
+    self.requested_usernames: list[str] = []
+
+  def set_users(self, bot_users: list[BotUser]) -> None:
+    """Set the users which can be returned by get_users."""
+    self.bot_users_by_name = {bot_user.username: bot_user for bot_user in bot_users}
+
+  def get_users(self, usernames: list[str]) -> list[BotUser]:
+    """Return the users with the given usernames."""
+    self.requested_usernames.extend(usernames)
+    return [self.bot_users_by_name[name] for name in usernames if name in self.bot_users_by_name]
@@ -0,0 +1,78 @@
+"""A local stand-in for the lichess bulk users API which runs in a background thread."""
+
+import http.server
+import json
+import threading
+import time
+from types import TracebackType
+from typing import Any
+
+
+class StandInLichessServer:
+  """Serves `POST /api/users` from a fixed set of users.
+
+  The server records the batches it receives and the maximum number of requests which were handled at the same time.
+  """
+
+  def __init__(self, users: list[dict[str, Any]], response_delay: float = 0.0) -> None:
+    """Create the server. Each user is looked up by their lowercase username."""
+    self.users_by_id = {user["username"].lower(): user for user in users}
+    self.response_delay = response_delay
+    self.received_batches: list[list[str]] = []
+    self.in_flight = 0
+    self.max_in_flight = 0
+    self.lock = threading.Lock()
+    self.server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), self.create_handler())
+    self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+  def __enter__(self) -> "StandInLichessServer":
+    """Start serving requests."""
+    self.thread.start()
+    return self
+
+  def __exit__(
+    self, exc_type: type[BaseException] | None, exc_value: BaseException | None, traceback: TracebackType | None
+  ) -> None:
+    """Stop serving requests."""
+    self.server.shutdown()
+    self.server.server_close()
+
+  @property
+  def base_url(self) -> str:
+    """Return the url to use instead of https://lichess.org."""
+    return f"http://127.0.0.1:{self.server.server_port}"
+
+  def lookup_users(self, body: str) -> list[dict[str, Any]]:
+    """Record the batch and return the users which exist."""
+    names = body.split(",")
+    with self.lock:
+      self.received_batches.append(names)
+      self.in_flight += 1
+      self.max_in_flight = max(self.max_in_flight, self.in_flight)
+    time.sleep(self.response_delay)
+    with self.lock:
+      self.in_flight -= 1
+    return [self.users_by_id[name.lower()] for name in names if name.lower() in self.users_by_id]
+
+  def create_handler(self) -> type[http.server.BaseHTTPRequestHandler]:
+    """Create a request handler class bound to this server."""
+    stand_in = self
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+      def do_POST(self) -> None:
+        """Respond to `POST /api/users`."""
+        if self.path != "/api/users":
+          self.send_error(404)
+          return
+        content_length = int(self.headers.get("Content-Length", 0))
+        body = json.dumps(stand_in.lookup_users(self.rfile.read(content_length).decode())).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+      def log_message(self, format: str, *args: object) -> None:  # noqa: A002 - name required by BaseHTTPRequestHandler
+        """Do not log requests."""
+
+    return Handler
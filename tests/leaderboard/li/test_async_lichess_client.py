@@ -0,0 +1,72 @@
+"""Tests for async_lichess_client.py."""
+
+import unittest
+from unittest import mock
+
+import requests
+
+from src.leaderboard.li.async_lichess_client import MAX_USERS_PER_REQUEST, AsyncLichessClient
+from src.leaderboard.li.bot_user import BotUser
+from src.leaderboard.li.pert_type import PerfType
+from src.leaderboard.log.log_writer import LogWriter
+from tests.leaderboard.li.stand_in_lichess_server import StandInLichessServer
+
+
+def create_user_json(index: int) -> dict[str, object]:
+  """Create the json for a user as returned by the bulk users API."""
+  return {
+    "id": f"bot-{index}",
+    "username": f"Bot-{index}",
+    "seenAt": 1743500000000,
+    "perfs": {"bullet": {"games": index, "rating": 1500 + index}},
+  }
+
+
+class TestAsyncLichessClient(unittest.TestCase):
+  """Tests for AsyncLichessClient."""
+
+  def test_get_users_no_usernames(self) -> None:
+    with StandInLichessServer([]) as server:
+      self.assertListEqual(AsyncLichessClient(base_url=server.base_url).get_users([]), [])
+      self.assertListEqual(server.received_batches, [])
+
+  def test_get_users(self) -> None:
+    with StandInLichessServer([create_user_json(1), create_user_json(2)]) as server:
+      bot_users = AsyncLichessClient(base_url=server.base_url).get_users(["Bot-1", "Bot-2", "Bot-3"])
+    self.assertListEqual([bot_user.username for bot_user in bot_users], ["Bot-1", "Bot-2"])
+    self.assertEqual(bot_users[0].seen_at, 1743500000)
+    self.assertEqual(bot_users[1].perfs[0].perf_type, PerfType.BULLET)
+    self.assertEqual(bot_users[1].perfs[0].rating, 1502)
+
+  def test_get_users_batches_concurrently(self) -> None:
+    user_count = 2 * MAX_USERS_PER_REQUEST + 10
+    users = [create_user_json(index) for index in range(user_count)]
+    names = [f"Bot-{index}" for index in range(user_count)]
+    with StandInLichessServer(users, response_delay=0.2) as server:
+      lichess_client = AsyncLichessClient(
+        base_url=server.base_url, max_concurrent_requests=2, requests_per_second=100, request_burst=3
+      )
+      bot_users = lichess_client.get_users(names)
+    # The results are in the same order as the requested names
+    self.assertListEqual([bot_user.username for bot_user in bot_users], names)
+    self.assertListEqual(
+      sorted(len(batch) for batch in server.received_batches), [10, MAX_USERS_PER_REQUEST, MAX_USERS_PER_REQUEST]
+    )
+    self.assertEqual(server.max_in_flight, 2)
+
+  def test_get_users_failed_batch(self) -> None:
+    names = [f"Bot-{index}" for index in range(MAX_USERS_PER_REQUEST + 1)]
+
+    def post_users(usernames: list[str]) -> list[BotUser]:
+      if len(usernames) == MAX_USERS_PER_REQUEST:
+        error_msg = "Connection refused"
+        raise requests.ConnectionError(error_msg)
+      return [BotUser.from_json_dict(create_user_json(MAX_USERS_PER_REQUEST))]
+
+    log_writer = mock.Mock(spec=LogWriter)
+    lichess_client = AsyncLichessClient(mock.Mock(), requests_per_second=100, log_writer=log_writer)
+    with mock.patch.object(lichess_client, "post_users", side_effect=post_users):
+      bot_users = lichess_client.get_users(names)
+    # The users of the failed batch are left out and the other batch is still returned
+    self.assertListEqual([bot_user.username for bot_user in bot_users], [f"Bot-{MAX_USERS_PER_REQUEST}"])
+    log_writer.info.assert_called_once()
@@ -2,7 +2,7 @@
 
 import unittest
 
-from src.leaderboard.li.bot_user import BotUser, Perf
+from src.leaderboard.li.bot_user import BotUser, Perf, create_perf_table_from_perfs
 from src.leaderboard.li.pert_type import PerfType
 
 
@@ -36,15 +36,6 @@ BOT_USER_JSON = """
 """
 
 
-class TestPerf(unittest.TestCase):
-  """Tests for Perf."""
-
-  def test_from_json_dict(self) -> None:
-    json_key = "bullet"
-    json_value = {"games": 15, "rating": 2800, "rd": 200, "prog": 700, "prov": True}
-    self.assertEqual(Perf.from_json_dict(json_key, json_value), Perf(PerfType.BULLET, 15, 2800, 200, 700, True))
-
-
 class TestBotUser(unittest.TestCase):
   """Tests for BotUser."""
 
@@ -63,3 +54,18 @@ class TestBotUser(unittest.TestCase):
     self.assertTrue(bot_user.patron)
     self.assertFalse(bot_user.tos_violation)
     self.assertListEqual(bot_user.perfs, expected_perfs)
+
+  def test_to_json_dict_round_trip(self) -> None:
+    bot_user = BotUser.from_json(BOT_USER_JSON)
+    self.assertEqual(BotUser.from_json_dict(bot_user.to_json_dict()), bot_user)
+
+  def test_from_json_drops_unknown_perfs(self) -> None:
+    bot_user = BotUser.from_json(
+      b'{"username": "Bot-1", "perfs": {"puzzle": {"games": 5}, "storm": {"runs": 1}, "blitz": {"games": 2, "rating": 1600}}}'
+    )
+    self.assertListEqual(bot_user.perfs, [Perf(PerfType.BLITZ, 2, 1600, 0, 0, False)])
+
+  def test_perfs_match_perf_table(self) -> None:
+    bot_user = BotUser.from_json(BOT_USER_JSON)
+    self.assertEqual(create_perf_table_from_perfs(bot_user.perfs), bot_user.perf_table)
+    self.assertEqual(bot_user.perf_table.get_rating(PerfType.BLITZ), 1500)
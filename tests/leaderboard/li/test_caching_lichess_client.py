@@ -0,0 +1,146 @@
+"""Tests for caching_lichess_client.py."""
+
+import unittest
+from http import HTTPStatus
+from unittest import mock
+
+from src.leaderboard.chrono.fixed_time_provider import FixedTimeProvider
+from src.leaderboard.li.bot_user import BotUser
+from src.leaderboard.li.caching_lichess_client import CachingLichessClient
+from src.leaderboard.li.pert_type import PerfType
+from src.leaderboard.li.real_lichess_client import RealLichessClient
+from src.leaderboard.li.response_cache import ResponseCache, ResponseHeader
+from tests.leaderboard.fs.in_memory_file_system import InMemoryFileSystem
+from tests.leaderboard.li.test_response_cache import save_response
+
+
+ONLINE_BOTS_NDJSON = '{"username":"Bot-1"}\n{"username":"Bot-2"}\n'
+ONLINE_BOTS_LINES = [b'{"username":"Bot-1"}', b'{"username":"Bot-2"}']
+ONLINE_BOT_USERS = [BotUser.from_json(line) for line in ONLINE_BOTS_LINES]
+
+
+def create_session(status_code: int, content: bytes = b"", headers: dict[str, str] | None = None) -> mock.Mock:
+  """Create a mock session which responds to get with the given response."""
+  session = mock.Mock()
+  response = mock.MagicMock()
+  response.__enter__.return_value = response
+  response.status_code = status_code
+  response.iter_lines.return_value = iter(content.splitlines())
+  response.headers = headers or {}
+  session.get.return_value = response
+  return session
+
+
+def get_cached_ndjson(response_cache: ResponseCache) -> str:
+  """Return the cached body as ndjson."""
+  return "".join(f"{line}\n" for line in response_cache.iter_lines())
+
+
+class TestCachingLichessClient(unittest.TestCase):
+  """Tests for CachingLichessClient."""
+
+  def test_fetch_saves_response(self) -> None:
+    session = create_session(HTTPStatus.OK, ONLINE_BOTS_NDJSON.encode(), {"ETag": '"etag"'})
+    response_cache = ResponseCache(InMemoryFileSystem())
+    lichess_client = CachingLichessClient(RealLichessClient(session), response_cache, FixedTimeProvider(7))
+
+    self.assertListEqual(list(lichess_client.iter_online_bots()), ['{"username":"Bot-1"}', '{"username":"Bot-2"}'])
+    self.assertEqual(lichess_client.get_online_bots(), ONLINE_BOTS_NDJSON)
+    self.assertTrue(lichess_client.has_online_bots_changed())
+    # The online bots are only requested once
+    session.get.assert_called_once()
+    self.assertEqual(response_cache.load_header(), ResponseHeader('"etag"', "", 7))
+    self.assertEqual(get_cached_ndjson(response_cache), ONLINE_BOTS_NDJSON)
+
+  def test_fetch_streams_response(self) -> None:
+    session = create_session(HTTPStatus.OK, ONLINE_BOTS_NDJSON.encode(), {"ETag": '"etag"'})
+    response_cache = ResponseCache(InMemoryFileSystem())
+    save_response(response_cache, ResponseHeader('"previous etag"', "", 1), [])
+    lichess_client = CachingLichessClient(RealLichessClient(session), response_cache, FixedTimeProvider(7))
+
+    online_bots = lichess_client.iter_online_bots()
+    self.assertEqual(next(online_bots), '{"username":"Bot-1"}')
+    # The body is not read all at once and the cache is replaced once every line has been read
+    session.get.return_value.iter_lines.assert_called_once_with()
+    self.assertEqual(response_cache.load_header(), ResponseHeader('"previous etag"', "", 1))
+    self.assertListEqual(list(online_bots), ['{"username":"Bot-2"}'])
+    self.assertEqual(response_cache.load_header(), ResponseHeader('"etag"', "", 7))
+    session.get.return_value.__exit__.assert_called_once()
+
+  def test_fetch_not_modified_uses_cache(self) -> None:
+    session = create_session(HTTPStatus.NOT_MODIFIED)
+    response_cache = ResponseCache(InMemoryFileSystem())
+    save_response(response_cache, ResponseHeader('"etag"', "", 1), ONLINE_BOTS_LINES)
+    lichess_client = CachingLichessClient(RealLichessClient(session), response_cache, FixedTimeProvider(7))
+
+    self.assertFalse(lichess_client.has_online_bots_changed())
+    self.assertEqual(lichess_client.get_online_bots(), ONLINE_BOTS_NDJSON)
+    self.assertEqual(session.get.call_args.kwargs["headers"]["If-None-Match"], '"etag"')
+    session.get.return_value.close.assert_called_once_with()
+    # The cached response keeps the time it was originally fetched
+    self.assertEqual(response_cache.load_header(), ResponseHeader('"etag"', "", 1))
+
+  def test_offline_replays_cache(self) -> None:
+    session = mock.Mock()
+    response_cache = ResponseCache(InMemoryFileSystem())
+    save_response(response_cache, ResponseHeader('"etag"', "", 1), ONLINE_BOTS_LINES)
+    lichess_client = CachingLichessClient(RealLichessClient(session), response_cache, FixedTimeProvider(7), offline=True)
+
+    self.assertEqual(lichess_client.get_online_bots(), ONLINE_BOTS_NDJSON)
+    self.assertEqual(lichess_client.get_response_header().fetched_at, 1)
+    session.get.assert_not_called()
+
+  def test_offline_without_cache(self) -> None:
+    response_cache = ResponseCache(InMemoryFileSystem())
+    lichess_client = CachingLichessClient(RealLichessClient(mock.Mock()), response_cache, FixedTimeProvider(7), offline=True)
+    with self.assertRaises(ValueError):
+      lichess_client.get_online_bots()
+
+  def test_fetch_saves_parsed_bots(self) -> None:
+    session = create_session(HTTPStatus.OK, ONLINE_BOTS_NDJSON.encode(), {"ETag": '"etag"'})
+    response_cache = ResponseCache(InMemoryFileSystem())
+    lichess_client = CachingLichessClient(RealLichessClient(session), response_cache, FixedTimeProvider(7))
+
+    # Every perf is parsed, so the parsed bots can be reused whichever perf types are generated next
+    self.assertListEqual(list(lichess_client.iter_online_bot_users([PerfType.BULLET])), ONLINE_BOT_USERS)
+    self.assertEqual(get_cached_ndjson(response_cache), ONLINE_BOTS_NDJSON)
+    self.assertListEqual(response_cache.load_bot_users(ResponseHeader('"etag"', "", 7)) or [], ONLINE_BOT_USERS)
+
+  def test_fetch_not_modified_loads_parsed_bots(self) -> None:
+    session = create_session(HTTPStatus.NOT_MODIFIED)
+    response_cache = ResponseCache(InMemoryFileSystem())
+    response_header = ResponseHeader('"etag"', "", 1)
+    save_response(response_cache, response_header, ONLINE_BOTS_LINES)
+    writer = response_cache.create_bot_users_writer(response_header)
+    for bot_user in ONLINE_BOT_USERS:
+      writer.write_bot_user(bot_user)
+    writer.save()
+    lichess_client = CachingLichessClient(RealLichessClient(session), response_cache, FixedTimeProvider(7))
+
+    with mock.patch.object(BotUser, "from_json") as from_json:
+      self.assertListEqual(list(lichess_client.iter_online_bot_users()), ONLINE_BOT_USERS)
+    from_json.assert_not_called()
+
+  def test_fetch_not_modified_parses_without_parsed_bots(self) -> None:
+    session = create_session(HTTPStatus.NOT_MODIFIED)
+    response_cache = ResponseCache(InMemoryFileSystem())
+    save_response(response_cache, ResponseHeader('"etag"', "", 1), ONLINE_BOTS_LINES)
+    # The parsed bots of a previous response are not used
+    writer = response_cache.create_bot_users_writer(ResponseHeader('"previous etag"', "", 0))
+    writer.write_bot_user(ONLINE_BOT_USERS[0])
+    writer.save()
+    lichess_client = CachingLichessClient(RealLichessClient(session), response_cache, FixedTimeProvider(7))
+
+    self.assertListEqual(list(lichess_client.iter_online_bot_users()), ONLINE_BOT_USERS)
+    self.assertListEqual(response_cache.load_bot_users(ResponseHeader('"etag"', "", 1)) or [], ONLINE_BOT_USERS)
+
+  def test_offline_loads_parsed_bots(self) -> None:
+    response_cache = ResponseCache(InMemoryFileSystem())
+    save_response(response_cache, ResponseHeader('"etag"', "", 1), ONLINE_BOTS_LINES)
+    lichess_client = CachingLichessClient(RealLichessClient(mock.Mock()), response_cache, FixedTimeProvider(7), offline=True)
+    self.assertListEqual(list(lichess_client.iter_online_bot_users()), ONLINE_BOT_USERS)
+
+    lichess_client = CachingLichessClient(RealLichessClient(mock.Mock()), response_cache, FixedTimeProvider(7), offline=True)
+    with mock.patch.object(BotUser, "from_json") as from_json:
+      self.assertListEqual(list(lichess_client.iter_online_bot_users()), ONLINE_BOT_USERS)
+    from_json.assert_not_called()
@@ -0,0 +1,57 @@
+"""Tests for http_session.py."""
+
+import http.server
+import threading
+import unittest
+
+from src.leaderboard.li import http_session
+
+
+class FlakyHandler(http.server.BaseHTTPRequestHandler):
+  """Responds with 429 to the first request and 200 to every request after that."""
+
+  request_count = 0
+
+  def do_GET(self) -> None:
+    """Respond to a GET request."""
+    FlakyHandler.request_count += 1
+    if FlakyHandler.request_count == 1:
+      self.send_response(429)
+      self.send_header("Retry-After", "0")
+      self.send_header("Content-Length", "0")
+      self.end_headers()
+      return
+    body = b"ok"
+    self.send_response(200)
+    self.send_header("Content-Length", str(len(body)))
+    self.end_headers()
+    self.wfile.write(body)
+
+  def log_message(self, format: str, *args: object) -> None:  # noqa: A002 - name required by BaseHTTPRequestHandler
+    """Do not log requests."""
+
+
+class TestHttpSession(unittest.TestCase):
+  """Tests for http_session functions."""
+
+  def test_create_retry(self) -> None:
+    retry = http_session.create_retry()
+    self.assertEqual(retry.total, http_session.MAX_RETRIES)
+    self.assertEqual(retry.backoff_max, http_session.BACKOFF_MAX)
+    self.assertTrue(retry.respect_retry_after_header)
+    self.assertIn(429, retry.status_forcelist or [])
+    self.assertIn(503, retry.status_forcelist or [])
+
+  def test_create_session_retries_too_many_requests(self) -> None:
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), FlakyHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+      with http_session.create_session() as session:
+        response = session.get(f"http://127.0.0.1:{server.server_port}/", timeout=http_session.TIMEOUT)
+      self.assertEqual(response.status_code, 200)
+      self.assertEqual(response.text, "ok")
+      self.assertEqual(FlakyHandler.request_count, 2)
+    finally:
+      server.shutdown()
+      server.server_close()
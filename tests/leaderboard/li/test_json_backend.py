@@ -0,0 +1,20 @@
+"""Tests for json_backend.py."""
+
+import unittest
+
+from src.leaderboard.li import json_backend
+
+
+class TestJsonBackend(unittest.TestCase):
+  """Tests for json_backend functions."""
+
+  def test_loads(self) -> None:
+    self.assertEqual(json_backend.loads('{"a": [1, "b", true, null]}'), {"a": [1, "b", True, None]})
+    self.assertEqual(json_backend.loads(b'{"a": 1}'), {"a": 1})
+
+  def test_loads_invalid(self) -> None:
+    with self.assertRaises(ValueError):
+      json_backend.loads("{")
+
+  def test_get_backend_name(self) -> None:
+    self.assertIn(json_backend.get_backend_name(), ("orjson", "json"))
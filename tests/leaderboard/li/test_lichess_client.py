@@ -2,6 +2,7 @@
 
 import unittest
 
+from src.leaderboard.li.pert_type import PerfType
 from tests.leaderboard.li.fake_lichess_client import FakeLichessClient
 
 
@@ -15,3 +16,18 @@ class TestLichessClient(unittest.TestCase):
     lichess_client = FakeLichessClient()
     lichess_client.set_online_bots(ONLINE_BOT_NDJSON)
     self.assertEqual(lichess_client.get_online_bots(), ONLINE_BOT_NDJSON)
+
+  def test_iter_online_bots(self) -> None:
+    lichess_client = FakeLichessClient()
+    lichess_client.set_online_bots("{bot 1}\n\n{bot 2}\n")
+    self.assertListEqual(list(lichess_client.iter_online_bots()), ["{bot 1}", "{bot 2}"])
+
+  def test_iter_online_bot_users(self) -> None:
+    lichess_client = FakeLichessClient()
+    lichess_client.set_online_bots(
+      '{"username":"Bot-1","perfs":{"bullet":{"games":1}}}\n{"username":"Bot-2","perfs":{"blitz":{"games":2}}}\n'
+    )
+    bot_users = list(lichess_client.iter_online_bot_users([PerfType.BLITZ]))
+    self.assertListEqual([bot_user.username for bot_user in bot_users], ["Bot-1", "Bot-2"])
+    self.assertFalse(bot_users[0].perf_table.has_perf(PerfType.BULLET))
+    self.assertEqual(bot_users[1].perf_table.get_games(PerfType.BLITZ), 2)
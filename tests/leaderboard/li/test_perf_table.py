@@ -0,0 +1,61 @@
+"""Tests for perf_table.py."""
+
+import unittest
+
+from src.leaderboard.li.perf_table import PerfTable, create_perf_table
+from src.leaderboard.li.pert_type import PerfType
+
+
+class TestPerfTable(unittest.TestCase):
+  """Tests for PerfTable."""
+
+  def test_empty(self) -> None:
+    perf_table = PerfTable()
+    self.assertListEqual(list(perf_table.get_perf_types()), [])
+    self.assertFalse(perf_table.has_perf(PerfType.BULLET))
+    self.assertEqual(perf_table.get_games(PerfType.BULLET), 0)
+
+  def test_from_json_dict(self) -> None:
+    perf_table = PerfTable.from_json_dict(
+      {
+        "puzzle": {"games": 5, "rating": 1500},
+        "racingKings": {"games": 3, "rating": 1400, "rd": 80, "prog": -5, "prov": True},
+        "bullet": {"games": 10, "rating": 2000},
+      }
+    )
+    self.assertListEqual(list(perf_table.get_perf_types()), [PerfType.BULLET, PerfType.RACING_KINGS])
+    self.assertEqual(perf_table.get_games(PerfType.RACING_KINGS), 3)
+    self.assertEqual(perf_table.get_rating(PerfType.RACING_KINGS), 1400)
+    self.assertEqual(perf_table.get_rd(PerfType.RACING_KINGS), 80)
+    self.assertEqual(perf_table.get_prog(PerfType.RACING_KINGS), -5)
+    self.assertTrue(perf_table.get_prov(PerfType.RACING_KINGS))
+    self.assertEqual(perf_table.get_perf_values(PerfType.BULLET), (10, 2000, 0, 0, False))
+    self.assertFalse(perf_table.has_perf(PerfType.BLITZ))
+
+  def test_from_json_dict_selected_perf_types(self) -> None:
+    perf_table = PerfTable.from_json_dict(
+      {"bullet": {"games": 10, "rating": 2000}, "blitz": {"games": 5, "rating": 1900}}, frozenset((PerfType.BLITZ,))
+    )
+    self.assertListEqual(list(perf_table.get_perf_types()), [PerfType.BLITZ])
+
+  def test_perf_with_no_games_is_present(self) -> None:
+    perf_table = PerfTable.from_json_dict({"blitz": {"games": 0, "rating": 1500, "rd": 500, "prov": True}})
+    self.assertTrue(perf_table.has_perf(PerfType.BLITZ))
+
+  def test_updated_with(self) -> None:
+    older = create_perf_table([(PerfType.BULLET, (1, 1500, 60, 0, False)), (PerfType.BLITZ, (2, 1600, 50, 0, False))])
+    newer = create_perf_table([(PerfType.BULLET, (3, 1700, 45, 10, False))])
+    updated = older.updated_with(newer)
+    self.assertEqual(
+      updated, create_perf_table([(PerfType.BULLET, (3, 1700, 45, 10, False)), (PerfType.BLITZ, (2, 1600, 50, 0, False))])
+    )
+    # The original tables are unchanged
+    self.assertEqual(older.get_rating(PerfType.BULLET), 1500)
+
+  def test_equality(self) -> None:
+    perf_table = create_perf_table([(PerfType.ATOMIC, (1, 1500, 60, 0, False))])
+    self.assertEqual(perf_table, create_perf_table([(PerfType.ATOMIC, (1, 1500, 60, 0, False))]))
+    self.assertEqual(hash(perf_table), hash(create_perf_table([(PerfType.ATOMIC, (1, 1500, 60, 0, False))])))
+    self.assertNotEqual(perf_table, create_perf_table([(PerfType.ATOMIC, (1, 1501, 60, 0, False))]))
+    self.assertNotEqual(perf_table, PerfTable())
+    self.assertIn("atomic=(1, 1500, 60, 0, False)", repr(perf_table))
@@ -3,6 +3,10 @@
 import unittest
 from unittest import mock
 
+import requests
+from requests.adapters import HTTPAdapter
+
+from src.leaderboard.li import http_session
 from src.leaderboard.li.real_lichess_client import RealLichessClient
 
 
@@ -12,20 +16,87 @@ ONLINE_BOT_NDJSON = "{some json}"
 class TestRealLichessClient(unittest.TestCase):
   """Tests for RealLichessClient."""
 
-  @mock.patch("src.leaderboard.li.real_lichess_client.requests.get")
-  def test_get_online_bots_requests_maximum_number_of_bots(self, requests_get: mock.Mock) -> None:
-    response = mock.Mock()
+  def test_get_online_bots_requests_maximum_number_of_bots(self) -> None:
+    session = mock.Mock()
+    response = mock.MagicMock()
+    response.__enter__.return_value = response
     response.text = ONLINE_BOT_NDJSON
-    requests_get.return_value = response
+    session.get.return_value = response
 
-    online_bots = RealLichessClient().get_online_bots()
+    online_bots = RealLichessClient(session).get_online_bots()
 
     self.assertEqual(online_bots, ONLINE_BOT_NDJSON)
-    requests_get.assert_called_once_with(
+    session.get.assert_called_once_with(
       "https://lichess.org/api/bot/online",
       headers={"Accept": "application/x-ndjson"},
       params={"nb": 512},
-      timeout=10,
+      timeout=http_session.TIMEOUT,
       stream=True,
     )
     response.raise_for_status.assert_called_once_with()
+
+  def test_iter_online_bots_streams_lines(self) -> None:
+    session = mock.Mock()
+    response = mock.MagicMock()
+    response.__enter__.return_value = response
+    response.iter_lines.return_value = iter([b"{bot 1}", b"", b"{bot 2}"])
+    session.get.return_value = response
+
+    online_bots = RealLichessClient(session).iter_online_bots()
+
+    # Nothing is requested until the first line is consumed
+    session.get.assert_not_called()
+    self.assertListEqual(list(online_bots), ["{bot 1}", "{bot 2}"])
+    session.get.assert_called_once_with(
+      "https://lichess.org/api/bot/online",
+      headers={"Accept": "application/x-ndjson"},
+      params={"nb": 512},
+      timeout=http_session.TIMEOUT,
+      stream=True,
+    )
+    response.raise_for_status.assert_called_once_with()
+    response.__exit__.assert_called_once()
+
+  def test_request_online_bots_sends_validators(self) -> None:
+    session = mock.Mock()
+
+    RealLichessClient(session).request_online_bots('"etag"', "Wed, 21 Oct 2015 07:28:00 GMT")
+
+    session.get.assert_called_once_with(
+      "https://lichess.org/api/bot/online",
+      headers={
+        "Accept": "application/x-ndjson",
+        "If-None-Match": '"etag"',
+        "If-Modified-Since": "Wed, 21 Oct 2015 07:28:00 GMT",
+      },
+      params={"nb": 512},
+      timeout=http_session.TIMEOUT,
+      stream=True,
+    )
+
+  def test_request_online_bots_closes_failed_response(self) -> None:
+    session = mock.Mock()
+    response = session.get.return_value
+    response.raise_for_status.side_effect = requests.HTTPError("500 Server Error")
+
+    with self.assertRaises(requests.HTTPError):
+      RealLichessClient(session).request_online_bots()
+    response.close.assert_called_once_with()
+
+  def test_base_url(self) -> None:
+    session = mock.Mock()
+    RealLichessClient(session, "http://127.0.0.1:8000").request_online_bots()
+    self.assertEqual(session.get.call_args.args, ("http://127.0.0.1:8000/api/bot/online",))
+
+  def test_context_manager_closes_session(self) -> None:
+    session = mock.Mock()
+    with RealLichessClient(session):
+      session.close.assert_not_called()
+    session.close.assert_called_once_with()
+
+  def test_default_session_retries(self) -> None:
+    with RealLichessClient() as lichess_client:
+      adapter = lichess_client.session.get_adapter("https://lichess.org")
+      if not isinstance(adapter, HTTPAdapter):
+        self.fail(f"Unexpected adapter: {adapter}")
+      self.assertEqual(adapter.max_retries.total, http_session.MAX_RETRIES)
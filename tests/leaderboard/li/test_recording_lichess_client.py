@@ -0,0 +1,85 @@
+"""Tests for recording_lichess_client.py."""
+
+import unittest
+
+from src.leaderboard.chrono.fixed_time_provider import FixedTimeProvider
+from src.leaderboard.fs import compression, file_paths
+from src.leaderboard.li.recording_lichess_client import RecordingLichessClient
+from tests.leaderboard.fs.in_memory_file_system import InMemoryFileSystem
+from tests.leaderboard.li.fake_lichess_client import FakeLichessClient
+
+
+ONLINE_BOTS_NDJSON = '{"username":"Bot-1"}\n{"username":"Bot-2"}\n'
+
+
+class TestRecordingLichessClient(unittest.TestCase):
+  """Tests for RecordingLichessClient."""
+
+  def test_get_online_bots_records(self) -> None:
+    file_system = InMemoryFileSystem()
+    fake_client = FakeLichessClient()
+    fake_client.set_online_bots(ONLINE_BOTS_NDJSON)
+    lichess_client = RecordingLichessClient(fake_client, file_system, FixedTimeProvider(123), ".gz")
+
+    self.assertEqual(lichess_client.get_online_bots(), ONLINE_BOTS_NDJSON)
+
+    file_name = file_paths.recording_path(123, 0, ".gz")
+    self.assertListEqual(lichess_client.recorded_file_names, [file_name])
+    data = file_system.read_bytes(file_name)
+    if not data:
+      self.fail(f"Missing recording: {file_name}")
+    self.assertEqual(compression.decompress(data).decode(), ONLINE_BOTS_NDJSON)
+
+  def test_iter_online_bots_records_after_last_line(self) -> None:
+    file_system = InMemoryFileSystem()
+    fake_client = FakeLichessClient()
+    fake_client.set_online_bots(ONLINE_BOTS_NDJSON)
+    lichess_client = RecordingLichessClient(fake_client, file_system, FixedTimeProvider(123))
+
+    online_bots = lichess_client.iter_online_bots()
+    self.assertEqual(next(online_bots), '{"username":"Bot-1"}')
+    self.assertListEqual(lichess_client.recorded_file_names, [])
+    self.assertListEqual(list(online_bots), ['{"username":"Bot-2"}'])
+
+    data = file_system.read_bytes(lichess_client.recorded_file_names[0])
+    if not data:
+      self.fail("Missing recording")
+    self.assertEqual(compression.decompress(data).decode(), ONLINE_BOTS_NDJSON)
+
+  def test_recordings_in_the_same_second(self) -> None:
+    file_system = InMemoryFileSystem()
+    fake_client = FakeLichessClient()
+    fake_client.set_online_bots(ONLINE_BOTS_NDJSON)
+    lichess_client = RecordingLichessClient(fake_client, file_system, FixedTimeProvider(123), ".gz")
+    lichess_client.get_online_bots()
+    list(lichess_client.iter_online_bots())
+    # Another recorder does not overwrite the recordings either
+    RecordingLichessClient(fake_client, file_system, FixedTimeProvider(123), ".gz").get_online_bots()
+
+    self.assertListEqual(
+      file_system.list_files(file_paths.recordings_dir()),
+      [file_paths.recording_path(123, sequence, ".gz") for sequence in range(3)],
+    )
+
+  def test_has_online_bots_changed_delegates(self) -> None:
+    fake_client = FakeLichessClient()
+    fake_client.set_online_bots_changed(False)
+    lichess_client = RecordingLichessClient(fake_client, InMemoryFileSystem(), FixedTimeProvider(0))
+    self.assertFalse(lichess_client.has_online_bots_changed())
+
+  def test_iter_online_bot_users_records_changed(self) -> None:
+    fake_client = FakeLichessClient()
+    fake_client.set_online_bots(ONLINE_BOTS_NDJSON)
+    lichess_client = RecordingLichessClient(fake_client, InMemoryFileSystem(), FixedTimeProvider(123), ".gz")
+    bot_users = list(lichess_client.iter_online_bot_users())
+    self.assertListEqual([bot_user.username for bot_user in bot_users], ["Bot-1", "Bot-2"])
+    self.assertListEqual(lichess_client.recorded_file_names, [file_paths.recording_path(123, 0, ".gz")])
+
+  def test_iter_online_bot_users_unchanged_not_recorded(self) -> None:
+    fake_client = FakeLichessClient()
+    fake_client.set_online_bots(ONLINE_BOTS_NDJSON)
+    fake_client.set_online_bots_changed(False)
+    lichess_client = RecordingLichessClient(fake_client, InMemoryFileSystem(), FixedTimeProvider(123))
+    bot_users = list(lichess_client.iter_online_bot_users())
+    self.assertListEqual([bot_user.username for bot_user in bot_users], ["Bot-1", "Bot-2"])
+    self.assertListEqual(lichess_client.recorded_file_names, [])
@@ -0,0 +1,43 @@
+"""Tests for replay_lichess_client.py."""
+
+import unittest
+
+from src.leaderboard.fs import compression, file_paths
+from src.leaderboard.li.replay_lichess_client import ReplayLichessClient
+from tests.leaderboard.fs.in_memory_file_system import InMemoryFileSystem
+
+
+def create_file_system() -> InMemoryFileSystem:
+  """Create a file system with two recordings."""
+  file_system = InMemoryFileSystem()
+  file_system.write_bytes(file_paths.recording_path(1, 0, ".gz"), compression.compress(b'{"username":"Bot-1"}\n'))
+  file_system.write_bytes(file_paths.recording_path(2, 0, ".gz"), compression.compress(b'{"username":"Bot-2"}\n\n'))
+  return file_system
+
+
+class TestReplayLichessClient(unittest.TestCase):
+  """Tests for ReplayLichessClient."""
+
+  def test_replays_in_order_and_starts_over(self) -> None:
+    lichess_client = ReplayLichessClient.from_recordings(create_file_system())
+    self.assertListEqual(list(lichess_client.iter_online_bots()), ['{"username":"Bot-1"}'])
+    self.assertListEqual(list(lichess_client.iter_online_bots()), ['{"username":"Bot-2"}'])
+    self.assertEqual(lichess_client.get_online_bots(), '{"username":"Bot-1"}\n')
+
+  def test_from_recordings_latest(self) -> None:
+    lichess_client = ReplayLichessClient.from_recordings(create_file_system(), 1)
+    self.assertListEqual(lichess_client.file_names, [file_paths.recording_path(2, 0, ".gz")])
+
+  def test_chosen_recording(self) -> None:
+    lichess_client = ReplayLichessClient(create_file_system(), [file_paths.recording_path(2, 0, ".gz")])
+    self.assertEqual(lichess_client.get_online_bots(), '{"username":"Bot-2"}\n\n')
+    self.assertEqual(lichess_client.get_online_bots(), '{"username":"Bot-2"}\n\n')
+
+  def test_no_recordings(self) -> None:
+    with self.assertRaises(ValueError):
+      ReplayLichessClient.from_recordings(InMemoryFileSystem())
+
+  def test_missing_recording(self) -> None:
+    lichess_client = ReplayLichessClient(InMemoryFileSystem(), ["missing.ndjson.gz"])
+    with self.assertRaises(ValueError):
+      lichess_client.get_online_bots()
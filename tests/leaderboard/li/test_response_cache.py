@@ -0,0 +1,94 @@
+"""Tests for response_cache.py."""
+
+import unittest
+
+from src.leaderboard.fs import file_paths
+from src.leaderboard.li.bot_user import BotUser
+from src.leaderboard.li.perf_table import create_perf_table
+from src.leaderboard.li.pert_type import PerfType
+from src.leaderboard.li.response_cache import ResponseCache, ResponseHeader
+from tests.leaderboard.fs.in_memory_file_system import InMemoryFileSystem
+
+
+RESPONSE_HEADER = ResponseHeader('"etag"', "Wed, 21 Oct 2015 07:28:00 GMT", 1)
+BOT_USERS = [
+  BotUser("Bot-1", "", "", 0, 0, False, False, create_perf_table([])),
+  BotUser(
+    "Bot-Ω",
+    "activity.lichess-berserk",
+    "GB",
+    1000,
+    2000,
+    True,
+    True,
+    create_perf_table([(PerfType.BULLET, (10, 2000, 50, -5, False)), (PerfType.ATOMIC, (3, 1500, 110, 0, True))]),
+  ),
+]
+
+
+def save_response(response_cache: ResponseCache, header: ResponseHeader, lines: list[bytes]) -> None:
+  """Replace the cached response with a response with header and lines."""
+  writer = response_cache.create_writer(header)
+  for line in lines:
+    writer.write_line(line)
+  writer.save()
+
+
+class TestResponseCache(unittest.TestCase):
+  """Tests for ResponseCache."""
+
+  def test_load_header(self) -> None:
+    file_system = InMemoryFileSystem()
+    response_cache = ResponseCache(file_system)
+    self.assertIsNone(response_cache.load_header())
+    save_response(response_cache, RESPONSE_HEADER, [b'{"username":"Bot-1"}'])
+    self.assertIn(file_paths.online_bots_cache_path(), file_system.binary_files)
+    self.assertEqual(ResponseCache(file_system).load_header(), RESPONSE_HEADER)
+
+  def test_iter_lines(self) -> None:
+    response_cache = ResponseCache(InMemoryFileSystem())
+    self.assertListEqual(list(response_cache.iter_lines()), [])
+    save_response(response_cache, RESPONSE_HEADER, [b'{"username":"Bot-1"}', b"", b'{"username":"Bot-2"}'])
+    self.assertListEqual(list(response_cache.iter_lines()), ['{"username":"Bot-1"}', '{"username":"Bot-2"}'])
+
+  def test_writer(self) -> None:
+    response_cache = ResponseCache(InMemoryFileSystem())
+    writer = response_cache.create_writer(RESPONSE_HEADER)
+    writer.write_line(b'{"username":"Bot-1"}')
+    writer.write_line(b'{"username":"Bot-2"}')
+    # Nothing is cached until the writer is saved
+    self.assertIsNone(response_cache.load_header())
+    writer.save()
+    self.assertEqual(response_cache.load_header(), RESPONSE_HEADER)
+    self.assertListEqual(list(response_cache.iter_lines()), ['{"username":"Bot-1"}', '{"username":"Bot-2"}'])
+
+  def test_bot_users_round_trip(self) -> None:
+    file_system = InMemoryFileSystem()
+    response_cache = ResponseCache(file_system)
+    self.assertIsNone(response_cache.load_bot_users(RESPONSE_HEADER))
+    writer = response_cache.create_bot_users_writer(RESPONSE_HEADER)
+    for bot_user in BOT_USERS:
+      writer.write_bot_user(bot_user)
+    # Nothing is saved until the writer is saved
+    self.assertIsNone(response_cache.load_bot_users(RESPONSE_HEADER))
+    writer.save()
+    self.assertIn(file_paths.online_bot_users_cache_path(), file_system.binary_files)
+    self.assertListEqual(ResponseCache(file_system).load_bot_users(RESPONSE_HEADER) or [], BOT_USERS)
+
+  def test_bot_users_of_another_response(self) -> None:
+    response_cache = ResponseCache(InMemoryFileSystem())
+    writer = response_cache.create_bot_users_writer(RESPONSE_HEADER)
+    writer.write_bot_user(BOT_USERS[0])
+    writer.save()
+    self.assertIsNone(response_cache.load_bot_users(ResponseHeader('"other etag"', "", 1)))
+
+  def test_bot_users_not_valid(self) -> None:
+    file_system = InMemoryFileSystem()
+    response_cache = ResponseCache(file_system)
+    writer = response_cache.create_bot_users_writer(RESPONSE_HEADER)
+    writer.write_bot_user(BOT_USERS[1])
+    writer.save()
+    data = file_system.read_bytes(file_paths.online_bot_users_cache_path()) or b""
+    for invalid_data in (data[:-1], data[:20], b"not parsed bots"):
+      file_system.write_bytes(file_paths.online_bot_users_cache_path(), invalid_data)
+      self.assertIsNone(response_cache.load_bot_users(RESPONSE_HEADER))
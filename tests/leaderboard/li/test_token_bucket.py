@@ -0,0 +1,30 @@
+"""Tests for token_bucket.py."""
+
+import asyncio
+import time
+import unittest
+
+from src.leaderboard.li.token_bucket import TokenBucket
+
+
+async def acquire_tokens(rate: float, capacity: int, count: int) -> float:
+  """Acquire tokens concurrently and return the number of seconds it took."""
+  token_bucket = TokenBucket(rate, capacity)
+  start_time = time.monotonic()
+  await asyncio.gather(*(token_bucket.acquire() for _ in range(count)))
+  return time.monotonic() - start_time
+
+
+class TestTokenBucket(unittest.TestCase):
+  """Tests for TokenBucket."""
+
+  def test_burst_does_not_wait(self) -> None:
+    self.assertLess(asyncio.run(acquire_tokens(1, 5, 5)), 0.5)
+
+  def test_rate_is_limited(self) -> None:
+    # The first two tokens are available immediately, the next three take 1/50s each
+    self.assertGreaterEqual(asyncio.run(acquire_tokens(50, 2, 5)), 0.05)
+
+  def test_invalid(self) -> None:
+    self.assertRaises(ValueError, lambda: TokenBucket(0, 1))
+    self.assertRaises(ValueError, lambda: TokenBucket(1, 0))
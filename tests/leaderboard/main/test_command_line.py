@@ -0,0 +1,82 @@
+"""Tests for command_line.py."""
+
+import contextlib
+import io
+import unittest
+from unittest import mock
+
+from src.leaderboard.data import vectorized_ranking
+from src.leaderboard.li.pert_type import PerfType
+from src.leaderboard.main import command_line
+
+
+class TestCommandLine(unittest.TestCase):
+  """Tests for command_line functions."""
+
+  def test_parse_arguments_default(self) -> None:
+    arguments = command_line.parse_arguments([])
+    self.assertFalse(arguments.poll)
+    self.assertFalse(arguments.render_only)
+    self.assertFalse(arguments.skip_unchanged_pages)
+    self.assertEqual(arguments.workers, 0)
+    self.assertEqual(arguments.store, "json")
+    self.assertFalse(arguments.record)
+    self.assertEqual(arguments.ranking, "python")
+    self.assertEqual(arguments.base_url, "https://lichess.org")
+    self.assertEqual(arguments.poll_interval, command_line.DEFAULT_POLL_INTERVAL_MINUTES)
+    self.assertIsNone(arguments.perf)
+
+  def test_parse_arguments_poll(self) -> None:
+    arguments = command_line.parse_arguments(["--poll", "--poll-interval", "2.5"])
+    self.assertTrue(arguments.poll)
+    self.assertEqual(arguments.poll_interval, 2.5)
+
+  def test_parse_arguments_render_only(self) -> None:
+    arguments = command_line.parse_arguments(["--render-only"])
+    self.assertTrue(arguments.render_only)
+
+  def test_parse_arguments_store(self) -> None:
+    arguments = command_line.parse_arguments(["--store", "sqlite"])
+    self.assertEqual(arguments.store, "sqlite")
+    arguments = command_line.parse_arguments(["--store", "delta"])
+    self.assertEqual(arguments.store, "delta")
+
+  def test_parse_arguments_archive_after(self) -> None:
+    self.assertIsNone(command_line.parse_arguments([]).archive_after)
+    self.assertEqual(command_line.parse_arguments(["--archive-after", "30"]).archive_after, 30)
+
+  def test_parse_arguments_perf(self) -> None:
+    arguments = command_line.parse_arguments(["--perf", "blitz,bullet"])
+    self.assertEqual(arguments.perf, frozenset((PerfType.BULLET, PerfType.BLITZ)))
+    arguments = command_line.parse_arguments(["--perf", "threeCheck"])
+    self.assertEqual(arguments.perf, frozenset((PerfType.THREE_CHECK,)))
+    with self.assertRaises(SystemExit), contextlib.redirect_stderr(io.StringIO()):
+      command_line.parse_arguments(["--perf", "blitz,puzzle"])
+
+  def test_parse_arguments_workers(self) -> None:
+    arguments = command_line.parse_arguments(["--workers", "4"])
+    self.assertEqual(arguments.workers, 4)
+
+  def test_parse_arguments_skip_unchanged_pages(self) -> None:
+    arguments = command_line.parse_arguments(["--skip-unchanged-pages"])
+    self.assertTrue(arguments.skip_unchanged_pages)
+
+  def test_parse_arguments_record(self) -> None:
+    arguments = command_line.parse_arguments(["--poll", "--record"])
+    self.assertTrue(arguments.record)
+
+  def test_parse_arguments_base_url(self) -> None:
+    arguments = command_line.parse_arguments(["--base-url", "http://127.0.0.1:8000"])
+    self.assertEqual(arguments.base_url, "http://127.0.0.1:8000")
+
+  def test_parse_arguments_ranking(self) -> None:
+    with mock.patch.object(vectorized_ranking, "is_available", return_value=True):
+      self.assertEqual(command_line.parse_arguments(["--ranking", "numpy"]).ranking, "numpy")
+
+  def test_parse_arguments_ranking_numpy_not_installed(self) -> None:
+    with (
+      mock.patch.object(vectorized_ranking, "is_available", return_value=False),
+      self.assertRaises(SystemExit),
+      contextlib.redirect_stderr(io.StringIO()),
+    ):
+      command_line.parse_arguments(["--ranking", "numpy"])
@@ -0,0 +1,136 @@
+"""Tests for history_backfill.py."""
+
+import json
+import os
+import subprocess
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from src.leaderboard.data.leaderboard_objects import LeaderboardPerf, LeaderboardRow, RankInfo
+from src.leaderboard.data.rating_history import HistoryPoint, RatingHistory
+from src.leaderboard.fs import file_paths
+from src.leaderboard.li.pert_type import PerfType
+from src.leaderboard.main import history_backfill
+from src.leaderboard.main.history_backfill import GenerationCommit, GitBlobReader
+from tests.leaderboard.fs.in_memory_file_system import InMemoryFileSystem
+from tests.leaderboard.log.fake_log_writer import FakeLogWriter
+
+
+def create_row(name: str, rating: int, rank: int) -> LeaderboardRow:
+  """Create a row with a rating and rank."""
+  return LeaderboardRow(name, LeaderboardPerf(rating, 50, 0, 10, False), RankInfo(rank, 0, 0, 0, rank, rating, 0))
+
+
+def git(repo_dir: Path, *args: str, author_time: int = 0) -> None:
+  """Run a git command in a repository, authoring at author_time if it is positive.
+
+  The commit time is left as the current time, as it is after the generations are rebased.
+  """
+  env = {**os.environ, "GIT_AUTHOR_DATE": f"@{author_time} +0000"} if author_time else None
+  subprocess.run(  # noqa: S603 - the arguments are not interpreted by a shell
+    ["git", "-C", str(repo_dir), "-c", "user.name=test", "-c", "user.email=test@example.com", *args],  # noqa: S607 - git is found on the path
+    check=True,
+    capture_output=True,
+    env=env,
+  )
+
+
+def commit_rows(repo_dir: Path, subject: str, author_time: int, rows: list[LeaderboardRow]) -> None:
+  """Commit the rows as the bullet data file."""
+  data_path = repo_dir / file_paths.data_path(PerfType.BULLET)
+  data_path.parent.mkdir(parents=True, exist_ok=True)
+  data_path.write_text(json.dumps([row.as_dict() for row in rows], indent=2))
+  git(repo_dir, "add", "-A")
+  git(repo_dir, "commit", "--allow-empty", "-m", subject, author_time=author_time)
+
+
+def create_repo(repo_dir: Path) -> None:
+  """Create a repository with the commits of three generations, and a commit which is not a generation."""
+  git(repo_dir, "init", "--initial-branch", history_backfill.DEFAULT_REF)
+  commit_rows(repo_dir, "Add the leaderboard", 1_000, [])
+  commit_rows(repo_dir, "Generate leaderboard # 1 #", 2_000, [create_row("Bot-1", 2000, 1), create_row("Bot-2", 1900, 2)])
+  commit_rows(repo_dir, "Generate leaderboard # 2 #", 3_000, [create_row("Bot-1", 2000, 1), create_row("Bot-2", 1950, 2)])
+  commit_rows(repo_dir, "Generate leaderboard # 3 #", 4_000, [create_row("Bot-1", 2000, 2), create_row("Bot-2", 2050, 1)])
+
+
+class TestHistoryBackfill(unittest.TestCase):
+  """Tests for history_backfill functions."""
+
+  def setUp(self) -> None:
+    temp_dir = tempfile.TemporaryDirectory()
+    self.addCleanup(temp_dir.cleanup)
+    self.repo_dir = Path(temp_dir.name)
+    create_repo(self.repo_dir)
+
+  def test_list_generation_commits(self) -> None:
+    commits = history_backfill.list_generation_commits(self.repo_dir, history_backfill.DEFAULT_REF)
+    self.assertListEqual([(commit.generation_number, commit.time) for commit in commits], [(1, 2_000), (2, 3_000), (3, 4_000)])
+
+  def test_read_blobs(self) -> None:
+    commits = history_backfill.list_generation_commits(self.repo_dir, history_backfill.DEFAULT_REF)
+    with GitBlobReader(self.repo_dir) as blob_reader:
+      blobs = blob_reader.read_blobs(
+        [f"{commits[0].sha}:{file_paths.data_path(PerfType.BULLET)}", f"{commits[0].sha}:missing"]
+      )
+    self.assertIsNotNone(blobs[0])
+    self.assertIsNone(blobs[1])
+
+  def test_decode_chunk(self) -> None:
+    commits = history_backfill.list_generation_commits(self.repo_dir, history_backfill.DEFAULT_REF)
+    decoded_chunk = history_backfill.decode_chunk(self.repo_dir, (commits[0], commits[1:]))
+    self.assertListEqual([commit for commit, _ in decoded_chunk], commits[1:])
+    self.assertListEqual(decoded_chunk[0][1][PerfType.BULLET], [create_row("Bot-2", 1950, 2)])
+    self.assertListEqual(decoded_chunk[0][1][PerfType.BLITZ], [])
+
+  def test_backfill_history(self) -> None:
+    expected_series = [
+      HistoryPoint(1, 2_000, 1900, 50, 10, 2),
+      HistoryPoint(2, 3_000, 1950, 50, 10, 2),
+      HistoryPoint(3, 4_000, 2050, 50, 10, 1),
+    ]
+    for workers in (0, 2):
+      file_system = InMemoryFileSystem()
+      with mock.patch.object(history_backfill, "DEFAULT_CHUNK_SIZE", 2):
+        generation_count = history_backfill.backfill_history(
+          self.repo_dir, file_system, FakeLogWriter(), history_backfill.DEFAULT_REF, workers
+        )
+      self.assertEqual(generation_count, 3)
+      history = RatingHistory(file_system)
+      self.assertListEqual(history.load_series("Bot-2", PerfType.BULLET), expected_series)
+      self.assertEqual(len(history.load_series("Bot-1", PerfType.BULLET)), 2)
+
+  def test_backfill_history_skips_retired_data_files(self) -> None:
+    # The data files are deleted once the state is kept by the delta store
+    (self.repo_dir / file_paths.data_path(PerfType.BULLET)).unlink()
+    git(self.repo_dir, "add", "-A")
+    git(self.repo_dir, "commit", "-m", "Generate leaderboard # 4 #", author_time=5_000)
+    git(self.repo_dir, "commit", "--allow-empty", "-m", "Generate leaderboard # 5 #", author_time=6_000)
+    file_system = InMemoryFileSystem()
+    with mock.patch.object(history_backfill, "DEFAULT_CHUNK_SIZE", 3):
+      generation_count = history_backfill.backfill_history(self.repo_dir, file_system, FakeLogWriter())
+    self.assertEqual(generation_count, 3)
+    self.assertEqual(RatingHistory(file_system).load_series("Bot-2", PerfType.BULLET)[-1].generation, 3)
+
+  def test_backfill_history_requires_empty_history(self) -> None:
+    file_system = InMemoryFileSystem()
+    RatingHistory(file_system).append_rows(1, 1_000, {PerfType.BULLET: [create_row("Bot-1", 2000, 1)]})
+    with self.assertRaises(ValueError):
+      history_backfill.backfill_history(self.repo_dir, file_system, FakeLogWriter())
+
+  def test_parse_arguments(self) -> None:
+    arguments = history_backfill.parse_arguments(["repo", "--ref", "main", "--output", "out", "--workers", "4"])
+    self.assertEqual(arguments.repo_dir, Path("repo"))
+    self.assertEqual(arguments.ref, "main")
+    self.assertEqual(arguments.output, Path("out"))
+    self.assertEqual(arguments.workers, 4)
+
+
+class TestGenerationCommit(unittest.TestCase):
+  """Tests for GenerationCommit."""
+
+  def test_generation_subject(self) -> None:
+    self.assertIsNotNone(history_backfill.GENERATION_SUBJECT.fullmatch("Generate leaderboard # 12 #"))
+    self.assertIsNone(history_backfill.GENERATION_SUBJECT.fullmatch("Generate leaderboard"))
+    self.assertEqual(GenerationCommit("sha", 1, 2).generation_number, 1)
@@ -0,0 +1,30 @@
+"""Tests for history_query.py."""
+
+import unittest
+
+from src.leaderboard.data.rating_history import RatingHistory
+from src.leaderboard.li.pert_type import PerfType
+from src.leaderboard.main import history_query
+from tests.leaderboard.data.test_rating_history import append_generations
+from tests.leaderboard.fs.in_memory_file_system import InMemoryFileSystem
+from tests.leaderboard.log.fake_log_writer import FakeLogWriter
+
+
+class TestHistoryQuery(unittest.TestCase):
+  """Tests for history_query functions."""
+
+  def test_query_history(self) -> None:
+    file_system = InMemoryFileSystem()
+    append_generations(RatingHistory(file_system))
+    points = history_query.query_history(file_system, FakeLogWriter(), "Bot-1", PerfType.BULLET, "chart.svg")
+    self.assertEqual(len(points), 2)
+    self.assertIn("<title>Bot-1 Bullet</title>", file_system.read_file("chart.svg") or "")
+
+  def test_query_missing_history(self) -> None:
+    self.assertListEqual(history_query.query_history(InMemoryFileSystem(), FakeLogWriter(), "Bot-1", PerfType.BULLET), [])
+
+  def test_parse_arguments(self) -> None:
+    arguments = history_query.parse_arguments(["Bot-1", "bullet", "--svg", "chart.svg"])
+    self.assertEqual(arguments.name, "Bot-1")
+    self.assertEqual(arguments.perf_type, "bullet")
+    self.assertEqual(arguments.svg, "chart.svg")
@@ -1,8 +1,21 @@
 """Tests for leaderboard_generator.py."""
 
+import copy
+import dataclasses
 import unittest
+from unittest import mock
 
+from src.leaderboard.bench import synthetic_bots
+from src.leaderboard.chrono.durations import ONE_DAY, TWO_WEEKS
 from src.leaderboard.chrono.fixed_time_provider import FixedTimeProvider
+from src.leaderboard.data import binary_snapshot, bot_archive, eligibility_expiry, sightings_buffer
+from src.leaderboard.data.data_generator import GenerationOptions
+from src.leaderboard.data.delta_leaderboard_store import DeltaLeaderboardStore
+from src.leaderboard.data.json_leaderboard_store import JsonLeaderboardStore
+from src.leaderboard.data.leaderboard_store import copy_leaderboard_state
+from src.leaderboard.data.rating_history import RatingHistory
+from src.leaderboard.data.sightings_buffer import SightingsBuffer
+from src.leaderboard.data.sqlite_leaderboard_store import SqliteLeaderboardStore
 from src.leaderboard.fs import file_paths
 from src.leaderboard.li.pert_type import PerfType
 from src.leaderboard.main import leaderboard_generator as leaderboard_generation_functions
@@ -17,11 +30,15 @@ class TestLeaderboardGeneratorFunctions(unittest.TestCase):
 
   def test_increment_generation_number(self) -> None:
     file_system = InMemoryFileSystem()
-    leaderboard_generation_functions.increment_generation_number(file_system)
+    self.assertEqual(leaderboard_generation_functions.increment_generation_number(file_system), 1)
     self.assertEqual(file_system.read_file(file_paths.generation_number_path()), "1")
-    leaderboard_generation_functions.increment_generation_number(file_system)
+    self.assertEqual(leaderboard_generation_functions.increment_generation_number(file_system), 2)
     self.assertEqual(file_system.read_file(file_paths.generation_number_path()), "2")
 
+  def test_estimate_seconds_saved(self) -> None:
+    self.assertAlmostEqual(leaderboard_generation_functions.estimate_seconds_saved(2.0, 100, 50), 1.0)
+    self.assertEqual(leaderboard_generation_functions.estimate_seconds_saved(2.0, 0, 50), 0.0)
+
 
 class TestLeaderboardGenerator(unittest.TestCase):
   """Tests for leaderboard generator."""
@@ -46,3 +63,258 @@ class TestLeaderboardGenerator(unittest.TestCase):
     if not bullet_html:
       self.fail(f"Missing bullet_html: {bullet_html}")
     self.assertIn("Bot-1", bullet_html)
+
+  def test_generate_leaderboard_consumes_sightings(self) -> None:
+    file_system = InMemoryFileSystem()
+    lichess_client = FakeLichessClient()
+    sightings_buffer.save_sightings_buffer(
+      file_system, SightingsBuffer.from_ndjson("""{"username":"Bot-2","perfs":{"bullet":{"rating":2000,"games":10}}}""")
+    )
+
+    lichess_client.set_online_bots("""{ "username": "Bot-1", "perfs": { "bullet": { "rating": 2345, "games": 678 } } }""")
+
+    leaderboard_generator = LeaderboardGenerator(file_system, lichess_client, FixedTimeProvider(0), FakeLogWriter())
+    leaderboard_generator.generate_leaderboards()
+
+    bullet_data = file_system.read_file(file_paths.data_path(PerfType.BULLET))
+    if not bullet_data:
+      self.fail(f"Missing bullet_data: {bullet_data}")
+    self.assertIn("Bot-1", bullet_data)
+    self.assertIn("Bot-2", bullet_data)
+    self.assertEqual(len(sightings_buffer.load_sightings_buffer(file_system)), 0)
+
+  def test_generate_leaderboard_when_unchanged(self) -> None:
+    file_system = InMemoryFileSystem()
+    lichess_client = FakeLichessClient()
+    lichess_client.set_online_bots("""{ "username": "Bot-1", "perfs": { "bullet": { "rating": 2345, "games": 678 } } }""")
+    lichess_client.set_online_bots_changed(False)
+
+    LeaderboardGenerator(file_system, lichess_client, FixedTimeProvider(0), FakeLogWriter()).generate_leaderboards()
+
+    # The unchanged online bots are still generated, so that the generation advances with the passage of time
+    bullet_data = file_system.read_file(file_paths.data_path(PerfType.BULLET))
+    if not bullet_data:
+      self.fail(f"Missing bullet_data: {bullet_data}")
+    self.assertIn("Bot-1", bullet_data)
+    self.assertEqual(file_system.read_file(file_paths.generation_number_path()), "1")
+
+  def test_generate_leaderboard_keeps_unchanged_pages(self) -> None:
+    file_system = InMemoryFileSystem()
+    lichess_client = FakeLichessClient()
+    lichess_client.set_online_bots("""{ "username": "Bot-1", "perfs": { "bullet": { "rating": 2345, "games": 678 } } }""")
+    options = GenerationOptions(skip_unchanged_pages=True)
+    LeaderboardGenerator(file_system, lichess_client, FixedTimeProvider(0), FakeLogWriter(), options).generate_leaderboards()
+    bullet_data = file_system.read_file(file_paths.data_path(PerfType.BULLET))
+    file_system.write_file(file_paths.html_path(PerfType.BULLET.to_string()), "kept")
+
+    LeaderboardGenerator(file_system, lichess_client, FixedTimeProvider(1), FakeLogWriter(), options).generate_leaderboards()
+
+    self.assertEqual(file_system.read_file(file_paths.data_path(PerfType.BULLET)), bullet_data)
+    self.assertEqual(file_system.read_file(file_paths.html_path(PerfType.BULLET.to_string())), "kept")
+    self.assertEqual(file_system.read_file(file_paths.generation_number_path()), "2")
+
+  def test_generate_leaderboard_in_parallel(self) -> None:
+    file_systems = [InMemoryFileSystem(), InMemoryFileSystem()]
+    for file_system, workers in zip(file_systems, (0, 2), strict=True):
+      lichess_client = FakeLichessClient()
+      options = GenerationOptions(workers=workers)
+      for seed in range(2):
+        lichess_client.set_online_bots("\n".join(synthetic_bots.create_online_bots_lines(100, seed)))
+        time_provider = FixedTimeProvider(synthetic_bots.SEEN_AT // 1000 + seed)
+        LeaderboardGenerator(file_system, lichess_client, time_provider, FakeLogWriter(), options).generate_leaderboards()
+
+    self.assertDictEqual(file_systems[1].file_system, file_systems[0].file_system)
+
+  def test_generate_leaderboard_saves_snapshot(self) -> None:
+    file_system = InMemoryFileSystem()
+    lichess_client = FakeLichessClient()
+    for seed in range(2):
+      lichess_client.set_online_bots("\n".join(synthetic_bots.create_online_bots_lines(50, seed)))
+      time_provider = FixedTimeProvider(synthetic_bots.SEEN_AT // 1000 + seed)
+      LeaderboardGenerator(file_system, lichess_client, time_provider, FakeLogWriter()).generate_leaderboards()
+
+    # The snapshot of the last generation matches the json files
+    snapshot = binary_snapshot.load_snapshot(file_system)
+    self.assertIsNotNone(snapshot)
+    if snapshot:
+      json_store = JsonLeaderboardStore(file_system)
+      self.assertDictEqual(snapshot.load_bot_profiles(), json_store.load_bot_profiles())
+      self.assertDictEqual(snapshot.load_leaderboard_rows(), json_store.load_leaderboard_rows())
+
+  def test_generate_leaderboard_with_eligibility_expiry(self) -> None:
+    file_systems = [InMemoryFileSystem(), InMemoryFileSystem()]
+    lichess_client = FakeLichessClient()
+    lichess_client.set_online_bots("\n".join(synthetic_bots.create_online_bots_lines(50)))
+    start_time = synthetic_bots.SEEN_AT // 1000
+    for current_time in (start_time, start_time + 1, start_time + 2, start_time + TWO_WEEKS + 1, start_time + TWO_WEEKS + 2):
+      for file_system in file_systems:
+        time_provider = FixedTimeProvider(current_time)
+        LeaderboardGenerator(file_system, lichess_client, time_provider, FakeLogWriter()).generate_leaderboards()
+      self.assertIsNotNone(eligibility_expiry.load_eligibility_expiry(file_systems[0]))
+      # Without the index the eligibility of every row is checked
+      del file_systems[1].binary_files[file_paths.eligibility_expiry_path()]
+
+    # The leaderboards are the same either way
+    self.assertDictEqual(file_systems[0].file_system, file_systems[1].file_system)
+
+  def test_generate_leaderboard_archives_stale_bots(self) -> None:
+    file_system = InMemoryFileSystem()
+    lichess_client = FakeLichessClient()
+    bot_1_json = (
+      """{ "username": "Bot-1", "createdAt": 1000, "seenAt": %d, "perfs": { "bullet": { "rating": %d, "games": %d } } }"""
+    )
+    bot_2_json = """{ "username": "Bot-2", "seenAt": %d, "perfs": { "bullet": { "rating": 2000, "games": 100 } } }"""
+    options = GenerationOptions(archive_after=ONE_DAY)
+    time_provider = FixedTimeProvider(ONE_DAY)
+    lichess_client.set_online_bots("\n".join([bot_1_json % (ONE_DAY * 1000, 2345, 678), bot_2_json % (ONE_DAY * 1000)]))
+    LeaderboardGenerator(file_system, lichess_client, time_provider, FakeLogWriter(), options).generate_leaderboards()
+
+    # Bot-1 is not seen again until it has not been eligible for longer than the horizon
+    time_provider.fixed_current_time = 2 * ONE_DAY + TWO_WEEKS + 1
+    lichess_client.set_online_bots(bot_2_json % (time_provider.fixed_current_time * 1000))
+    LeaderboardGenerator(file_system, lichess_client, time_provider, FakeLogWriter(), options).generate_leaderboards()
+    json_store = JsonLeaderboardStore(file_system)
+    self.assertListEqual(list(json_store.load_bot_profiles()), ["Bot-2"])
+    self.assertListEqual([row.name for row in json_store.load_leaderboard_rows()[PerfType.BULLET]], ["Bot-2"])
+    archive = bot_archive.load_bot_archive(file_system)
+    self.assertListEqual(list(archive.bot_profiles_by_name), ["Bot-1"])
+    snapshot = binary_snapshot.load_snapshot(file_system)
+    self.assertIsNotNone(snapshot)
+    if snapshot:
+      self.assertDictEqual(snapshot.load_leaderboard_rows(), json_store.load_leaderboard_rows())
+
+    # Bot-1 is restored with its peak rating and creation time when it is seen again
+    time_provider.fixed_current_time += ONE_DAY
+    seen_at = time_provider.fixed_current_time * 1000
+    lichess_client.set_online_bots("\n".join([bot_1_json % (seen_at, 2100, 700), bot_2_json % seen_at]))
+    with mock.patch.object(bot_archive.BotArchive, "deserialize", wraps=bot_archive.BotArchive.deserialize) as deserialize:
+      LeaderboardGenerator(file_system, lichess_client, time_provider, FakeLogWriter(), options).generate_leaderboards()
+    # The archive is only loaded once
+    deserialize.assert_called_once()
+    bot_profiles = json_store.load_bot_profiles()
+    self.assertEqual(bot_profiles["Bot-1"].created, 1)
+    bot_1_row = next(row for row in json_store.load_leaderboard_rows()[PerfType.BULLET] if row.name == "Bot-1")
+    self.assertEqual((bot_1_row.perf.rating, bot_1_row.rank_info.peak_rating), (2100, 2345))
+    self.assertDictEqual(bot_archive.load_bot_archive(file_system).bot_profiles_by_name, {})
+
+  def test_generate_leaderboard_records_history(self) -> None:
+    file_system = InMemoryFileSystem()
+    lichess_client = FakeLichessClient()
+    for seed in range(3):
+      lichess_client.set_online_bots("\n".join(synthetic_bots.create_online_bots_lines(50, seed)))
+      time_provider = FixedTimeProvider(synthetic_bots.SEEN_AT // 1000 + seed)
+      LeaderboardGenerator(file_system, lichess_client, time_provider, FakeLogWriter()).generate_leaderboards()
+
+    # The last point of each bot's series is its current row
+    history = RatingHistory(file_system)
+    rows_by_perf_type = JsonLeaderboardStore(file_system).load_leaderboard_rows()
+    for perf_type, rows in rows_by_perf_type.items():
+      for row in rows:
+        point = history.load_series(row.name, perf_type)[-1]
+        self.assertEqual(
+          (point.rating, point.rd, point.games, point.rank), (row.perf.rating, row.perf.rd, row.perf.games, row.rank_info.rank)
+        )
+        self.assertLessEqual(point.generation, 3)
+
+  def test_generate_leaderboard_with_store(self) -> None:
+    file_system = InMemoryFileSystem()
+    lichess_client = FakeLichessClient()
+    with SqliteLeaderboardStore(":memory:") as store:
+      options = GenerationOptions(store=store)
+      for seed in range(2):
+        lichess_client.set_online_bots("\n".join(synthetic_bots.create_online_bots_lines(50, seed)))
+        time_provider = FixedTimeProvider(synthetic_bots.SEEN_AT // 1000 + seed)
+        LeaderboardGenerator(file_system, lichess_client, time_provider, FakeLogWriter(), options).generate_leaderboards()
+
+      # The json files are an export of the store
+      json_store = JsonLeaderboardStore(file_system)
+      self.assertDictEqual(store.load_bot_profiles(), json_store.load_bot_profiles())
+      self.assertDictEqual(store.load_leaderboard_rows(), json_store.load_leaderboard_rows())
+
+  def test_generate_leaderboard_with_delta_store(self) -> None:
+    file_system = InMemoryFileSystem()
+    lichess_client = FakeLichessClient()
+    lichess_client.set_online_bots("\n".join(synthetic_bots.create_online_bots_lines(50, 0)))
+    time_provider = FixedTimeProvider(synthetic_bots.SEEN_AT // 1000)
+    LeaderboardGenerator(file_system, lichess_client, time_provider, FakeLogWriter()).generate_leaderboards()
+    # The store is seeded from the json files, which are then deleted rather than left to go stale
+    json_file_system = copy.deepcopy(file_system)
+    store = DeltaLeaderboardStore(file_system)
+    copy_leaderboard_state(JsonLeaderboardStore(file_system), store)
+    options = GenerationOptions(store=store, export_json=False)
+    for seed, perf_types in ((1, None), (2, None), (3, frozenset((PerfType.BULLET,)))):
+      lichess_client.set_online_bots("\n".join(synthetic_bots.create_online_bots_lines(50, seed)))
+      time_provider = FixedTimeProvider(synthetic_bots.SEEN_AT // 1000 + seed)
+      options = dataclasses.replace(options, perf_types=perf_types)
+      LeaderboardGenerator(file_system, lichess_client, time_provider, FakeLogWriter(), options).generate_leaderboards()
+      json_options = GenerationOptions(perf_types=perf_types)
+      LeaderboardGenerator(
+        json_file_system, lichess_client, time_provider, FakeLogWriter(), json_options
+      ).generate_leaderboards()
+
+    # A record is written for each generation instead of the json files, and only some leaderboards do not make a generation
+    self.assertListEqual(
+      file_system.list_files(file_paths.generations_dir()), [file_paths.generation_record_path(number) for number in (1, 2, 3)]
+    )
+    self.assertTrue(JsonLeaderboardStore(file_system).is_empty())
+    self.assertNotIn(file_paths.data_path(PerfType.BULLET), file_system.file_system)
+    # The state rebuilt from the records is the same as the json files of the same generations
+    store = DeltaLeaderboardStore(file_system)
+    json_store = JsonLeaderboardStore(json_file_system)
+    self.assertDictEqual(store.load_bot_profiles(), json_store.load_bot_profiles())
+    self.assertDictEqual(store.load_leaderboard_rows(), json_store.load_leaderboard_rows())
+
+    # The pages are rendered from the store
+    file_system.write_file(file_paths.html_path(PerfType.BULLET.to_string()), "")
+    render_options = GenerationOptions(store=store)
+    LeaderboardGenerator(
+      file_system, lichess_client, FixedTimeProvider(0), FakeLogWriter(), render_options
+    ).render_leaderboards()
+    self.assertIn("Synthetic-Bot-", file_system.read_file(file_paths.html_path(PerfType.BULLET.to_string())) or "")
+
+  def test_generate_selected_perf_types(self) -> None:
+    file_system = InMemoryFileSystem()
+    lichess_client = FakeLichessClient()
+    lichess_client.set_online_bots("\n".join(synthetic_bots.create_online_bots_lines(50, 0)))
+    time_provider = FixedTimeProvider(synthetic_bots.SEEN_AT // 1000)
+    LeaderboardGenerator(file_system, lichess_client, time_provider, FakeLogWriter()).generate_leaderboards()
+    history_record_count = RatingHistory(file_system).get_record_count()
+    blitz_files = [file_paths.data_path(PerfType.BLITZ), file_paths.html_path(PerfType.BLITZ.to_string())]
+    blitz_contents = [file_system.read_file(file_name) for file_name in blitz_files]
+    bullet_data = file_system.read_file(file_paths.data_path(PerfType.BULLET))
+    file_system.write_file(file_paths.html_path("index"), "")
+
+    lichess_client.set_online_bots("\n".join(synthetic_bots.create_online_bots_lines(50, 1)))
+    time_provider.fixed_current_time += 1
+    options = GenerationOptions(perf_types=frozenset((PerfType.BULLET,)))
+    LeaderboardGenerator(file_system, lichess_client, time_provider, FakeLogWriter(), options).generate_leaderboards()
+
+    # Only the bullet leaderboard and the index are generated
+    self.assertNotEqual(file_system.read_file(file_paths.data_path(PerfType.BULLET)), bullet_data)
+    self.assertListEqual([file_system.read_file(file_name) for file_name in blitz_files], blitz_contents)
+    self.assertIn("Synthetic-Bot-", file_system.read_file(file_paths.html_path("index")) or "")
+    # It is not a new generation, and the snapshot still matches the json files
+    self.assertEqual(file_system.read_file(file_paths.generation_number_path()), "1")
+    self.assertEqual(RatingHistory(file_system).get_record_count(), history_record_count)
+    snapshot = binary_snapshot.load_snapshot(file_system)
+    self.assertIsNotNone(snapshot)
+    if snapshot:
+      self.assertDictEqual(snapshot.load_leaderboard_rows(), JsonLeaderboardStore(file_system).load_leaderboard_rows())
+
+  def test_render_leaderboard(self) -> None:
+    file_system = InMemoryFileSystem()
+    lichess_client = FakeLichessClient()
+    lichess_client.set_online_bots("""{ "username": "Bot-1", "perfs": { "bullet": { "rating": 2345, "games": 678 } } }""")
+    LeaderboardGenerator(file_system, lichess_client, FixedTimeProvider(0), FakeLogWriter()).generate_leaderboards()
+    bullet_data = file_system.read_file(file_paths.data_path(PerfType.BULLET))
+    file_system.write_file(file_paths.html_path(PerfType.BULLET.to_string()), "")
+
+    LeaderboardGenerator(file_system, lichess_client, FixedTimeProvider(0), FakeLogWriter()).render_leaderboards()
+
+    bullet_html = file_system.read_file(file_paths.html_path(PerfType.BULLET.to_string()))
+    if not bullet_html:
+      self.fail(f"Missing bullet_html: {bullet_html}")
+    self.assertIn("Bot-1", bullet_html)
+    # The data is not regenerated
+    self.assertEqual(file_system.read_file(file_paths.data_path(PerfType.BULLET)), bullet_data)
+    self.assertEqual(file_system.read_file(file_paths.generation_number_path()), "1")
@@ -0,0 +1,166 @@
+"""Tests for perf_type_generation.py."""
+
+import json
+import unittest
+
+from src.leaderboard.bench import synthetic_bots
+from src.leaderboard.chrono.durations import ONE_DAY
+from src.leaderboard.chrono.fixed_time_provider import FixedTimeProvider
+from src.leaderboard.data.data_generator import DataGenerator, GenerationInputs, GenerationOptions, create_ranked_rows
+from src.leaderboard.data.leaderboard_objects import LeaderboardPerf, LeaderboardRow, RankInfo
+from src.leaderboard.fs import file_paths
+from src.leaderboard.li.bot_user import BotUser
+from src.leaderboard.li.pert_type import PerfType
+from src.leaderboard.main import perf_type_generation
+from src.leaderboard.main.perf_type_generation import PerfTypeResult, PerfTypeTask
+from tests.leaderboard.chrono.epoch_seconds import DATE_2025_04_01
+from tests.leaderboard.data.test_data_generator import (
+  BOT_1_CURRENT_JSON,
+  BOT_1_CURRENT_PERF_BULLET,
+  BOT_1_CURRENT_PROFILE,
+  BOT_1_PROFILE,
+  BOT_1_ROW_BULLET,
+  BOT_2_CURRENT_JSON,
+  BOT_2_CURRENT_PERF_BULLET,
+  BOT_2_CURRENT_PROFILE,
+  BOT_2_PROFILE,
+  BOT_2_ROW_BULLET,
+  remove_whitespace,
+)
+from tests.leaderboard.fs.in_memory_file_system import InMemoryFileSystem
+from tests.leaderboard.li.fake_lichess_client import FakeLichessClient
+from tests.leaderboard.li.fake_users_client import FakeUsersClient
+
+
+# The time of the generation, when the synthetic bots were seen
+CURRENT_TIME = synthetic_bots.SEEN_AT // 1000
+
+
+def generate_all_perf_types(data_generator: DataGenerator) -> tuple[GenerationInputs, dict[PerfType, PerfTypeResult]]:
+  """Load the inputs of a generation and generate the leaderboard of every perf type from them."""
+  inputs = data_generator.load_generation_inputs()
+  tasks = [perf_type_generation.create_task(inputs, perf_type) for perf_type in PerfType.all_except_unknown()]
+  results = perf_type_generation.generate_perf_types(inputs, tasks, create_ranked_rows)
+  return inputs, {result.perf_type: result for result in results}
+
+
+def save_previous_data(file_system: InMemoryFileSystem) -> None:
+  """Save the bot profiles and bullet rows of Bot-1 and Bot-2."""
+  file_system.write_file(file_paths.bot_profiles_path(), json.dumps([BOT_1_PROFILE.as_dict(), BOT_2_PROFILE.as_dict()]))
+  file_system.write_file(
+    file_paths.data_path(PerfType.BULLET), json.dumps([BOT_1_ROW_BULLET.as_dict(), BOT_2_ROW_BULLET.as_dict()])
+  )
+
+
+class TestPerfTypeGeneration(unittest.TestCase):
+  """Tests for perf_type_generation functions."""
+
+  def test_serialize_rows(self) -> None:
+    rows = [
+      LeaderboardRow("Bot-1", LeaderboardPerf(1900, 50, 0, 10, False), RankInfo(2, 0, 0, 0, 2, 1900, 0)),
+      LeaderboardRow("bot-2", LeaderboardPerf(2000, 50, 0, 10, False), RankInfo(1, 0, 0, 0, 1, 2000, 0)),
+    ]
+    row_dicts = json.loads(perf_type_generation.serialize_rows(rows))
+    self.assertListEqual([LeaderboardRow.from_dict(row_dict) for row_dict in row_dicts], rows)
+
+  def test_remove_rows(self) -> None:
+    rows = [
+      LeaderboardRow("Bot-1", LeaderboardPerf(1900, 50, 0, 10, False), RankInfo(1, 0, 0, 0, 1, 1900, 0)),
+      LeaderboardRow("bot-2", LeaderboardPerf(2000, 50, 0, 10, False), RankInfo(0, 0, 0, 0, 0, 2000, 0)),
+    ]
+    result = PerfTypeResult(PerfType.BULLET, rows, rows, True, "", "", 0.0, 0.0)
+    self.assertIs(perf_type_generation.remove_rows(result, {"Bot-3"}, True), result)
+    removed_result = perf_type_generation.remove_rows(result, {"bot-2"}, True)
+    self.assertListEqual(removed_result.name_sorted_rows, rows[:1])
+    self.assertListEqual(removed_result.ranked_rows, rows[:1])
+    # The rows are saved again
+    self.assertFalse(removed_result.reused)
+    self.assertEqual(removed_result.data_json, perf_type_generation.serialize_rows(rows[:1]))
+
+  def test_generate_perf_types_in_parallel(self) -> None:
+    lichess_client = FakeLichessClient()
+    lichess_client.set_online_bots("\n".join(synthetic_bots.create_online_bots_lines(200)))
+    data_generator = DataGenerator(InMemoryFileSystem(), lichess_client, FixedTimeProvider(CURRENT_TIME))
+    inputs = data_generator.load_generation_inputs()
+    tasks = [
+      PerfTypeTask(perf_type, [], inputs.current_bot_perfs_by_perf_type[perf_type], False)
+      for perf_type in PerfType.all_except_unknown()
+    ]
+
+    sequential_results = perf_type_generation.generate_perf_types(inputs, tasks, create_ranked_rows)
+    parallel_results = perf_type_generation.generate_perf_types(inputs, tasks, create_ranked_rows, 2)
+
+    self.assertListEqual([result.perf_type for result in parallel_results], list(PerfType.all_except_unknown()))
+    for sequential_result, parallel_result in zip(sequential_results, parallel_results, strict=True):
+      self.assertListEqual(parallel_result.ranked_rows, sequential_result.ranked_rows)
+      self.assertEqual(parallel_result.data_json, sequential_result.data_json)
+      self.assertEqual(parallel_result.html, sequential_result.html)
+
+  def test_generate_perf_types(self) -> None:
+    file_system = InMemoryFileSystem()
+    save_previous_data(file_system)
+    lichess_client = FakeLichessClient()
+    lichess_client.set_online_bots("\n".join([remove_whitespace(BOT_1_CURRENT_JSON), remove_whitespace(BOT_2_CURRENT_JSON)]))
+
+    inputs, results = generate_all_perf_types(DataGenerator(file_system, lichess_client, FixedTimeProvider(DATE_2025_04_01)))
+
+    expected_ranked_rows = [
+      LeaderboardRow("Bot-2", BOT_2_CURRENT_PERF_BULLET.perf, RankInfo(1, 1, 100, 100, 1, 3000, DATE_2025_04_01)),
+      LeaderboardRow("Bot-1", BOT_1_CURRENT_PERF_BULLET.perf, RankInfo(2, -1, -50, 100, 1, 3000, DATE_2025_04_01)),
+    ]
+    self.assertListEqual(results[PerfType.BULLET].ranked_rows, expected_ranked_rows)
+    expected_bot_profiles = {
+      "Bot-1": BOT_1_CURRENT_PROFILE.create_updated_copy_for_for_merge(),
+      "Bot-2": BOT_2_CURRENT_PROFILE.create_updated_copy_for_for_merge(),
+    }
+    self.assertDictEqual(inputs.bot_profiles_by_name, expected_bot_profiles)
+
+  def test_generate_perf_types_refreshes_offline_bots(self) -> None:
+    file_system = InMemoryFileSystem()
+    save_previous_data(file_system)
+    # Only Bot-1 is online, Bot-2 is looked up
+    lichess_client = FakeLichessClient()
+    lichess_client.set_online_bots(remove_whitespace(BOT_1_CURRENT_JSON))
+    users_client = FakeUsersClient()
+    users_client.set_users([BotUser.from_json(BOT_2_CURRENT_JSON)])
+    data_generator = DataGenerator(
+      file_system, lichess_client, FixedTimeProvider(DATE_2025_04_01), GenerationOptions(users_client)
+    )
+
+    inputs, results = generate_all_perf_types(data_generator)
+
+    # Bot-2's rating is refreshed even though they are offline
+    expected_ranked_rows = [
+      LeaderboardRow("Bot-2", BOT_2_CURRENT_PERF_BULLET.perf, RankInfo(1, 1, 100, 100, 1, 3000, DATE_2025_04_01)),
+      LeaderboardRow("Bot-1", BOT_1_CURRENT_PERF_BULLET.perf, RankInfo(2, -1, -50, 100, 1, 3000, DATE_2025_04_01)),
+    ]
+    self.assertListEqual(results[PerfType.BULLET].ranked_rows, expected_ranked_rows)
+    expected_bot_profiles = {
+      "Bot-1": BOT_1_CURRENT_PROFILE.create_updated_copy_for_for_merge(),
+      "Bot-2": BOT_2_CURRENT_PROFILE.create_refreshed_copy_for_merge(),
+    }
+    self.assertDictEqual(inputs.bot_profiles_by_name, expected_bot_profiles)
+
+  def test_generate_perf_types_reuses_unchanged_rows(self) -> None:
+    file_system = InMemoryFileSystem()
+    lichess_client = FakeLichessClient()
+    lichess_client.set_online_bots(remove_whitespace(BOT_1_CURRENT_JSON))
+    first_inputs, first_results = generate_all_perf_types(
+      DataGenerator(file_system, lichess_client, FixedTimeProvider(DATE_2025_04_01))
+    )
+    self.assertFalse(any(result.reused for result in first_results.values()))
+    file_system.write_file(
+      file_paths.bot_profiles_path(),
+      json.dumps([bot_profile.as_dict() for bot_profile in first_inputs.bot_profiles_by_name.values()]),
+    )
+    for perf_type, result in first_results.items():
+      file_system.write_file(file_paths.data_path(perf_type), result.data_json)
+
+    _, results = generate_all_perf_types(
+      DataGenerator(file_system, lichess_client, FixedTimeProvider(DATE_2025_04_01 + ONE_DAY))
+    )
+
+    self.assertTrue(results[PerfType.BULLET].reused)
+    # The data file of a reused perf type is not written again
+    self.assertEqual(results[PerfType.BULLET].data_json, "")
+    self.assertListEqual(results[PerfType.BULLET].ranked_rows, first_results[PerfType.BULLET].ranked_rows)
@@ -0,0 +1,51 @@
+"""Tests for sightings_poller.py."""
+
+import unittest
+from collections.abc import Iterator
+
+from src.leaderboard.data import sightings_buffer
+from src.leaderboard.main.sightings_poller import SightingsPoller
+from tests.leaderboard.fs.in_memory_file_system import InMemoryFileSystem
+from tests.leaderboard.li.fake_lichess_client import FakeLichessClient
+from tests.leaderboard.log.fake_log_writer import FakeLogWriter
+
+
+class FailingLichessClient(FakeLichessClient):
+  """A lichess client which fails to connect."""
+
+  def iter_online_bots(self) -> Iterator[str]:
+    """Raise a connection error."""
+    error_msg = "Connection refused"
+    raise ConnectionError(error_msg)
+
+
+class TestSightingsPoller(unittest.TestCase):
+  """Tests for SightingsPoller."""
+
+  def test_poll(self) -> None:
+    file_system = InMemoryFileSystem()
+    lichess_client = FakeLichessClient()
+    poller = SightingsPoller(file_system, lichess_client, FakeLogWriter())
+
+    lichess_client.set_online_bots('{"username":"Bot-1","seenAt":1000}\n{"username":"Bot-2","seenAt":1000}')
+    poller.poll()
+    lichess_client.set_online_bots('{"username":"Bot-1","seenAt":2000}')
+    poller.poll()
+
+    bot_users = sightings_buffer.load_sightings_buffer(file_system).get_bot_users()
+    self.assertListEqual([(bot_user.username, bot_user.seen_at) for bot_user in bot_users], [("Bot-1", 2), ("Bot-2", 1)])
+
+  def test_run(self) -> None:
+    sleeps: list[float] = []
+    file_system = InMemoryFileSystem()
+    lichess_client = FakeLichessClient()
+    lichess_client.set_online_bots('{"username":"Bot-1"}')
+    SightingsPoller(file_system, lichess_client, FakeLogWriter(), sleeps.append).run(300, 3)
+    # There is no need to sleep after the last poll
+    self.assertListEqual(sleeps, [300, 300])
+    self.assertEqual(len(sightings_buffer.load_sightings_buffer(file_system)), 1)
+
+  def test_run_continues_after_failure(self) -> None:
+    sleeps: list[float] = []
+    SightingsPoller(InMemoryFileSystem(), FailingLichessClient(), FakeLogWriter(), sleeps.append).run(60, 2)
+    self.assertListEqual(sleeps, [60])
@@ -0,0 +1,25 @@
+"""Tests for rating_chart.py."""
+
+import unittest
+
+from src.leaderboard.data.rating_history import HistoryPoint
+from src.leaderboard.page import rating_chart
+
+
+POINTS = [HistoryPoint(1, 1000, 1500, 50, 1, 0), HistoryPoint(2, 2000, 1600, 50, 2, 1), HistoryPoint(3, 3000, 1550, 50, 3, 1)]
+
+
+class TestRatingChart(unittest.TestCase):
+  """Tests for rating_chart functions."""
+
+  def test_get_chart_coordinates(self) -> None:
+    coordinates = rating_chart.get_chart_coordinates(POINTS, 120, 120)
+    self.assertListEqual(coordinates, [(10.0, 110.0), (60.0, 10.0), (110.0, 60.0)])
+    self.assertListEqual(rating_chart.get_chart_coordinates(POINTS[:1], 120, 120), [(10.0, 110.0)])
+    self.assertListEqual(rating_chart.get_chart_coordinates([], 120, 120), [])
+
+  def test_render_rating_chart(self) -> None:
+    svg = rating_chart.render_rating_chart("Bot<1> Bullet", POINTS, 120, 120)
+    self.assertTrue(svg.startswith('<svg xmlns="http://www.w3.org/2000/svg" width="120" height="120"'))
+    self.assertIn("<title>Bot&lt;1&gt; Bullet</title>", svg)
+    self.assertIn('points="10.0,110.0 60.0,10.0 110.0,60.0"', svg)